@@ -0,0 +1 @@
+"""Offline benchmarks of the MCP server against a local GitHub stand-in."""
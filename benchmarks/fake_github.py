@@ -0,0 +1,689 @@
+"""A local stand-in for the GitHub REST and GraphQL APIs.
+
+Serves seeded repositories, issues, pull requests and file trees with the
+payload shapes, pagination links, conditional requests and rate-limit
+headers of the real API, so tools can be driven offline by both client
+backends. Every request is counted by route, which is what the benchmark
+reports as upstream requests per call.
+"""
+import asyncio
+import base64
+import gzip
+import hashlib
+import io
+import json
+import random
+import tarfile
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+
+RAW_MEDIA_TYPE = "application/vnd.github.raw"
+CREATED_AT = "2024-01-02T03:04:05Z"
+# The contents API inlines files up to this size.
+CONTENTS_MAX_BYTES = 1024 * 1024
+
+
+def git_sha(kind: str, data: bytes) -> str:
+    """SHA of a git object, as GitHub reports it."""
+    return hashlib.sha1(f"{kind} {len(data)}\0".encode() + data).hexdigest()
+
+
+@dataclass
+class Seed:
+    """Shape of the data a fake server starts with."""
+
+    owner: str = "bench"
+    repos: int = 3
+    issues: int = 60
+    pulls: int = 30
+    directories: int = 8
+    files_per_directory: int = 25
+    file_bytes: int = 2048
+    body_chars: int = 600
+
+
+@dataclass
+class FakeRepository:
+    """One seeded repository and its issues, pull requests and files."""
+
+    owner: str
+    name: str
+    index: int
+    files: Dict[str, bytes]
+    issues: List[Dict[str, Any]] = field(default_factory=list)
+    pulls: List[Dict[str, Any]] = field(default_factory=list)
+    default_branch: str = "main"
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.owner}/{self.name}"
+
+    @property
+    def commit_sha(self) -> str:
+        return git_sha("commit", self.full_name.encode())
+
+    @property
+    def tree_sha(self) -> str:
+        return git_sha("tree", "\n".join(sorted(self.files)).encode())
+
+    def directories(self) -> List[str]:
+        """Every directory holding a file, without the root."""
+        found = set()
+        for path in self.files:
+            parts = path.split("/")[:-1]
+            for end in range(1, len(parts) + 1):
+                found.add("/".join(parts[:end]))
+        return sorted(found)
+
+
+class FakeGitHub:
+    """In-memory GitHub data behind a FastAPI app.
+
+    ``latency`` (plus up to ``jitter``) seconds are added to every
+    response. Each token gets ``rate_limit`` requests per hour, reported
+    in ``X-RateLimit-*`` headers; an exhausted quota is refused with a
+    403, as GitHub does. ``304 Not Modified`` answers to conditional
+    requests are not counted against it.
+    """
+
+    def __init__(
+        self,
+        seed: Optional[Seed] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit: int = 5000,
+        base_url: str = "http://127.0.0.1",
+    ) -> None:
+        self.seed = seed or Seed()
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.base_url = base_url.rstrip("/")
+        self.repositories: Dict[str, FakeRepository] = {}
+        self._lock = threading.Lock()
+        self._requests: Counter = Counter()
+        self._used: Counter = Counter()
+        self._reset = time.time() + 3600
+        self._rng = random.Random(0)
+        self._seed_data()
+        self.app = self._build_app()
+
+    # Seed data
+
+    def _seed_data(self) -> None:
+        seed = self.seed
+        for index in range(seed.repos):
+            name = f"repo-{index}"
+            files = {}
+            for directory in range(seed.directories):
+                for number in range(seed.files_per_directory):
+                    path = f"src/pkg{directory}/module_{number}.py"
+                    line = f"# {name} {path}\nVALUE = {number}\n"
+                    content = (line * (seed.file_bytes // len(line) + 1)).encode()
+                    files[path] = content[: seed.file_bytes]
+            files["README.md"] = f"# {name}\n\nSeeded benchmark repository.\n".encode()
+            repository = FakeRepository(seed.owner, name, index, files)
+            for number in range(1, seed.issues + 1):
+                repository.issues.append(
+                    self._issue(repository, number, f"Issue {number}")
+                )
+            for number in range(1, seed.pulls + 1):
+                repository.pulls.append(
+                    self._pull(repository, seed.issues + number, f"Change {number}")
+                )
+            self.repositories[repository.full_name] = repository
+
+    def _body(self, title: str) -> str:
+        text = (
+            f"{title}.\n\n<!-- template -->\n![screenshot](https://example.com/s.png)\n"
+        )
+        return text + "Details. " * (self.seed.body_chars // 9)
+
+    def _user(self, login: str) -> Dict[str, Any]:
+        return {
+            "login": login,
+            "id": int(hashlib.sha1(login.encode()).hexdigest()[:8], 16),
+            "type": "User",
+            "url": f"{self.base_url}/users/{login}",
+            "html_url": f"https://github.com/{login}",
+        }
+
+    def _issue(
+        self, repository: FakeRepository, number: int, title: str
+    ) -> Dict[str, Any]:
+        api = f"{self.base_url}/repos/{repository.full_name}"
+        return {
+            "id": repository.index * 100000 + number,
+            "number": number,
+            "title": title,
+            "state": "open" if number % 4 else "closed",
+            "url": f"{api}/issues/{number}",
+            "html_url": f"https://github.com/{repository.full_name}/issues/{number}",
+            "body": self._body(title),
+            "created_at": CREATED_AT,
+            "updated_at": CREATED_AT,
+            "closed_at": None if number % 4 else CREATED_AT,
+            "labels": [{"name": "bug" if number % 2 else "enhancement"}],
+            "assignees": [self._user("octocat")],
+            "user": self._user("octocat"),
+            "comments": number % 5,
+            "locked": False,
+            "milestone": None,
+        }
+
+    def _pull(
+        self, repository: FakeRepository, number: int, title: str
+    ) -> Dict[str, Any]:
+        api = f"{self.base_url}/repos/{repository.full_name}"
+        repo = {"full_name": repository.full_name, "url": api}
+        return {
+            "id": repository.index * 100000 + number,
+            "number": number,
+            "title": title,
+            "state": "open" if number % 3 else "closed",
+            "url": f"{api}/pulls/{number}",
+            "html_url": f"https://github.com/{repository.full_name}/pull/{number}",
+            "body": self._body(title),
+            "created_at": CREATED_AT,
+            "updated_at": CREATED_AT,
+            "closed_at": None,
+            "merged_at": None,
+            "head": {
+                "ref": f"feature-{number}",
+                "sha": git_sha("commit", f"{title}".encode()),
+                "user": self._user("octocat"),
+                "repo": repo,
+            },
+            "base": {
+                "ref": repository.default_branch,
+                "sha": repository.commit_sha,
+                "user": self._user(repository.owner),
+                "repo": repo,
+            },
+            "user": self._user("octocat"),
+            "assignees": [],
+            "labels": [{"name": "enhancement"}],
+            "draft": False,
+            # Only in the single pull request payload.
+            "comments": 2,
+            "review_comments": 1,
+            "commits": 3,
+            "additions": 40,
+            "deletions": 4,
+            "changed_files": 2,
+            "mergeable": True,
+            "mergeable_state": "clean",
+        }
+
+    # Payloads
+
+    def repository_payload(self, repository: FakeRepository) -> Dict[str, Any]:
+        """Full REST payload of a repository."""
+        return {
+            "id": repository.index + 1,
+            "name": repository.name,
+            "full_name": repository.full_name,
+            "owner": self._user(repository.owner),
+            "private": False,
+            "fork": False,
+            "archived": False,
+            "url": f"{self.base_url}/repos/{repository.full_name}",
+            "html_url": f"https://github.com/{repository.full_name}",
+            "description": f"Benchmark repository {repository.index}",
+            "stargazers_count": 10 * repository.index,
+            "watchers_count": 10 * repository.index,
+            "forks_count": repository.index,
+            "language": "Python",
+            "topics": ["benchmark"],
+            "default_branch": repository.default_branch,
+            "open_issues_count": len(repository.issues) + len(repository.pulls),
+            "subscribers_count": 3,
+            "network_count": repository.index,
+            "size": sum(len(data) for data in repository.files.values()) // 1024,
+            "license": {"key": "mit", "name": "MIT License"},
+            "permissions": {"admin": True, "push": True, "pull": True},
+            "created_at": CREATED_AT,
+            "updated_at": CREATED_AT,
+            "pushed_at": CREATED_AT,
+        }
+
+    def repository_node(self, repository: FakeRepository) -> Dict[str, Any]:
+        """GraphQL ``Repository`` node with every field the server queries."""
+        return {
+            "name": repository.name,
+            "nameWithOwner": repository.full_name,
+            "description": f"Benchmark repository {repository.index}",
+            "url": f"https://github.com/{repository.full_name}",
+            "stargazerCount": 10 * repository.index,
+            "forkCount": repository.index,
+            "isPrivate": False,
+            "isArchived": False,
+            "defaultBranchRef": {"name": repository.default_branch},
+            "primaryLanguage": {"name": "Python"},
+            "repositoryTopics": {"nodes": [{"topic": {"name": "benchmark"}}]},
+            "createdAt": CREATED_AT,
+            "updatedAt": CREATED_AT,
+            "pushedAt": CREATED_AT,
+            "issues": {"totalCount": len(repository.issues)},
+            "pullRequests": {"totalCount": len(repository.pulls)},
+            "watchers": {"totalCount": 3},
+            "isFork": False,
+            "parent": None,
+            "diskUsage": sum(len(data) for data in repository.files.values()) // 1024,
+            "licenseInfo": {"name": "MIT License"},
+            "viewerPermission": "ADMIN",
+        }
+
+    def content_payload(self, repository: FakeRepository, path: str) -> Dict[str, Any]:
+        """Contents API entry of a file or directory."""
+        api = f"{self.base_url}/repos/{repository.full_name}"
+        data = repository.files.get(path)
+        entry = {
+            "name": path.rpartition("/")[2],
+            "path": path,
+            "sha": (
+                git_sha("blob", data)
+                if data is not None
+                else git_sha("tree", path.encode())
+            ),
+            "size": len(data) if data is not None else 0,
+            "url": f"{api}/contents/{quote(path)}",
+            "html_url": f"https://github.com/{repository.full_name}/blob/main/{path}",
+            "git_url": f"{api}/git/blobs/{git_sha('blob', data or b'')}",
+            "download_url": (
+                f"{self.base_url}/{repository.full_name}/raw/main/{path}"
+                if data is not None
+                else None
+            ),
+            "type": "file" if data is not None else "dir",
+        }
+        return entry
+
+    def tree_payload(self, repository: FakeRepository) -> Dict[str, Any]:
+        """Recursive ``git/trees`` payload of the default branch."""
+        tree = [
+            {
+                "path": directory,
+                "mode": "040000",
+                "type": "tree",
+                "sha": git_sha("tree", directory.encode()),
+            }
+            for directory in repository.directories()
+        ]
+        tree += [
+            {
+                "path": path,
+                "mode": "100644",
+                "type": "blob",
+                "sha": git_sha("blob", data),
+                "size": len(data),
+            }
+            for path, data in repository.files.items()
+        ]
+        api = f"{self.base_url}/repos/{repository.full_name}"
+        return {
+            "sha": repository.tree_sha,
+            "url": f"{api}/git/trees/{repository.tree_sha}",
+            "tree": sorted(tree, key=lambda entry: entry["path"]),
+            "truncated": False,
+        }
+
+    def archive(self, repository: FakeRepository) -> bytes:
+        """Gzipped tarball of a repository, nested as GitHub nests it."""
+        prefix = f"{repository.owner}-{repository.name}-{repository.commit_sha[:7]}"
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w") as archive:
+            for path, data in sorted(repository.files.items()):
+                info = tarfile.TarInfo(f"{prefix}/{path}")
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+        return gzip.compress(buffer.getvalue())
+
+    # Accounting
+
+    def stats(self) -> Dict[str, Any]:
+        """Requests served so far, in total and by route."""
+        with self._lock:
+            return {
+                "requests": sum(self._requests.values()),
+                "routes": dict(self._requests),
+            }
+
+    def reset_stats(self) -> None:
+        """Forget the requests counted so far."""
+        with self._lock:
+            self._requests.clear()
+
+    def _count(self, route: str, token: str, billed: bool) -> Tuple[int, int]:
+        """Record a request; return the token's quota used and remaining."""
+        with self._lock:
+            self._requests[route] += 1
+            if billed:
+                self._used[token] += 1
+            used = self._used[token]
+            return used, max(self.rate_limit - used, 0)
+
+    # HTTP
+
+    def _build_app(self) -> FastAPI:
+        app = FastAPI(title="fake-github")
+        fake = self
+
+        @app.middleware("http")
+        async def simulate(request: Request, call_next: Any) -> Response:
+            if fake.latency or fake.jitter:
+                await asyncio.sleep(fake.latency + fake._rng.random() * fake.jitter)
+            token = request.headers.get("authorization", "")
+            resource = "graphql" if request.url.path.endswith("/graphql") else "core"
+            with fake._lock:
+                exhausted = fake._used[token] >= fake.rate_limit
+            if exhausted:
+                response: Response = JSONResponse(
+                    {"message": "API rate limit exceeded"}, status_code=403
+                )
+            else:
+                response = await call_next(request)
+                etag = response.headers.get("etag")
+                if (
+                    etag is not None
+                    and request.method == "GET"
+                    and request.headers.get("if-none-match") == etag
+                ):
+                    response = Response(status_code=304, headers={"etag": etag})
+            route = request.scope.get("route")
+            name = f"{request.method} {route.path if route else request.url.path}"
+            used, remaining = fake._count(name, token, response.status_code != 304)
+            response.headers.update(
+                {
+                    "x-ratelimit-limit": str(fake.rate_limit),
+                    "x-ratelimit-remaining": str(remaining),
+                    "x-ratelimit-used": str(used),
+                    "x-ratelimit-reset": str(int(fake._reset)),
+                    "x-ratelimit-resource": resource,
+                }
+            )
+            return response
+
+        def repository_or_404(owner: str, repo: str) -> Optional[FakeRepository]:
+            return fake.repositories.get(f"{owner}/{repo}")
+
+        def not_found() -> JSONResponse:
+            return JSONResponse({"message": "Not Found"}, status_code=404)
+
+        def json_response(
+            data: Any, headers: Optional[Dict[str, str]] = None
+        ) -> Response:
+            body = json.dumps(data).encode()
+            etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+            return Response(
+                body,
+                media_type="application/json",
+                headers={"etag": etag, **(headers or {})},
+            )
+
+        def paged(request: Request, items: List[Any]) -> Response:
+            page = max(int(request.query_params.get("page", 1)), 1)
+            per_page = min(max(int(request.query_params.get("per_page", 30)), 1), 100)
+            start = (page - 1) * per_page
+            links = []
+            if start + per_page < len(items):
+                next_url = request.url.include_query_params(page=page + 1)
+                last = (len(items) + per_page - 1) // per_page
+                last_url = request.url.include_query_params(page=last)
+                links = [f'<{next_url}>; rel="next"', f'<{last_url}>; rel="last"']
+            headers = {"link": ", ".join(links)} if links else None
+            return json_response(items[start : start + per_page], headers)
+
+        def by_state(items: List[Dict[str, Any]], state: str) -> List[Dict[str, Any]]:
+            return [item for item in items if state == "all" or item["state"] == state]
+
+        @app.get("/user/repos")
+        async def list_repositories(request: Request) -> Response:
+            repositories = [
+                fake.repository_payload(repository)
+                for repository in fake.repositories.values()
+            ]
+            return paged(request, repositories)
+
+        @app.get("/repos/{owner}/{repo}")
+        async def get_repository(owner: str, repo: str) -> Response:
+            repository = repository_or_404(owner, repo)
+            if repository is None:
+                return not_found()
+            return json_response(fake.repository_payload(repository))
+
+        @app.get("/repos/{owner}/{repo}/issues")
+        async def list_issues(request: Request, owner: str, repo: str) -> Response:
+            repository = repository_or_404(owner, repo)
+            if repository is None:
+                return not_found()
+            state = request.query_params.get("state", "open")
+            return paged(request, by_state(repository.issues, state))
+
+        @app.get("/repos/{owner}/{repo}/issues/{number}")
+        async def get_issue(owner: str, repo: str, number: int) -> Response:
+            repository = repository_or_404(owner, repo)
+            if repository is None:
+                return not_found()
+            for issue in repository.issues:
+                if issue["number"] == number:
+                    return json_response(issue)
+            return not_found()
+
+        @app.post("/repos/{owner}/{repo}/issues")
+        async def create_issue(request: Request, owner: str, repo: str) -> Response:
+            repository = repository_or_404(owner, repo)
+            if repository is None:
+                return not_found()
+            data = await request.json()
+            with fake._lock:
+                number = len(repository.issues) + len(repository.pulls) + 1
+                issue = fake._issue(repository, number, data["title"])
+                issue.update(
+                    body=data.get("body"),
+                    state="open",
+                    closed_at=None,
+                    labels=[{"name": name} for name in data.get("labels", [])],
+                    assignees=[
+                        fake._user(login) for login in data.get("assignees", [])
+                    ],
+                )
+                repository.issues.insert(0, issue)
+            return JSONResponse(issue, status_code=201)
+
+        @app.get("/repos/{owner}/{repo}/pulls")
+        async def list_pull_requests(
+            request: Request, owner: str, repo: str
+        ) -> Response:
+            repository = repository_or_404(owner, repo)
+            if repository is None:
+                return not_found()
+            state = request.query_params.get("state", "open")
+            detail = {
+                "comments",
+                "review_comments",
+                "commits",
+                "additions",
+                "deletions",
+                "changed_files",
+                "mergeable",
+                "mergeable_state",
+            }
+            pulls = [
+                {name: value for name, value in pr.items() if name not in detail}
+                for pr in by_state(repository.pulls, state)
+            ]
+            return paged(request, pulls)
+
+        @app.get("/repos/{owner}/{repo}/pulls/{number}")
+        async def get_pull_request(owner: str, repo: str, number: int) -> Response:
+            repository = repository_or_404(owner, repo)
+            if repository is None:
+                return not_found()
+            for pr in repository.pulls:
+                if pr["number"] == number:
+                    return json_response(pr)
+            return not_found()
+
+        @app.post("/repos/{owner}/{repo}/pulls")
+        async def create_pull_request(
+            request: Request, owner: str, repo: str
+        ) -> Response:
+            repository = repository_or_404(owner, repo)
+            if repository is None:
+                return not_found()
+            data = await request.json()
+            with fake._lock:
+                number = len(repository.issues) + len(repository.pulls) + 1
+                pr = fake._pull(repository, number, data["title"])
+                pr["body"] = data.get("body")
+                pr["draft"] = bool(data.get("draft"))
+                pr["head"]["ref"] = data["head"]
+                pr["base"]["ref"] = data["base"]
+                repository.pulls.insert(0, pr)
+            return JSONResponse(pr, status_code=201)
+
+        @app.get("/repos/{owner}/{repo}/contents/{path:path}")
+        @app.get("/repos/{owner}/{repo}/contents")
+        async def get_contents(owner: str, repo: str, path: str = "") -> Response:
+            repository = repository_or_404(owner, repo)
+            if repository is None:
+                return not_found()
+            path = path.strip("/")
+            data = repository.files.get(path)
+            if data is not None:
+                entry = fake.content_payload(repository, path)
+                if len(data) <= CONTENTS_MAX_BYTES:
+                    entry["encoding"] = "base64"
+                    entry["content"] = base64.encodebytes(data).decode("ascii")
+                else:
+                    entry["encoding"] = "none"
+                    entry["content"] = ""
+                return json_response(entry)
+            prefix = f"{path}/" if path else ""
+            children = sorted(
+                {
+                    prefix + name[len(prefix) :].split("/")[0]
+                    for name in repository.files
+                    if name.startswith(prefix)
+                }
+            )
+            if not children:
+                return not_found()
+            return json_response(
+                [fake.content_payload(repository, child) for child in children]
+            )
+
+        @app.get("/repos/{owner}/{repo}/git/trees/{ref:path}")
+        async def get_tree(owner: str, repo: str, ref: str) -> Response:
+            repository = repository_or_404(owner, repo)
+            if repository is None:
+                return not_found()
+            refs = {
+                repository.default_branch,
+                repository.commit_sha,
+                repository.tree_sha,
+            }
+            if ref not in refs:
+                return not_found()
+            return json_response(fake.tree_payload(repository))
+
+        @app.get("/repos/{owner}/{repo}/git/blobs/{sha}")
+        async def get_blob(
+            request: Request, owner: str, repo: str, sha: str
+        ) -> Response:
+            repository = repository_or_404(owner, repo)
+            if repository is None:
+                return not_found()
+            for data in repository.files.values():
+                if git_sha("blob", data) == sha:
+                    if request.headers.get("accept") == RAW_MEDIA_TYPE:
+                        return Response(data, media_type="application/octet-stream")
+                    return json_response(
+                        {
+                            "sha": sha,
+                            "size": len(data),
+                            "encoding": "base64",
+                            "content": base64.encodebytes(data).decode("ascii"),
+                        }
+                    )
+            return not_found()
+
+        @app.get("/repos/{owner}/{repo}/tarball")
+        @app.get("/repos/{owner}/{repo}/tarball/{ref:path}")
+        async def get_archive_link(owner: str, repo: str, ref: str = "") -> Response:
+            if repository_or_404(owner, repo) is None:
+                return not_found()
+            location = f"{fake.base_url}/_archives/{owner}/{repo}.tar.gz"
+            return Response(status_code=302, headers={"location": location})
+
+        @app.get("/_archives/{owner}/{repo}.tar.gz")
+        async def get_archive(owner: str, repo: str) -> Response:
+            repository = repository_or_404(owner, repo)
+            if repository is None:
+                return not_found()
+            return Response(fake.archive(repository), media_type="application/x-gzip")
+
+        @app.get("/{owner}/{repo}/raw/{ref}/{path:path}")
+        async def get_raw(owner: str, repo: str, ref: str, path: str) -> Response:
+            repository = repository_or_404(owner, repo)
+            if repository is None or path not in repository.files:
+                return not_found()
+            return Response(
+                repository.files[path], media_type="application/octet-stream"
+            )
+
+        @app.post("/graphql")
+        async def graphql(request: Request) -> Response:
+            payload = await request.json()
+            query = payload.get("query", "")
+            variables = payload.get("variables") or {}
+            if "query GetRepository" in query:
+                repository = repository_or_404(variables["owner"], variables["name"])
+                node = fake.repository_node(repository) if repository else None
+                return JSONResponse({"data": {"repository": node}})
+            if "query ListRepositories" in query:
+                nodes = [
+                    fake.repository_node(repository)
+                    for repository in fake.repositories.values()
+                ]
+                start = int(variables.get("after") or 0)
+                end = start + int(variables["first"])
+                return JSONResponse(
+                    {
+                        "data": {
+                            "viewer": {
+                                "repositories": {
+                                    "nodes": nodes[start:end],
+                                    "pageInfo": {
+                                        "hasNextPage": end < len(nodes),
+                                        "endCursor": str(min(end, len(nodes))),
+                                    },
+                                }
+                            }
+                        }
+                    }
+                )
+            return JSONResponse({"errors": [{"message": "Unsupported query"}]})
+
+        @app.get("/rate_limit")
+        async def rate_limit(request: Request) -> Response:
+            token = request.headers.get("authorization", "")
+            with fake._lock:
+                used = fake._used[token]
+            core = {
+                "limit": fake.rate_limit,
+                "used": used,
+                "remaining": max(fake.rate_limit - used, 0),
+                "reset": int(fake._reset),
+            }
+            return JSONResponse({"resources": {"core": core}, "rate": core})
+
+        return app
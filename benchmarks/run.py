@@ -0,0 +1,435 @@
+"""Benchmark tool calls through ``POST /tool`` against the fake GitHub API.
+
+Usage::
+
+    python -m benchmarks.run --backend pygithub,httpx --concurrency 1,8,32
+
+The fake API runs in this process and the MCP server in a subprocess
+pointed at it. Every tool is called once on cold caches, then repeatedly
+at each concurrency level; each run reports p50/p99 latency, throughput
+and the upstream requests made per call. With ``--budgets``, runs that
+make more upstream requests per call than allowed fail the benchmark, so
+a hidden N+1 fetch shows up in CI.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import httpx
+import uvicorn
+
+from benchmarks.fake_github import FakeGitHub, Seed
+
+TOKEN = "bench-token"
+HEADERS = {"Authorization": f"Bearer {TOKEN}"}
+
+
+@dataclass
+class Scenario:
+    """A tool and the parameters of its ``n``-th call."""
+
+    tool: str
+    parameters: Callable[[int], Dict[str, Any]]
+
+
+def scenarios(seed: Seed) -> List[Scenario]:
+    """One scenario per tool, over the seeded data."""
+    owner = seed.owner
+
+    def repo(n: int) -> Dict[str, Any]:
+        return {"owner": owner, "repo": f"repo-{n % seed.repos}"}
+
+    def module(n: int) -> str:
+        directory = n % seed.directories
+        return f"src/pkg{directory}/module_{n % seed.files_per_directory}.py"
+
+    return [
+        Scenario("list_repositories", lambda n: {"limit": 10}),
+        Scenario("get_repository", repo),
+        Scenario("list_issues", lambda n: {**repo(n), "state": "all", "limit": 30}),
+        Scenario(
+            "create_issue",
+            lambda n: {
+                **repo(n),
+                "title": f"Benchmark issue {n}",
+                "body": "Filed by the benchmark",
+            },
+        ),
+        Scenario(
+            "list_pull_requests", lambda n: {**repo(n), "state": "all", "limit": 20}
+        ),
+        Scenario(
+            "create_pull_request",
+            lambda n: {
+                **repo(n),
+                "title": f"Benchmark change {n}",
+                "head": f"bench-{n}",
+            },
+        ),
+        Scenario("get_file_content", lambda n: {**repo(n), "path": module(n)}),
+        Scenario(
+            "list_directory",
+            lambda n: {
+                **repo(n),
+                "path": f"src/pkg{n % seed.directories}",
+            },
+        ),
+        Scenario(
+            "get_tree", lambda n: {**repo(n), "pattern": "src/**/*.py", "limit": 100}
+        ),
+        Scenario(
+            "get_files",
+            lambda n: {
+                **repo(n),
+                "paths": [f"src/pkg{n % seed.directories}/*.py"],
+                "limit": 10,
+            },
+        ),
+        Scenario(
+            "search_content",
+            lambda n: {
+                **repo(n),
+                "query": f"^VALUE = {n % seed.files_per_directory}$",
+                "regex": True,
+                "limit": 20,
+            },
+        ),
+    ]
+
+
+@dataclass
+class Measurement:
+    """Outcome of one tool at one concurrency level."""
+
+    tool: str
+    phase: str
+    concurrency: int
+    calls: int
+    errors: int
+    p50_ms: float
+    p99_ms: float
+    throughput: float
+    upstream_per_call: float
+    routes: Dict[str, float] = field(default_factory=dict)
+
+
+def percentile(samples: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of ``samples``."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+async def measure(
+    client: httpx.AsyncClient,
+    fake: FakeGitHub,
+    scenario: Scenario,
+    calls: int,
+    concurrency: int,
+    phase: str = "warm",
+    first_call: int = 0,
+) -> Measurement:
+    """Make ``calls`` calls of a scenario, ``concurrency`` at a time."""
+    latencies: List[float] = []
+    errors = 0
+    numbers = iter(range(first_call, first_call + calls))
+
+    async def worker() -> None:
+        nonlocal errors
+        for number in numbers:
+            started = time.perf_counter()
+            response = await client.post(
+                "/tool",
+                json={"name": scenario.tool, "parameters": scenario.parameters(number)},
+                headers=HEADERS,
+            )
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    fake.reset_stats()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, calls))))
+    elapsed = time.perf_counter() - started
+    stats = fake.stats()
+    return Measurement(
+        tool=scenario.tool,
+        phase=phase,
+        concurrency=concurrency,
+        calls=calls,
+        errors=errors,
+        p50_ms=round(percentile(latencies, 0.50) * 1000, 2),
+        p99_ms=round(percentile(latencies, 0.99) * 1000, 2),
+        throughput=round(calls / elapsed, 1) if elapsed else 0.0,
+        upstream_per_call=round(stats["requests"] / calls, 2),
+        routes={
+            route: round(count / calls, 2)
+            for route, count in sorted(stats["routes"].items())
+        },
+    )
+
+
+async def run_benchmark(
+    client: httpx.AsyncClient,
+    fake: FakeGitHub,
+    tools: Optional[Sequence[str]] = None,
+    concurrency: Sequence[int] = (1, 8, 32),
+    calls: int = 100,
+) -> List[Measurement]:
+    """Benchmark each tool: one call on cold caches, then ``calls`` per level."""
+    results = []
+    for scenario in scenarios(fake.seed):
+        if tools and scenario.tool not in tools:
+            continue
+        results.append(await measure(client, fake, scenario, 1, 1, phase="cold"))
+        first_call = 1
+        for level in concurrency:
+            results.append(
+                await measure(
+                    client, fake, scenario, calls, level, first_call=first_call
+                )
+            )
+            first_call += calls
+    return results
+
+
+def check_budgets(
+    results: Sequence[Measurement],
+    budgets: Dict[str, Dict[str, float]],
+) -> List[str]:
+    """Describe every run that made more upstream requests per call than allowed."""
+    violations = []
+    for result in results:
+        limit = budgets.get(result.phase, {}).get(result.tool)
+        if limit is not None and result.upstream_per_call > limit:
+            violations.append(
+                f"{result.tool} ({result.phase}, concurrency {result.concurrency}): "
+                f"{result.upstream_per_call} upstream requests per call, budget {limit}"
+            )
+    return violations
+
+
+def format_table(results: Sequence[Measurement]) -> str:
+    """Render results as a plain-text table."""
+    header = (
+        f"{'tool':<22}{'phase':<7}{'conc':>5}{'calls':>7}{'err':>5}"
+        f"{'p50 ms':>10}{'p99 ms':>10}{'calls/s':>10}{'upstream':>10}"
+    )
+    lines = [header, "-" * len(header)]
+    for result in results:
+        lines.append(
+            f"{result.tool:<22}{result.phase:<7}{result.concurrency:>5}"
+            f"{result.calls:>7}{result.errors:>5}{result.p50_ms:>10.2f}"
+            f"{result.p99_ms:>10.2f}{result.throughput:>10.1f}"
+            f"{result.upstream_per_call:>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+def free_port() -> int:
+    """A local port nothing is listening on."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+@contextmanager
+def serve_fake(fake_options: Dict[str, Any]) -> Iterator[FakeGitHub]:
+    """Run a fake GitHub API on a free port in a background thread."""
+    port = free_port()
+    fake = FakeGitHub(base_url=f"http://127.0.0.1:{port}", **fake_options)
+    server = uvicorn.Server(
+        uvicorn.Config(
+            fake.app, host="127.0.0.1", port=port, log_level="warning", lifespan="off"
+        )
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("Fake GitHub API did not start")
+        time.sleep(0.01)
+    try:
+        yield fake
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+@contextmanager
+def serve_mcp(
+    api_url: str,
+    backend: str,
+    env: Optional[Dict[str, str]] = None,
+    verbose: bool = False,
+) -> Iterator[str]:
+    """Run the MCP server in a subprocess against ``api_url``; yield its URL."""
+    port = free_port()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "github_mcp.server"],
+            env={
+                **os.environ,
+                "GITHUB_MCP_HOST": "127.0.0.1",
+                "GITHUB_MCP_PORT": str(port),
+                "GITHUB_MCP_WORKERS": "1",
+                "GITHUB_MCP_RELOAD": "false",
+                "GITHUB_MCP_API_URL": api_url,
+                "GITHUB_MCP_BACKEND": backend,
+                "GITHUB_MCP_REQUIRE_REQUEST_TOKEN": "true",
+                "GITHUB_MCP_BLOB_CACHE_PATH": os.path.join(cache_dir, "blobs"),
+                "GITHUB_MCP_RESPONSE_CACHE_PATH": os.path.join(cache_dir, "responses"),
+                **(env or {}),
+            },
+            stdout=None if verbose else subprocess.DEVNULL,
+            stderr=None if verbose else subprocess.DEVNULL,
+        )
+        url = f"http://127.0.0.1:{port}"
+        try:
+            deadline = time.monotonic() + 30
+            while True:
+                if process.poll() is not None:
+                    raise RuntimeError("MCP server exited during startup")
+                try:
+                    if httpx.get(f"{url}/status").status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise RuntimeError("MCP server did not start within 30s")
+                time.sleep(0.1)
+            yield url
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--backend",
+        default="pygithub,httpx",
+        help="Comma-separated client backends to benchmark",
+    )
+    parser.add_argument(
+        "--concurrency",
+        default="1,8,32",
+        help="Comma-separated numbers of concurrent calls",
+    )
+    parser.add_argument(
+        "--calls", type=int, default=100, help="Calls per tool and concurrency level"
+    )
+    parser.add_argument(
+        "--tools", default="", help="Comma-separated tools to run (default: all)"
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.02,
+        help="Seconds the fake API adds to every response",
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=0.01,
+        help="Up to this many more seconds, at random",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=int,
+        default=1_000_000,
+        help="Requests per hour the fake API allows the token",
+    )
+    parser.add_argument("--repos", type=int, default=Seed.repos)
+    parser.add_argument("--issues", type=int, default=Seed.issues)
+    parser.add_argument("--pulls", type=int, default=Seed.pulls)
+    parser.add_argument(
+        "--files",
+        type=int,
+        default=Seed.files_per_directory,
+        help="Files per seeded directory",
+    )
+    parser.add_argument(
+        "--budgets", help="JSON file of upstream requests allowed per call"
+    )
+    parser.add_argument(
+        "--json", dest="json_path", help="Write the results to this file"
+    )
+    parser.add_argument("--verbose", action="store_true", help="Show MCP server logs")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the benchmark; return a non-zero status on errors or budget overruns."""
+    args = parse_args(argv)
+    seed = Seed(
+        repos=args.repos,
+        issues=args.issues,
+        pulls=args.pulls,
+        files_per_directory=args.files,
+    )
+    tools = [tool for tool in args.tools.split(",") if tool]
+    concurrency = [int(level) for level in args.concurrency.split(",")]
+    budgets = {}
+    if args.budgets:
+        with open(args.budgets) as budgets_file:
+            budgets = json.load(budgets_file)
+
+    report: Dict[str, List[Dict[str, Any]]] = {}
+    failures = []
+    for backend in args.backend.split(","):
+        fake_options = {
+            "seed": seed,
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "rate_limit": args.rate_limit,
+        }
+        with (
+            serve_fake(fake_options) as fake,
+            serve_mcp(fake.base_url, backend, verbose=args.verbose) as url,
+        ):
+
+            async def run() -> List[Measurement]:
+                limits = httpx.Limits(max_connections=max(concurrency))
+                async with httpx.AsyncClient(
+                    base_url=url, timeout=120, limits=limits
+                ) as client:
+                    return await run_benchmark(
+                        client, fake, tools, concurrency, args.calls
+                    )
+
+            results = asyncio.run(run())
+        print(f"\n{backend} backend\n")
+        print(format_table(results))
+        report[backend] = [asdict(result) for result in results]
+        failures += [
+            f"{backend}: {result.tool} had {result.errors} failed calls"
+            for result in results
+            if result.errors
+        ]
+        failures += [
+            f"{backend}: {message}" for message in check_budgets(results, budgets)
+        ]
+
+    if args.json_path:
+        with open(args.json_path, "w") as json_file:
+            json.dump(report, json_file, indent=2)
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
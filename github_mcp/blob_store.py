@@ -0,0 +1,467 @@
+"""Content-addressed store for git blobs, keyed by blob SHA."""
+import base64
+import hashlib
+import mmap
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Generator, Iterable, List, Optional
+
+from github_mcp.cache import LRUCache
+from github_mcp.config import get_settings
+from github_mcp.context import credential_scoped, unscoped
+from github_mcp.metrics import record_cache_hit
+from github_mcp.shared_store import SharedTable, get_shared_store
+
+_COMMIT_SHA = re.compile(r"[0-9a-f]{40}")
+
+
+def git_blob_sha(data: bytes) -> str:
+    """Compute the git object id of a blob."""
+    header = f"blob {len(data)}\0".encode()
+    return hashlib.sha1(header + data).hexdigest()
+
+
+def is_immutable_ref(ref: Optional[str]) -> bool:
+    """Return True if ``ref`` is a full commit SHA, which can never move."""
+    return ref is not None and _COMMIT_SHA.fullmatch(ref) is not None
+
+
+class BlobStore:
+    """On-disk blob store with size-bounded LRU eviction.
+
+    A blob with a given SHA never changes, so once stored it can be served
+    forever without another API request or base64 decode. Blobs live in a
+    two-level fan-out directory and are read through ``mmap`` so byte
+    ranges can be served without loading the whole file. Blobs written by
+    other server workers sharing the directory are picked up on demand.
+    """
+
+    def __init__(self, path: str, max_bytes: int) -> None:
+        self.path = os.path.expanduser(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes_served = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()
+        self._total = 0
+        os.makedirs(self.path, exist_ok=True)
+        self._load()
+
+    def _load(self) -> None:
+        """Index blobs left by earlier runs, least recently used first."""
+        found = []
+        for directory in os.listdir(self.path):
+            subdirectory = os.path.join(self.path, directory)
+            if len(directory) != 2 or not os.path.isdir(subdirectory):
+                continue
+            for name in os.listdir(subdirectory):
+                stat = os.stat(os.path.join(subdirectory, name))
+                found.append((stat.st_mtime, directory + name, stat.st_size))
+        for _, sha, size in sorted(found):
+            self._sizes[sha] = size
+            self._total += size
+        self._evict()
+
+    def _blob_path(self, sha: str) -> str:
+        return os.path.join(self.path, sha[:2], sha[2:])
+
+    def _known(self, sha: str) -> bool:
+        """Return True if a blob is stored, adopting one another worker wrote."""
+        with self._lock:
+            if sha in self._sizes:
+                return True
+        try:
+            size = os.stat(self._blob_path(sha)).st_size
+        except (FileNotFoundError, NotADirectoryError):
+            return False
+        self._add(sha, size)
+        return True
+
+    def __contains__(self, sha: str) -> bool:
+        return self._known(sha)
+
+    def size(self, sha: str) -> Optional[int]:
+        """Return the stored size of a blob, or None if it is not stored."""
+        if not self._known(sha):
+            return None
+        with self._lock:
+            return self._sizes.get(sha)
+
+    def read(
+        self,
+        sha: str,
+        offset: int = 0,
+        length: Optional[int] = None,
+    ) -> Optional[bytes]:
+        """Return a blob (or a byte range of it), or None if it is not stored."""
+        known = self._known(sha)
+        with self._lock:
+            if not known or sha not in self._sizes:
+                self.misses += 1
+                return None
+            self._sizes.move_to_end(sha)
+        path = self._blob_path(sha)
+        try:
+            with open(path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                end = size if length is None else min(size, offset + length)
+                if size == 0 or offset >= end:
+                    data = b""
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        data = mapped[offset:end]
+            os.utime(path)
+        except FileNotFoundError:
+            self._forget(sha)
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            self.bytes_served += len(data)
+        record_cache_hit("blob")
+        return data
+
+    def iter_chunks(
+        self, sha: str, chunk_size: int = 64 * 1024
+    ) -> Optional[Generator[bytes, None, None]]:
+        """Return a generator over a stored blob's bytes, or None if it is not stored.
+
+        Close it if it is not read to the end, to release the file.
+        """
+        known = self._known(sha)
+        with self._lock:
+            if not known or sha not in self._sizes:
+                self.misses += 1
+                return None
+            self._sizes.move_to_end(sha)
+            self.hits += 1
+        record_cache_hit("blob")
+        try:
+            f = open(self._blob_path(sha), "rb")
+        except FileNotFoundError:
+            self._forget(sha)
+            return None
+        os.utime(f.fileno())
+
+        def chunks() -> Generator[bytes, None, None]:
+            with f:
+                while True:
+                    chunk = f.read(chunk_size)
+                    if not chunk:
+                        return
+                    with self._lock:
+                        self.bytes_served += len(chunk)
+                    yield chunk
+
+        return chunks()
+
+    def writer(self, sha: str, size: int) -> Optional["BlobWriter"]:
+        """Start streaming a blob of ``size`` bytes into the store.
+
+        Returns None if the blob is already stored or would not fit.
+        """
+        if size > self.max_bytes or sha in self:
+            return None
+        return BlobWriter(self, sha, size)
+
+    def _add(self, sha: str, size: int) -> None:
+        with self._lock:
+            if sha not in self._sizes:
+                self._sizes[sha] = size
+                self._total += size
+        self._evict()
+
+    def put(self, sha: str, data: bytes) -> bool:
+        """Store a blob, returning False if ``data`` does not hash to ``sha``.
+
+        The check keeps truncated payloads (such as the empty content the
+        contents API returns for large files) out of the store.
+        """
+        if git_blob_sha(data) != sha:
+            return False
+        if len(data) > self.max_bytes or sha in self:
+            return True
+        path = self._blob_path(sha)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self._add(sha, len(data))
+        return True
+
+    def _forget(self, sha: str) -> None:
+        with self._lock:
+            size = self._sizes.pop(sha, None)
+            if size is not None:
+                self._total -= size
+
+    def _evict(self) -> None:
+        """Delete least recently used blobs until the store fits its budget."""
+        while True:
+            with self._lock:
+                if self._total <= self.max_bytes or not self._sizes:
+                    return
+                sha, size = self._sizes.popitem(last=False)
+                self._total -= size
+                self.evictions += 1
+            try:
+                os.remove(self._blob_path(sha))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and occupancy."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bytes_served": self.bytes_served,
+                "evictions": self.evictions,
+                "blobs": len(self._sizes),
+                "bytes": self._total,
+                "max_bytes": self.max_bytes,
+            }
+
+
+class BlobWriter:
+    """A blob being written to the store chunk by chunk.
+
+    The git object id is computed as the chunks arrive, and the blob only
+    becomes visible on :meth:`commit` if it matches, so a download that
+    is cut short or has changed never reaches the store.
+    """
+
+    def __init__(self, store: BlobStore, sha: str, size: int) -> None:
+        self.sha = sha
+        self.size = size
+        self._store = store
+        self._hash = hashlib.sha1(f"blob {size}\0".encode())
+        self._written = 0
+        self._path = store._blob_path(sha)
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(dir=os.path.dirname(self._path))
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        """Append a chunk of the blob."""
+        self._hash.update(chunk)
+        self._written += len(chunk)
+        self._file.write(chunk)
+
+    def commit(self) -> bool:
+        """Publish the blob, returning False (and discarding it) on a mismatch."""
+        self._file.close()
+        if self._written != self.size or self._hash.hexdigest() != self.sha:
+            self.abort()
+            return False
+        os.replace(self._tmp_path, self._path)
+        self._store._add(self.sha, self.size)
+        return True
+
+    def abort(self) -> None:
+        """Discard whatever was written."""
+        self._file.close()
+        try:
+            os.remove(self._tmp_path)
+        except FileNotFoundError:
+            pass
+
+
+class PathIndex:
+    """Maps ``owner/repo@ref:path`` to the file metadata last seen there.
+
+    Entries for a full commit SHA are permanent facts and let
+    ``get_file_content`` skip the API entirely; entries for branches and
+    tags are only hints until the next fetch. With a ``shared`` table,
+    entries are also written through to the store every worker reads.
+    Entries recorded for a caller's own token are only visible to it.
+    """
+
+    def __init__(self, max_entries: int, shared: Optional[SharedTable] = None) -> None:
+        self._entries: LRUCache[Dict[str, Any]] = LRUCache(max_entries, float("inf"))
+        self._shared = shared
+
+    @staticmethod
+    def _key(owner: str, repo: str, ref: Optional[str], path: str) -> str:
+        key = f"{owner.lower()}/{repo.lower()}@{ref or ''}:{path.strip('/')}"
+        return credential_scoped(key)
+
+    def get(
+        self,
+        owner: str,
+        repo: str,
+        ref: Optional[str],
+        path: str,
+    ) -> Optional[Dict[str, Any]]:
+        """Return the metadata recorded for a path."""
+        key = self._key(owner, repo, ref, path)
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry.value
+        metadata = self._shared.get(key) if self._shared is not None else None
+        if metadata is not None:
+            self._entries.set(key, metadata)
+        return metadata
+
+    def put(
+        self,
+        owner: str,
+        repo: str,
+        ref: Optional[str],
+        metadata: Dict[str, Any],
+    ) -> None:
+        """Record the metadata of a file (as returned by the tools) at ``ref``."""
+        self.put_many(owner, repo, ref, [metadata])
+
+    def put_many(
+        self,
+        owner: str,
+        repo: str,
+        ref: Optional[str],
+        files: List[Dict[str, Any]],
+    ) -> None:
+        """Record the metadata of several files at ``ref``."""
+        changed = []
+        for metadata in files:
+            key = self._key(owner, repo, ref, metadata["path"])
+            entry = self._entries.get(key)
+            if entry is None or entry.value != metadata:
+                self._entries.set(key, metadata)
+                changed.append((key, metadata))
+        # Only new facts are written through, in a single transaction.
+        if self._shared is not None and changed:
+            self._shared.set_many(changed)
+
+    def evict(
+        self,
+        owner: str,
+        repo: str,
+        refs: Optional[Iterable[str]] = None,
+        paths: Optional[Iterable[str]] = None,
+    ) -> int:
+        """Forget paths of a repository for every credential.
+
+        Only entries at ``refs`` and ``paths`` are dropped when they are
+        given; ``""`` stands for the default branch.
+        """
+        name = f"{owner.lower()}/{repo.lower()}"
+        ref_set = None if refs is None else set(refs)
+        path_set = None if paths is None else {path.strip("/") for path in paths}
+
+        def matches(key: str) -> bool:
+            key_name, _, rest = unscoped(key).partition("@")
+            # Ref names cannot contain a colon, so the first one ends the ref.
+            ref, _, path = rest.partition(":")
+            return (
+                key_name == name
+                and (ref_set is None or ref in ref_set)
+                and (path_set is None or path in path_set)
+            )
+
+        evicted = self._entries.pop_where(matches)
+        if self._shared is not None:
+            if ref_set is None:
+                evicted += self._shared.delete_scoped(f"{name}@", prefix=True)
+            elif path_set is None:
+                for ref in ref_set:
+                    evicted += self._shared.delete_scoped(f"{name}@{ref}:", prefix=True)
+            else:
+                for ref in ref_set:
+                    for path in path_set:
+                        evicted += self._shared.delete_scoped(f"{name}@{ref}:{path}")
+        return evicted
+
+
+def lookup_file(
+    owner: str,
+    repo: str,
+    ref: Optional[str],
+    path: str,
+) -> Optional[Dict[str, Any]]:
+    """Return the metadata of a stored file, so it can be served without an API call.
+
+    Only full commit SHAs qualify: what a branch points at may have moved.
+    """
+    store = get_blob_store()
+    if store is None or not is_immutable_ref(ref):
+        return None
+    metadata = get_path_index().get(owner, repo, ref, path)
+    if (
+        metadata is None
+        or metadata.get("type") != "file"
+        or metadata["sha"] not in store
+    ):
+        return None
+    return metadata
+
+
+def decode_file(
+    owner: str,
+    repo: str,
+    ref: Optional[str],
+    metadata: Dict[str, Any],
+    encoded: Optional[str],
+) -> bytes:
+    """Return a file's bytes, reusing a stored blob instead of decoding."""
+    get_path_index().put(owner, repo, ref, metadata)
+    store = get_blob_store()
+    data = store.read(metadata["sha"]) if store is not None else None
+    if data is None:
+        data = base64.b64decode(encoded or "")
+        if store is not None:
+            store.put(metadata["sha"], data)
+    return data
+
+
+def record_listing(
+    owner: str,
+    repo: str,
+    ref: Optional[str],
+    entries: List[Dict[str, Any]],
+) -> None:
+    """Record directory entries so later file reads can use the blob store."""
+    files = [entry for entry in entries if entry.get("type") == "file"]
+    get_path_index().put_many(owner, repo, ref, files)
+
+
+_blob_store: Optional[BlobStore] = None
+_path_index: Optional[PathIndex] = None
+_lock = threading.Lock()
+
+
+def get_blob_store() -> Optional[BlobStore]:
+    """Return the process-wide blob store, or None if it is disabled."""
+    global _blob_store
+    settings = get_settings()
+    if settings.blob_cache_max_bytes <= 0:
+        return None
+    if _blob_store is None:
+        with _lock:
+            if _blob_store is None:
+                _blob_store = BlobStore(
+                    settings.blob_cache_path,
+                    settings.blob_cache_max_bytes,
+                )
+    return _blob_store
+
+
+def get_path_index() -> PathIndex:
+    """Return the process-wide path index."""
+    global _path_index
+    if _path_index is None:
+        with _lock:
+            if _path_index is None:
+                size = get_settings().path_index_size
+                shared = get_shared_store()
+                _path_index = PathIndex(
+                    size,
+                    shared.table("path_index", size) if shared is not None else None,
+                )
+    return _path_index
@@ -0,0 +1,242 @@
+"""Size budgets for tool output: trimmed bodies and bounded responses."""
+import re
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+
+from github_mcp.file_ranges import FileRange, FileSlice
+from github_mcp.pagination import Page
+from github_mcp.serializers import dumps, select_fields
+
+# Schema fragment of the budget parameters.
+BUDGET_PARAMETERS: Dict[str, Any] = {
+    "max_bytes": {
+        "type": "integer",
+        "minimum": 1,
+        "description": (
+            "Approximate size limit of the result in bytes; items that do not "
+            "fit are left for next_cursor, and long text is cut to fit"
+        ),
+    },
+}
+
+# Budget parameters of tools whose items carry a markdown body.
+BODY_BUDGET_PARAMETERS: Dict[str, Any] = {
+    **BUDGET_PARAMETERS,
+    "max_body_chars": {
+        "type": "integer",
+        "minimum": 0,
+        "description": (
+            "Cut each body to this many characters, after dropping images and "
+            "HTML comments"
+        ),
+    },
+}
+
+_MARKDOWN_IMAGE = re.compile(r"!\[[^\]]*\]\([^)]*\)|<img\b[^>]*>", re.IGNORECASE)
+_HTML_COMMENT = re.compile(r"<!--.*?(?:-->|\Z)", re.DOTALL)
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def strip_markdown(text: str) -> Tuple[str, int, int]:
+    """Drop images and HTML comments; return the text and how many of each went."""
+    text, comments = _HTML_COMMENT.subn("", text)
+    text, images = _MARKDOWN_IMAGE.subn("", text)
+    if images or comments:
+        text = _BLANK_LINES.sub("\n\n", text).strip()
+    return text, images, comments
+
+
+def _encoded_size(data: Any) -> int:
+    return len(dumps(data).encode())
+
+
+class OutputBudget:
+    """Fits result items into ``max_bytes``, trimming ``text_field`` on the way.
+
+    With ``max_body_chars``, the text field (a markdown body) is stripped of
+    images and HTML comments and cut to that many characters. Items are
+    then added until the next one would overflow ``max_bytes``: a listing
+    stops there and resumes from that item's cursor, while items that
+    cannot be left out (the first one, any without a cursor, or all of
+    them with ``droppable=False``) have their text cut to what is left.
+    Every trimmed item reports what it lost under ``elided``.
+    """
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        max_body_chars: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+        text_field: Optional[str] = "body",
+        droppable: bool = True,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.max_body_chars = max_body_chars
+        self.fields = fields
+        self.text_field = text_field
+        self.droppable = droppable
+        self.items: List[Any] = []
+        self.used = 2
+        self.truncated = False
+        self._elided = {"items": 0, "chars": 0, "images": 0, "comments": 0}
+
+    @classmethod
+    def from_parameters(
+        cls, parameters: Dict[str, Any], **options: Any
+    ) -> "OutputBudget":
+        """Build the budget a tool call asks for."""
+        max_bytes = parameters.get("max_bytes")
+        max_body_chars = parameters.get("max_body_chars")
+        if max_bytes is not None and int(max_bytes) < 1:
+            raise ValueError("'max_bytes' must be at least 1")
+        if max_body_chars is not None and int(max_body_chars) < 0:
+            raise ValueError("'max_body_chars' must be at least 0")
+        return cls(
+            int(max_bytes) if max_bytes is not None else None,
+            int(max_body_chars) if max_body_chars is not None else None,
+            parameters.get("fields"),
+            **options,
+        )
+
+    @property
+    def active(self) -> bool:
+        """Return True if the call set a budget."""
+        return self.max_bytes is not None or self.max_body_chars is not None
+
+    def add(self, item: Any, cursor: Optional[Callable[[], str]] = None) -> bool:
+        """Add an item, or return False if a listing should stop before it."""
+        item = select_fields(item, self.fields)
+        if not self.active:
+            self.items.append(item)
+            return True
+        item = dict(item) if isinstance(item, dict) else item
+        elided = self._trim_body(item)
+        size = _encoded_size(item) + 1
+        if self.max_bytes is not None and self.used + size > self.max_bytes:
+            if self.droppable and self.items and cursor is not None:
+                self.truncated = True
+                return False
+            cut = self._cut_text(item, self.used + size - self.max_bytes)
+            if cut:
+                elided["chars"] = elided.get("chars", 0) + cut
+                size = _encoded_size(item) + 1
+        if elided:
+            if cursor is not None:
+                elided["cursor"] = cursor()
+            item["elided"] = elided
+            self._elided["items"] += 1
+            for name in ("chars", "images", "comments"):
+                self._elided[name] += elided.get(name, 0)
+        self.items.append(item)
+        self.used += size
+        return True
+
+    def _text(self, item: Any) -> Optional[str]:
+        if self.text_field is None or not isinstance(item, dict):
+            return None
+        text = item.get(self.text_field)
+        return text if isinstance(text, str) else None
+
+    def _trim_body(self, item: Any) -> Dict[str, Any]:
+        text = self._text(item)
+        if self.max_body_chars is None or text is None:
+            return {}
+        elided: Dict[str, Any] = {}
+        trimmed, images, comments = strip_markdown(text)
+        if images:
+            elided["images"] = images
+        if comments:
+            elided["comments"] = comments
+        if len(trimmed) > self.max_body_chars:
+            elided["chars"] = len(trimmed) - self.max_body_chars
+            trimmed = trimmed[:self.max_body_chars]
+        item[self.text_field] = trimmed
+        return elided
+
+    def _cut_text(self, item: Any, excess: int) -> int:
+        """Shorten the text field by about ``excess`` bytes; return the chars cut."""
+        text = self._text(item)
+        if not text:
+            return 0
+        keep = max(len(text.encode()) - excess, 0)
+        kept = text.encode()[:keep].decode(errors="ignore")
+        if item.get("encoding") == "base64":
+            kept = kept[:len(kept) - len(kept) % 4]
+        item[self.text_field] = kept
+        return len(text) - len(kept)
+
+    def summary(self) -> Optional[Dict[str, Any]]:
+        """What the budget left out, or None if nothing was."""
+        if not self._elided["items"] and not self.truncated:
+            return None
+        return {**self._elided, "truncated": self.truncated}
+
+
+async def collect_within_budget(
+    pages: AsyncIterator[Page[Any]],
+    budget: OutputBudget,
+) -> Tuple[List[Any], Optional[str]]:
+    """Gather a listing's pages until the budget is spent.
+
+    Returns the items and the cursor to continue from: the cursor of the
+    first item left out, or the listing's own next cursor.
+    """
+    next_cursor = None
+    try:
+        async for page in pages:
+            for index, item in enumerate(page.items):
+                cursor = _item_cursor(page, index)
+                if not budget.add(item, cursor) and cursor is not None:
+                    return budget.items, cursor()
+            next_cursor = page.next_cursor
+    finally:
+        close = getattr(pages, "aclose", None)
+        if close is not None:
+            await close()
+    return budget.items, next_cursor
+
+
+def fit_page(page: Page[Any], budget: OutputBudget) -> Tuple[List[Any], Optional[str]]:
+    """Fit an in-memory page into the budget; return its items and next cursor."""
+    for index, item in enumerate(page.items):
+        cursor = _item_cursor(page, index)
+        if not budget.add(item, cursor) and cursor is not None:
+            return budget.items, cursor()
+    return budget.items, page.next_cursor
+
+
+def _item_cursor(page: Page[Any], index: int) -> Optional[Callable[[], str]]:
+    if page.item_cursor is None:
+        return None
+    item_cursor = page.item_cursor
+    return lambda: item_cursor(index)
+
+
+def cap_range(file_range: FileRange, max_bytes: Optional[int]) -> FileRange:
+    """Bound a byte range (or the whole file) to ``max_bytes``."""
+    if max_bytes is None or file_range.lines:
+        return file_range
+    length = (
+        max_bytes if file_range.length is None else min(file_range.length, max_bytes)
+    )
+    return FileRange(offset=file_range.offset, length=length)
+
+
+def cap_slice(file_slice: FileSlice, max_bytes: Optional[int]) -> FileSlice:
+    """Cut a slice (of a line range) to ``max_bytes``."""
+    if max_bytes is None or len(file_slice.data) <= max_bytes:
+        return file_slice
+    return FileSlice(file_slice.data[:max_bytes], file_slice.binary, True)
+
+
+def file_summary(
+    file_range: FileRange,
+    file_slice: FileSlice,
+    max_bytes: Optional[int],
+) -> Optional[Dict[str, Any]]:
+    """What ``max_bytes`` left out of a capped file read, or None if nothing was."""
+    if max_bytes is None or not file_slice.has_more or len(file_slice.data) < max_bytes:
+        return None
+    summary: Dict[str, Any] = {"truncated": True, "bytes": len(file_slice.data)}
+    if not file_range.lines:
+        summary["next_offset"] = file_range.offset + len(file_slice.data)
+    return summary
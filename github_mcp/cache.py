@@ -0,0 +1,194 @@
+"""In-process caches for GitHub objects."""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generic, Optional, TypeVar
+
+from github_mcp.config import get_settings
+from github_mcp.context import credential_scoped, key_credential, unscoped
+from github_mcp.metrics import record_cache_hit
+
+if TYPE_CHECKING:
+    from github import Github
+    from github.Repository import Repository
+
+V = TypeVar("V")
+
+
+@dataclass
+class CacheEntry(Generic[V]):
+    """A cached value and the time it was stored or last revalidated."""
+
+    value: V
+    stored_at: float
+
+
+class LRUCache(Generic[V]):
+    """Size-bounded LRU mapping whose entries go stale after a TTL.
+
+    Stale entries are kept rather than dropped so callers can revalidate
+    them with a conditional request instead of fetching from scratch.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.evictions = 0
+        self._clock = clock
+        self._entries: "OrderedDict[str, CacheEntry[V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry[V]]:
+        """Return the entry for ``key``, fresh or stale, marking it recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, value: V) -> None:
+        """Store ``value`` under ``key``, evicting the least recently used entry."""
+        with self._lock:
+            self._entries[key] = CacheEntry(value, self._clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: str) -> Optional[CacheEntry[V]]:
+        """Remove and return the entry for ``key``."""
+        with self._lock:
+            return self._entries.pop(key, None)
+
+    def pop_where(self, predicate: Callable[[str], bool]) -> int:
+        """Remove every entry whose key satisfies ``predicate``; return how many."""
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def is_fresh(self, entry: CacheEntry[V]) -> bool:
+        """Return True if ``entry`` is younger than the TTL."""
+        return self._clock() - entry.stored_at < self.ttl
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RepositoryCache:
+    """Cache of PyGithub ``Repository`` objects keyed by ``owner/repo``.
+
+    Handlers only need the repository as an anchor for follow-up requests,
+    so a cached object saves the ``get_repo`` round-trip on every call.
+    Once an entry outlives the TTL it is revalidated with an ETag
+    conditional request; a ``304 Not Modified`` does not count against
+    the rate limit. A repository fetched with a caller's own token is
+    bound to that token's client and cached for that caller only.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._entries: LRUCache["Repository"] = LRUCache(max_size, ttl, clock)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.refreshed = 0
+
+    def get(self, github_client: "Github", owner: str, repo: str) -> "Repository":
+        """Return the repository, fetching or revalidating it as needed."""
+        key = credential_scoped(f"{owner}/{repo}".lower())
+        entry = self._entries.get(key)
+
+        if entry is not None and self._entries.is_fresh(entry):
+            self._count("hits")
+            record_cache_hit("repository")
+            return entry.value
+
+        if entry is not None:
+            try:
+                changed = entry.value.update()
+            except Exception:
+                self._entries.pop(key)
+                raise
+            self._count("refreshed" if changed else "revalidated")
+            self._entries.set(key, entry.value)
+            return entry.value
+
+        self._count("misses")
+        repository = github_client.get_repo(f"{owner}/{repo}")
+        self._entries.set(key, repository)
+        return repository
+
+    def invalidate(self, owner: str, repo: str) -> None:
+        """Drop the cached repository so the next call fetches it again."""
+        self._entries.pop(credential_scoped(f"{owner}/{repo}".lower()))
+
+    def evict(self, owner: str, repo: str) -> int:
+        """Drop the repository for every credential, as when GitHub reports a change."""
+        name = f"{owner}/{repo}".lower()
+        return self._entries.pop_where(lambda key: unscoped(key) == name)
+
+    def forget_credential(self, credential: str) -> int:
+        """Drop the repositories fetched with a credential whose client is closed."""
+        return self._entries.pop_where(lambda key: key_credential(key) == credential)
+
+    def clear(self) -> None:
+        """Drop every cached repository."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and occupancy."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "refreshed": self.refreshed,
+                "evictions": self._entries.evictions,
+                "size": len(self._entries),
+                "max_size": self._entries.max_size,
+            }
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+_repository_cache: Optional[RepositoryCache] = None
+_repository_cache_lock = threading.Lock()
+
+
+def get_repository_cache() -> RepositoryCache:
+    """Return the process-wide repository cache."""
+    global _repository_cache
+    if _repository_cache is None:
+        with _repository_cache_lock:
+            if _repository_cache is None:
+                settings = get_settings()
+                _repository_cache = RepositoryCache(
+                    settings.repo_cache_size,
+                    settings.repo_cache_ttl,
+                )
+    return _repository_cache
+
+
+def get_repository(github_client: "Github", owner: str, repo: str) -> "Repository":
+    """Return ``owner/repo`` through the repository cache."""
+    return get_repository_cache().get(github_client, owner, repo)
@@ -0,0 +1,219 @@
+"""GitHub clients, created on first use for each token."""
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from githubauthlib import GitHubAuthError, get_github_token
+
+from github_mcp.cache import get_repository_cache
+from github_mcp.config import Settings, get_settings
+from github_mcp.context import current_credential
+from github_mcp.executor import run_blocking
+from github_mcp.rate_limit import forget_rate_limiter, get_rate_limiter
+from github_mcp.response_cache import get_response_cache
+
+logger = logging.getLogger(__name__)
+
+
+class AuthenticationError(Exception):
+    """No usable GitHub token could be found."""
+
+
+def create_client(token: str, settings: Settings) -> Any:
+    """Build the client of the configured backend for ``token``.
+
+    Each backend's client library is imported here, so startup does not
+    pay for a backend that is not used.
+    """
+    if settings.backend == "httpx":
+        from github_mcp.rest import AsyncGitHubClient
+
+        return AsyncGitHubClient(
+            token,
+            settings,
+            response_cache=get_response_cache(),
+            rate_limiter=get_rate_limiter(),
+        )
+    if settings.backend == "pygithub":
+        from github import Auth, Github
+
+        from github_mcp import transport
+
+        transport.install()
+        return Github(
+            auth=Auth.Token(token),
+            base_url=settings.api_url,
+            pool_size=settings.max_workers,
+            seconds_between_requests=settings.seconds_between_requests,
+            # Retries are left to the rate-limit scheduler in the transport.
+            retry=None,
+        )
+    raise ValueError(f"Unknown client backend: {settings.backend}")
+
+
+def credential_id(token: str) -> str:
+    """Short fingerprint of a token, safe to log and to key caches by."""
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+async def close_client(client: Any) -> None:
+    """Close a client of either backend."""
+    if hasattr(client, "aclose"):
+        await client.aclose()
+    else:
+        from github_mcp import transport
+
+        client.close()
+        transport.close_sessions(client.requester)
+
+
+@dataclass
+class _Lease:
+    client: Any
+    credential: str
+    leases: int = 0
+    last_used: float = 0.0
+    evicted: bool = False
+
+
+class ClientRegistry:
+    """One client, with its connection pool, per credential.
+
+    At most ``max_clients`` clients are kept, least recently used first
+    out, and a client idle for ``idle_timeout`` seconds is closed. Both
+    are checked whenever a client is leased. A client that is still
+    leased is never closed under its callers: it is dropped from the
+    registry and closed once the last lease is returned.
+    """
+
+    def __init__(
+        self,
+        max_clients: int,
+        idle_timeout: float,
+        factory: Callable[[str], Any],
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_clients = max_clients
+        self.idle_timeout = idle_timeout
+        self._factory = factory
+        self._clock = clock
+        self._entries: "OrderedDict[str, _Lease]" = OrderedDict()
+        self.created = 0
+        self.evicted = 0
+
+    @asynccontextmanager
+    async def lease(self, credential: str, token: str) -> AsyncIterator[Any]:
+        """Yield the client for ``token``, creating it on first use."""
+        entry = self._entries.get(credential)
+        if entry is None:
+            entry = _Lease(self._factory(token), credential)
+            self._entries[credential] = entry
+            self.created += 1
+        self._entries.move_to_end(credential)
+        entry.leases += 1
+        try:
+            await self._evict()
+            yield entry.client
+        finally:
+            entry.leases -= 1
+            entry.last_used = self._clock()
+            if entry.evicted and not entry.leases:
+                await self._close(entry)
+
+    async def _evict(self) -> None:
+        """Drop clients over the size bound or past the idle timeout."""
+        now = self._clock()
+        excess = len(self._entries) - self.max_clients
+        for entry in list(self._entries.values()):
+            # Closing a client yields, so entries may be leased or gone by now.
+            if entry.leases or entry.evicted:
+                continue
+            if excess <= 0 and now - entry.last_used < self.idle_timeout:
+                continue
+            del self._entries[entry.credential]
+            excess -= 1
+            self.evicted += 1
+            entry.evicted = True
+            forget_rate_limiter(entry.credential)
+            await self._close(entry)
+
+    async def close(self) -> None:
+        """Close every client that is not leased; leased ones close on return."""
+        entries = list(self._entries.values())
+        self._entries.clear()
+        for entry in entries:
+            entry.evicted = True
+            if not entry.leases:
+                await self._close(entry)
+
+    async def _close(self, entry: _Lease) -> None:
+        """Close an evicted client, with the cached repositories bound to it."""
+        get_repository_cache().forget_credential(entry.credential)
+        await close_client(entry.client)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool occupancy and churn counters."""
+        return {
+            "clients": len(self._entries),
+            "leased": sum(1 for entry in self._entries.values() if entry.leases),
+            "max_clients": self.max_clients,
+            "created": self.created,
+            "evicted": self.evicted,
+        }
+
+
+_keychain_token: Optional[str] = None
+_client_registry: Optional[ClientRegistry] = None
+
+
+async def keychain_token() -> str:
+    """Return the token from the system keychain, read once on first use."""
+    global _keychain_token
+    if _keychain_token is None:
+        try:
+            token = await run_blocking(get_github_token)
+        except GitHubAuthError as e:
+            logger.error(f"Failed to authenticate with GitHub: {str(e)}")
+            raise AuthenticationError(f"GitHub authentication failed: {str(e)}")
+        if not token:
+            raise AuthenticationError("No GitHub token found in system keychain")
+        logger.info("Successfully authenticated with GitHub using system keychain")
+        _keychain_token = token
+    return _keychain_token
+
+
+def get_client_registry() -> ClientRegistry:
+    """Return the process-wide client registry."""
+    global _client_registry
+    if _client_registry is None:
+        settings = get_settings()
+        _client_registry = ClientRegistry(
+            settings.client_pool_size,
+            settings.client_idle_timeout,
+            lambda token: create_client(token, settings),
+        )
+    return _client_registry
+
+
+@asynccontextmanager
+async def lease_client(token: Optional[str] = None) -> AsyncIterator[Any]:
+    """Lease the client for ``token``, or for the keychain token by default.
+
+    The call's credential (see :data:`current_credential`) must already
+    be set, so that the client's rate limiter is the caller's.
+    """
+    credential = current_credential.get()
+    if token is None:
+        token = await keychain_token()
+    async with get_client_registry().lease(credential, token) as client:
+        yield client
+
+
+async def close_clients() -> None:
+    """Close every client created so far."""
+    if _client_registry is not None:
+        await _client_registry.close()
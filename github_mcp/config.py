@@ -0,0 +1,279 @@
+"""Runtime configuration for the GitHub MCP server."""
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+
+ENV_PREFIX = "GITHUB_MCP_"
+
+def _env(name: str, default: Optional[str] = None) -> Optional[str]:
+    """Read a prefixed environment variable."""
+    return os.environ.get(f"{ENV_PREFIX}{name}", default)
+
+def _env_int(name: str, default: int) -> int:
+    """Read a prefixed integer environment variable."""
+    value = _env(name)
+    return int(value) if value not in (None, "") else default
+
+def _env_float(name: str, default: float) -> float:
+    """Read a prefixed float environment variable."""
+    value = _env(name)
+    return float(value) if value not in (None, "") else default
+
+def _env_optional_float(name: str) -> Optional[float]:
+    """Read a prefixed float environment variable that may be unset."""
+    value = _env(name)
+    return float(value) if value not in (None, "") else None
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a prefixed boolean environment variable."""
+    value = _env(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+def _parse_limits(value: Optional[str]) -> Dict[str, int]:
+    """Parse a ``tool=limit,tool=limit`` mapping."""
+    limits: Dict[str, int] = {}
+    for item in (value or "").split(","):
+        if not item.strip():
+            continue
+        name, _, limit = item.partition("=")
+        limits[name.strip()] = int(limit)
+    return limits
+
+def _parse_list(value: Optional[str]) -> Tuple[str, ...]:
+    """Parse a comma-separated list, lower-cased."""
+    return tuple(
+        item.strip().lower() for item in (value or "").split(",") if item.strip()
+    )
+
+@dataclass(frozen=True)
+class Settings:
+    """Server settings, read from ``GITHUB_MCP_*`` environment variables."""
+
+    # Where and how ``github-mcp`` serves: worker processes, auto-reload
+    # (development only; implies one worker), uvicorn's event loop and
+    # HTTP parser ("auto" picks uvloop and httptools when installed), and
+    # how long shutdown waits for in-flight calls to finish.
+    host: str = "0.0.0.0"
+    port: int = 8000
+    workers: int = 1
+    reload: bool = False
+    loop: str = "auto"
+    http: str = "auto"
+    graceful_timeout: int = 30
+    # SQLite database holding the caches every worker shares; None keeps
+    # caches per process.
+    shared_cache_path: Optional[str] = None
+    # Size of the worker pool that runs blocking PyGithub calls.
+    max_workers: int = 16
+    # Default number of concurrent calls allowed per tool.
+    tool_concurrency: int = 8
+    # Per-tool overrides of ``tool_concurrency``.
+    tool_limits: Dict[str, int] = field(default_factory=dict)
+    # Minimum spacing PyGithub enforces between requests; None disables it.
+    seconds_between_requests: Optional[float] = None
+    # Client backend: "pygithub" (threaded) or "httpx" (native async).
+    backend: str = "pygithub"
+    # Base URL of the GitHub REST API.
+    api_url: str = "https://api.github.com"
+    # Calls may carry their own GitHub token; without one they use the
+    # keychain token, unless every call is required to bring one. One
+    # client is kept per token, up to ``client_pool_size``, and closed
+    # after ``client_idle_timeout`` seconds unused.
+    require_request_token: bool = False
+    client_pool_size: int = 64
+    client_idle_timeout: float = 600.0
+    # Repository object cache: entries older than the TTL are revalidated.
+    repo_cache_size: int = 256
+    repo_cache_ttl: float = 60.0
+    # Conditional-request response cache: "memory", "sqlite" or "none".
+    response_cache: str = "memory"
+    response_cache_size: int = 1024
+    response_cache_max_bytes: int = 64 * 1024 * 1024
+    response_cache_path: str = "~/.cache/github-mcp/responses.sqlite3"
+    # SHA-keyed blob store for file contents; 0 bytes disables it.
+    blob_cache_path: str = "~/.cache/github-mcp/blobs"
+    blob_cache_max_bytes: int = 256 * 1024 * 1024
+    # Remembered path -> blob metadata entries, per repository and ref.
+    path_index_size: int = 16384
+    # Recursive tree indexes kept by tree SHA, and how long a branch or tag
+    # is trusted to still point at the tree last fetched for it.
+    tree_cache_size: int = 32
+    tree_ref_ttl: float = 60.0
+    # get_files: concurrent file fetches per call, and the number of files
+    # above which the ref's tarball is streamed instead.
+    batch_concurrency: int = 16
+    archive_threshold: int = 50
+    # search_content: text held by the trigram index across repositories,
+    # and the size above which a file is not indexed.
+    search_index_max_bytes: int = 256 * 1024 * 1024
+    search_max_file_size: int = 1024 * 1024
+    # POST /tools/batch: calls of one batch run at once, and calls per batch.
+    tool_batch_concurrency: int = 8
+    tool_batch_max_calls: int = 100
+    # Rate-limit scheduling: retries with jittered exponential backoff,
+    # the quota fraction below which reads are paced, and the longest a
+    # request may be held back before failing with a 429.
+    rate_limit_retries: int = 3
+    rate_limit_backoff: float = 1.0
+    rate_limit_max_backoff: float = 30.0
+    rate_limit_reserve: float = 0.1
+    rate_limit_max_wait: float = 60.0
+    # Encode tool results without indentation (with orjson when installed)
+    # instead of pretty-printing them.
+    compact_output: bool = True
+    # Let identical read-only tool calls that are in flight together share
+    # one upstream call.
+    coalesce_calls: bool = True
+    # Use GraphQL for repository metadata, falling back to REST on failure.
+    graphql: bool = True
+    # httpx backend connection pool and protocol settings.
+    http2: bool = True
+    http_timeout: float = 30.0
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
+    # Record per-tool histograms and serve them on /metrics.
+    metrics: bool = True
+    # Repositories ("owner/repo") whose issues and pull requests are synced
+    # into a local SQLite mirror every ``mirror_interval`` seconds. List
+    # calls for them are answered from the mirror while its last sync is
+    # at most ``mirror_max_age`` seconds old.
+    mirror_repos: Tuple[str, ...] = ()
+    mirror_path: str = "~/.cache/github-mcp/mirror.sqlite3"
+    mirror_interval: float = 60.0
+    mirror_max_age: float = 300.0
+    # Secret GitHub signs webhook deliveries with. POST /webhook is only
+    # served when it is set.
+    webhook_secret: Optional[str] = None
+    # Add a Server-Timing header to /tool and /tools/batch responses.
+    timing_headers: bool = False
+    # Wrap tool calls and their GitHub requests in OpenTelemetry spans
+    # (requires opentelemetry-api and, to export them, a configured SDK).
+    tracing: bool = False
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Build settings from the environment (and a ``.env`` file if present)."""
+        load_dotenv()
+        return cls(
+            host=_env("HOST") or cls.host,
+            port=_env_int("PORT", cls.port),
+            workers=_env_int("WORKERS", cls.workers),
+            reload=_env_bool("RELOAD", cls.reload),
+            loop=(_env("LOOP") or cls.loop).lower(),
+            http=(_env("HTTP") or cls.http).lower(),
+            graceful_timeout=_env_int("GRACEFUL_TIMEOUT", cls.graceful_timeout),
+            shared_cache_path=_env("SHARED_CACHE_PATH") or cls.shared_cache_path,
+            max_workers=_env_int("MAX_WORKERS", cls.max_workers),
+            tool_concurrency=_env_int("TOOL_CONCURRENCY", cls.tool_concurrency),
+            tool_limits=_parse_limits(_env("TOOL_LIMITS")),
+            seconds_between_requests=_env_optional_float("SECONDS_BETWEEN_REQUESTS"),
+            backend=(_env("BACKEND") or cls.backend).lower(),
+            require_request_token=_env_bool(
+                "REQUIRE_REQUEST_TOKEN", cls.require_request_token
+            ),
+            client_pool_size=_env_int("CLIENT_POOL_SIZE", cls.client_pool_size),
+            client_idle_timeout=_env_float(
+                "CLIENT_IDLE_TIMEOUT", cls.client_idle_timeout
+            ),
+            api_url=(_env("API_URL") or cls.api_url).rstrip("/"),
+            repo_cache_size=_env_int("REPO_CACHE_SIZE", cls.repo_cache_size),
+            repo_cache_ttl=_env_float("REPO_CACHE_TTL", cls.repo_cache_ttl),
+            response_cache=(_env("RESPONSE_CACHE") or cls.response_cache).lower(),
+            response_cache_size=_env_int(
+                "RESPONSE_CACHE_SIZE", cls.response_cache_size
+            ),
+            response_cache_max_bytes=_env_int(
+                "RESPONSE_CACHE_MAX_BYTES", cls.response_cache_max_bytes
+            ),
+            response_cache_path=_env("RESPONSE_CACHE_PATH") or cls.response_cache_path,
+            blob_cache_path=_env("BLOB_CACHE_PATH") or cls.blob_cache_path,
+            blob_cache_max_bytes=_env_int(
+                "BLOB_CACHE_MAX_BYTES", cls.blob_cache_max_bytes
+            ),
+            path_index_size=_env_int("PATH_INDEX_SIZE", cls.path_index_size),
+            tree_cache_size=_env_int("TREE_CACHE_SIZE", cls.tree_cache_size),
+            tree_ref_ttl=_env_float("TREE_REF_TTL", cls.tree_ref_ttl),
+            batch_concurrency=_env_int("BATCH_CONCURRENCY", cls.batch_concurrency),
+            archive_threshold=_env_int("ARCHIVE_THRESHOLD", cls.archive_threshold),
+            search_index_max_bytes=_env_int(
+                "SEARCH_INDEX_MAX_BYTES", cls.search_index_max_bytes
+            ),
+            search_max_file_size=_env_int(
+                "SEARCH_MAX_FILE_SIZE", cls.search_max_file_size
+            ),
+            tool_batch_concurrency=_env_int(
+                "TOOL_BATCH_CONCURRENCY", cls.tool_batch_concurrency
+            ),
+            tool_batch_max_calls=_env_int(
+                "TOOL_BATCH_MAX_CALLS", cls.tool_batch_max_calls
+            ),
+            rate_limit_retries=_env_int("RATE_LIMIT_RETRIES", cls.rate_limit_retries),
+            rate_limit_backoff=_env_float("RATE_LIMIT_BACKOFF", cls.rate_limit_backoff),
+            rate_limit_max_backoff=_env_float(
+                "RATE_LIMIT_MAX_BACKOFF", cls.rate_limit_max_backoff
+            ),
+            rate_limit_reserve=_env_float("RATE_LIMIT_RESERVE", cls.rate_limit_reserve),
+            rate_limit_max_wait=_env_float(
+                "RATE_LIMIT_MAX_WAIT", cls.rate_limit_max_wait
+            ),
+            compact_output=_env_bool("COMPACT_OUTPUT", cls.compact_output),
+            coalesce_calls=_env_bool("COALESCE_CALLS", cls.coalesce_calls),
+            graphql=_env_bool("GRAPHQL", cls.graphql),
+            http2=_env_bool("HTTP2", cls.http2),
+            http_timeout=_env_float("HTTP_TIMEOUT", cls.http_timeout),
+            http_max_connections=_env_int(
+                "HTTP_MAX_CONNECTIONS", cls.http_max_connections
+            ),
+            http_max_keepalive_connections=_env_int(
+                "HTTP_MAX_KEEPALIVE_CONNECTIONS", cls.http_max_keepalive_connections
+            ),
+            http_keepalive_expiry=_env_float(
+                "HTTP_KEEPALIVE_EXPIRY", cls.http_keepalive_expiry
+            ),
+            mirror_repos=_parse_list(_env("MIRROR_REPOS")),
+            mirror_path=_env("MIRROR_PATH") or cls.mirror_path,
+            mirror_interval=_env_float("MIRROR_INTERVAL", cls.mirror_interval),
+            mirror_max_age=_env_float("MIRROR_MAX_AGE", cls.mirror_max_age),
+            webhook_secret=_env("WEBHOOK_SECRET") or cls.webhook_secret,
+            metrics=_env_bool("METRICS", cls.metrics),
+            timing_headers=_env_bool("TIMING_HEADERS", cls.timing_headers),
+            tracing=_env_bool("TRACING", cls.tracing),
+        )
+
+    @property
+    def graphql_url(self) -> str:
+        """GraphQL endpoint that belongs to ``api_url``."""
+        if self.api_url.endswith("/api/v3"):
+            # GitHub Enterprise Server serves GraphQL next to the REST prefix.
+            return f"{self.api_url[:-len('/v3')]}/graphql"
+        return f"{self.api_url}/graphql"
+
+    @property
+    def web_url(self) -> str:
+        """Web (HTML) base URL that belongs to ``api_url``."""
+        if self.api_url.endswith("/api/v3"):
+            return self.api_url[:-len("/api/v3")]
+        if self.api_url.startswith("https://api."):
+            return f"https://{self.api_url[len('https://api.'):]}"
+        return self.api_url
+
+    def raw_url(self, owner: str, repo: str, ref: str, path: str) -> str:
+        """Download URL of a file, as the contents API reports it."""
+        if self.api_url == "https://api.github.com":
+            return f"https://raw.githubusercontent.com/{owner}/{repo}/{ref}/{path}"
+        return f"{self.web_url}/{owner}/{repo}/raw/{ref}/{path}"
+
+    def tool_limit(self, tool_name: str) -> int:
+        """Return the concurrency limit for a tool."""
+        return self.tool_limits.get(tool_name, self.tool_concurrency)
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """Return the process-wide settings."""
+    return Settings.from_env()
@@ -0,0 +1,32 @@
+"""Context variables describing the tool call being served."""
+from contextvars import ContextVar
+from typing import Optional
+
+# Name of the tool whose handler is running. Worker threads inherit it
+# because the executor runs blocking calls in a copy of the caller's context.
+current_tool: ContextVar[Optional[str]] = ContextVar("current_tool", default=None)
+
+# Fingerprint of the GitHub credential the call is served with, empty for
+# the server's own keychain token. Caches that can answer without asking
+# GitHub scope their keys by it, so no caller sees what only another may read.
+current_credential: ContextVar[str] = ContextVar("current_credential", default="")
+
+
+# Separates a key's credential from the rest. Credential fingerprints are
+# hex and refs cannot hold control characters, so the first one found is it.
+SCOPE_SEPARATOR = "\x1f"
+
+
+def credential_scoped(key: str) -> str:
+    """Prefix a cache key with the current credential, empty for the server's own."""
+    return f"{current_credential.get()}{SCOPE_SEPARATOR}{key}"
+
+
+def unscoped(key: str) -> str:
+    """Strip the credential prefix :func:`credential_scoped` added."""
+    return key.partition(SCOPE_SEPARATOR)[2]
+
+
+def key_credential(key: str) -> str:
+    """The credential :func:`credential_scoped` prefixed a key with."""
+    return key.partition(SCOPE_SEPARATOR)[0]
@@ -0,0 +1,144 @@
+"""Bounded execution of blocking GitHub calls off the event loop."""
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Optional, TypeVar
+
+from github_mcp.config import Settings, get_settings
+
+T = TypeVar("T")
+
+
+@dataclass
+class ToolStats:
+    """Concurrency counters for a single tool."""
+
+    waiting: int = 0
+    active: int = 0
+    completed: int = 0
+    failed: int = 0
+    max_waiting: int = 0
+
+
+class ToolExecutor:
+    """Run blocking work in a bounded thread pool with per-tool limits.
+
+    PyGithub is synchronous, so every call into it is dispatched to a worker
+    thread via :meth:`run`. :meth:`limit` caps how many calls of one tool may
+    be in flight at once; callers above the cap wait and are counted as queued.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self._settings = settings
+        self._pool = ThreadPoolExecutor(
+            max_workers=settings.max_workers,
+            thread_name_prefix="github-mcp",
+        )
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._tools: Dict[str, ToolStats] = {}
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._max_pending = 0
+
+    @asynccontextmanager
+    async def limit(self, tool_name: str) -> AsyncIterator[None]:
+        """Hold one of the tool's concurrency slots for the duration of a call."""
+        semaphore = self._semaphores.get(tool_name)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._settings.tool_limit(tool_name))
+            self._semaphores[tool_name] = semaphore
+        stats = self._tools.setdefault(tool_name, ToolStats())
+
+        stats.waiting += 1
+        stats.max_waiting = max(stats.max_waiting, stats.waiting)
+        try:
+            await semaphore.acquire()
+        finally:
+            stats.waiting -= 1
+
+        stats.active += 1
+        try:
+            yield
+        except BaseException:
+            stats.failed += 1
+            raise
+        else:
+            stats.completed += 1
+        finally:
+            stats.active -= 1
+            semaphore.release()
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``fn`` in the worker pool and await its result."""
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, self._track, fn, *args, **kwargs)
+        with self._lock:
+            self._pending += 1
+            self._max_pending = max(self._max_pending, self._pending)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, call)
+
+    def _track(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Update pool counters around a call on a worker thread."""
+        with self._lock:
+            self._pending -= 1
+            self._running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool and per-tool queue metrics."""
+        with self._lock:
+            pool = {
+                "max_workers": self._settings.max_workers,
+                "queue_depth": self._pending,
+                "running": self._running,
+                "max_queue_depth": self._max_pending,
+            }
+        return {
+            "pool": pool,
+            "tools": {
+                name: {"limit": self._settings.tool_limit(name), **asdict(stats)}
+                for name, stats in self._tools.items()
+            },
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker pool."""
+        self._pool.shutdown(wait=wait)
+
+
+_executor: Optional[ToolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ToolExecutor:
+    """Return the process-wide executor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ToolExecutor(get_settings())
+    return _executor
+
+
+def shutdown_executor(wait: bool = True) -> None:
+    """Shut down the process-wide executor if it was started."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
+
+
+async def run_blocking(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking callable in the shared worker pool."""
+    return await get_executor().run(fn, *args, **kwargs)
@@ -0,0 +1,274 @@
+"""Batch file fetches for get_files: concurrent downloads or one streamed archive."""
+import asyncio
+import base64
+import io
+import tarfile
+import threading
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from github_mcp.blob_store import get_blob_store, git_blob_sha
+from github_mcp.config import get_settings
+from github_mcp.executor import run_blocking
+from github_mcp.pagination import Page, parse_page_request, slice_page
+from github_mcp.trees import TreeIndex, cursor_tree
+
+# Files get_files returns when no limit is given.
+FILES_DEFAULT_LIMIT = 100
+
+# Fetch one file at the call's ref: path -> (blob SHA, bytes).
+BlobFetcher = Callable[[str], Awaitable[Tuple[str, bytes]]]
+# Open the ref's tarball as a blocking, gzipped byte stream.
+ArchiveOpener = Callable[[], AsyncContextManager[BinaryIO]]
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+def is_glob(path: str) -> bool:
+    """Return True if ``path`` is a glob rather than a literal path."""
+    return not _GLOB_CHARS.isdisjoint(path)
+
+
+def select_paths(
+    patterns: Sequence[str],
+    index: Optional[TreeIndex],
+    parameters: Dict[str, Any],
+) -> Tuple[List[str], Optional[str]]:
+    """Expand globs against the tree and cut out the requested page of paths.
+
+    Literal paths are kept as given, so they need no tree. Paths keep the
+    order of ``patterns`` with duplicates dropped. Returns the paths and
+    the cursor of the next page; cursors over expanded globs are bound to
+    the tree by :func:`~github_mcp.trees.cursor_tree`.
+    """
+    globbed = any(is_glob(pattern) for pattern in patterns)
+    selected: Dict[str, None] = {}
+    for pattern in patterns:
+        pattern = pattern.strip("/")
+        if is_glob(pattern):
+            if index is None:
+                raise ValueError(f"Glob '{pattern}' needs the repository tree")
+            matches = [
+                entry["path"]
+                for entry in index.find(pattern=pattern, entry_type="blob")
+            ]
+        else:
+            matches = [pattern]
+        for path in matches:
+            selected.setdefault(path, None)
+
+    page_request = parse_page_request(
+        parameters,
+        {
+            "owner": parameters["owner"],
+            "repo": parameters["repo"],
+            "ref": parameters.get("ref"),
+            "tree": cursor_tree(index) if globbed else None,
+            "paths": list(patterns),
+        },
+        default_limit=FILES_DEFAULT_LIMIT,
+    )
+    page = slice_page(list(selected), page_request)
+    return page.items, page.next_cursor
+
+
+def file_result(path: str, sha: str, data: bytes) -> Dict[str, Any]:
+    """get_files output for one file; non-UTF-8 content is base64 encoded."""
+    try:
+        content, encoding = data.decode("utf-8"), "utf-8"
+    except UnicodeDecodeError:
+        content, encoding = base64.b64encode(data).decode("ascii"), "base64"
+    return {
+        "path": path,
+        "sha": sha,
+        "size": len(data),
+        "encoding": encoding,
+        "content": content,
+    }
+
+
+class AsyncByteReader(io.RawIOBase):
+    """Blocking reader over an async byte stream, for use from a worker thread.
+
+    Each read waits for the next chunk on the event loop, so a parser
+    running in the worker pool consumes a download as it arrives.
+    """
+
+    def __init__(
+        self, chunks: AsyncIterator[bytes], loop: asyncio.AbstractEventLoop
+    ) -> None:
+        super().__init__()
+        self._chunks = chunks
+        self._loop = loop
+        self._buffer = memoryview(b"")
+        self._exhausted = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._buffer and not self._exhausted:
+            chunk = asyncio.run_coroutine_threadsafe(self._next(), self._loop).result()
+            if chunk is None:
+                self._exhausted = True
+            else:
+                self._buffer = memoryview(chunk)
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    async def _next(self) -> Optional[bytes]:
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return None
+
+
+def extract_members(
+    fileobj: BinaryIO,
+    wanted: Set[str],
+    on_member: Callable[[str, bytes], None],
+    stop: Optional[threading.Event] = None,
+) -> None:
+    """Read a gzipped tarball front to back, passing wanted files to ``on_member``.
+
+    GitHub archives nest everything under one ``owner-repo-sha/``
+    directory, which is stripped from member names. Reading stops as soon
+    as every wanted file has been seen, or when ``stop`` is set.
+    """
+    remaining = set(wanted)
+    with tarfile.open(fileobj=fileobj, mode="r|gz") as archive:
+        for member in archive:
+            if not remaining or (stop is not None and stop.is_set()):
+                return
+            if not member.isfile():
+                continue
+            path = member.name.partition("/")[2]
+            if path not in remaining:
+                continue
+            extracted = archive.extractfile(member)
+            if extracted is not None:
+                on_member(path, extracted.read())
+                remaining.discard(path)
+
+
+async def _fetch_each(
+    paths: List[str],
+    fetch_blob: BlobFetcher,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Fetch files concurrently and yield them in completion order."""
+    semaphore = asyncio.Semaphore(get_settings().batch_concurrency)
+
+    async def fetch(path: str) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                sha, data = await fetch_blob(path)
+            except Exception as e:
+                return {"path": path, "error": str(e)}
+        return file_result(path, sha, data)
+
+    tasks = [asyncio.ensure_future(fetch(path)) for path in paths]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _extract_archive(
+    paths: List[str],
+    open_archive: ArchiveOpener,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Stream the ref's tarball and yield wanted files as they are extracted."""
+    loop = asyncio.get_running_loop()
+    store = get_blob_store()
+    queue: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue()
+    stop = threading.Event()
+    found: Set[str] = set()
+
+    def on_member(path: str, data: bytes) -> None:
+        sha = git_blob_sha(data)
+        if store is not None:
+            store.put(sha, data)
+        found.add(path)
+        loop.call_soon_threadsafe(queue.put_nowait, file_result(path, sha, data))
+
+    def extract(fileobj: BinaryIO) -> None:
+        try:
+            extract_members(fileobj, set(paths), on_member, stop)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+
+    async with open_archive() as fileobj:
+        extraction = asyncio.ensure_future(run_blocking(extract, fileobj))
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                yield item
+            await extraction
+        finally:
+            stop.set()
+            await asyncio.gather(extraction, return_exceptions=True)
+
+    for path in paths:
+        if path not in found:
+            yield {"path": path, "error": "File not found in archive"}
+
+
+async def iter_files(
+    paths: List[str],
+    index: Optional[TreeIndex],
+    fetch_blob: BlobFetcher,
+    open_archive: ArchiveOpener,
+    next_cursor: Optional[str] = None,
+) -> AsyncIterator[Page[Dict[str, Any]]]:
+    """Yield one page per file as soon as its content is available.
+
+    Files whose blob SHA the tree names and the blob store holds are
+    served first, without a request. The rest are fetched concurrently,
+    or, above ``archive_threshold`` files, extracted from a single
+    streamed tarball of the ref. A file that cannot be read yields an
+    entry with an ``error`` instead of failing the batch. The last page
+    carries ``next_cursor``.
+    """
+    store = get_blob_store()
+    pending: List[str] = []
+    for path in paths:
+        entry = index.get(path) if index is not None else None
+        if index is not None and entry is None and not index.truncated:
+            yield Page([{"path": path, "error": "File not found"}], None)
+            continue
+        if entry is not None and entry["type"] != "blob":
+            yield Page([{"path": path, "error": f"Path '{path}' is not a file"}], None)
+            continue
+        if entry is not None and store is not None:
+            data = store.read(entry["sha"])
+            if data is not None:
+                yield Page([file_result(path, entry["sha"], data)], None)
+                continue
+        pending.append(path)
+
+    if len(pending) > get_settings().archive_threshold:
+        results = _extract_archive(pending, open_archive)
+    else:
+        results = _fetch_each(pending, fetch_blob)
+    async for result in results:
+        yield Page([result], None)
+    yield Page([], next_cursor)
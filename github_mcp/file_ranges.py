@@ -0,0 +1,278 @@
+"""Byte and line ranges of file contents, read in chunks."""
+import base64
+from contextlib import closing
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, Dict, Iterable, List, Mapping, Optional
+
+from github_mcp.blob_store import get_blob_store
+
+# Files above this size come back from the contents API without content.
+CONTENTS_API_MAX_BYTES = 1024 * 1024
+# Bytes checked for a NUL when telling binary from text, as git does.
+BINARY_SNIFF_BYTES = 8000
+CHUNK_SIZE = 64 * 1024
+# Media type that makes the git blobs endpoint return the raw bytes.
+RAW_MEDIA_TYPE = "application/vnd.github.raw+json"
+
+# Schema fragment for the range parameters of get_file_content.
+FILE_RANGE_PARAMETERS: Dict[str, Any] = {
+    "offset": {
+        "type": "integer",
+        "minimum": 0,
+        "description": "First byte to return",
+    },
+    "length": {
+        "type": "integer",
+        "minimum": 1,
+        "description": "Number of bytes to return from offset",
+    },
+    "start_line": {
+        "type": "integer",
+        "minimum": 1,
+        "description": (
+            "First line to return (1-based); cannot be combined with offset/length"
+        ),
+    },
+    "end_line": {
+        "type": "integer",
+        "minimum": 1,
+        "description": "Last line to return (inclusive)",
+    },
+}
+
+
+@dataclass(frozen=True)
+class FileRange:
+    """The part of a file a call asked for: a byte range or a line range."""
+
+    offset: int = 0
+    length: Optional[int] = None
+    start_line: Optional[int] = None
+    end_line: Optional[int] = None
+
+    @property
+    def lines(self) -> bool:
+        """Return True for a line range."""
+        return self.start_line is not None or self.end_line is not None
+
+    @property
+    def whole(self) -> bool:
+        """Return True if the whole file was asked for."""
+        return not self.lines and self.offset == 0 and self.length is None
+
+    def describe(self) -> Dict[str, Any]:
+        """The range as reported in tool output."""
+        if self.lines:
+            return {"start_line": self.start_line or 1, "end_line": self.end_line}
+        return {"offset": self.offset, "length": self.length}
+
+
+@dataclass
+class FileSlice:
+    """Bytes read for a range, and what is known about the rest of the file."""
+
+    data: bytes
+    binary: bool
+    has_more: bool
+
+
+def parse_file_range(parameters: Mapping[str, Any]) -> FileRange:
+    """Build the range of a get_file_content call from its parameters."""
+    values = {
+        name: int(parameters[name])
+        for name in FILE_RANGE_PARAMETERS
+        if parameters.get(name) is not None
+    }
+    file_range = FileRange(**values)
+    if file_range.lines and ("offset" in values or "length" in values):
+        raise ValueError("Use either offset/length or start_line/end_line, not both")
+    if file_range.offset < 0 or (
+        file_range.length is not None and file_range.length < 1
+    ):
+        raise ValueError("'offset' must be at least 0 and 'length' at least 1")
+    start = file_range.start_line or 1
+    if start < 1 or (file_range.end_line is not None and file_range.end_line < start):
+        raise ValueError("'start_line' must be at least 1 and not after 'end_line'")
+    return file_range
+
+
+def needs_raw(metadata: Mapping[str, Any]) -> bool:
+    """Return True if the contents API did not inline a file's content."""
+    return (
+        metadata.get("encoding") != "base64"
+        or metadata["size"] > CONTENTS_API_MAX_BYTES
+    )
+
+
+def is_binary(head: bytes) -> bool:
+    """Return True if the start of a file marks it as binary."""
+    return b"\0" in head[:BINARY_SNIFF_BYTES]
+
+
+class RangeSlicer:
+    """Cuts a range out of a file that is fed to it chunk by chunk.
+
+    Only the range and the first ``BINARY_SNIFF_BYTES`` are kept, and
+    :meth:`feed` reports when the range is complete, so a download can
+    stop there.
+    """
+
+    def __init__(self, file_range: FileRange, size: int) -> None:
+        self.range = file_range
+        self.size = size
+        self.done = False
+        self._head = bytearray()
+        self._parts: List[bytes] = []
+        self._position = 0
+        # Line ranges: the 1-based line the next byte belongs to.
+        self._line = 1
+
+    def feed(self, chunk: bytes) -> bool:
+        """Consume the next chunk; return True once the range is complete."""
+        if self.done:
+            return True
+        if len(self._head) < BINARY_SNIFF_BYTES:
+            self._head += chunk[:BINARY_SNIFF_BYTES - len(self._head)]
+        if self.range.lines:
+            self._feed_lines(chunk)
+        else:
+            self._feed_bytes(chunk)
+        return self.done
+
+    def _feed_bytes(self, chunk: bytes) -> None:
+        start = self._position
+        self._position += len(chunk)
+        end = (
+            None if self.range.length is None else self.range.offset + self.range.length
+        )
+        lower = max(self.range.offset - start, 0)
+        upper = len(chunk) if end is None else min(end - start, len(chunk))
+        if upper > lower:
+            self._parts.append(chunk[lower:upper])
+        if end is not None and self._position >= end:
+            self.done = True
+
+    def _feed_lines(self, chunk: bytes) -> None:
+        first = self.range.start_line or 1
+        last = self.range.end_line
+        index = 0
+        while index < len(chunk) and not self.done:
+            newline = chunk.find(b"\n", index)
+            stop = len(chunk) if newline == -1 else newline + 1
+            if self._line >= first:
+                self._parts.append(chunk[index:stop])
+            if newline != -1:
+                if self._line == last:
+                    self.done = True
+                self._line += 1
+            index = stop
+        self._position += index
+
+    def slice(self) -> FileSlice:
+        """Return what was cut out so far."""
+        data = b"".join(self._parts)
+        if self.range.lines:
+            has_more = self.done and self._position < self.size
+        else:
+            has_more = self.range.offset + len(data) < self.size
+        return FileSlice(data, is_binary(bytes(self._head)), has_more)
+
+
+def slice_chunks(
+    chunks: Iterable[bytes],
+    sha: str,
+    size: int,
+    file_range: FileRange,
+) -> FileSlice:
+    """Read a range from a file's chunks, storing the blob on the way.
+
+    When the blob store can take the file, the whole of it is read so the
+    next range is served from disk; otherwise reading stops at the end of
+    the range.
+    """
+    store = get_blob_store()
+    writer = store.writer(sha, size) if store is not None else None
+    slicer = RangeSlicer(file_range, size)
+    try:
+        for chunk in chunks:
+            if writer is not None:
+                writer.write(chunk)
+            if slicer.feed(chunk) and writer is None:
+                break
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+    if writer is not None:
+        writer.commit()
+    return slicer.slice()
+
+
+async def aslice_chunks(
+    chunks: AsyncIterable[bytes],
+    sha: str,
+    size: int,
+    file_range: FileRange,
+) -> FileSlice:
+    """Async counterpart of :func:`slice_chunks`."""
+    store = get_blob_store()
+    writer = store.writer(sha, size) if store is not None else None
+    slicer = RangeSlicer(file_range, size)
+    try:
+        async for chunk in chunks:
+            if writer is not None:
+                writer.write(chunk)
+            if slicer.feed(chunk) and writer is None:
+                break
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+    if writer is not None:
+        writer.commit()
+    return slicer.slice()
+
+
+def slice_stored(sha: str, size: int, file_range: FileRange) -> Optional[FileSlice]:
+    """Read a range of a blob from the blob store, or return None if it is not there."""
+    store = get_blob_store()
+    if store is None:
+        return None
+    if file_range.lines or file_range.whole:
+        chunks = store.iter_chunks(sha, CHUNK_SIZE)
+        if chunks is None:
+            return None
+        slicer = RangeSlicer(file_range, size)
+        # Stopping early must still close the blob's file.
+        with closing(chunks):
+            for chunk in chunks:
+                if slicer.feed(chunk):
+                    break
+        return slicer.slice()
+    # Byte ranges are read straight out of the memory-mapped blob.
+    head = store.read(sha, 0, BINARY_SNIFF_BYTES)
+    data = store.read(sha, file_range.offset, file_range.length)
+    if head is None or data is None:
+        return None
+    return FileSlice(data, is_binary(head), file_range.offset + len(data) < size)
+
+
+def render_file(
+    metadata: Dict[str, Any],
+    file_slice: FileSlice,
+    file_range: FileRange,
+) -> Dict[str, Any]:
+    """get_file_content output for a slice of a file.
+
+    Text is returned as UTF-8 (invalid sequences, such as a character cut
+    by a byte range, are replaced); binary content is base64 encoded.
+    """
+    if file_slice.binary:
+        content = base64.b64encode(file_slice.data).decode("ascii")
+    else:
+        content = file_slice.data.decode("utf-8", errors="replace")
+    result = {**metadata, "binary": file_slice.binary, "content": content}
+    if not file_range.whole:
+        result["range"] = file_range.describe()
+        result["has_more"] = file_slice.has_more
+    return result
@@ -0,0 +1,162 @@
+"""GraphQL queries that fetch repository metadata in one round-trip."""
+from typing import Any, Dict, List, Optional, Tuple
+
+from github_mcp.serializers import isoformat
+
+REPOSITORY_FIELDS = """
+fragment RepositoryFields on Repository {
+  name
+  nameWithOwner
+  description
+  url
+  stargazerCount
+  forkCount
+  isPrivate
+  isArchived
+  defaultBranchRef { name }
+  primaryLanguage { name }
+  repositoryTopics(first: 100) { nodes { topic { name } } }
+  createdAt
+  updatedAt
+  pushedAt
+}
+"""
+
+REPOSITORY_DETAIL_FIELDS = """
+fragment RepositoryDetailFields on Repository {
+  ...RepositoryFields
+  issues(states: OPEN) { totalCount }
+  pullRequests(states: OPEN) { totalCount }
+  watchers { totalCount }
+  isFork
+  parent { forkCount }
+  diskUsage
+  licenseInfo { name }
+  viewerPermission
+}
+"""
+
+LIST_REPOSITORIES_QUERY = REPOSITORY_FIELDS + """
+query ListRepositories(
+  $first: Int!
+  $after: String
+  $privacy: RepositoryPrivacy
+  $field: RepositoryOrderField!
+  $direction: OrderDirection!
+) {
+  viewer {
+    repositories(
+      first: $first
+      after: $after
+      privacy: $privacy
+      orderBy: {field: $field, direction: $direction}
+      ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER]
+    ) {
+      nodes { ...RepositoryFields }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+"""
+
+GET_REPOSITORY_QUERY = REPOSITORY_FIELDS + REPOSITORY_DETAIL_FIELDS + """
+query GetRepository($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) { ...RepositoryDetailFields }
+}
+"""
+
+# REST sort keys mapped to GraphQL order fields and REST's default direction.
+_ORDER_FIELDS = {
+    "created": ("CREATED_AT", "DESC"),
+    "updated": ("UPDATED_AT", "DESC"),
+    "pushed": ("PUSHED_AT", "DESC"),
+    "full_name": ("NAME", "ASC"),
+}
+
+_PUSH_PERMISSIONS = {"ADMIN", "MAINTAIN", "WRITE"}
+
+
+def list_repositories_variables(
+    visibility: str,
+    sort: str,
+    first: int = 10,
+    after: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Translate list_repositories parameters into query variables."""
+    field, direction = _ORDER_FIELDS[sort]
+    return {
+        "first": first,
+        "after": after,
+        "privacy": None if visibility == "all" else visibility.upper(),
+        "field": field,
+        "direction": direction,
+    }
+
+
+def repository_from_node(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a ``RepositoryFields`` node to the list output format."""
+    default_branch = node.get("defaultBranchRef")
+    language = node.get("primaryLanguage")
+    return {
+        "name": node["name"],
+        "full_name": node["nameWithOwner"],
+        "description": node["description"],
+        "url": node["url"],
+        "stars": node["stargazerCount"],
+        "forks": node["forkCount"],
+        "private": node["isPrivate"],
+        "archived": node["isArchived"],
+        "default_branch": default_branch["name"] if default_branch else None,
+        "language": language["name"] if language else None,
+        "topics": [
+            topic["topic"]["name"] for topic in node["repositoryTopics"]["nodes"]
+        ],
+        "created_at": isoformat(node["createdAt"]),
+        "updated_at": isoformat(node["updatedAt"]),
+        "pushed_at": isoformat(node.get("pushedAt")),
+    }
+
+
+def repository_detail_from_node(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a ``RepositoryDetailFields`` node to the get output format."""
+    permission: Optional[str] = node.get("viewerPermission")
+    license_info = node.get("licenseInfo")
+    # GraphQL has no network count; the fork network of a repository is
+    # counted on its parent, or on itself when it is not a fork.
+    network = node["parent"] if node.get("isFork") and node.get("parent") else node
+    return {
+        **repository_from_node(node),
+        # REST counts open pull requests as open issues.
+        "open_issues_count": (
+            node["issues"]["totalCount"] + node["pullRequests"]["totalCount"]
+        ),
+        "subscribers_count": node["watchers"]["totalCount"],
+        "network_count": network["forkCount"],
+        "size": node["diskUsage"],
+        "license": license_info["name"] if license_info else None,
+        "permissions": {
+            "admin": permission == "ADMIN",
+            "push": permission in _PUSH_PERMISSIONS,
+            "pull": permission is not None,
+        },
+    }
+
+
+def repositories_from_response(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Extract list output from a ``ListRepositories`` response."""
+    nodes = data["data"]["viewer"]["repositories"]["nodes"]
+    return [repository_from_node(node) for node in nodes]
+
+
+def repositories_page_info(data: Dict[str, Any]) -> Tuple[Optional[str], bool]:
+    """Return the end cursor and whether more repositories follow."""
+    page_info = data["data"]["viewer"]["repositories"].get("pageInfo") or {}
+    return page_info.get("endCursor"), bool(page_info.get("hasNextPage"))
+
+
+def repository_from_response(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract get output from a ``GetRepository`` response."""
+    node = data["data"]["repository"]
+    if node is None:
+        raise ValueError("Repository not found")
+    return repository_detail_from_node(node)
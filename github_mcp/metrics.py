@@ -0,0 +1,422 @@
+"""Per-tool instrumentation: histograms, Prometheus exposition and tracing.
+
+Every tool call is tracked by a :class:`CallMetrics` held in a context
+variable. The GitHub clients, caches and serializers report into it as the
+call runs (worker threads inherit the context from the executor), and the
+totals are folded into per-tool histograms when the call finishes.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from github_mcp.config import get_settings
+
+try:
+    from opentelemetry import trace
+
+    HAVE_OPENTELEMETRY = True
+except ImportError:
+    HAVE_OPENTELEMETRY = False
+
+logger = logging.getLogger(__name__)
+
+# Content type of the Prometheus text exposition format.
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+FAST_SECONDS_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+class CallMetrics:
+    """What one tool call cost: upstream traffic, cache hits and output.
+
+    Updated from the event loop and from worker threads, so every update
+    takes a lock.
+    """
+
+    def __init__(self, tool: str) -> None:
+        self.tool = tool
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.outcome = "ok"
+        self.upstream_requests = 0
+        self.upstream_bytes = 0
+        self.upstream_seconds = 0.0
+        self.statuses: Dict[int, int] = {}
+        self.cache_hits: Dict[str, int] = {}
+        self.serialization_seconds = 0.0
+        self.response_bytes = 0
+        self._lock = threading.Lock()
+
+    def add_upstream(self, status: int, size: int, seconds: float) -> None:
+        with self._lock:
+            self.upstream_requests += 1
+            self.upstream_bytes += size
+            self.upstream_seconds += seconds
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def add_cache_hit(self, cache: str) -> None:
+        with self._lock:
+            self.cache_hits[cache] = self.cache_hits.get(cache, 0) + 1
+
+    def add_output(self, seconds: float, size: int) -> None:
+        with self._lock:
+            self.serialization_seconds += seconds
+            self.response_bytes += size
+
+    def finish(self, outcome: Optional[str] = None) -> None:
+        """Stop the clock, keeping an outcome already set by the caller."""
+        self.duration = time.perf_counter() - self.started
+        if outcome is not None and self.outcome == "ok":
+            self.outcome = outcome
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with one series per label combination."""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str]) -> None:
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, labels: Sequence[str], amount: float = 1) -> None:
+        key = tuple(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, labels: Sequence[str]) -> float:
+        return self._values.get(tuple(labels), 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.labels, key)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with one series per label combination."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        buckets: Sequence[float],
+        labels: Sequence[str] = ("tool",),
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets) + (float("inf"),)
+        self.labels = tuple(labels)
+        # Per series: a count per bucket (not yet cumulative), the sum and the count.
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, labels: Sequence[str], value: float) -> None:
+        key = tuple(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = ([0] * len(self.buckets), [0.0, 0.0])
+        counts, totals = series
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+                break
+        totals[0] += value
+        totals[1] += 1
+
+    def count(self, labels: Sequence[str]) -> int:
+        series = self._series.get(tuple(labels))
+        return int(series[1][1]) if series else 0
+
+    def sum(self, labels: Sequence[str]) -> float:
+        series = self._series.get(tuple(labels))
+        return series[1][0] if series else 0.0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, (total, count)) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _labels(self.labels, key, f'le="{_number(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_number(total)}")
+            lines.append(f"{self.name}_count{labels} {_number(count)}")
+        return lines
+
+
+class Metrics:
+    """Process-wide registry of per-tool call metrics.
+
+    Each worker process keeps its own; with several workers a scrape sees
+    the one that answered it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.calls = Counter(
+            "github_mcp_tool_calls_total",
+            "Tool calls by outcome.",
+            ("tool", "outcome"),
+        )
+        self.duration = Histogram(
+            "github_mcp_tool_duration_seconds",
+            "Wall time of a tool call.",
+            SECONDS_BUCKETS,
+        )
+        self.upstream_requests = Histogram(
+            "github_mcp_tool_upstream_requests",
+            "GitHub requests made by a tool call.",
+            COUNT_BUCKETS,
+        )
+        self.upstream_bytes = Histogram(
+            "github_mcp_tool_upstream_bytes",
+            "Response body bytes received from GitHub by a tool call.",
+            BYTES_BUCKETS,
+        )
+        self.upstream_seconds = Histogram(
+            "github_mcp_tool_upstream_seconds",
+            "Time a tool call spent waiting on GitHub responses.",
+            SECONDS_BUCKETS,
+        )
+        self.cache_hits = Histogram(
+            "github_mcp_tool_cache_hits",
+            "Cache hits of a tool call, over all caches.",
+            COUNT_BUCKETS,
+        )
+        self.serialization_seconds = Histogram(
+            "github_mcp_tool_serialization_seconds",
+            "Time spent encoding a tool call's output.",
+            FAST_SECONDS_BUCKETS,
+        )
+        self.response_bytes = Histogram(
+            "github_mcp_tool_response_bytes",
+            "Encoded size of a tool call's output.",
+            BYTES_BUCKETS,
+        )
+        self.upstream_responses = Counter(
+            "github_mcp_upstream_responses_total",
+            "GitHub responses by tool and status code.",
+            ("tool", "status"),
+        )
+        self.cache_hits_by_cache = Counter(
+            "github_mcp_cache_hits_total",
+            "Cache hits by tool and cache.",
+            ("tool", "cache"),
+        )
+
+    def observe(self, call: CallMetrics) -> None:
+        """Fold a finished call into the histograms."""
+        tool = (call.tool,)
+        with self._lock:
+            self.calls.inc((call.tool, call.outcome))
+            self.duration.observe(tool, call.duration)
+            self.upstream_requests.observe(tool, call.upstream_requests)
+            self.upstream_bytes.observe(tool, call.upstream_bytes)
+            self.upstream_seconds.observe(tool, call.upstream_seconds)
+            self.cache_hits.observe(tool, sum(call.cache_hits.values()))
+            self.serialization_seconds.observe(tool, call.serialization_seconds)
+            self.response_bytes.observe(tool, call.response_bytes)
+            for status, count in call.statuses.items():
+                self.upstream_responses.inc((call.tool, str(status)), count)
+            for cache, count in call.cache_hits.items():
+                self.cache_hits_by_cache.inc((call.tool, cache), count)
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        with self._lock:
+            lines: List[str] = []
+            for metric in (
+                self.calls,
+                self.duration,
+                self.upstream_requests,
+                self.upstream_bytes,
+                self.upstream_seconds,
+                self.cache_hits,
+                self.serialization_seconds,
+                self.response_bytes,
+                self.upstream_responses,
+                self.cache_hits_by_cache,
+            ):
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+_metrics: Optional[Metrics] = None
+_metrics_lock = threading.Lock()
+
+# The call being served, if it is tracked.
+_current_call: ContextVar[Optional[CallMetrics]] = ContextVar(
+    "current_call", default=None
+)
+# Calls finished while serving the current HTTP request, for timing headers.
+_request_calls: ContextVar[Optional[List[CallMetrics]]] = ContextVar(
+    "request_calls", default=None
+)
+
+
+def get_metrics() -> Metrics:
+    """Return the process-wide metrics registry, creating it on first use."""
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = Metrics()
+    return _metrics
+
+
+@lru_cache(maxsize=None)
+def _tracing_available() -> bool:
+    """Return True if OpenTelemetry is installed, warning once if it is not."""
+    if not HAVE_OPENTELEMETRY:
+        logger.warning("Tracing requested but 'opentelemetry-api' is not installed")
+        return False
+    return True
+
+
+def _tracing() -> bool:
+    return get_settings().tracing and _tracing_available()
+
+
+@contextmanager
+def track_call(tool: str) -> Iterator[CallMetrics]:
+    """Track a tool call, recording it when the block exits.
+
+    With tracing enabled the call also runs in an OpenTelemetry span, and
+    each GitHub request it makes is recorded as a child span.
+    """
+    call = CallMetrics(tool)
+    if not get_settings().metrics:
+        yield call
+        return
+    span_context = (
+        trace.get_tracer("github_mcp").start_as_current_span(
+            f"tools/call {tool}",
+            attributes={"gen_ai.tool.name": tool},
+        )
+        if _tracing()
+        else nullcontext()
+    )
+    token = _current_call.set(call)
+    try:
+        with span_context as span:
+            try:
+                yield call
+            except Exception:
+                call.outcome = "error"
+                raise
+            finally:
+                if span is not None:
+                    span.set_attributes({
+                        "github_mcp.upstream.requests": call.upstream_requests,
+                        "github_mcp.upstream.bytes": call.upstream_bytes,
+                        "github_mcp.cache.hits": sum(call.cache_hits.values()),
+                        "github_mcp.response.bytes": call.response_bytes,
+                    })
+    except BaseException:
+        # Cancelled calls, and generators closed before they finished.
+        call.finish("cancelled")
+        raise
+    finally:
+        _current_call.reset(token)
+        call.finish()
+        get_metrics().observe(call)
+        calls = _request_calls.get()
+        if calls is not None:
+            calls.append(call)
+
+
+def record_upstream(
+    method: str,
+    url: str,
+    status: int,
+    size: int,
+    started: float,
+) -> None:
+    """Record a GitHub response received by the current call.
+
+    ``started`` is the :func:`time.perf_counter` reading taken before the
+    request was sent.
+    """
+    call = _current_call.get()
+    if call is None:
+        return
+    seconds = time.perf_counter() - started
+    call.add_upstream(status, size, seconds)
+    if _tracing():
+        end = time.time_ns()
+        span = trace.get_tracer("github_mcp").start_span(
+            method,
+            kind=trace.SpanKind.CLIENT,
+            start_time=end - int(seconds * 1e9),
+            attributes={
+                "http.request.method": method,
+                "url.full": url,
+                "http.response.status_code": status,
+                "http.response.body.size": size,
+            },
+        )
+        span.end(end_time=end)
+
+
+def record_cache_hit(cache: str) -> None:
+    """Record that ``cache`` answered part of the current call."""
+    call = _current_call.get()
+    if call is not None:
+        call.add_cache_hit(cache)
+
+
+def record_output(seconds: float, size: int) -> None:
+    """Record time spent encoding output of the current call, and its size."""
+    call = _current_call.get()
+    if call is not None:
+        call.add_output(seconds, size)
+
+
+@contextmanager
+def collect_calls() -> Iterator[List[CallMetrics]]:
+    """Collect the calls that finish inside the block, including its tasks."""
+    calls: List[CallMetrics] = []
+    token = _request_calls.set(calls)
+    try:
+        yield calls
+    finally:
+        _request_calls.reset(token)
+
+
+def server_timing(calls: Sequence[CallMetrics]) -> str:
+    """Summarise calls as a ``Server-Timing`` header value, durations in ms."""
+    requests = sum(call.upstream_requests for call in calls)
+    size = sum(call.upstream_bytes for call in calls)
+    hits = sum(sum(call.cache_hits.values()) for call in calls)
+    return ", ".join([
+        f"tool;dur={sum(call.duration for call in calls) * 1000:.1f}",
+        f"github;dur={sum(call.upstream_seconds for call in calls) * 1000:.1f}"
+        f';desc="{requests} requests, {size} bytes"',
+        f'cache;desc="{hits} hits"',
+        f"serialize;dur={sum(call.serialization_seconds for call in calls) * 1000:.1f}",
+    ])
@@ -0,0 +1,603 @@
+"""Local SQLite mirror of the issues and pull requests of configured repositories.
+
+A background task keeps the mirror in step with GitHub: issues are fetched
+with ``since=`` the newest ``updated_at`` already stored, pull requests
+newest-updated first until an unchanged one is reached, and every request
+goes through the response cache, so a poll that finds nothing new costs
+``304`` responses that GitHub does not count against the rate limit.
+``list_issues`` and ``list_pull_requests`` for a mirrored repository are
+answered from the mirror, with filters GitHub's list endpoints lack.
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+
+from github_mcp.clients import keychain_token
+from github_mcp.config import get_settings
+from github_mcp.context import current_credential, current_tool
+from github_mcp.executor import run_blocking
+from github_mcp.metrics import record_cache_hit
+from github_mcp.pagination import MAX_PER_PAGE, Page, PageRequest, iter_pages
+from github_mcp.planner import PULL_REQUEST_DETAIL_FIELDS, PULL_REQUEST_FIELDS
+from github_mcp.rate_limit import get_rate_limiter
+from github_mcp.response_cache import get_response_cache
+from github_mcp.serializers import serialize_issue, serialize_pull_request
+
+logger = logging.getLogger(__name__)
+
+ISSUES = "issues"
+PULLS = "pulls"
+
+# Pull request fields the mirror keeps: those of the list payload.
+MIRROR_PULL_REQUEST_FIELDS: Tuple[str, ...] = tuple(
+    name for name in PULL_REQUEST_FIELDS if name not in PULL_REQUEST_DETAIL_FIELDS
+)
+
+# Sort orders a mirrored listing can reproduce.
+MIRROR_SORTS = ("created", "updated")
+
+# How long a worker may hold a repository's sync before others take over.
+SYNC_LEASE = 600.0
+
+# Filters only the mirror can apply, by listing.
+LOCAL_FILTERS: Dict[str, Tuple[str, ...]] = {
+    ISSUES: ("search",),
+    PULLS: ("labels", "author", "assignee", "search"),
+}
+
+# Schema fragments of the mirror filters.
+SEARCH_PARAMETER: Dict[str, Any] = {
+    "search": {
+        "type": "string",
+        "description": (
+            "Only items whose title or body contains every word "
+            "(repositories in the local mirror only)"
+        ),
+    },
+}
+AUTHOR_PARAMETERS: Dict[str, Any] = {
+    "author": {"type": "string", "description": "Filter by author login"},
+    "assignee": {"type": "string", "description": "Filter by assignee login"},
+}
+
+
+@dataclass(frozen=True)
+class MirrorQuery:
+    """Filters and order of a listing answered from the mirror."""
+
+    state: str = "open"
+    labels: Tuple[str, ...] = ()
+    author: Optional[str] = None
+    assignee: Optional[str] = None
+    search: Optional[str] = None
+    sort: str = "created"
+    direction: str = "desc"
+
+    @classmethod
+    def from_parameters(
+        cls, parameters: Dict[str, Any], sort: str = "created"
+    ) -> "MirrorQuery":
+        """Read the filters of a list tool call."""
+        return cls(
+            state=parameters.get("state", "open"),
+            labels=tuple(parameters.get("labels") or ()),
+            author=parameters.get("author"),
+            assignee=parameters.get("assignee"),
+            search=parameters.get("search"),
+            sort=sort,
+        )
+
+
+def local_filters(kind: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """The mirror-only filters a list call sets, for its cursor fingerprint."""
+    return {
+        name: parameters[name] for name in LOCAL_FILTERS[kind] if parameters.get(name)
+    }
+
+
+def _like(word: str) -> str:
+    """A LIKE pattern matching ``word`` anywhere, with wildcards escaped."""
+    escaped = word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def repo_key(owner: str, repo: str) -> str:
+    """Key of a repository in the mirror and in ``mirror_repos``."""
+    return f"{owner}/{repo}".lower()
+
+
+class Mirror:
+    """Issues and pull requests of some repositories, in a SQLite database.
+
+    Rows hold the serialized tool output with the columns listings filter
+    and sort on. Several workers can open the same database; a lease makes
+    sure only one of them syncs a repository at a time.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        busy_timeout: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        path = os.path.expanduser(path)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._clock = clock
+        self._owner = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=busy_timeout, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS items ("
+            " repo TEXT NOT NULL,"
+            " kind TEXT NOT NULL,"
+            " number INTEGER NOT NULL,"
+            " state TEXT NOT NULL,"
+            " author TEXT,"
+            " created_at TEXT NOT NULL,"
+            " updated_at TEXT NOT NULL,"
+            " data TEXT NOT NULL,"
+            " PRIMARY KEY (repo, kind, number))"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS items_created_at"
+            " ON items (repo, kind, created_at)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS items_updated_at"
+            " ON items (repo, kind, updated_at)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS repos ("
+            " repo TEXT PRIMARY KEY,"
+            " issues_since TEXT,"
+            " pulls_since TEXT,"
+            " synced_at REAL,"
+            " lease_owner TEXT,"
+            " lease_until REAL)"
+        )
+        self._db.commit()
+        self.syncs = 0
+        self.errors = 0
+
+    def store(self, repo: str, kind: str, items: Sequence[Dict[str, Any]]) -> None:
+        """Insert or update serialized issues or pull requests of ``repo``.
+
+        A stored item is only replaced by one updated at the same time or
+        later, so a sync page and a webhook delivery may arrive in any order.
+        """
+        rows = [
+            (
+                repo,
+                kind,
+                item["number"],
+                item["state"],
+                item.get("author"),
+                item["created_at"],
+                item["updated_at"],
+                json.dumps(item),
+            )
+            for item in items
+        ]
+        with self._lock:
+            self._db.executemany(
+                "INSERT INTO items"
+                " (repo, kind, number, state, author, created_at, updated_at, data)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (repo, kind, number) DO UPDATE SET"
+                " state = excluded.state, author = excluded.author,"
+                " created_at = excluded.created_at, updated_at = excluded.updated_at,"
+                " data = excluded.data"
+                " WHERE excluded.updated_at >= items.updated_at",
+                rows,
+            )
+            self._db.commit()
+
+    def store_pull_request(self, repo: str, pull_request: Dict[str, Any]) -> None:
+        """Store a REST pull request payload, and the issue it also is."""
+        self.store(
+            repo,
+            PULLS,
+            [serialize_pull_request(pull_request, MIRROR_PULL_REQUEST_FIELDS)],
+        )
+        # list_issues lists pull requests too, flagged as such.
+        as_issue = {**pull_request, "pull_request": {"url": pull_request["url"]}}
+        self.store(repo, ISSUES, [serialize_issue(as_issue)])
+
+    def remove(
+        self, repo: str, kind: Optional[str] = None, number: Optional[int] = None
+    ) -> int:
+        """Drop items of ``repo``: all of them, those of one kind, or one.
+
+        Returns how many were dropped.
+        """
+        clauses = ["repo = ?"]
+        arguments: List[Any] = [repo]
+        if kind is not None:
+            clauses.append("kind = ?")
+            arguments.append(kind)
+        if number is not None:
+            clauses.append("number = ?")
+            arguments.append(number)
+        with self._lock:
+            cursor = self._db.execute(
+                f"DELETE FROM items WHERE {' AND '.join(clauses)}", arguments
+            )
+            self._db.commit()
+        return cursor.rowcount
+
+    def query(
+        self,
+        repo: str,
+        kind: str,
+        query: MirrorQuery,
+        offset: int,
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        """Return matching items of ``repo`` in listing order."""
+        clauses = ["repo = ?", "kind = ?"]
+        arguments: List[Any] = [repo, kind]
+        if query.state != "all":
+            clauses.append("state = ?")
+            arguments.append(query.state)
+        if query.author:
+            clauses.append("author = ? COLLATE NOCASE")
+            arguments.append(query.author)
+        if query.assignee:
+            clauses.append(
+                "EXISTS (SELECT 1 FROM json_each(data, '$.assignees')"
+                " WHERE value = ? COLLATE NOCASE)"
+            )
+            arguments.append(query.assignee)
+        for label in query.labels:
+            clauses.append(
+                "EXISTS (SELECT 1 FROM json_each(data, '$.labels')"
+                " WHERE value = ? COLLATE NOCASE)"
+            )
+            arguments.append(label)
+        for word in (query.search or "").split():
+            clauses.append(
+                "(json_extract(data, '$.title') LIKE ? ESCAPE '\\'"
+                " OR json_extract(data, '$.body') LIKE ? ESCAPE '\\')"
+            )
+            arguments.extend([_like(word), _like(word)])
+        column = "updated_at" if query.sort == "updated" else "created_at"
+        direction = "ASC" if query.direction == "asc" else "DESC"
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT data FROM items WHERE {' AND '.join(clauses)}"
+                f" ORDER BY {column} {direction}, number {direction}"
+                " LIMIT ? OFFSET ?",
+                [*arguments, limit, offset],
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def synced_at(self, repo: str) -> Optional[float]:
+        """Return when ``repo`` was last fully synced, if ever."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT synced_at FROM repos WHERE repo = ?", (repo,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def covers(self, repo: str, max_age: float) -> bool:
+        """Return True if ``repo`` was synced within the last ``max_age`` seconds."""
+        synced_at = self.synced_at(repo)
+        return synced_at is not None and synced_at >= self._clock() - max_age
+
+    def cursors(self, repo: str) -> Tuple[Optional[str], Optional[str]]:
+        """Return the ``updated_at`` that ``repo``'s issues and pull requests reach."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT issues_since, pulls_since FROM repos WHERE repo = ?", (repo,)
+            ).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+
+    def claim(self, repo: str, interval: float) -> bool:
+        """Take the lease on syncing ``repo`` if a sync is due and nobody holds it."""
+        now = self._clock()
+        with self._lock:
+            self._db.execute("INSERT OR IGNORE INTO repos (repo) VALUES (?)", (repo,))
+            claimed = self._db.execute(
+                "UPDATE repos SET lease_owner = ?, lease_until = ?"
+                " WHERE repo = ?"
+                " AND (synced_at IS NULL OR synced_at <= ?)"
+                " AND (lease_until IS NULL OR lease_until < ? OR lease_owner = ?)",
+                (self._owner, now + SYNC_LEASE, repo, now - interval, now, self._owner),
+            ).rowcount
+            self._db.commit()
+        return claimed == 1
+
+    def save_cursor(self, repo: str, kind: str, since: Optional[str]) -> None:
+        """Record how far the ``kind`` items of ``repo`` are synced."""
+        column = "issues_since" if kind == ISSUES else "pulls_since"
+        with self._lock:
+            self._db.execute(
+                f"UPDATE repos SET {column} = ? WHERE repo = ?", (since, repo)
+            )
+            self._db.commit()
+
+    def release(self, repo: str, synced: bool) -> None:
+        """Give up the lease on ``repo``, recording a completed sync."""
+        with self._lock:
+            if synced:
+                self._db.execute(
+                    "UPDATE repos SET synced_at = ?, lease_owner = NULL,"
+                    " lease_until = NULL WHERE repo = ? AND lease_owner = ?",
+                    (self._clock(), repo, self._owner),
+                )
+            else:
+                self._db.execute(
+                    "UPDATE repos SET lease_owner = NULL, lease_until = NULL"
+                    " WHERE repo = ? AND lease_owner = ?",
+                    (repo, self._owner),
+                )
+            self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return items per repository and when each was last synced."""
+        with self._lock:
+            counts = self._db.execute(
+                "SELECT repo, kind, COUNT(*) FROM items GROUP BY repo, kind"
+            ).fetchall()
+            synced = dict(
+                self._db.execute("SELECT repo, synced_at FROM repos").fetchall()
+            )
+        repos: Dict[str, Dict[str, Any]] = {
+            repo: {"synced_at": synced_at, ISSUES: 0, PULLS: 0}
+            for repo, synced_at in synced.items()
+        }
+        for repo, kind, count in counts:
+            repos.setdefault(repo, {"synced_at": None, ISSUES: 0, PULLS: 0})[
+                kind
+            ] = count
+        return {
+            "path": self.path,
+            "syncs": self.syncs,
+            "errors": self.errors,
+            "repos": repos,
+        }
+
+
+async def sync_issues(
+    client: Any, mirror: Mirror, repo: str, since: Optional[str]
+) -> Optional[str]:
+    """Fetch the issues of ``repo`` updated since ``since``; return the new cursor.
+
+    Issues are listed oldest-updated first, so the cursor can be saved after
+    every page and an interrupted sync resumes where it stopped.
+    """
+    params: Dict[str, Any] = {"state": "all", "sort": "updated", "direction": "asc"}
+    if since:
+        params["since"] = since
+    page = 1
+    while True:
+        issues, has_next = await client.get_page(
+            f"/repos/{repo}/issues", params, page, MAX_PER_PAGE
+        )
+        if issues:
+            await run_blocking(
+                mirror.store, repo, ISSUES, [serialize_issue(i) for i in issues]
+            )
+            since = max(since or "", *(issue["updated_at"] for issue in issues))
+            await run_blocking(mirror.save_cursor, repo, ISSUES, since)
+        if not has_next:
+            return since
+        page += 1
+
+
+async def sync_pulls(
+    client: Any, mirror: Mirror, repo: str, since: Optional[str]
+) -> Optional[str]:
+    """Fetch ``repo``'s pull requests updated since ``since``; return the new cursor.
+
+    The pulls endpoint has no ``since``, so pull requests are listed
+    newest-updated first until one older than the cursor comes up.
+    """
+    params = {"state": "all", "sort": "updated", "direction": "desc"}
+    newest = since
+    page = 1
+    while True:
+        pulls, has_next = await client.get_page(
+            f"/repos/{repo}/pulls", params, page, MAX_PER_PAGE
+        )
+        changed = [pr for pr in pulls if since is None or pr["updated_at"] >= since]
+        if changed:
+            await run_blocking(
+                mirror.store,
+                repo,
+                PULLS,
+                [
+                    serialize_pull_request(pr, MIRROR_PULL_REQUEST_FIELDS)
+                    for pr in changed
+                ],
+            )
+            newest = max(newest or "", *(pr["updated_at"] for pr in changed))
+        if len(changed) < len(pulls) or not has_next:
+            break
+        page += 1
+    await run_blocking(mirror.save_cursor, repo, PULLS, newest)
+    return newest
+
+
+async def sync_repository(
+    client: Any, mirror: Mirror, repo: str, interval: float
+) -> bool:
+    """Sync one repository if it is due and no other worker is at it.
+
+    Return True if a sync ran to completion.
+    """
+    if not await run_blocking(mirror.claim, repo, interval):
+        return False
+    synced = False
+    try:
+        issues_since, pulls_since = await run_blocking(mirror.cursors, repo)
+        await sync_issues(client, mirror, repo, issues_since)
+        await sync_pulls(client, mirror, repo, pulls_since)
+        synced = True
+        mirror.syncs += 1
+    except Exception as e:
+        mirror.errors += 1
+        logger.warning(f"Mirror sync of {repo} failed: {str(e)}")
+    finally:
+        await run_blocking(mirror.release, repo, synced)
+    return synced
+
+
+class MirrorSync:
+    """Background task syncing every configured repository in turn."""
+
+    def __init__(self, mirror: Mirror, repos: Sequence[str], interval: float) -> None:
+        self.mirror = mirror
+        self.repos = tuple(repos)
+        self.interval = interval
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def start(self) -> None:
+        """Start syncing in the background."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """Stop syncing and wait for the task to end."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def sync_once(self) -> None:
+        """Sync every repository that is due, with the keychain token's client."""
+        from github_mcp.rest import AsyncGitHubClient
+
+        # The sync always uses the async REST client, whatever the tools' backend.
+        client = AsyncGitHubClient(
+            await keychain_token(),
+            get_settings(),
+            response_cache=get_response_cache(),
+            rate_limiter=get_rate_limiter(""),
+        )
+        try:
+            for repo in self.repos:
+                await sync_repository(client, self.mirror, repo, self.interval)
+        finally:
+            await client.aclose()
+
+    async def _run(self) -> None:
+        current_tool.set("mirror_sync")
+        while True:
+            try:
+                await self.sync_once()
+            except Exception as e:
+                logger.warning(f"Mirror sync failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+
+def mirrored_listing(
+    kind: str,
+    parameters: Dict[str, Any],
+    request: PageRequest,
+    sort: str = "created",
+    fields: Optional[Sequence[str]] = None,
+    usable: bool = True,
+) -> Optional[AsyncIterator[Page[Dict[str, Any]]]]:
+    """Pages of a list call answered from the mirror, or None to ask GitHub.
+
+    The mirror answers for repositories synced recently enough, and only
+    calls served with the keychain token it is synced with. ``usable`` is
+    False when the call needs what the mirror does not keep. Filters only
+    the mirror can apply are an error for calls it cannot answer.
+    """
+    repo = repo_key(parameters["owner"], parameters["repo"])
+    settings = get_settings()
+    mirror = get_mirror()
+    local = [name for name in LOCAL_FILTERS[kind] if parameters.get(name)]
+    if (
+        not usable
+        or mirror is None
+        or repo not in settings.mirror_repos
+        or current_credential.get()
+        or not mirror.covers(repo, settings.mirror_max_age)
+    ):
+        if local:
+            raise ValueError(
+                f"Filtering by {', '.join(local)} needs {repo} in the local mirror "
+                "(GITHUB_MCP_MIRROR_REPOS), with the default fields and sort"
+            )
+        return None
+    query = MirrorQuery.from_parameters(parameters, sort)
+
+    async def fetch_page(page: int, per_page: int) -> Tuple[List[Dict[str, Any]], bool]:
+        items = await run_blocking(
+            mirror.query, repo, kind, query, (page - 1) * per_page, per_page + 1
+        )
+        record_cache_hit("mirror")
+        if fields is not None:
+            items = [{name: item.get(name) for name in fields} for item in items]
+        return items[:per_page], len(items) > per_page
+
+    return iter_pages(fetch_page, request)
+
+
+_mirror: Optional[Mirror] = None
+_mirror_sync: Optional[MirrorSync] = None
+_mirror_lock = threading.Lock()
+
+
+def get_mirror() -> Optional[Mirror]:
+    """Return the process-wide mirror, or None if no repository is mirrored."""
+    global _mirror
+    settings = get_settings()
+    if _mirror is None and settings.mirror_repos:
+        with _mirror_lock:
+            if _mirror is None:
+                _mirror = Mirror(settings.mirror_path)
+    return _mirror
+
+
+def record_created(owner: str, repo: str, kind: str, payload: Dict[str, Any]) -> None:
+    """Add an issue or pull request this server created to the mirror.
+
+    Listings answered from the mirror then include it without waiting for
+    the next sync. Repositories that are not mirrored are left alone.
+    """
+    key = repo_key(owner, repo)
+    mirror = get_mirror()
+    if mirror is None or key not in get_settings().mirror_repos:
+        return
+    if kind == PULLS:
+        mirror.store_pull_request(key, payload)
+    else:
+        mirror.store(key, ISSUES, [serialize_issue(payload)])
+
+
+def start_mirror_sync() -> Optional[MirrorSync]:
+    """Start the background sync of the configured repositories, if any."""
+    global _mirror_sync
+    mirror = get_mirror()
+    if mirror is None:
+        return None
+    if _mirror_sync is None:
+        settings = get_settings()
+        _mirror_sync = MirrorSync(
+            mirror, settings.mirror_repos, settings.mirror_interval
+        )
+        _mirror_sync.start()
+    return _mirror_sync
+
+
+async def stop_mirror_sync() -> None:
+    """Stop the background sync if it was started."""
+    global _mirror_sync
+    if _mirror_sync is not None:
+        await _mirror_sync.stop()
+        _mirror_sync = None
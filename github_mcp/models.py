@@ -0,0 +1,52 @@
+"""Request and response models of the MCP server."""
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ToolCall(BaseModel):
+    """Model for MCP tool calls."""
+    name: str = Field(..., description="Name of the tool to call")
+    parameters: Dict[str, Any] = Field(
+        default_factory=dict, description="Tool parameters"
+    )
+
+
+class ToolDefinition(BaseModel):
+    """Model for MCP tool definitions."""
+    name: str = Field(..., description="Name of the tool")
+    description: str = Field(..., description="Tool description")
+    parameters: Dict[str, Any] = Field(..., description="Tool parameters schema")
+
+
+class ToolResult(BaseModel):
+    """Model for MCP tool results."""
+    content: List[Dict[str, Any]] = Field(..., description="Tool result content")
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Continuation token for the next page of a listing",
+    )
+    elided: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="What a max_bytes or max_body_chars budget left out",
+    )
+
+
+class ToolError(BaseModel):
+    """Model for a failed tool call within a batch."""
+    status_code: int = Field(
+        ..., description="HTTP status the call alone would have returned"
+    )
+    detail: str = Field(..., description="Error message")
+
+
+class BatchItem(BaseModel):
+    """Model for the outcome of one call in a batch."""
+    index: int = Field(..., description="Position of the call in the batch")
+    name: str = Field(..., description="Name of the tool called")
+    result: Optional[ToolResult] = Field(
+        default=None, description="Result, if the call succeeded"
+    )
+    error: Optional[ToolError] = Field(
+        default=None, description="Error, if the call failed"
+    )
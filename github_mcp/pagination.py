@@ -0,0 +1,342 @@
+"""Page size, page and continuation-cursor handling for the list tools."""
+import asyncio
+import base64
+import hashlib
+import json
+from collections import deque
+from dataclasses import dataclass, replace
+from functools import partial
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Generic,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    TYPE_CHECKING,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+if TYPE_CHECKING:
+    from github.GithubObject import GithubObject
+    from github.Requester import Requester
+
+T = TypeVar("T")
+G = TypeVar("G", bound="GithubObject")
+
+DEFAULT_LIMIT = 10
+MAX_PER_PAGE = 100
+MAX_PAGES_IN_FLIGHT = 4
+
+# Schema fragment shared by every list tool.
+PAGINATION_PARAMETERS: Dict[str, Any] = {
+    "limit": {
+        "type": "integer",
+        "minimum": 1,
+        "default": DEFAULT_LIMIT,
+        "description": "Maximum number of items to return",
+    },
+    "per_page": {
+        "type": "integer",
+        "minimum": 1,
+        "maximum": MAX_PER_PAGE,
+        "description": "Upstream page size; defaults to the limit (up to 100)",
+    },
+    "page": {
+        "type": "integer",
+        "minimum": 1,
+        "default": 1,
+        "description": "Page of per_page items to start from",
+    },
+    "cursor": {
+        "type": "string",
+        "description": "next_cursor returned by a previous call; resumes the listing",
+    },
+}
+
+# A fetch of one REST page: (page, per_page) -> (items, has_next_page).
+PageFetcher = Callable[[int, int], Awaitable[Tuple[List[T], bool]]]
+# A fetch of one GraphQL page: (after, first) -> (items, end_cursor, has_next_page),
+# or None if GraphQL is unavailable.
+CursorFetcher = Callable[
+    [Optional[str], int],
+    Awaitable[Optional[Tuple[List[T], Optional[str], bool]]],
+]
+
+
+@dataclass(frozen=True)
+class PageRequest:
+    """Where a listing starts and how much of it to return.
+
+    REST listings are addressed by ``page`` and an ``offset`` into it, so a
+    listing can stop part-way through a page and resume there; GraphQL
+    listings are addressed by the ``after`` cursor, and ``skip`` items
+    past it when they stop part-way through a page.
+    """
+
+    limit: int
+    per_page: int
+    page: int = 1
+    offset: int = 0
+    after: Optional[str] = None
+    skip: int = 0
+    query: str = ""
+
+    @property
+    def at_start(self) -> bool:
+        """Return True if the listing starts at its first item."""
+        return self.page == 1 and self.offset == 0 and self.after is None
+
+    def cursor(self, **position: Any) -> str:
+        """Encode the continuation token for ``position``."""
+        state = replace(self, **position)
+        token: Dict[str, Any] = {
+            "q": state.query,
+            "l": state.limit,
+            "n": state.per_page,
+        }
+        if state.after is not None:
+            token["a"] = state.after
+            if state.skip:
+                token["s"] = state.skip
+        else:
+            token["p"] = state.page
+            token["o"] = state.offset
+        encoded = json.dumps(token, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(encoded).decode().rstrip("=")
+
+
+@dataclass
+class Page(Generic[T]):
+    """Items of one upstream page and the cursor of the item after them.
+
+    ``next_cursor`` is None on the last page of an exhausted listing.
+    ``item_cursor``, where the listing can resume mid-page, returns the
+    cursor of the page's i-th item.
+    """
+
+    items: List[T]
+    next_cursor: Optional[str]
+    item_cursor: Optional[Callable[[int], str]] = None
+
+
+def _fingerprint(query: Mapping[str, Any]) -> str:
+    """Short hash of the filters a cursor was issued for."""
+    encoded = json.dumps(query, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()[:12]
+
+
+def _positive(parameters: Mapping[str, Any], name: str) -> Optional[int]:
+    value = parameters.get(name)
+    if value is None:
+        return None
+    value = int(value)
+    if value < 1:
+        raise ValueError(f"'{name}' must be at least 1")
+    return value
+
+
+def parse_page_request(
+    parameters: Mapping[str, Any],
+    query: Mapping[str, Any],
+    default_limit: int = DEFAULT_LIMIT,
+) -> PageRequest:
+    """Build the page request for a list tool call.
+
+    ``query`` holds the call's filters; a cursor is only accepted by a call
+    with the same filters. The page size is fixed by the cursor so its page
+    arithmetic stays valid, while ``limit`` may change between calls.
+    """
+    fingerprint = _fingerprint(query)
+    limit = _positive(parameters, "limit")
+    cursor = parameters.get("cursor")
+    if cursor:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            token = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            request = PageRequest(
+                limit=limit or int(token["l"]),
+                per_page=int(token["n"]),
+                page=int(token.get("p", 1)),
+                offset=int(token.get("o", 0)),
+                after=token.get("a"),
+                skip=int(token.get("s", 0)),
+                query=str(token["q"]),
+            )
+        except (ValueError, KeyError, TypeError):
+            raise ValueError("Invalid cursor")
+        if request.query != fingerprint:
+            raise ValueError("Cursor was issued for different parameters")
+        return request
+
+    limit = limit or default_limit
+    per_page = _positive(parameters, "per_page") or min(limit, MAX_PER_PAGE)
+    if per_page > MAX_PER_PAGE:
+        raise ValueError(f"'per_page' must be at most {MAX_PER_PAGE}")
+    return PageRequest(
+        limit=limit,
+        per_page=per_page,
+        page=_positive(parameters, "page") or 1,
+        query=fingerprint,
+    )
+
+
+def slice_page(items: Sequence[T], request: PageRequest) -> Page[T]:
+    """Cut the requested page out of a listing that is already in memory."""
+    start = (request.page - 1) * request.per_page + request.offset
+    end = start + request.limit
+
+    def cursor_at(position: int) -> str:
+        return request.cursor(
+            page=1 + position // request.per_page,
+            offset=position % request.per_page,
+        )
+
+    def item_cursor(index: int) -> str:
+        return cursor_at(start + index)
+
+    if end >= len(items):
+        return Page(list(items[start:]), None, item_cursor)
+    return Page(list(items[start:end]), cursor_at(end), item_cursor)
+
+
+def has_next_page(link: Optional[str]) -> bool:
+    """Return True if a ``Link`` header points at a next page."""
+    return link is not None and 'rel="next"' in link
+
+
+async def iter_pages(
+    fetch_page: PageFetcher[T],
+    request: PageRequest,
+) -> AsyncIterator[Page[T]]:
+    """Yield the REST pages covering ``request`` in order.
+
+    Up to ``MAX_PAGES_IN_FLIGHT`` pages are fetched ahead concurrently, so
+    a long listing neither waits on each round-trip in turn nor holds more
+    than a few pages in memory.
+    """
+    last = request.page + (request.offset + request.limit - 1) // request.per_page
+    scheduled = request.page
+    pending: Deque["asyncio.Future[Tuple[List[T], bool]]"] = deque()
+    number = request.page
+    offset = request.offset
+    remaining = request.limit
+    try:
+        while remaining > 0:
+            while scheduled <= last and len(pending) < MAX_PAGES_IN_FLIGHT:
+                pending.append(
+                    asyncio.ensure_future(fetch_page(scheduled, request.per_page))
+                )
+                scheduled += 1
+            items, has_next = await pending.popleft()
+            chunk = items[offset:offset + remaining]
+            end = offset + len(chunk)
+            remaining -= len(chunk)
+            if end < len(items):
+                next_cursor: Optional[str] = request.cursor(page=number, offset=end)
+            elif has_next:
+                next_cursor = request.cursor(page=number + 1, offset=0)
+            else:
+                next_cursor = None
+            item_cursor = partial(_rest_item_cursor, request, number, offset)
+            yield Page(chunk, next_cursor, item_cursor)
+            if next_cursor is None:
+                return
+            number += 1
+            offset = 0
+    finally:
+        for future in pending:
+            future.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def iter_cursor_pages(
+    fetch_page: CursorFetcher[T],
+    request: PageRequest,
+    fallback: Optional[Callable[[], AsyncIterator[Page[T]]]] = None,
+) -> AsyncIterator[Page[T]]:
+    """Yield GraphQL pages from ``request.after`` until the limit is reached.
+
+    Each page asks for no more than the items still wanted, so the end
+    cursor always sits right after the last returned item. If GraphQL is
+    unavailable for the first page the listing continues from ``fallback``.
+    """
+    after = request.after
+    skip = request.skip
+    remaining = request.limit
+    while remaining > 0:
+        result = await fetch_page(after, min(request.per_page, remaining + skip))
+        if result is None:
+            if after is not None or fallback is None:
+                raise ValueError("GraphQL is unavailable; cannot resume this cursor")
+            async for page in fallback():
+                yield page
+            return
+        items, end_cursor, has_next = result
+        item_cursor = partial(_graphql_item_cursor, request, after, skip)
+        items = items[skip:]
+        remaining -= len(items)
+        done = not has_next or not items
+        next_cursor = None if done else request.cursor(after=end_cursor, skip=0)
+        yield Page(items, next_cursor, item_cursor)
+        if done:
+            return
+        after = end_cursor
+        skip = 0
+
+
+def _rest_item_cursor(request: PageRequest, page: int, offset: int, index: int) -> str:
+    """Cursor of the item ``index`` items into a REST page chunk."""
+    return request.cursor(page=page, offset=offset + index)
+
+
+def _graphql_item_cursor(
+    request: PageRequest,
+    after: Optional[str],
+    skip: int,
+    index: int,
+) -> str:
+    """Cursor of the item ``skip + index`` items past ``after``."""
+    if after is None:
+        # The first page has no cursor before it; address it as REST does.
+        return request.cursor(page=1, offset=skip + index, after=None)
+    return request.cursor(after=after, skip=skip + index)
+
+
+async def collect_pages(pages: AsyncIterator[Page[T]]) -> Tuple[List[T], Optional[str]]:
+    """Gather every page of a listing and the cursor that follows it."""
+    items: List[T] = []
+    next_cursor = None
+    async for page in pages:
+        items.extend(page.items)
+        next_cursor = page.next_cursor
+    return items, next_cursor
+
+
+def fetch_github_page(
+    requester: "Requester",
+    content_class: Type[G],
+    url: str,
+    parameters: Mapping[str, Any],
+    page: int,
+    per_page: int,
+) -> Tuple[List[G], bool]:
+    """Fetch one page of a PyGithub listing.
+
+    Builds the objects the way ``PaginatedList`` does, but requests exactly
+    ``page`` and ``per_page`` and reports whether GitHub links a next page.
+    """
+    headers, data = requester.requestJsonAndCheck(
+        "GET",
+        url,
+        parameters={**parameters, "page": page, "per_page": per_page},
+    )
+    items = [content_class(requester, headers, element) for element in data]
+    return items, has_next_page(headers.get("link"))
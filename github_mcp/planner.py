@@ -0,0 +1,77 @@
+"""Plan the GitHub requests a tool call needs for the fields it returns."""
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+# Pull request fields in output order.
+PULL_REQUEST_FIELDS: Tuple[str, ...] = (
+    "number",
+    "title",
+    "state",
+    "url",
+    "body",
+    "created_at",
+    "updated_at",
+    "closed_at",
+    "merged_at",
+    "head",
+    "base",
+    "author",
+    "assignees",
+    "labels",
+    "comments",
+    "review_comments",
+    "commits",
+    "additions",
+    "deletions",
+    "changed_files",
+    "draft",
+    "mergeable",
+    "mergeable_state",
+)
+
+# Pull request fields missing from the list-pulls payload. Reading any of
+# them costs one extra GET of the full pull request.
+PULL_REQUEST_DETAIL_FIELDS: Tuple[str, ...] = (
+    "comments",
+    "review_comments",
+    "commits",
+    "additions",
+    "deletions",
+    "changed_files",
+    "mergeable",
+    "mergeable_state",
+)
+
+
+@dataclass(frozen=True)
+class FetchPlan:
+    """Fields to return and whether per-item detail fetches are needed."""
+
+    fields: Tuple[str, ...]
+    needs_detail: bool
+
+
+def plan_fields(
+    requested: Optional[Sequence[str]],
+    available: Sequence[str],
+    detail: Sequence[str],
+) -> FetchPlan:
+    """Plan a listing for the requested fields.
+
+    With no explicit request only the fields served by the list payload are
+    returned, so the listing costs a single request. Requesting ``"*"``
+    selects every available field.
+    """
+    if not requested:
+        fields = tuple(name for name in available if name not in detail)
+    elif "*" in requested:
+        fields = tuple(available)
+    else:
+        unknown = sorted(set(requested) - set(available))
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        fields = tuple(name for name in available if name in requested)
+    return FetchPlan(
+        fields=fields,
+        needs_detail=any(name in detail for name in fields),
+    )
@@ -0,0 +1,287 @@
+"""Rate-limit-aware request scheduling shared by both client backends."""
+import random
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from email.utils import parsedate_to_datetime
+from types import ModuleType
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from github_mcp.config import Settings, get_settings
+from github_mcp.context import current_credential
+
+# Statuses retried for reads; GitHub returns them for transient failures.
+RETRY_STATUSES = frozenset((500, 502, 503, 504))
+# Requests a paced resource may still burst before reads are spaced out.
+BURST = 5
+
+
+class RateLimitExceeded(Exception):
+    """GitHub's rate limit would not allow a request within the wait budget."""
+
+    def __init__(self, retry_after: float, resource: str = "core") -> None:
+        super().__init__(
+            f"GitHub rate limit exceeded for '{resource}'; retry in {retry_after:.0f}s"
+        )
+        self.retry_after = retry_after
+        self.resource = resource
+
+
+@dataclass
+class Quota:
+    """Last reported state of one rate-limit resource."""
+
+    limit: int
+    remaining: int
+    used: int
+    reset: float
+
+
+def resource_for(path: str) -> str:
+    """Rate-limit resource a request path is counted against."""
+    if path.rstrip("/").endswith("/graphql"):
+        return "graphql"
+    if "/search/" in path:
+        return "search"
+    return "core"
+
+
+def retry_after_seconds(headers: Mapping[str, str], now: float) -> Optional[float]:
+    """Parse a ``Retry-After`` header given in seconds or as an HTTP date."""
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - now, 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_rate_limited(status: int, headers: Mapping[str, str]) -> bool:
+    """Return True if a response was refused by a primary or secondary rate limit."""
+    if status == 429:
+        return True
+    return status == 403 and (
+        bool(headers.get("retry-after")) or headers.get("x-ratelimit-remaining") == "0"
+    )
+
+
+def _loaded_pygithub() -> Optional[ModuleType]:
+    """The ``github`` package if a PyGithub client has been created, else None.
+
+    :func:`github_mcp.clients.create_client` imports PyGithub only when its
+    backend is used; if it is not loaded, none of its errors can be raised.
+    """
+    return sys.modules.get("github")
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Return True for a rate-limit refusal raised by either backend."""
+    if isinstance(error, RateLimitExceeded):
+        return True
+    github = _loaded_pygithub()
+    return github is not None and isinstance(error, github.RateLimitExceededException)
+
+
+class RateLimiter:
+    """Schedules GitHub requests around the rate limits they report.
+
+    Every response's ``X-RateLimit-*`` headers update the quota of its
+    resource. While a resource has plenty of quota requests go straight
+    through; once it falls below ``reserve`` of its limit, reads draw from
+    a token bucket that spreads the remaining quota evenly until the
+    reset, so writes (which are not delayed) still have room. An
+    exhausted quota or a ``Retry-After`` holds every request back.
+
+    Failed requests are retried with jittered exponential backoff: rate
+    limit responses (``429``, or ``403`` with an exhausted quota or a
+    ``Retry-After``) always, server errors only for reads. Waits longer
+    than ``max_wait`` raise :class:`RateLimitExceeded` instead of
+    blocking the caller.
+    """
+
+    def __init__(
+        self,
+        retries: int = 3,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        reserve: float = 0.1,
+        max_wait: float = 60.0,
+        clock: Callable[[], float] = time.time,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self._clock = clock
+        self._rng = rng
+        self._lock = threading.Lock()
+        self._quotas: Dict[str, Quota] = {}
+        self._tokens: Dict[str, float] = {}
+        self._refilled: Dict[str, float] = {}
+        self._blocked_until = 0.0
+        self.throttled = 0
+        self.waited = 0.0
+        self.retried = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "RateLimiter":
+        """Build a limiter from the rate-limit settings."""
+        return cls(
+            retries=settings.rate_limit_retries,
+            backoff=settings.rate_limit_backoff,
+            max_backoff=settings.rate_limit_max_backoff,
+            reserve=settings.rate_limit_reserve,
+            max_wait=settings.rate_limit_max_wait,
+        )
+
+    def observe(self, status: int, headers: Mapping[str, str]) -> None:
+        """Record the quota and any back-off a response reports."""
+        now = self._clock()
+        with self._lock:
+            remaining = headers.get("x-ratelimit-remaining")
+            if remaining is not None:
+                resource = headers.get("x-ratelimit-resource") or "core"
+                try:
+                    self._quotas[resource] = Quota(
+                        limit=int(headers.get("x-ratelimit-limit") or 0),
+                        remaining=int(remaining),
+                        used=int(headers.get("x-ratelimit-used") or 0),
+                        reset=float(headers.get("x-ratelimit-reset") or 0),
+                    )
+                except ValueError:
+                    pass
+            retry_after = retry_after_seconds(headers, now)
+            if retry_after is not None and status in (403, 429):
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def delay(self, resource: str = "core", write: bool = False) -> float:
+        """Reserve a slot for a request and return how long to wait for it.
+
+        Raises :class:`RateLimitExceeded` if the wait exceeds ``max_wait``.
+        """
+        now = self._clock()
+        with self._lock:
+            wait = max(self._blocked_until - now, 0.0)
+            quota = self._quotas.get(resource)
+            if quota is not None and quota.reset > now:
+                if quota.remaining <= 0:
+                    wait = max(wait, quota.reset - now)
+                elif quota.remaining < quota.limit * self.reserve:
+                    wait = max(wait, self._take_token(resource, quota, now, write))
+            if wait > self.max_wait:
+                self.rejected += 1
+                raise RateLimitExceeded(wait, resource)
+            if wait > 0:
+                self.throttled += 1
+                self.waited += wait
+            return wait
+
+    def _take_token(
+        self, resource: str, quota: Quota, now: float, write: bool
+    ) -> float:
+        """Draw from the resource's bucket; return the wait for a read."""
+        rate = quota.remaining / (quota.reset - now)
+        tokens = self._tokens.get(resource, float(BURST))
+        elapsed = now - self._refilled.get(resource, now)
+        tokens = min(float(BURST), tokens + elapsed * rate) - 1
+        self._tokens[resource] = tokens
+        self._refilled[resource] = now
+        if write or tokens >= 0:
+            return 0.0
+        # The debt is repaid at ``rate``; this request waits its turn.
+        return -tokens / rate
+
+    def backoff_delay(
+        self,
+        attempt: int,
+        status: int,
+        headers: Mapping[str, str],
+        write: bool = False,
+    ) -> Optional[float]:
+        """Return how long to wait before retrying a response, or None to give up."""
+        if attempt >= self.retries:
+            return None
+        if not is_rate_limited(status, headers) and (
+            write or status not in RETRY_STATUSES
+        ):
+            return None
+        now = self._clock()
+        retry_after = retry_after_seconds(headers, now)
+
+        ceiling: float = min(self.max_backoff, self.backoff * 2 ** attempt)
+        delay = ceiling / 2 + self._rng() * ceiling / 2
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        elif headers.get("x-ratelimit-remaining") == "0":
+            try:
+                delay = max(delay, float(headers.get("x-ratelimit-reset") or 0) - now)
+            except ValueError:
+                pass
+        if delay > self.max_wait:
+            return None
+        with self._lock:
+            self.retried += 1
+            self.waited += delay
+        return delay
+
+    def retry_after(self, resource: str = "core") -> float:
+        """Seconds until a resource is expected to accept requests again."""
+        now = self._clock()
+        with self._lock:
+            wait = self._blocked_until - now
+            quota = self._quotas.get(resource)
+            if quota is not None and quota.remaining <= 0:
+                wait = max(wait, quota.reset - now)
+            return max(wait, 0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-resource quotas and scheduling counters."""
+        now = self._clock()
+        with self._lock:
+            return {
+                "resources": {
+                    resource: {**asdict(quota), "reset_in": max(quota.reset - now, 0.0)}
+                    for resource, quota in self._quotas.items()
+                },
+                "blocked_for": max(self._blocked_until - now, 0.0),
+                "throttled": self.throttled,
+                "retried": self.retried,
+                "rejected": self.rejected,
+                "waited_seconds": round(self.waited, 3),
+            }
+
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(credential: Optional[str] = None) -> RateLimiter:
+    """Return the rate limiter of a credential, by default the current call's.
+
+    GitHub counts quota per token, so each credential is scheduled on its own.
+    """
+    if credential is None:
+        credential = current_credential.get()
+    limiter = _rate_limiters.get(credential)
+    if limiter is None:
+        with _rate_limiters_lock:
+            limiter = _rate_limiters.get(credential)
+            if limiter is None:
+                limiter = RateLimiter.from_settings(get_settings())
+                _rate_limiters[credential] = limiter
+    return limiter
+
+
+def forget_rate_limiter(credential: str) -> None:
+    """Drop what is known about a credential's quota once its client is gone."""
+    with _rate_limiters_lock:
+        _rate_limiters.pop(credential, None)
@@ -0,0 +1,362 @@
+"""Conditional-request (ETag / Last-Modified) cache for GitHub GET responses."""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Mapping, Optional
+
+from github_mcp.config import Settings, get_settings
+from github_mcp.context import current_tool
+from github_mcp.metrics import record_cache_hit
+from github_mcp.shared_store import TOUCH_INTERVAL
+
+# Headers that describe the 304 itself rather than the cached body.
+_VOLATILE_HEADERS = {"content-length", "content-encoding", "transfer-encoding"}
+
+
+@dataclass
+class CachedResponse:
+    """A stored response body with its validators."""
+
+    body: bytes
+    headers: Dict[str, str]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Request headers that revalidate this response."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def revalidated(self, headers: Mapping[str, str]) -> "CachedResponse":
+        """Return this response with headers refreshed from a ``304``."""
+        fresh = {
+            name.lower(): value
+            for name, value in headers.items()
+            if name.lower() not in _VOLATILE_HEADERS
+        }
+        return CachedResponse(
+            body=self.body,
+            headers={**self.headers, **fresh},
+            etag=fresh.get("etag", self.etag),
+            last_modified=fresh.get("last-modified", self.last_modified),
+        )
+
+
+class ResponseStorage(ABC):
+    """Storage backend interface for :class:`ResponseCache`."""
+
+    name = "base"
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Return the response stored under ``key``, if any."""
+
+    @abstractmethod
+    def set(self, key: str, response: CachedResponse) -> None:
+        """Store ``response`` under ``key``, evicting as needed."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove the response stored under ``key``."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every stored response."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of stored responses."""
+
+
+class MemoryStorage(ResponseStorage):
+    """In-process LRU storage bounded by entry count and total body size."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._total = 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+            return response
+
+    def set(self, key: str, response: CachedResponse) -> None:
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total -= len(previous.body)
+            self._entries[key] = response
+            self._total += len(response.body)
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._total > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._total -= len(evicted.body)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            response = self._entries.pop(key, None)
+            if response is not None:
+                self._total -= len(response.body)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteStorage(ResponseStorage):
+    """On-disk SQLite storage with approximately least-recently-used eviction."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, max_entries: int) -> None:
+        path = os.path.expanduser(path)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " headers TEXT NOT NULL,"
+            " body BLOB NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at"
+            " ON responses (accessed_at)"
+        )
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, headers, body, accessed_at"
+                " FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            etag, last_modified, headers, body, accessed_at = row
+            if now - accessed_at >= TOUCH_INTERVAL:
+                self._db.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                    (now, key),
+                )
+                self._db.commit()
+        return CachedResponse(
+            body=bytes(body),
+            headers=json.loads(headers),
+            etag=etag,
+            last_modified=last_modified,
+        )
+
+    def set(self, key: str, response: CachedResponse) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (key, etag, last_modified, headers, body, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response.etag,
+                    response.last_modified,
+                    json.dumps(response.headers),
+                    response.body,
+                    time.time(),
+                ),
+            )
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY accessed_at DESC"
+                " LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._db.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0])
+
+
+@dataclass
+class ToolCacheStats:
+    """Conditional-request counters for a single tool."""
+
+    requests: int = 0
+    hits: int = 0
+    misses: int = 0
+    bytes_saved: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Counters plus the hit ratio."""
+        return {
+            **asdict(self),
+            "hit_ratio": self.hits / self.requests if self.requests else 0.0,
+        }
+
+
+class ResponseCache:
+    """Store GET responses with their validators and revalidate them.
+
+    Backends call :meth:`lookup` before a GET and send the returned
+    entry's conditional headers. A ``304 Not Modified`` is answered from
+    the stored body via :meth:`revalidated`, and does not count against
+    GitHub's rate limit; any other cacheable response goes to :meth:`store`.
+    """
+
+    def __init__(self, storage: ResponseStorage) -> None:
+        self.storage = storage
+        self._tools: Dict[str, ToolCacheStats] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, authorization: Optional[str] = None) -> str:
+        """Cache key for a URL as seen by one credential."""
+        credential = hashlib.sha256((authorization or "").encode()).hexdigest()[:16]
+        return f"{credential}:{url}"
+
+    def lookup(self, key: str) -> Optional[CachedResponse]:
+        """Return the stored response for ``key``, if any."""
+        return self.storage.get(key)
+
+    def store(
+        self,
+        key: str,
+        body: bytes,
+        headers: Mapping[str, str],
+    ) -> None:
+        """Store a ``200`` response if it carries a validator."""
+        headers = {name.lower(): value for name, value in headers.items()}
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        self._record(hit=False)
+        if etag or last_modified:
+            self.storage.set(
+                key,
+                CachedResponse(
+                    body=body,
+                    headers={
+                        name: value
+                        for name, value in headers.items()
+                        if name not in _VOLATILE_HEADERS
+                    },
+                    etag=etag,
+                    last_modified=last_modified,
+                ),
+            )
+
+    def revalidated(
+        self,
+        key: str,
+        cached: CachedResponse,
+        headers: Mapping[str, str],
+    ) -> CachedResponse:
+        """Record a ``304`` for ``key`` and return the refreshed entry."""
+        response = cached.revalidated(headers)
+        self.storage.set(key, response)
+        self._record(hit=True, bytes_saved=len(cached.body))
+        return response
+
+    def invalidate(self, key: str) -> None:
+        """Drop a stored response."""
+        self.storage.delete(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-tool hit ratio and bytes saved."""
+        with self._lock:
+            tools = {name: stats.as_dict() for name, stats in self._tools.items()}
+        return {
+            "storage": self.storage.name,
+            "entries": len(self.storage),
+            "tools": tools,
+        }
+
+    def _record(self, hit: bool, bytes_saved: int = 0) -> None:
+        tool = current_tool.get() or "unknown"
+        with self._lock:
+            stats = self._tools.setdefault(tool, ToolCacheStats())
+            stats.requests += 1
+            if hit:
+                stats.hits += 1
+                stats.bytes_saved += bytes_saved
+            else:
+                stats.misses += 1
+        if hit:
+            record_cache_hit("response")
+
+
+def create_response_cache(settings: Settings) -> Optional[ResponseCache]:
+    """Build the response cache selected by ``settings``, or None if disabled."""
+    if settings.response_cache == "none":
+        return None
+    if settings.shared_cache_path:
+        # Workers share one store, so a response cached by one revalidates in all.
+        return ResponseCache(
+            SQLiteStorage(settings.shared_cache_path, settings.response_cache_size)
+        )
+    if settings.response_cache == "memory":
+        return ResponseCache(
+            MemoryStorage(
+                settings.response_cache_size, settings.response_cache_max_bytes
+            )
+        )
+    if settings.response_cache == "sqlite":
+        return ResponseCache(
+            SQLiteStorage(settings.response_cache_path, settings.response_cache_size)
+        )
+    raise ValueError(f"Unknown response cache storage: {settings.response_cache}")
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+_response_cache_created = False
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the process-wide response cache, or None if it is disabled."""
+    global _response_cache, _response_cache_created
+    if not _response_cache_created:
+        with _response_cache_lock:
+            if not _response_cache_created:
+                _response_cache = create_response_cache(get_settings())
+                _response_cache_created = True
+    return _response_cache
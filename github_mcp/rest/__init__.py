@@ -0,0 +1,4 @@
+"""Native async GitHub REST backend built on httpx."""
+from github_mcp.rest.client import AsyncGitHubClient, GitHubAPIError
+
+__all__ = ["AsyncGitHubClient", "GitHubAPIError"]
@@ -0,0 +1,293 @@
+"""Pooled async GitHub REST client."""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+
+from github_mcp.config import Settings
+from github_mcp.metrics import record_upstream
+from github_mcp.pagination import has_next_page
+from github_mcp.rate_limit import (
+    RateLimiter,
+    RateLimitExceeded,
+    is_rate_limited,
+    resource_for,
+)
+from github_mcp.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+GITHUB_MEDIA_TYPE = "application/vnd.github+json"
+GITHUB_API_VERSION = "2022-11-28"
+
+
+def _http2_available() -> bool:
+    """Return True if the optional ``h2`` package is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class GitHubAPIError(Exception):
+    """Error response returned by the GitHub API."""
+
+    def __init__(self, status_code: int, message: str) -> None:
+        super().__init__(f"{status_code}: {message}")
+        self.status_code = status_code
+        self.message = message
+
+
+class AsyncGitHubClient:
+    """GitHub REST client sharing one keep-alive ``httpx.AsyncClient``.
+
+    A single instance is meant to serve every tool call in the process, so
+    connections (and HTTP/2 streams, when ``h2`` is installed) are reused
+    across concurrent requests instead of being opened per call.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        settings: Settings,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        response_cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> None:
+        http2 = settings.http2 and _http2_available()
+        if settings.http2 and not http2:
+            logger.warning("HTTP/2 requested but 'h2' is not installed; using HTTP/1.1")
+        self.base_url = settings.api_url
+        self.response_cache = response_cache
+        self.rate_limiter = rate_limiter
+        self.graphql_url = settings.graphql_url
+        self._client = httpx.AsyncClient(
+            base_url=settings.api_url,
+            headers={
+                "Accept": GITHUB_MEDIA_TYPE,
+                "Authorization": f"Bearer {token}",
+                "User-Agent": "github-mcp",
+                "X-GitHub-Api-Version": GITHUB_API_VERSION,
+            },
+            http2=http2,
+            timeout=settings.http_timeout,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+                keepalive_expiry=settings.http_keepalive_expiry,
+            ),
+            transport=transport,
+            event_hooks=(
+                {"response": [self._observe]} if rate_limiter is not None else None
+            ),
+        )
+
+    async def _observe(self, response: httpx.Response) -> None:
+        """Feed every response's rate-limit headers to the scheduler."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.observe(response.status_code, response.headers)
+
+    async def _throttle(self, resource: str, write: bool) -> None:
+        """Wait for the rate-limit scheduler to admit a request."""
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.delay(resource, write)
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+    async def _backoff(
+        self, attempt: int, response: httpx.Response, write: bool
+    ) -> bool:
+        """Wait before retrying a failed response; return False to give up."""
+        if self.rate_limiter is None or response.status_code < 400:
+            return False
+        delay = self.rate_limiter.backoff_delay(
+            attempt,
+            response.status_code,
+            response.headers,
+            write,
+        )
+        if delay is None:
+            return False
+        logger.warning(
+            f"GitHub returned {response.status_code}; retrying in {delay:.1f}s"
+        )
+        await asyncio.sleep(delay)
+        return True
+
+    def _raise_for_status(self, response: httpx.Response, resource: str) -> None:
+        """Raise for an error response that was not (or no longer) retried."""
+        if self.rate_limiter is not None and is_rate_limited(
+            response.status_code, response.headers
+        ):
+            raise RateLimitExceeded(self.rate_limiter.retry_after(resource), resource)
+        raise GitHubAPIError(response.status_code, _error_message(response))
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Any] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.Response:
+        """Send a request and raise :class:`GitHubAPIError` on error statuses.
+
+        GETs are revalidated against the response cache, so an unchanged
+        resource costs a ``304`` instead of a full, rate-limited response.
+        With a rate limiter, requests wait for quota, failures are retried
+        with backoff, and a final rate-limit refusal raises
+        :class:`RateLimitExceeded`.
+        """
+        resource = resource_for(path)
+        write = method != "GET" and resource != "graphql"
+        cache = self.response_cache if method == "GET" and not headers else None
+        attempt = 0
+        while True:
+            await self._throttle(resource, write)
+            if cache is None:
+                started = time.perf_counter()
+                response = await self._client.request(
+                    method,
+                    path,
+                    params=params,
+                    json=json,
+                    headers=headers,
+                )
+                _record(response, started, len(response.content))
+            else:
+                response = await self._cached_get(cache, path, params)
+            if not await self._backoff(attempt, response, write):
+                break
+            attempt += 1
+        if response.status_code >= 400:
+            self._raise_for_status(response, resource)
+        return response
+
+    async def _cached_get(
+        self,
+        cache: ResponseCache,
+        path: str,
+        params: Optional[Dict[str, Any]],
+    ) -> httpx.Response:
+        """GET through the response cache with a conditional request."""
+        request = self._client.build_request("GET", path, params=params)
+        key = cache.key(str(request.url), request.headers.get("Authorization"))
+        cached = cache.lookup(key)
+        if cached is not None:
+            request.headers.update(cached.conditional_headers())
+
+        started = time.perf_counter()
+        response = await self._client.send(request)
+        _record(response, started, len(response.content))
+        if response.status_code == 304 and cached is not None:
+            cached = cache.revalidated(key, cached, response.headers)
+            return httpx.Response(
+                200,
+                headers=cached.headers,
+                content=cached.body,
+                request=request,
+            )
+        if response.status_code == 200:
+            cache.store(key, response.content, response.headers)
+        return response
+
+    async def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """GET a path and return the decoded JSON body."""
+        response = await self.request("GET", path, params=params)
+        return response.json()
+
+    async def get_page(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        page: int,
+        per_page: int,
+    ) -> Tuple[List[Any], bool]:
+        """GET one page of a listing and report whether a next page exists."""
+        response = await self.request(
+            "GET",
+            path,
+            params={**params, "page": page, "per_page": per_page},
+        )
+        return response.json(), has_next_page(response.headers.get("link"))
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        path: str,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> AsyncIterator[httpx.Response]:
+        """GET a path without reading its body, following redirects.
+
+        For archive and raw blob downloads. GitHub redirects archives to a
+        pre-authorised URL on another host, to which the token is not
+        forwarded.
+        """
+        resource = resource_for(path)
+        attempt = 0
+        while True:
+            await self._throttle(resource, False)
+            started = time.perf_counter()
+            async with self._client.stream(
+                "GET",
+                path,
+                headers=headers,
+                follow_redirects=True,
+            ) as response:
+                try:
+                    if response.status_code < 400:
+                        yield response
+                        return
+                    await response.aread()
+                finally:
+                    # Recorded once the caller has read what it needed.
+                    _record(response, started, response.num_bytes_downloaded)
+                if not await self._backoff(attempt, response, False):
+                    self._raise_for_status(response, resource)
+            attempt += 1
+
+    async def post_json(self, path: str, payload: Dict[str, Any]) -> Any:
+        """POST a JSON payload and return the decoded JSON body."""
+        response = await self.request("POST", path, json=payload)
+        return response.json()
+
+    async def graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a GraphQL query and return the full response document."""
+        data: Dict[str, Any] = await self.post_json(
+            self.graphql_url,
+            {"query": query, "variables": variables},
+        )
+        if data.get("errors"):
+            messages = "; ".join(error.get("message", "") for error in data["errors"])
+            raise GitHubAPIError(400, messages)
+        return data
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self._client.aclose()
+
+
+def _record(response: httpx.Response, started: float, size: int) -> None:
+    """Record a response, ``size`` bytes of body, for the call that sent it."""
+    record_upstream(
+        response.request.method,
+        str(response.request.url),
+        response.status_code,
+        size,
+        started,
+    )
+
+
+def _error_message(response: httpx.Response) -> str:
+    """Extract the error message from a GitHub error response."""
+    try:
+        data = response.json()
+    except ValueError:
+        return response.text
+    if isinstance(data, dict) and "message" in data:
+        return str(data["message"])
+    return response.text
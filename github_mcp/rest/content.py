@@ -0,0 +1,319 @@
+"""Content-related tools on the async REST backend."""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, BinaryIO, Dict, Optional, Tuple, cast
+from urllib.parse import quote
+
+from github_mcp.blob_store import (
+    decode_file,
+    get_path_index,
+    lookup_file,
+    record_listing,
+)
+from github_mcp.budget import (
+    OutputBudget,
+    cap_range,
+    cap_slice,
+    collect_within_budget,
+    file_summary,
+)
+from github_mcp.file_batch import (
+    ArchiveOpener,
+    AsyncByteReader,
+    BlobFetcher,
+    is_glob,
+    iter_files,
+    select_paths,
+)
+from github_mcp.file_ranges import (
+    CHUNK_SIZE,
+    RAW_MEDIA_TYPE,
+    FileRange,
+    FileSlice,
+    aslice_chunks,
+    needs_raw,
+    parse_file_range,
+    render_file,
+    slice_chunks,
+    slice_stored,
+)
+from github_mcp.models import ToolResult
+from github_mcp.pagination import Page
+from github_mcp.rest.client import AsyncGitHubClient
+from github_mcp.search_index import search_tree
+from github_mcp.serializers import text_result
+from github_mcp.trees import (
+    TreeIndex,
+    get_tree_cache,
+    tree_listing,
+    tree_path,
+    warm_directory,
+)
+
+async def _get_contents(
+    client: AsyncGitHubClient,
+    parameters: Dict[str, Any],
+    path: str,
+) -> Any:
+    """Fetch the contents API payload for a path."""
+    owner = parameters["owner"]
+    repo = parameters["repo"]
+    ref = parameters.get("ref")
+    params = {"ref": ref} if ref else None
+    return await client.get_json(
+        f"/repos/{owner}/{repo}/contents/{quote(path.strip('/'))}",
+        params=params,
+    )
+
+async def _get_file(
+    client: AsyncGitHubClient,
+    parameters: Dict[str, Any],
+    path: str,
+) -> Tuple[Dict[str, Any], Optional[str]]:
+    """Fetch a file's contents API metadata and its base64 content, if inlined."""
+    file_content = await _get_contents(client, parameters, path)
+
+    if isinstance(file_content, list):
+        raise ValueError(f"Path '{path}' is a directory, not a file")
+
+    metadata = {
+        "name": file_content["name"],
+        "path": file_content["path"],
+        "sha": file_content["sha"],
+        "size": file_content["size"],
+        "url": file_content["html_url"],
+        "download_url": file_content["download_url"],
+        "type": file_content["type"],
+        "encoding": file_content.get("encoding"),
+    }
+    return metadata, file_content.get("content")
+
+async def _read_file(
+    client: AsyncGitHubClient,
+    parameters: Dict[str, Any],
+    metadata: Dict[str, Any],
+    encoded: Optional[str],
+    file_range: FileRange,
+) -> FileSlice:
+    """Read a range of a file from its inlined content, the blob store or a download."""
+    owner = parameters["owner"]
+    repo = parameters["repo"]
+    ref = parameters.get("ref")
+    sha = metadata["sha"]
+    size = metadata["size"]
+    if not needs_raw(metadata):
+        data = decode_file(owner, repo, ref, metadata, encoded)
+        return slice_chunks([data], sha, len(data), file_range)
+
+    get_path_index().put(owner, repo, ref, metadata)
+    file_slice = slice_stored(sha, size, file_range)
+    if file_slice is not None:
+        return file_slice
+    # The contents API leaves out files over 1 MB; stream the raw blob instead.
+    async with client.stream(
+        f"/repos/{owner}/{repo}/git/blobs/{sha}",
+        headers={"Accept": RAW_MEDIA_TYPE},
+    ) as response:
+        return await aslice_chunks(
+            response.aiter_bytes(CHUNK_SIZE), sha, size, file_range
+        )
+
+async def _fetch_file(
+    client: AsyncGitHubClient,
+    parameters: Dict[str, Any],
+    path: str,
+) -> Tuple[Dict[str, Any], bytes]:
+    """Fetch a file's contents API metadata and bytes."""
+    metadata, encoded = await _get_file(client, parameters, path)
+    file_slice = await _read_file(client, parameters, metadata, encoded, FileRange())
+    return metadata, file_slice.data
+
+async def _load_tree(
+    client: AsyncGitHubClient,
+    owner: str,
+    repo: str,
+    ref: Optional[str],
+) -> Tuple[TreeIndex, str]:
+    """Fetch the recursive tree of ``ref`` into the tree cache."""
+    resolved = ref
+    if not resolved:
+        repository = await client.get_json(f"/repos/{owner}/{repo}")
+        resolved = repository["default_branch"]
+    data = await client.get_json(
+        tree_path(owner, repo, resolved),
+        params={"recursive": "1"},
+    )
+    return get_tree_cache().store(owner, repo, ref, resolved, data), resolved
+
+async def handle_get_file_content(
+    client: AsyncGitHubClient,
+    parameters: Dict[str, Any],
+) -> ToolResult:
+    """Handle get_file_content tool call."""
+    owner = parameters["owner"]
+    repo = parameters["repo"]
+    path = parameters["path"]
+    ref = parameters.get("ref")
+
+    max_bytes = parameters.get("max_bytes")
+    file_range = cap_range(parse_file_range(parameters), max_bytes)
+
+    # A file at a commit SHA we have read before needs no request at all.
+    metadata = lookup_file(owner, repo, ref, path)
+    file_slice = None
+    if metadata is not None:
+        file_slice = slice_stored(metadata["sha"], metadata["size"], file_range)
+    if metadata is None or file_slice is None:
+        metadata, encoded = await _get_file(client, parameters, path)
+        file_slice = await _read_file(client, parameters, metadata, encoded, file_range)
+    file_slice = cap_slice(file_slice, max_bytes)
+
+    result = render_file(metadata, file_slice, file_range)
+
+    return text_result(
+        result,
+        parameters.get("fields"),
+        elided=file_summary(file_range, file_slice, max_bytes),
+    )
+
+async def handle_list_directory(
+    client: AsyncGitHubClient,
+    parameters: Dict[str, Any],
+) -> ToolResult:
+    """Handle list_directory tool call."""
+    owner = parameters["owner"]
+    repo = parameters["repo"]
+    path = parameters.get("path", "")
+    ref = parameters.get("ref")
+
+    # After get_tree, directories are listed from the path index.
+    entries = warm_directory(owner, repo, ref, path)
+    if entries is None:
+        contents = await _get_contents(client, parameters, path)
+
+        if not isinstance(contents, list):
+            contents = [contents]
+
+        entries = [{
+            "name": item["name"],
+            "path": item["path"],
+            "sha": item["sha"],
+            "size": item["size"],
+            "url": item["html_url"],
+            "download_url": item["download_url"],
+            "type": item["type"],
+            "encoding": item.get("encoding"),
+        } for item in contents]
+    record_listing(owner, repo, ref, entries)
+
+    return text_result(entries, parameters.get("fields"))
+
+async def handle_get_tree(
+    client: AsyncGitHubClient,
+    parameters: Dict[str, Any],
+) -> ToolResult:
+    """Handle get_tree tool call."""
+    owner = parameters["owner"]
+    repo = parameters["repo"]
+    ref = parameters.get("ref")
+
+    snapshot = get_tree_cache().lookup(owner, repo, ref)
+    if snapshot is None:
+        snapshot = await _load_tree(client, owner, repo, ref)
+    index, resolved = snapshot
+    budget = OutputBudget.from_parameters(parameters, text_field=None)
+    result, next_cursor = tree_listing(index, resolved, parameters, budget)
+
+    return text_result(result, next_cursor=next_cursor, elided=budget.summary())
+
+def _file_sources(
+    client: AsyncGitHubClient,
+    parameters: Dict[str, Any],
+) -> Tuple[BlobFetcher, ArchiveOpener]:
+    """Fetch single files, or open the tarball, at the call's ref."""
+    owner = parameters["owner"]
+    repo = parameters["repo"]
+    ref = parameters.get("ref")
+
+    async def fetch_blob(path: str) -> Tuple[str, bytes]:
+        metadata, content = await _fetch_file(client, parameters, path)
+        return metadata["sha"], content
+
+    @asynccontextmanager
+    async def open_archive() -> AsyncIterator[BinaryIO]:
+        path = f"/repos/{owner}/{repo}/tarball"
+        if ref:
+            path += f"/{quote(ref, safe='')}"
+        async with client.stream(path) as response:
+            reader = AsyncByteReader(
+                response.aiter_bytes(), asyncio.get_running_loop()
+            )
+            yield cast(BinaryIO, reader)
+
+    return fetch_blob, open_archive
+
+def stream_get_files(
+    client: AsyncGitHubClient,
+    parameters: Dict[str, Any],
+) -> AsyncIterator[Page[Dict[str, Any]]]:
+    """Yield get_files results file by file."""
+    owner = parameters["owner"]
+    repo = parameters["repo"]
+    ref = parameters.get("ref")
+    patterns = parameters["paths"]
+    fetch_blob, open_archive = _file_sources(client, parameters)
+
+    async def files() -> AsyncIterator[Page[Dict[str, Any]]]:
+        # Globs need the tree; a warm tree also lets cached blobs skip the API.
+        snapshot = get_tree_cache().lookup(owner, repo, ref)
+        if snapshot is None and any(is_glob(pattern) for pattern in patterns):
+            snapshot = await _load_tree(client, owner, repo, ref)
+        index = snapshot[0] if snapshot is not None else None
+        paths, next_cursor = select_paths(patterns, index, parameters)
+        async for page in iter_files(
+            paths, index, fetch_blob, open_archive, next_cursor
+        ):
+            yield page
+
+    return files()
+
+async def handle_get_files(
+    client: AsyncGitHubClient,
+    parameters: Dict[str, Any],
+) -> ToolResult:
+    """Handle get_files tool call."""
+    budget = OutputBudget.from_parameters(
+        parameters, text_field="content", droppable=False
+    )
+    files, next_cursor = await collect_within_budget(
+        stream_get_files(client, parameters), budget
+    )
+
+    return text_result(files, next_cursor=next_cursor, elided=budget.summary())
+
+async def handle_search_content(
+    client: AsyncGitHubClient,
+    parameters: Dict[str, Any],
+) -> ToolResult:
+    """Handle search_content tool call."""
+    owner = parameters["owner"]
+    repo = parameters["repo"]
+    ref = parameters.get("ref")
+
+    snapshot = get_tree_cache().lookup(owner, repo, ref)
+    if snapshot is None:
+        snapshot = await _load_tree(client, owner, repo, ref)
+    index, resolved = snapshot
+    fetch_blob, open_archive = _file_sources(client, parameters)
+    budget = OutputBudget.from_parameters(parameters, text_field="text")
+    result, next_cursor = await search_tree(
+        owner,
+        repo,
+        index,
+        resolved,
+        parameters,
+        lambda paths: iter_files(paths, index, fetch_blob, open_archive),
+        budget,
+    )
+
+    return text_result(result, next_cursor=next_cursor, elided=budget.summary())
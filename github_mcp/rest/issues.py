@@ -0,0 +1,77 @@
+"""Issue-related tools on the async REST backend."""
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from github_mcp.budget import OutputBudget, collect_within_budget
+from github_mcp.executor import run_blocking
+from github_mcp.mirror import ISSUES, local_filters, mirrored_listing, record_created
+from github_mcp.models import ToolResult
+from github_mcp.pagination import Page, iter_pages, parse_page_request
+from github_mcp.rest.client import AsyncGitHubClient
+from github_mcp.serializers import serialize_issue, text_result
+
+def stream_list_issues(
+    client: AsyncGitHubClient,
+    parameters: Dict[str, Any],
+) -> AsyncIterator[Page[Dict[str, Any]]]:
+    """Yield list_issues results page by page."""
+    owner = parameters["owner"]
+    repo = parameters["repo"]
+    state = parameters.get("state", "open")
+    labels = parameters.get("labels", [])
+    query: Dict[str, Any] = {"state": state}
+    if labels:
+        query["labels"] = ",".join(labels)
+    if parameters.get("author"):
+        query["creator"] = parameters["author"]
+    if parameters.get("assignee"):
+        query["assignee"] = parameters["assignee"]
+    page_request = parse_page_request(
+        parameters,
+        {"owner": owner, "repo": repo, **query, **local_filters(ISSUES, parameters)},
+    )
+    mirrored = mirrored_listing(ISSUES, parameters, page_request)
+    if mirrored is not None:
+        return mirrored
+
+    async def fetch_page(page: int, per_page: int) -> Tuple[List[Dict[str, Any]], bool]:
+        issues, has_next = await client.get_page(
+            f"/repos/{owner}/{repo}/issues", query, page, per_page
+        )
+        return [serialize_issue(issue) for issue in issues], has_next
+
+    return iter_pages(fetch_page, page_request)
+
+async def handle_list_issues(
+    client: AsyncGitHubClient,
+    parameters: Dict[str, Any],
+) -> ToolResult:
+    """Handle list_issues tool call."""
+    budget = OutputBudget.from_parameters(parameters)
+    issues, next_cursor = await collect_within_budget(
+        stream_list_issues(client, parameters), budget
+    )
+
+    return text_result(issues, next_cursor=next_cursor, elided=budget.summary())
+
+async def handle_create_issue(
+    client: AsyncGitHubClient,
+    parameters: Dict[str, Any],
+) -> ToolResult:
+    """Handle create_issue tool call."""
+    owner = parameters["owner"]
+    repo = parameters["repo"]
+    issue = await client.post_json(
+        f"/repos/{owner}/{repo}/issues",
+        {
+            "title": parameters["title"],
+            "body": parameters.get("body", ""),
+            "labels": parameters.get("labels", []),
+            "assignees": parameters.get("assignees", []),
+        },
+    )
+    await run_blocking(record_created, owner, repo, ISSUES, issue)
+
+    result = serialize_issue(issue)
+    del result["closed_at"], result["pull_request"]
+
+    return text_result(result, parameters.get("fields"))
@@ -0,0 +1,102 @@
+"""Pull request-related tools on the async REST backend."""
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from github_mcp.budget import OutputBudget, collect_within_budget
+from github_mcp.executor import run_blocking
+from github_mcp.mirror import (
+    MIRROR_SORTS,
+    PULLS,
+    local_filters,
+    mirrored_listing,
+    record_created,
+)
+from github_mcp.models import ToolResult
+from github_mcp.pagination import Page, iter_pages, parse_page_request
+from github_mcp.planner import (
+    PULL_REQUEST_DETAIL_FIELDS,
+    PULL_REQUEST_FIELDS,
+    plan_fields,
+)
+from github_mcp.rest.client import AsyncGitHubClient
+from github_mcp.serializers import serialize_pull_request, text_result
+
+def stream_list_pull_requests(
+    client: AsyncGitHubClient,
+    parameters: Dict[str, Any],
+) -> AsyncIterator[Page[Dict[str, Any]]]:
+    """Yield list_pull_requests results page by page."""
+    owner = parameters["owner"]
+    repo = parameters["repo"]
+    state = parameters.get("state", "open")
+    sort = parameters.get("sort", "created")
+    plan = plan_fields(
+        parameters.get("fields"),
+        PULL_REQUEST_FIELDS,
+        PULL_REQUEST_DETAIL_FIELDS,
+    )
+    query = {"state": state, "sort": sort}
+    page_request = parse_page_request(
+        parameters,
+        {"owner": owner, "repo": repo, **query, **local_filters(PULLS, parameters)},
+    )
+    mirrored = mirrored_listing(
+        PULLS,
+        parameters,
+        page_request,
+        sort,
+        plan.fields,
+        usable=not plan.needs_detail and sort in MIRROR_SORTS,
+    )
+    if mirrored is not None:
+        return mirrored
+
+    async def fetch_page(page: int, per_page: int) -> Tuple[List[Dict[str, Any]], bool]:
+        pulls, has_next = await client.get_page(
+            f"/repos/{owner}/{repo}/pulls", query, page, per_page
+        )
+        if plan.needs_detail:
+            # The list payload omits mergeability and diff stats; fetch the full
+            # pull requests concurrently rather than one after another.
+            pulls = await asyncio.gather(*(
+                client.get_json(f"/repos/{owner}/{repo}/pulls/{pr['number']}")
+                for pr in pulls
+            ))
+        return [serialize_pull_request(pr, plan.fields) for pr in pulls], has_next
+
+    return iter_pages(fetch_page, page_request)
+
+async def handle_list_pull_requests(
+    client: AsyncGitHubClient,
+    parameters: Dict[str, Any],
+) -> ToolResult:
+    """Handle list_pull_requests tool call."""
+    budget = OutputBudget.from_parameters(parameters)
+    pulls, next_cursor = await collect_within_budget(
+        stream_list_pull_requests(client, parameters), budget
+    )
+
+    return text_result(pulls, next_cursor=next_cursor, elided=budget.summary())
+
+async def handle_create_pull_request(
+    client: AsyncGitHubClient,
+    parameters: Dict[str, Any],
+) -> ToolResult:
+    """Handle create_pull_request tool call."""
+    owner = parameters["owner"]
+    repo = parameters["repo"]
+    pr = await client.post_json(
+        f"/repos/{owner}/{repo}/pulls",
+        {
+            "title": parameters["title"],
+            "body": parameters.get("body", ""),
+            "head": parameters["head"],
+            "base": parameters.get("base", "main"),
+            "draft": parameters.get("draft", False),
+        },
+    )
+    await run_blocking(record_created, owner, repo, PULLS, pr)
+    result = serialize_pull_request(pr)
+    del result["closed_at"], result["merged_at"]
+
+    return text_result(result, parameters.get("fields"))
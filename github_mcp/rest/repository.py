@@ -0,0 +1,109 @@
+"""Repository-related tools on the async REST backend."""
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from github_mcp.budget import OutputBudget, collect_within_budget
+from github_mcp.config import get_settings
+from github_mcp.graphql import (
+    GET_REPOSITORY_QUERY,
+    LIST_REPOSITORIES_QUERY,
+    list_repositories_variables,
+    repositories_from_response,
+    repositories_page_info,
+    repository_from_response,
+)
+from github_mcp.models import ToolResult
+from github_mcp.pagination import (
+    Page,
+    iter_cursor_pages,
+    iter_pages,
+    parse_page_request,
+)
+from github_mcp.rest.client import AsyncGitHubClient
+from github_mcp.serializers import (
+    serialize_repository,
+    serialize_repository_detail,
+    text_result,
+)
+
+logger = logging.getLogger(__name__)
+
+async def _graphql(
+    client: AsyncGitHubClient,
+    query: str,
+    variables: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    """Run a GraphQL query, returning None if GraphQL is disabled or fails."""
+    if not get_settings().graphql:
+        return None
+    try:
+        return await client.graphql(query, variables)
+    except Exception as e:
+        logger.warning(f"GraphQL query failed, falling back to REST: {str(e)}")
+        return None
+
+def stream_list_repositories(
+    client: AsyncGitHubClient,
+    parameters: Dict[str, Any],
+) -> AsyncIterator[Page[Dict[str, Any]]]:
+    """Yield list_repositories results page by page."""
+    visibility = parameters.get("visibility", "all")
+    sort = parameters.get("sort", "updated")
+    query = {"visibility": visibility, "sort": sort}
+    page_request = parse_page_request(parameters, query)
+
+    async def fetch_page(page: int, per_page: int) -> Tuple[List[Dict[str, Any]], bool]:
+        repos, has_next = await client.get_page("/user/repos", query, page, per_page)
+        return [serialize_repository(repo) for repo in repos], has_next
+
+    def rest_pages() -> AsyncIterator[Page[Dict[str, Any]]]:
+        return iter_pages(fetch_page, page_request)
+
+    async def fetch_graphql_page(
+        after: Optional[str],
+        first: int,
+    ) -> Optional[Tuple[List[Dict[str, Any]], Optional[str], bool]]:
+        data = await _graphql(
+            client,
+            LIST_REPOSITORIES_QUERY,
+            list_repositories_variables(visibility, sort, first, after),
+        )
+        if data is None:
+            return None
+        return (repositories_from_response(data), *repositories_page_info(data))
+
+    # GraphQL cannot seek to a page number, so page/offset positions are
+    # always served by REST.
+    if page_request.after is not None or page_request.at_start:
+        return iter_cursor_pages(fetch_graphql_page, page_request, fallback=rest_pages)
+    return rest_pages()
+
+async def handle_list_repositories(
+    client: AsyncGitHubClient,
+    parameters: Dict[str, Any],
+) -> ToolResult:
+    """Handle list_repositories tool call."""
+    budget = OutputBudget.from_parameters(parameters, text_field="description")
+    repositories, next_cursor = await collect_within_budget(
+        stream_list_repositories(client, parameters), budget
+    )
+
+    return text_result(repositories, next_cursor=next_cursor, elided=budget.summary())
+
+async def handle_get_repository(
+    client: AsyncGitHubClient,
+    parameters: Dict[str, Any],
+) -> ToolResult:
+    """Handle get_repository tool call."""
+    owner = parameters["owner"]
+    repo = parameters["repo"]
+
+    data = await _graphql(client, GET_REPOSITORY_QUERY, {"owner": owner, "name": repo})
+    if data is not None and data["data"]["repository"] is not None:
+        return text_result(repository_from_response(data), parameters.get("fields"))
+
+    repository = await client.get_json(f"/repos/{owner}/{repo}")
+
+    return text_result(
+        serialize_repository_detail(repository), parameters.get("fields")
+    )
@@ -0,0 +1,439 @@
+"""Trigram index over the files of repository trees, for search_content.
+
+Each file is indexed once per blob SHA: every lowercased three-character
+sequence of its text maps to the blobs containing it. A query is reduced
+to the trigrams any match must contain, and only blobs holding all of
+them are read, line by line. When a ref moves to a new tree, only blobs
+the index has not seen are fetched, usually from the blob store or in one
+tarball download; unchanged files are reused as they are.
+"""
+import asyncio
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Set,
+    Tuple,
+)
+
+from github_mcp.budget import OutputBudget, fit_page
+from github_mcp.config import get_settings
+from github_mcp.context import credential_scoped
+from github_mcp.executor import run_blocking
+from github_mcp.metrics import record_cache_hit
+from github_mcp.pagination import Page, parse_page_request, slice_page
+from github_mcp.trees import TreeIndex, cursor_tree
+
+# Matching lines search_content returns when no limit is given.
+SEARCH_DEFAULT_LIMIT = 100
+
+# Matching lines are cut to this many characters.
+MAX_LINE_CHARS = 500
+
+# Trees remembered per repository; blobs only older trees name are dropped.
+TREES_PER_REPOSITORY = 4
+
+# Git file mode of symbolic links, whose blob is the link target.
+_SYMLINK_MODE = "120000"
+
+# Hex digits that follow the regular expression escapes naming a character.
+_ESCAPE_WIDTHS = {"x": 2, "u": 4, "U": 8}
+
+# Fetch the given paths of the tree, one result page per file, as get_files does.
+FileLoader = Callable[[List[str]], AsyncIterator[Page[Dict[str, Any]]]]
+
+
+def trigrams(text: str) -> Set[str]:
+    """The lowercased three-character sequences of ``text``."""
+    text = text.lower()
+    return {text[index : index + 3] for index in range(len(text) - 2)}
+
+
+def literal_runs(pattern: str) -> List[str]:
+    """Literal strings every match of a regular expression contains.
+
+    Conservative rather than complete: alternation and verbose mode yield
+    nothing, and groups, classes, escapes and optional characters end a run.
+    """
+    if "|" in pattern or re.search(r"\(\?[a-zA-Z]*x", pattern):
+        return []
+    runs: List[str] = []
+    current: List[str] = []
+
+    def end_run() -> None:
+        if current:
+            runs.append("".join(current))
+            current.clear()
+
+    depth = 0
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            escaped = pattern[index + 1 : index + 2]
+            index += 2
+            # Skip the operands of \xhh, \uhhhh, \Uhhhhhhhh, \N{...} and \digits.
+            if escaped in _ESCAPE_WIDTHS:
+                index += _ESCAPE_WIDTHS[escaped]
+            elif escaped == "N":
+                index = pattern.find("}", index) + 1 or len(pattern)
+            elif escaped.isdigit():
+                while pattern[index : index + 1].isdigit():
+                    index += 1
+            if depth == 0:
+                if escaped and not escaped.isalnum():
+                    current.append(escaped)
+                else:
+                    end_run()
+            continue
+        if char == "[":
+            # Skip the class; "]" right after "[" or "[^" is a member.
+            end_run()
+            index += 2 if pattern.startswith("[^", index) else 1
+            index += 1 if pattern[index : index + 1] == "]" else 0
+            while index < len(pattern) and pattern[index] != "]":
+                index += 2 if pattern[index] == "\\" else 1
+            index += 1
+            continue
+        index += 1
+        if char == "(":
+            end_run()
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif depth:
+            continue
+        elif char in "?*{":
+            # The preceding character may not occur at all.
+            if current:
+                current.pop()
+            end_run()
+            if char == "{":
+                closing = pattern.find("}", index)
+                index = len(pattern) if closing == -1 else closing + 1
+        elif char in ".^$+":
+            end_run()
+        else:
+            current.append(char)
+    end_run()
+    return runs
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    """A compiled search_content query and the trigrams its matches contain."""
+
+    matcher: Pattern[str]
+    required: Set[str]
+
+    @classmethod
+    def from_parameters(cls, parameters: Dict[str, Any]) -> "SearchQuery":
+        """Compile the query of a search_content call."""
+        query = parameters["query"]
+        if not query:
+            raise ValueError("'query' must not be empty")
+        regex = bool(parameters.get("regex"))
+        flags = 0 if parameters.get("case_sensitive") else re.IGNORECASE
+        try:
+            matcher = re.compile(query if regex else re.escape(query), flags)
+        except re.error as e:
+            raise ValueError(f"Invalid regular expression: {e}")
+        required: Set[str] = set()
+        for run in literal_runs(query) if regex else [query]:
+            required |= trigrams(run)
+        return cls(matcher, required)
+
+
+def matching_lines(text: str, matcher: Pattern[str]) -> Iterator[Tuple[int, str]]:
+    """Yield the number and text of each line ``matcher`` finds something in."""
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    for number, line in enumerate(lines, 1):
+        line = line[:-1] if line.endswith("\r") else line
+        if matcher.search(line):
+            yield number, line
+
+
+class RepositoryIndex:
+    """Trigram postings over the blobs of one repository's recent trees."""
+
+    def __init__(self) -> None:
+        self.texts: Dict[str, str] = {}
+        # Blobs that are not text, so they are not fetched again.
+        self.binary: Set[str] = set()
+        # Blobs left out because the index was full; retried for a new tree.
+        self.skipped: Set[str] = set()
+        self.postings: Dict[str, Set[str]] = {}
+        self.trees: "OrderedDict[str, Set[str]]" = OrderedDict()
+        self.size = 0
+        self.loading = asyncio.Lock()
+        self._lock = threading.Lock()
+
+    def missing(
+        self, entries: List[Dict[str, Any]], max_file_size: int
+    ) -> List[Dict[str, Any]]:
+        """The file entries whose blobs are not indexed, binary or skipped."""
+        with self._lock:
+            return [
+                entry
+                for entry in entries
+                if entry["sha"] not in self.texts
+                and entry["sha"] not in self.binary
+                and entry["sha"] not in self.skipped
+                and (entry.get("size") or 0) <= max_file_size
+            ]
+
+    def add(self, sha: str, text: Optional[str]) -> int:
+        """Index the text of a blob, or record it as binary; return bytes added."""
+        if text is None:
+            with self._lock:
+                self.binary.add(sha)
+            return 0
+        grams = trigrams(text)
+        with self._lock:
+            if sha in self.texts:
+                return 0
+            self.texts[sha] = text
+            for gram in grams:
+                self.postings.setdefault(gram, set()).add(sha)
+            self.size += len(text)
+        return len(text)
+
+    def skip(self, sha: str) -> None:
+        """Record a blob that did not fit, so this tree does not fetch it again."""
+        with self._lock:
+            self.skipped.add(sha)
+
+    def remember(self, tree: TreeIndex) -> None:
+        """Mark ``tree`` as recent, dropping blobs only older trees named."""
+        with self._lock:
+            if tree.sha not in self.trees:
+                self.skipped.clear()
+            self.trees[tree.sha] = {entry["sha"] for entry in tree.entries}
+            self.trees.move_to_end(tree.sha)
+            if len(self.trees) <= TREES_PER_REPOSITORY:
+                return
+            self.trees.popitem(last=False)
+            kept = set().union(*self.trees.values())
+            for sha in [sha for sha in self.texts if sha not in kept]:
+                text = self.texts.pop(sha)
+                self.size -= len(text)
+                for gram in trigrams(text):
+                    blobs = self.postings.get(gram)
+                    if blobs is not None:
+                        blobs.discard(sha)
+                        if not blobs:
+                            del self.postings[gram]
+            self.binary &= kept
+
+    def candidates(self, required: Set[str]) -> Set[str]:
+        """Blobs holding every trigram in ``required``; all of them if it is empty."""
+        with self._lock:
+            if not required:
+                return set(self.texts)
+            postings = sorted(
+                (self.postings.get(gram, set()) for gram in required), key=len
+            )
+            return set(postings[0]).intersection(*postings[1:])
+
+    def search(
+        self, entries: List[Dict[str, Any]], query: SearchQuery, limit: int
+    ) -> Tuple[List[Dict[str, Any]], int, int]:
+        """Find up to ``limit`` matching lines in ``entries``, in path order.
+
+        Also returns how many of the entries are indexed and how many are not.
+        """
+        candidates = self.candidates(query.required)
+        hits: List[Dict[str, Any]] = []
+        searched = 0
+        for entry in entries:
+            text = self.texts.get(entry["sha"])
+            if text is None:
+                continue
+            searched += 1
+            if entry["sha"] not in candidates or len(hits) >= limit:
+                continue
+            for number, line in matching_lines(text, query.matcher):
+                hits.append(
+                    {
+                        "path": entry["path"],
+                        "line": number,
+                        "text": line[:MAX_LINE_CHARS],
+                    }
+                )
+                if len(hits) >= limit:
+                    break
+        return hits, searched, len(entries) - searched
+
+
+class ContentIndex:
+    """Repository indexes by ``owner/repo``, bounded by the text they hold.
+
+    A repository read with a caller's own token is indexed for that caller
+    only. When the text of all indexes exceeds ``max_bytes``, the least
+    recently searched repositories are dropped; files that still do not fit
+    are left out of the index and reported as skipped, and are only fetched
+    again once the repository is searched at a new tree.
+    """
+
+    def __init__(self, max_bytes: int, max_file_size: int) -> None:
+        self.max_bytes = max_bytes
+        self.max_file_size = max_file_size
+        self._repositories: "OrderedDict[str, RepositoryIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.searches = 0
+        self.indexed_files = 0
+        self.evictions = 0
+
+    def repository(self, owner: str, repo: str) -> RepositoryIndex:
+        """Return the index of a repository, creating it if needed."""
+        key = credential_scoped(f"{owner}/{repo}".lower())
+        with self._lock:
+            index = self._repositories.get(key)
+            if index is None:
+                index = self._repositories[key] = RepositoryIndex()
+            self._repositories.move_to_end(key)
+            self.searches += 1
+            return index
+
+    def reserve(self, index: RepositoryIndex, size: int) -> bool:
+        """Evict other repositories until ``size`` more bytes fit; return if they do."""
+        with self._lock:
+            total = sum(other.size for other in self._repositories.values())
+            for key in list(self._repositories):
+                if total + size <= self.max_bytes:
+                    break
+                other = self._repositories[key]
+                if other is not index:
+                    total -= other.size
+                    del self._repositories[key]
+                    self.evictions += 1
+            return total + size <= self.max_bytes
+
+    def index_files(self, index: RepositoryIndex, files: List[Dict[str, Any]]) -> None:
+        """Index fetched files, as get_files returns them, while they fit."""
+        for item in files:
+            if "error" in item:
+                continue
+            text = item["content"] if item["encoding"] == "utf-8" else None
+            if text is not None and "\x00" in text:
+                text = None
+            if text is not None and not self.reserve(index, len(text)):
+                index.skip(item["sha"])
+                continue
+            index.add(item["sha"], text)
+            with self._lock:
+                self.indexed_files += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return search counters and occupancy."""
+        with self._lock:
+            return {
+                "searches": self.searches,
+                "indexed_files": self.indexed_files,
+                "repositories": len(self._repositories),
+                "bytes": sum(index.size for index in self._repositories.values()),
+                "evictions": self.evictions,
+            }
+
+
+def _files_in_scope(
+    tree: TreeIndex, parameters: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """The regular files a call searches: below ``path`` and matching ``pattern``."""
+    return [
+        entry
+        for entry in tree.find(
+            parameters.get("path", ""), parameters.get("pattern"), "blob"
+        )
+        if entry["mode"] != _SYMLINK_MODE
+    ]
+
+
+async def search_tree(
+    owner: str,
+    repo: str,
+    tree: TreeIndex,
+    ref: str,
+    parameters: Dict[str, Any],
+    load_files: FileLoader,
+    budget: OutputBudget,
+) -> Tuple[Dict[str, Any], Optional[str]]:
+    """Answer search_content over ``tree``, indexing the files it is missing first.
+
+    Returns the tool output and the cursor of the next page, bound to the
+    tree by :func:`~github_mcp.trees.cursor_tree`.
+    """
+    query = SearchQuery.from_parameters(parameters)
+    entries = _files_in_scope(tree, parameters)
+    page_request = parse_page_request(
+        parameters,
+        {
+            "owner": owner,
+            "repo": repo,
+            "tree": cursor_tree(tree),
+            "query": parameters["query"],
+            "regex": bool(parameters.get("regex")),
+            "case_sensitive": bool(parameters.get("case_sensitive")),
+            "path": parameters.get("path", ""),
+            "pattern": parameters.get("pattern"),
+        },
+        default_limit=SEARCH_DEFAULT_LIMIT,
+    )
+
+    content_index = get_content_index()
+    index = content_index.repository(owner, repo)
+    # Concurrent searches of one repository fetch each missing blob once.
+    async with index.loading:
+        index.remember(tree)
+        missing = index.missing(entries, content_index.max_file_size)
+        if missing:
+            # Each file is indexed as it arrives, so only the index's own
+            # bytes bound what a large repository holds in memory.
+            async for page in load_files([entry["path"] for entry in missing]):
+                await run_blocking(content_index.index_files, index, page.items)
+        else:
+            record_cache_hit("search")
+
+    # One item past the page tells whether there is a next one.
+    end = (page_request.page - 1) * page_request.per_page + page_request.offset
+    hits, searched, skipped = await run_blocking(
+        index.search, entries, query, end + page_request.limit + 1
+    )
+    matches, next_cursor = fit_page(slice_page(hits, page_request), budget)
+    return {
+        "sha": tree.sha,
+        "ref": ref,
+        "truncated": tree.truncated,
+        "searched": searched,
+        "skipped": skipped,
+        "matches": matches,
+    }, next_cursor
+
+
+_content_index: Optional[ContentIndex] = None
+_content_index_lock = threading.Lock()
+
+
+def get_content_index() -> ContentIndex:
+    """Return the process-wide content index."""
+    global _content_index
+    if _content_index is None:
+        with _content_index_lock:
+            if _content_index is None:
+                settings = get_settings()
+                _content_index = ContentIndex(
+                    settings.search_index_max_bytes,
+                    settings.search_max_file_size,
+                )
+    return _content_index
@@ -0,0 +1,185 @@
+"""Tool output: REST payload serializers, field projection and JSON encoding."""
+import json
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from github_mcp.config import get_settings
+from github_mcp.metrics import record_output
+from github_mcp.models import ToolResult
+from github_mcp.planner import PULL_REQUEST_FIELDS
+
+try:
+    import orjson
+
+    HAVE_ORJSON = True
+except ImportError:
+    HAVE_ORJSON = False
+
+# The ``fields`` parameter every tool accepts.
+FIELDS_PARAMETER: Dict[str, Any] = {
+    "fields": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": (
+            "Only return these fields of each result item ('*' for all); "
+            "names the result does not have are ignored"
+        ),
+    },
+}
+
+
+def isoformat(timestamp: Optional[str]) -> Optional[str]:
+    """Normalise a GitHub timestamp to the format PyGithub's datetimes produce."""
+    if not timestamp:
+        return None
+    return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).isoformat()
+
+
+def serialize_repository(repo: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a REST repository payload to the list_repositories format."""
+    return {
+        "name": repo["name"],
+        "full_name": repo["full_name"],
+        "description": repo["description"],
+        "url": repo["html_url"],
+        "stars": repo["stargazers_count"],
+        "forks": repo["forks_count"],
+        "private": repo["private"],
+        "archived": repo["archived"],
+        "default_branch": repo["default_branch"],
+        "language": repo["language"],
+        "topics": repo.get("topics", []),
+        "created_at": isoformat(repo["created_at"]),
+        "updated_at": isoformat(repo["updated_at"]),
+        "pushed_at": isoformat(repo.get("pushed_at")),
+    }
+
+
+def serialize_repository_detail(repo: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a full REST repository payload to the get_repository format."""
+    permissions = repo.get("permissions") or {}
+    return {
+        **serialize_repository(repo),
+        "open_issues_count": repo["open_issues_count"],
+        "subscribers_count": repo.get("subscribers_count"),
+        "network_count": repo.get("network_count"),
+        "size": repo["size"],
+        "license": repo["license"]["name"] if repo.get("license") else None,
+        "permissions": {
+            "admin": permissions.get("admin", False),
+            "push": permissions.get("push", False),
+            "pull": permissions.get("pull", False),
+        },
+    }
+
+
+def serialize_issue(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a REST issue payload to the list_issues format."""
+    return {
+        "number": issue["number"],
+        "title": issue["title"],
+        "state": issue["state"],
+        "url": issue["html_url"],
+        "body": issue["body"],
+        "created_at": isoformat(issue["created_at"]),
+        "updated_at": isoformat(issue["updated_at"]),
+        "closed_at": isoformat(issue.get("closed_at")),
+        "labels": [label["name"] for label in issue["labels"]],
+        "assignees": [assignee["login"] for assignee in issue["assignees"]],
+        "author": issue["user"]["login"],
+        "comments": issue["comments"],
+        "locked": issue["locked"],
+        "milestone": issue["milestone"]["title"] if issue.get("milestone") else None,
+        "pull_request": bool(issue.get("pull_request")),
+    }
+
+
+PULL_REQUEST_GETTERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "number": lambda pr: pr["number"],
+    "title": lambda pr: pr["title"],
+    "state": lambda pr: pr["state"],
+    "url": lambda pr: pr["html_url"],
+    "body": lambda pr: pr["body"],
+    "created_at": lambda pr: isoformat(pr["created_at"]),
+    "updated_at": lambda pr: isoformat(pr["updated_at"]),
+    "closed_at": lambda pr: isoformat(pr.get("closed_at")),
+    "merged_at": lambda pr: isoformat(pr.get("merged_at")),
+    "head": lambda pr: {
+        "ref": pr["head"]["ref"],
+        "sha": pr["head"]["sha"],
+        "user": pr["head"]["user"]["login"],
+        "repo": pr["head"]["repo"]["full_name"] if pr["head"].get("repo") else None,
+    },
+    "base": lambda pr: {
+        "ref": pr["base"]["ref"],
+        "sha": pr["base"]["sha"],
+        "user": pr["base"]["user"]["login"],
+        "repo": pr["base"]["repo"]["full_name"],
+    },
+    "author": lambda pr: pr["user"]["login"],
+    "assignees": lambda pr: [assignee["login"] for assignee in pr["assignees"]],
+    "labels": lambda pr: [label["name"] for label in pr["labels"]],
+    "comments": lambda pr: pr["comments"],
+    "review_comments": lambda pr: pr["review_comments"],
+    "commits": lambda pr: pr["commits"],
+    "additions": lambda pr: pr["additions"],
+    "deletions": lambda pr: pr["deletions"],
+    "changed_files": lambda pr: pr["changed_files"],
+    "draft": lambda pr: pr["draft"],
+    "mergeable": lambda pr: pr["mergeable"],
+    "mergeable_state": lambda pr: pr["mergeable_state"],
+}
+
+
+def serialize_pull_request(
+    pr: Dict[str, Any],
+    fields: Sequence[str] = PULL_REQUEST_FIELDS,
+) -> Dict[str, Any]:
+    """Convert a REST pull request payload to the list_pull_requests format."""
+    return {name: PULL_REQUEST_GETTERS[name](pr) for name in fields}
+
+
+def select_fields(data: Any, fields: Optional[Sequence[str]]) -> Any:
+    """Keep only ``fields`` of a result item, or of each item of a list."""
+    if not fields or "*" in fields:
+        return data
+    if isinstance(data, list):
+        return [select_fields(item, fields) for item in data]
+    if isinstance(data, dict):
+        return {name: data[name] for name in fields if name in data}
+    return data
+
+
+def dumps(data: Any) -> str:
+    """Encode a tool result, compactly unless pretty output is configured.
+
+    Compact output uses orjson when it is installed.
+    """
+    if not get_settings().compact_output:
+        return json.dumps(data, indent=2)
+    if HAVE_ORJSON:
+        return orjson.dumps(data).decode()
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def encode_output(data: Any) -> str:
+    """Encode tool output with :func:`dumps`, recording the time taken and size."""
+    started = time.perf_counter()
+    text = dumps(data)
+    record_output(time.perf_counter() - started, len(text.encode()))
+    return text
+
+
+def text_result(
+    data: Any,
+    fields: Optional[Sequence[str]] = None,
+    next_cursor: Optional[str] = None,
+    elided: Optional[Dict[str, Any]] = None,
+) -> ToolResult:
+    """Build a tool result holding ``data``, projected to ``fields``, as JSON text."""
+    return ToolResult(
+        content=[{"type": "text", "text": encode_output(select_fields(data, fields))}],
+        next_cursor=next_cursor,
+        elided=elided,
+    )
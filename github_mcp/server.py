@@ -1,21 +1,54 @@
 """GitHub MCP Server implementation."""
 import asyncio
+import importlib
+import importlib.util
 import json
 import logging
-from typing import Any, Dict, List, Optional
+import math
+import os
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Union
 
-import uvicorn
-from fastapi import FastAPI, HTTPException
-from github import Github
-from githubauthlib import get_github_token, GitHubAuthError
-from pydantic import BaseModel, Field
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response
 from sse_starlette.sse import EventSourceResponse
 
+from github_mcp.blob_store import get_blob_store
+from github_mcp.cache import get_repository_cache
+from github_mcp.clients import (
+    AuthenticationError,
+    close_clients,
+    credential_id,
+    get_client_registry,
+    lease_client,
+)
+from github_mcp.config import ENV_PREFIX, get_settings
+from github_mcp.context import current_credential, current_tool
+from github_mcp.executor import get_executor, run_blocking, shutdown_executor
+from github_mcp.metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    CallMetrics,
+    collect_calls,
+    get_metrics,
+    server_timing,
+    track_call,
+)
+from github_mcp.mirror import get_mirror, start_mirror_sync, stop_mirror_sync
+from github_mcp.models import BatchItem, ToolCall, ToolError, ToolResult
+from github_mcp.rate_limit import (
+    RateLimitExceeded,
+    get_rate_limiter,
+    is_rate_limit_error,
+)
+from github_mcp.response_cache import get_response_cache
+from github_mcp.search_index import get_content_index
+from github_mcp.serializers import encode_output, select_fields
+from github_mcp.shared_store import DEFAULT_SHARED_CACHE_PATH, get_shared_store
+from github_mcp.single_flight import call_key, get_single_flight
 from github_mcp.tools import register_all_tools
-from github_mcp.tools.content import handle_get_file_content, handle_list_directory
-from github_mcp.tools.issues import handle_create_issue, handle_list_issues
-from github_mcp.tools.pull_requests import handle_create_pull_request, handle_list_pull_requests
-from github_mcp.tools.repository import handle_get_repository, handle_list_repositories
+from github_mcp.tools.registry import TOOLS, register_tool  # noqa: F401 (re-exported)
+from github_mcp.trees import get_tree_cache
+from github_mcp.webhooks import apply_event, parse_payload, verify_signature
 
 # Configure logging
 logging.basicConfig(
@@ -24,76 +57,300 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start the worker pool and mirror sync, and drain in-flight calls on shutdown.
+
+    GitHub clients are not created here but on the first tool call, so
+    starting a worker never waits on the keychain; the mirror sync reads
+    the keychain in the background.
+    """
+    get_executor()
+    start_mirror_sync()
+    yield
+    await stop_mirror_sync()
+    # Uvicorn has stopped taking requests and waited for those in flight;
+    # calls still running for coalesced callers get the same grace period.
+    await get_single_flight().drain(settings.graceful_timeout)
+    shutdown_executor()
+    await close_clients()
+
 # Initialize FastAPI app
-app = FastAPI(title="GitHub MCP Server")
-
-# Initialize GitHub client using githubauthlib
-try:
-    github_token = get_github_token()
-    if not github_token:
-        raise ValueError("No GitHub token found in system keychain")
-    github_client = Github(github_token)
-    logger.info("Successfully authenticated with GitHub using system keychain")
-except GitHubAuthError as e:
-    logger.error(f"Failed to authenticate with GitHub: {str(e)}")
-    raise ValueError(f"GitHub authentication failed: {str(e)}")
-
-class ToolCall(BaseModel):
-    """Model for MCP tool calls."""
-    name: str = Field(..., description="Name of the tool to call")
-    parameters: Dict[str, Any] = Field(default_factory=dict, description="Tool parameters")
-
-class ToolDefinition(BaseModel):
-    """Model for MCP tool definitions."""
-    name: str = Field(..., description="Name of the tool")
-    description: str = Field(..., description="Tool description")
-    parameters: Dict[str, Any] = Field(..., description="Tool parameters schema")
-
-class ToolResult(BaseModel):
-    """Model for MCP tool results."""
-    content: List[Dict[str, Any]] = Field(..., description="Tool result content")
-
-# Tool registry
-TOOLS: Dict[str, ToolDefinition] = {}
-
-def register_tool(name: str, description: str, parameters: Dict[str, Any]) -> None:
-    """Register a new tool with the MCP server."""
-    TOOLS[name] = ToolDefinition(
-        name=name,
-        description=description,
-        parameters=parameters,
-    )
+app = FastAPI(title="GitHub MCP Server", lifespan=lifespan)
+
+settings = get_settings()
 
 # Register all available tools
 register_all_tools()
 
-# Tool handler mapping
-TOOL_HANDLERS = {
-    "list_repositories": handle_list_repositories,
-    "get_repository": handle_get_repository,
-    "list_issues": handle_list_issues,
-    "create_issue": handle_create_issue,
-    "list_pull_requests": handle_list_pull_requests,
-    "create_pull_request": handle_create_pull_request,
-    "get_file_content": handle_get_file_content,
-    "list_directory": handle_list_directory,
+# Tool handler mapping. Handlers are named as "module:function" and
+# imported on first use, so only the configured backend is ever loaded.
+TOOL_HANDLERS: Dict[str, Union[str, Callable[..., Any]]] = {
+    "list_repositories": "github_mcp.tools.repository:handle_list_repositories",
+    "get_repository": "github_mcp.tools.repository:handle_get_repository",
+    "list_issues": "github_mcp.tools.issues:handle_list_issues",
+    "create_issue": "github_mcp.tools.issues:handle_create_issue",
+    "list_pull_requests": "github_mcp.tools.pull_requests:handle_list_pull_requests",
+    "create_pull_request": "github_mcp.tools.pull_requests:handle_create_pull_request",
+    "get_file_content": "github_mcp.tools.content:handle_get_file_content",
+    "list_directory": "github_mcp.tools.content:handle_list_directory",
+    "get_tree": "github_mcp.tools.content:handle_get_tree",
+    "get_files": "github_mcp.tools.content:handle_get_files",
+    "search_content": "github_mcp.tools.content:handle_search_content",
+}
+
+# Handlers for the native async REST backend
+REST_TOOL_HANDLERS: Dict[str, Union[str, Callable[..., Any]]] = {
+    "list_repositories": "github_mcp.rest.repository:handle_list_repositories",
+    "get_repository": "github_mcp.rest.repository:handle_get_repository",
+    "list_issues": "github_mcp.rest.issues:handle_list_issues",
+    "create_issue": "github_mcp.rest.issues:handle_create_issue",
+    "list_pull_requests": "github_mcp.rest.pull_requests:handle_list_pull_requests",
+    "create_pull_request": "github_mcp.rest.pull_requests:handle_create_pull_request",
+    "get_file_content": "github_mcp.rest.content:handle_get_file_content",
+    "list_directory": "github_mcp.rest.content:handle_list_directory",
+    "get_tree": "github_mcp.rest.content:handle_get_tree",
+    "get_files": "github_mcp.rest.content:handle_get_files",
+    "search_content": "github_mcp.rest.content:handle_search_content",
+}
+
+# Incremental variants of the list and batch tools, used by streaming calls
+TOOL_STREAMS: Dict[str, Union[str, Callable[..., Any]]] = {
+    "list_repositories": "github_mcp.tools.repository:stream_list_repositories",
+    "list_issues": "github_mcp.tools.issues:stream_list_issues",
+    "list_pull_requests": "github_mcp.tools.pull_requests:stream_list_pull_requests",
+    "get_files": "github_mcp.tools.content:stream_get_files",
+}
+
+REST_TOOL_STREAMS: Dict[str, Union[str, Callable[..., Any]]] = {
+    "list_repositories": "github_mcp.rest.repository:stream_list_repositories",
+    "list_issues": "github_mcp.rest.issues:stream_list_issues",
+    "list_pull_requests": "github_mcp.rest.pull_requests:stream_list_pull_requests",
+    "get_files": "github_mcp.rest.content:stream_get_files",
 }
 
-async def tool_handler(tool_call: ToolCall) -> ToolResult:
-    """Handle tool calls and return results."""
-    if tool_call.name not in TOOLS:
-        raise HTTPException(status_code=404, detail=f"Tool {tool_call.name} not found")
+if settings.backend == "httpx":
+    TOOL_HANDLERS = REST_TOOL_HANDLERS
+    TOOL_STREAMS = REST_TOOL_STREAMS
+
+# Tools with side effects: identical concurrent calls are all sent.
+MUTATING_TOOLS = frozenset({"create_issue", "create_pull_request"})
+
+def check_tool(name: str) -> None:
+    """Raise an HTTP error if a tool is unknown or has no handler."""
+    if name not in TOOLS:
+        raise HTTPException(status_code=404, detail=f"Tool {name} not found")
+
+    if name not in TOOL_HANDLERS:
+        raise HTTPException(status_code=501, detail=f"Tool {name} not implemented")
+
+@lru_cache(maxsize=None)
+def _import_target(target: str) -> Callable[..., Any]:
+    module, _, name = target.partition(":")
+    handler: Callable[..., Any] = getattr(importlib.import_module(module), name)
+    return handler
+
+def resolve(target: Union[str, Callable[..., Any]]) -> Callable[..., Any]:
+    """Return the handler a mapping entry names, importing its module if needed."""
+    return _import_target(target) if isinstance(target, str) else target
+
+def rate_limit_error(error: Exception) -> HTTPException:
+    """Turn a GitHub rate-limit refusal into a 429 with ``Retry-After``."""
+    if isinstance(error, RateLimitExceeded):
+        retry_after = error.retry_after
+    else:
+        retry_after = get_rate_limiter().retry_after()
+    return HTTPException(
+        status_code=429,
+        detail=str(error),
+        headers={"Retry-After": str(math.ceil(retry_after))},
+    )
+
+def request_token(
+    authorization: Optional[str] = Header(None),
+    x_github_token: Optional[str] = Header(None),
+) -> Optional[str]:
+    """Return the GitHub token a request carries, if any.
+
+    ``X-GitHub-Token`` takes precedence over an ``Authorization: Bearer``
+    (or ``token``) header. Requests without one are served with the
+    keychain token, unless ``require_request_token`` is set.
+    """
+    token = x_github_token
+    if not token and authorization:
+        scheme, _, credentials = authorization.partition(" ")
+        if scheme.lower() in ("bearer", "token"):
+            token = credentials.strip()
+    if not token and settings.require_request_token:
+        raise HTTPException(
+            status_code=401,
+            detail="A GitHub token is required",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return token or None
+
+@contextmanager
+def call_context(name: str, token: Optional[str]) -> Iterator[CallMetrics]:
+    """Set the tool and credential a call is served for, and track its metrics."""
+    tool_token = current_tool.set(name)
+    credential_token = current_credential.set(credential_id(token) if token else "")
+    try:
+        with track_call(name) as call:
+            yield call
+    finally:
+        current_credential.reset(credential_token)
+        current_tool.reset(tool_token)
+
+async def tool_handler(tool_call: ToolCall, token: Optional[str] = None) -> ToolResult:
+    """Handle tool calls and return results.
+
+    The call is served with ``token``'s client, or the keychain token's
+    when none is given.
+    """
+    check_tool(tool_call.name)
+
+    async def call() -> ToolResult:
+        handler = resolve(TOOL_HANDLERS[tool_call.name])
+        async with lease_client(token) as github_client:
+            async with get_executor().limit(tool_call.name):
+                result: ToolResult = await handler(github_client, tool_call.parameters)
+                return result
+
+    with call_context(tool_call.name, token):
+        try:
+            if not settings.coalesce_calls or tool_call.name in MUTATING_TOOLS:
+                return await call()
+            # Identical read calls already in flight share one upstream call.
+            key = call_key(
+                tool_call.name,
+                tool_call.parameters,
+                TOOLS[tool_call.name].parameters,
+            )
+            return await get_single_flight().do(key, call)
+
+        except AuthenticationError as e:
+            raise HTTPException(status_code=401, detail=str(e))
+
+        except Exception as e:
+            if is_rate_limit_error(e):
+                logger.warning(f"Rate limited handling tool {tool_call.name}: {str(e)}")
+                raise rate_limit_error(e)
+            logger.error(f"Error handling tool {tool_call.name}: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+async def stream_tool_events(
+    tool_call: ToolCall,
+    token: Optional[str] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Run a tool and yield one SSE event per result item.
+
+    List tools push each page's items as soon as the page arrives and
+    get_files pushes each file as it is read; other tools emit their
+    result once it is complete. A ``summary`` event with the item count
+    and continuation cursor closes the stream, or an ``error`` event if
+    the call fails part-way.
+    """
+    count = 0
+    next_cursor: Optional[str] = None
+    fields = tool_call.parameters.get("fields")
+    with call_context(tool_call.name, token) as call:
+        try:
+            async with lease_client(token) as github_client:
+                limit = get_executor().limit
+                stream = TOOL_STREAMS.get(tool_call.name)
+                if stream is not None:
+                    pages = resolve(stream)(github_client, tool_call.parameters)
+                    while True:
+                        # A slot is held while a page is fetched, not while a
+                        # slow client reads it.
+                        async with limit(tool_call.name):
+                            try:
+                                page = await pages.__anext__()
+                            except StopAsyncIteration:
+                                break
+                        for item in select_fields(page.items, fields):
+                            yield {"event": "item", "data": encode_output(item)}
+                        count += len(page.items)
+                        next_cursor = page.next_cursor
+                else:
+                    handler = resolve(TOOL_HANDLERS[tool_call.name])
+                    async with limit(tool_call.name):
+                        result = await handler(github_client, tool_call.parameters)
+                    next_cursor = result.next_cursor
+                    for content in result.content:
+                        data = json.loads(content["text"])
+                        for item in data if isinstance(data, list) else [data]:
+                            yield {"event": "item", "data": encode_output(item)}
+                            count += 1
+        except Exception as e:
+            call.outcome = "error"
+            logger.error(f"Error streaming tool {tool_call.name}: {str(e)}")
+            yield {
+                "event": "error",
+                "data": json.dumps({
+                    "error": str(e),
+                    "count": count,
+                    "next_cursor": next_cursor,
+                }),
+            }
+            return
+
+    yield {
+        "event": "summary",
+        "data": json.dumps({
+            "tool": tool_call.name,
+            "count": count,
+            "next_cursor": next_cursor,
+        }),
+    }
+
+async def run_batch(
+    tool_calls: List[ToolCall],
+    token: Optional[str] = None,
+) -> AsyncIterator[BatchItem]:
+    """Run tool calls concurrently and yield each outcome as it completes.
 
-    if tool_call.name not in TOOL_HANDLERS:
-        raise HTTPException(status_code=501, detail=f"Tool {tool_call.name} not implemented")
+    At most ``tool_batch_concurrency`` calls of a batch run at once; each
+    still goes through :func:`tool_handler`, so per-tool limits and
+    coalescing apply. A failed call yields an error item and does not
+    affect the others.
+    """
+    semaphore = asyncio.Semaphore(settings.tool_batch_concurrency)
 
+    async def run(index: int, tool_call: ToolCall) -> BatchItem:
+        async with semaphore:
+            try:
+                result = await tool_handler(tool_call, token)
+            except HTTPException as e:
+                error = ToolError(status_code=e.status_code, detail=str(e.detail))
+                return BatchItem(index=index, name=tool_call.name, error=error)
+        return BatchItem(index=index, name=tool_call.name, result=result)
+
+    tasks = [
+        asyncio.ensure_future(run(index, tool_call))
+        for index, tool_call in enumerate(tool_calls)
+    ]
     try:
-        handler = TOOL_HANDLERS[tool_call.name]
-        return await handler(github_client, tool_call.parameters)
+        for completed in asyncio.as_completed(tasks):
+            yield await completed
+    finally:
+        # A client that goes away mid-stream leaves nothing running.
+        for task in tasks:
+            task.cancel()
 
-    except Exception as e:
-        logger.error(f"Error handling tool {tool_call.name}: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+async def stream_batch_events(
+    tool_calls: List[ToolCall],
+    token: Optional[str] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield one SSE ``result`` event per call as it completes, then a ``summary``."""
+    failed = 0
+    async for item in run_batch(tool_calls, token):
+        failed += item.error is not None
+        yield {"event": "result", "data": json.dumps(item.model_dump())}
+    yield {
+        "event": "summary",
+        "data": json.dumps({"count": len(tool_calls), "failed": failed}),
+    }
 
 @app.get("/")
 async def root() -> Dict[str, Any]:
@@ -104,15 +361,124 @@ async def root() -> Dict[str, Any]:
         "tools": [tool.dict() for tool in TOOLS.values()],
     }
 
+@app.get("/status")
+async def status() -> Dict[str, Any]:
+    """Status endpoint reporting pool, queue, cache, rate-limit and client metrics.
+
+    Also reports the local mirror's repositories and when each was synced.
+    """
+    response_cache = get_response_cache()
+    blob_store = get_blob_store()
+    shared_store = get_shared_store()
+    mirror = get_mirror()
+    return {
+        "executor": get_executor().stats(),
+        "repository_cache": get_repository_cache().stats(),
+        "response_cache": response_cache.stats() if response_cache else None,
+        "blob_store": blob_store.stats() if blob_store else None,
+        "tree_cache": get_tree_cache().stats(),
+        "search_index": get_content_index().stats(),
+        "rate_limit": get_rate_limiter().stats(),
+        "single_flight": get_single_flight().stats(),
+        "clients": get_client_registry().stats(),
+        "shared_cache": shared_store.stats() if shared_store else None,
+        "mirror": mirror.stats() if mirror else None,
+    }
+
+@app.get("/metrics")
+async def metrics() -> Response:
+    """Per-tool call metrics in the Prometheus text format."""
+    if not settings.metrics:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(get_metrics().render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+@app.post("/webhook")
+async def webhook(
+    request: Request,
+    x_github_event: str = Header(...),
+    x_hub_signature_256: Optional[str] = Header(None),
+) -> Dict[str, Any]:
+    """Endpoint receiving GitHub webhook deliveries.
+
+    ``push``, ``issues``, ``pull_request`` and ``repository`` events drop
+    or rewrite the cached entries they affect; other events are ignored.
+    Deliveries must be signed with ``webhook_secret``.
+    """
+    if not settings.webhook_secret:
+        raise HTTPException(status_code=404, detail="Webhooks are not configured")
+    body = await request.body()
+    if not verify_signature(settings.webhook_secret, body, x_hub_signature_256):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+    try:
+        payload = parse_payload(body, request.headers.get("content-type", ""))
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+    try:
+        return await run_blocking(apply_event, x_github_event, payload)
+    except (KeyError, TypeError) as error:
+        raise HTTPException(
+            status_code=400, detail=f"Malformed {x_github_event} payload: {error}"
+        )
+
 @app.post("/tool")
-async def call_tool(tool_call: ToolCall) -> ToolResult:
+async def call_tool(
+    tool_call: ToolCall,
+    response: Response,
+    token: Optional[str] = Depends(request_token),
+) -> ToolResult:
     """Endpoint for synchronous tool calls."""
-    return await tool_handler(tool_call)
+    with collect_calls() as calls:
+        result = await tool_handler(tool_call, token)
+    if settings.timing_headers:
+        response.headers["Server-Timing"] = server_timing(calls)
+    return result
+
+@app.post("/tools/batch", response_model=List[BatchItem])
+async def call_tools(
+    tool_calls: List[ToolCall],
+    response: Response,
+    stream: bool = Query(
+        False, description="Stream results in completion order over SSE"
+    ),
+    token: Optional[str] = Depends(request_token),
+) -> Union[List[BatchItem], EventSourceResponse]:
+    """Endpoint running several tool calls concurrently.
+
+    Returns one item per call, in request order, holding either the
+    call's result or its error. With ``stream=true`` the items are sent
+    as SSE ``result`` events in the order the calls complete.
+    """
+    if len(tool_calls) > settings.tool_batch_max_calls:
+        raise HTTPException(
+            status_code=413,
+            detail=f"A batch may hold at most {settings.tool_batch_max_calls} calls",
+        )
+    if stream:
+        return EventSourceResponse(stream_batch_events(tool_calls, token))
+    with collect_calls() as calls:
+        items = [item async for item in run_batch(tool_calls, token)]
+    if settings.timing_headers:
+        response.headers["Server-Timing"] = server_timing(calls)
+    return sorted(items, key=lambda item: item.index)
 
 @app.get("/sse")
-async def sse_endpoint() -> EventSourceResponse:
-    """SSE endpoint for streaming tool results."""
-    async def event_generator():
+async def sse_endpoint(
+    tool: Optional[str] = Query(None, description="Tool to stream"),
+    parameters: str = Query("{}", description="Tool parameters as JSON"),
+    token: Optional[str] = Depends(request_token),
+) -> EventSourceResponse:
+    """SSE endpoint for streaming tool results.
+
+    Without a ``tool`` the stream only carries keep-alive pings.
+    """
+    if tool is not None:
+        try:
+            tool_call = ToolCall(name=tool, parameters=json.loads(parameters))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid parameters: {str(e)}")
+        return await stream_tool(tool_call, token)
+
+    async def event_generator() -> AsyncIterator[Dict[str, Any]]:
         try:
             while True:
                 # Keep the connection alive
@@ -130,13 +496,53 @@ async def sse_endpoint() -> EventSourceResponse:
 
     return EventSourceResponse(event_generator())
 
+@app.post("/sse")
+async def stream_tool(
+    tool_call: ToolCall,
+    token: Optional[str] = Depends(request_token),
+) -> EventSourceResponse:
+    """Call a tool and stream its results as they arrive."""
+    check_tool(tool_call.name)
+    return EventSourceResponse(stream_tool_events(tool_call, token))
+
+def _available(module: str) -> bool:
+    """Return True if an optional module can be imported."""
+    return importlib.util.find_spec(module) is not None
+
 def main() -> None:
-    """Run the MCP server."""
+    """Run the MCP server.
+
+    Serving options come from the ``GITHUB_MCP_*`` settings. Several
+    workers share their caches through a SQLite store, at a default path
+    unless ``shared_cache_path`` names one.
+    """
+    workers = 1 if settings.reload else settings.workers
+    if workers > 1 and not settings.shared_cache_path:
+        # Workers read the environment again when they import the app.
+        os.environ[f"{ENV_PREFIX}SHARED_CACHE_PATH"] = DEFAULT_SHARED_CACHE_PATH
+
+    loop = settings.loop
+    if loop == "uvloop" and not _available("uvloop"):
+        logger.warning(
+            "uvloop requested but not installed; using the default event loop"
+        )
+        loop = "auto"
+    http = settings.http
+    if http == "httptools" and not _available("httptools"):
+        logger.warning("httptools requested but not installed; using h11")
+        http = "auto"
+
+    import uvicorn
+
     uvicorn.run(
         "github_mcp.server:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
+        host=settings.host,
+        port=settings.port,
+        workers=workers,
+        reload=settings.reload,
+        loop=loop,
+        http=http,
+        timeout_graceful_shutdown=settings.graceful_timeout,
         log_level="info",
     )
 
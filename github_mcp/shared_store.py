@@ -0,0 +1,232 @@
+"""Cache tables in one SQLite database shared by every server worker."""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from github_mcp.config import get_settings
+from github_mcp.context import SCOPE_SEPARATOR
+
+# Used for the shared store when several workers are started without one.
+DEFAULT_SHARED_CACHE_PATH = "~/.cache/github-mcp/shared.sqlite3"
+
+# Reads refresh an entry's access time at most this often (seconds), so
+# eviction order is approximately least recently used and most hits stay
+# read-only.
+TOUCH_INTERVAL = 60.0
+
+
+class SharedStore:
+    """Key/value tables in a SQLite database that several processes open.
+
+    Values are stored as JSON with an optional expiry. The database runs
+    in WAL mode, so reads proceed while another worker writes; writes,
+    including the occasional access-time refresh of a read, wait up to
+    ``busy_timeout`` seconds for each other.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        busy_timeout: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        path = os.path.expanduser(path)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=busy_timeout, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL,"
+            " accessed_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS entries_accessed_at"
+            " ON entries (namespace, accessed_at)"
+        )
+        self._db.commit()
+
+    def table(self, namespace: str, max_entries: int) -> "SharedTable":
+        """Return a size-bounded view of one namespace."""
+        return SharedTable(self, namespace, max_entries)
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Return the value stored under ``key``, or None if missing or expired."""
+        now = self._clock()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, expires_at, accessed_at FROM entries"
+                " WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at, accessed_at = row
+            if expires_at is not None and expires_at <= now:
+                return None
+            if now - accessed_at >= TOUCH_INTERVAL:
+                self._db.execute(
+                    "UPDATE entries SET accessed_at = ?"
+                    " WHERE namespace = ? AND key = ?",
+                    (now, namespace, key),
+                )
+                self._db.commit()
+        return json.loads(value)
+
+    def contains(self, namespace: str, key: str) -> bool:
+        """Return True if an unexpired value is stored under ``key``."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT 1 FROM entries WHERE namespace = ? AND key = ?"
+                " AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, key, self._clock()),
+            ).fetchone()
+        return row is not None
+
+    def set_many(
+        self,
+        namespace: str,
+        items: Iterable[Tuple[str, Any]],
+        max_entries: int,
+        ttl: Optional[float] = None,
+    ) -> None:
+        """Store values in one transaction, evicting the least recently used."""
+        now = self._clock()
+        expires_at = None if ttl is None else now + ttl
+        rows = [
+            (namespace, key, json.dumps(value), expires_at, now)
+            for key, value in items
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO entries"
+                " (namespace, key, value, expires_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._db.execute(
+                "DELETE FROM entries WHERE namespace = ? AND key IN ("
+                " SELECT key FROM entries WHERE namespace = ?"
+                " ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (namespace, namespace, max_entries),
+            )
+            self._db.commit()
+
+    def delete(self, namespace: str, key: str) -> None:
+        """Remove one entry."""
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            )
+            self._db.commit()
+
+    def delete_scoped(self, namespace: str, key: str, prefix: bool = False) -> int:
+        """Remove ``key``, or with ``prefix`` all keys it starts, for any credential."""
+        pattern = key.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        if prefix:
+            pattern += "%"
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM entries WHERE namespace = ? AND key LIKE ? ESCAPE '\\'",
+                (namespace, "%" + SCOPE_SEPARATOR + pattern),
+            )
+            self._db.commit()
+        return cursor.rowcount
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Remove every entry of a namespace, or of all of them."""
+        with self._lock:
+            if namespace is None:
+                self._db.execute("DELETE FROM entries")
+            else:
+                self._db.execute(
+                    "DELETE FROM entries WHERE namespace = ?", (namespace,)
+                )
+            self._db.commit()
+
+    def count(self, namespace: str) -> int:
+        """Return the number of entries in a namespace."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT COUNT(*) FROM entries WHERE namespace = ?",
+                (namespace,),
+            ).fetchone()
+        return int(row[0])
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the database path and entries per namespace."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT namespace, COUNT(*) FROM entries GROUP BY namespace"
+            ).fetchall()
+        return {"path": self.path, "entries": dict(rows)}
+
+
+class SharedTable:
+    """One namespace of a :class:`SharedStore`, bounded to ``max_entries``."""
+
+    def __init__(self, store: SharedStore, namespace: str, max_entries: int) -> None:
+        self.store = store
+        self.namespace = namespace
+        self.max_entries = max_entries
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value stored under ``key``."""
+        return self.store.get(self.namespace, key)
+
+    def __contains__(self, key: str) -> bool:
+        return self.store.contains(self.namespace, key)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, expiring after ``ttl`` seconds if given."""
+        self.store.set_many(self.namespace, [(key, value)], self.max_entries, ttl)
+
+    def set_many(
+        self, items: Iterable[Tuple[str, Any]], ttl: Optional[float] = None
+    ) -> None:
+        """Store several values in one transaction."""
+        self.store.set_many(self.namespace, items, self.max_entries, ttl)
+
+    def delete(self, key: str) -> None:
+        """Remove one entry."""
+        self.store.delete(self.namespace, key)
+
+    def delete_scoped(self, key: str, prefix: bool = False) -> int:
+        """Remove ``key`` (or every key it starts) for every credential."""
+        return self.store.delete_scoped(self.namespace, key, prefix)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self.store.clear(self.namespace)
+
+
+_shared_store: Optional[SharedStore] = None
+_shared_store_lock = threading.Lock()
+_shared_store_created = False
+
+
+def get_shared_store() -> Optional[SharedStore]:
+    """Return the store shared between workers, or None if caches are per process."""
+    global _shared_store, _shared_store_created
+    if not _shared_store_created:
+        with _shared_store_lock:
+            if not _shared_store_created:
+                path = get_settings().shared_cache_path
+                _shared_store = SharedStore(path) if path else None
+                _shared_store_created = True
+    return _shared_store
@@ -0,0 +1,100 @@
+"""Coalescing of identical tool calls that are in flight at the same time."""
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, TypeVar
+
+from github_mcp.context import current_credential
+from github_mcp.metrics import record_cache_hit
+
+T = TypeVar("T")
+
+
+def call_key(
+    name: str,
+    parameters: Mapping[str, Any],
+    schema: Optional[Mapping[str, Any]] = None,
+) -> str:
+    """Hash a tool call so that equivalent calls get the same key.
+
+    Parameters left at their schema default (or passed as null) count the
+    same as omitted ones, and key order does not matter. Calls made with
+    different credentials never share a key.
+    """
+    normalized: Dict[str, Any] = {}
+    properties = (schema or {}).get("properties", {})
+    for parameter, definition in properties.items():
+        if "default" in definition:
+            normalized[parameter] = definition["default"]
+    normalized.update(
+        (parameter, value)
+        for parameter, value in parameters.items()
+        if value is not None
+    )
+    payload = json.dumps(
+        [current_credential.get(), name, normalized],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class SingleFlight:
+    """Run each key's call once, however many callers ask for it concurrently.
+
+    The first caller for a key starts the call as a task; callers that
+    arrive while it is pending await the same task and receive its result
+    or exception. A caller that is cancelled only stops waiting: the call
+    carries on for the others. Once the call finishes the key is free, so
+    later callers start a fresh one.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, "asyncio.Task[Any]"] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Return the result of ``fn()``, sharing a pending call with the same key."""
+        task = self._calls.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.coalesced += 1
+            record_cache_hit("coalesced")
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: "asyncio.Task[Any]") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception retrieved even if every caller was cancelled.
+        if not task.cancelled():
+            task.exception()
+
+    async def drain(self, timeout: float) -> None:
+        """Wait up to ``timeout`` seconds for the calls in flight to finish."""
+        if self._calls:
+            await asyncio.wait(list(self._calls.values()), timeout=timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """Return call and coalescing counters."""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+        }
+
+
+_single_flight: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> SingleFlight:
+    """Return the process-wide single-flight group."""
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
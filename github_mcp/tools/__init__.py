@@ -1,7 +1,14 @@
 """GitHub MCP tools package."""
-from typing import Dict, Any
-
-from github_mcp.server import register_tool
+from github_mcp.budget import BODY_BUDGET_PARAMETERS, BUDGET_PARAMETERS
+from github_mcp.file_batch import FILES_DEFAULT_LIMIT
+from github_mcp.file_ranges import FILE_RANGE_PARAMETERS
+from github_mcp.mirror import AUTHOR_PARAMETERS, SEARCH_PARAMETER
+from github_mcp.pagination import PAGINATION_PARAMETERS
+from github_mcp.planner import PULL_REQUEST_FIELDS
+from github_mcp.search_index import SEARCH_DEFAULT_LIMIT
+from github_mcp.serializers import FIELDS_PARAMETER
+from github_mcp.tools.registry import register_tool
+from github_mcp.trees import TREE_DEFAULT_LIMIT
 
 def register_repository_tools() -> None:
     """Register repository-related tools."""
@@ -21,6 +28,9 @@ def register_repository_tools() -> None:
                     "enum": ["created", "updated", "pushed", "full_name"],
                     "default": "updated",
                 },
+                **FIELDS_PARAMETER,
+                **BUDGET_PARAMETERS,
+                **PAGINATION_PARAMETERS,
             },
         },
     )
@@ -33,6 +43,7 @@ def register_repository_tools() -> None:
             "properties": {
                 "owner": {"type": "string", "description": "Repository owner"},
                 "repo": {"type": "string", "description": "Repository name"},
+                **FIELDS_PARAMETER,
             },
             "required": ["owner", "repo"],
         },
@@ -58,6 +69,11 @@ def register_issue_tools() -> None:
                     "items": {"type": "string"},
                     "description": "Filter by labels",
                 },
+                **AUTHOR_PARAMETERS,
+                **SEARCH_PARAMETER,
+                **FIELDS_PARAMETER,
+                **BODY_BUDGET_PARAMETERS,
+                **PAGINATION_PARAMETERS,
             },
             "required": ["owner", "repo"],
         },
@@ -83,6 +99,7 @@ def register_issue_tools() -> None:
                     "items": {"type": "string"},
                     "description": "Issue assignees",
                 },
+                **FIELDS_PARAMETER,
             },
             "required": ["owner", "repo", "title"],
         },
@@ -92,7 +109,10 @@ def register_pull_request_tools() -> None:
     """Register pull request-related tools."""
     register_tool(
         name="list_pull_requests",
-        description="List pull requests in a repository",
+        description=(
+            "List pull requests in a repository. Filtering by labels, author, "
+            "assignee or search text needs the repository in the local mirror"
+        ),
         parameters={
             "type": "object",
             "properties": {
@@ -108,6 +128,25 @@ def register_pull_request_tools() -> None:
                     "enum": ["created", "updated", "popularity", "long-running"],
                     "default": "created",
                 },
+                "labels": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Filter by labels",
+                },
+                **AUTHOR_PARAMETERS,
+                **SEARCH_PARAMETER,
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string", "enum": ["*", *PULL_REQUEST_FIELDS]},
+                    "description": (
+                        "Fields to return; defaults to those in the list payload. "
+                        "Detail fields (comments, commits, additions, deletions, "
+                        "changed_files, mergeable, ...) cost one request per "
+                        "pull request"
+                    ),
+                },
+                **PAGINATION_PARAMETERS,
+                **BODY_BUDGET_PARAMETERS,
             },
             "required": ["owner", "repo"],
         },
@@ -126,6 +165,7 @@ def register_pull_request_tools() -> None:
                 "head": {"type": "string", "description": "Source branch"},
                 "base": {"type": "string", "description": "Target branch", "default": "main"},
                 "draft": {"type": "boolean", "description": "Create as draft", "default": False},
+                **FIELDS_PARAMETER,
             },
             "required": ["owner", "repo", "title", "head"],
         },
@@ -135,7 +175,10 @@ def register_content_tools() -> None:
     """Register content-related tools."""
     register_tool(
         name="get_file_content",
-        description="Get the content of a file in a repository",
+        description=(
+            "Get the content of a file in a repository, optionally only a byte "
+            "or line range of it; binary files are returned base64 encoded"
+        ),
         parameters={
             "type": "object",
             "properties": {
@@ -143,6 +186,9 @@ def register_content_tools() -> None:
                 "repo": {"type": "string", "description": "Repository name"},
                 "path": {"type": "string", "description": "File path in repository"},
                 "ref": {"type": "string", "description": "Branch/tag/commit reference"},
+                **FILE_RANGE_PARAMETERS,
+                **FIELDS_PARAMETER,
+                **BUDGET_PARAMETERS,
             },
             "required": ["owner", "repo", "path"],
         },
@@ -158,11 +204,149 @@ def register_content_tools() -> None:
                 "repo": {"type": "string", "description": "Repository name"},
                 "path": {"type": "string", "description": "Directory path", "default": ""},
                 "ref": {"type": "string", "description": "Branch/tag/commit reference"},
+                **FIELDS_PARAMETER,
+            },
+            "required": ["owner", "repo"],
+        },
+    )
+
+    register_tool(
+        name="get_tree",
+        description=(
+            "Get the full recursive file tree of a repository in one request, "
+            "optionally filtered by path prefix, glob pattern or entry type"
+        ),
+        parameters={
+            "type": "object",
+            "properties": {
+                "owner": {"type": "string", "description": "Repository owner"},
+                "repo": {"type": "string", "description": "Repository name"},
+                "ref": {
+                    "type": "string",
+                    "description": (
+                        "Branch/tag/commit reference (default branch if omitted)"
+                    ),
+                },
+                "path": {
+                    "type": "string",
+                    "description": "Only return entries below this directory",
+                    "default": "",
+                },
+                "pattern": {
+                    "type": "string",
+                    "description": (
+                        "Glob matched against full paths, e.g. 'src/**/*.py'"
+                    ),
+                },
+                "type": {
+                    "type": "string",
+                    "enum": ["blob", "tree", "commit"],
+                    "description": (
+                        "Only return files (blob), directories (tree) "
+                        "or submodules (commit)"
+                    ),
+                },
+                **FIELDS_PARAMETER,
+                **BUDGET_PARAMETERS,
+                **PAGINATION_PARAMETERS,
+                "limit": {
+                    **PAGINATION_PARAMETERS["limit"],
+                    "default": TREE_DEFAULT_LIMIT,
+                },
             },
             "required": ["owner", "repo"],
         },
     )
 
+    register_tool(
+        name="get_files",
+        description=(
+            "Get the contents of several files at one ref in a single call; "
+            "paths may be globs such as 'src/**/*.py'"
+        ),
+        parameters={
+            "type": "object",
+            "properties": {
+                "owner": {"type": "string", "description": "Repository owner"},
+                "repo": {"type": "string", "description": "Repository name"},
+                "paths": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "minItems": 1,
+                    "description": "File paths or globs matched against full paths",
+                },
+                "ref": {
+                    "type": "string",
+                    "description": (
+                        "Branch/tag/commit reference (default branch if omitted)"
+                    ),
+                },
+                **FIELDS_PARAMETER,
+                **BUDGET_PARAMETERS,
+                **PAGINATION_PARAMETERS,
+                "limit": {
+                    **PAGINATION_PARAMETERS["limit"],
+                    "default": FILES_DEFAULT_LIMIT,
+                },
+            },
+            "required": ["owner", "repo", "paths"],
+        },
+    )
+
+    register_tool(
+        name="search_content",
+        description=(
+            "Search the text of a repository's files at one ref for a literal string "
+            "or regular expression, returning matching lines with their line numbers"
+        ),
+        parameters={
+            "type": "object",
+            "properties": {
+                "owner": {"type": "string", "description": "Repository owner"},
+                "repo": {"type": "string", "description": "Repository name"},
+                "query": {
+                    "type": "string",
+                    "minLength": 1,
+                    "description": (
+                        "Text to find on a line, or a regular expression with regex"
+                    ),
+                },
+                "regex": {
+                    "type": "boolean",
+                    "description": "Treat query as a Python regular expression",
+                    "default": False,
+                },
+                "case_sensitive": {"type": "boolean", "default": False},
+                "ref": {
+                    "type": "string",
+                    "description": (
+                        "Branch/tag/commit reference (default branch if omitted)"
+                    ),
+                },
+                "path": {
+                    "type": "string",
+                    "description": "Only search files below this directory",
+                    "default": "",
+                },
+                "pattern": {
+                    "type": "string",
+                    "description": (
+                        "Only search files whose path matches this glob, "
+                        "e.g. '**/*.py'"
+                    ),
+                },
+                **FIELDS_PARAMETER,
+                **BUDGET_PARAMETERS,
+                **PAGINATION_PARAMETERS,
+                "limit": {
+                    **PAGINATION_PARAMETERS["limit"],
+                    "default": SEARCH_DEFAULT_LIMIT,
+                },
+            },
+            "required": ["owner", "repo", "query"],
+        },
+    )
+
 def register_all_tools() -> None:
     """Register all available tools."""
     register_repository_tools()
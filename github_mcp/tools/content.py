@@ -1,12 +1,139 @@
 """Content-related tool implementations."""
-import base64
-import json
-from typing import Any, Dict, List
+from contextlib import ExitStack, asynccontextmanager
+from typing import Any, AsyncIterator, BinaryIO, Dict, List, Optional, Tuple, cast
 
 from github import Github
+from github.GithubObject import NotSet
 from github.Repository import Repository
+from github.Requester import RequestsResponse
 
-from github_mcp.server import ToolResult
+from github_mcp.blob_store import (
+    decode_file,
+    get_path_index,
+    lookup_file,
+    record_listing,
+)
+from github_mcp.budget import (
+    OutputBudget,
+    cap_range,
+    cap_slice,
+    collect_within_budget,
+    file_summary,
+)
+from github_mcp.cache import get_repository
+from github_mcp.executor import run_blocking
+from github_mcp.file_batch import (
+    ArchiveOpener,
+    BlobFetcher,
+    is_glob,
+    iter_files,
+    select_paths,
+)
+from github_mcp.file_ranges import (
+    CHUNK_SIZE,
+    RAW_MEDIA_TYPE,
+    FileRange,
+    FileSlice,
+    needs_raw,
+    parse_file_range,
+    render_file,
+    slice_chunks,
+    slice_stored,
+)
+from github_mcp.models import ToolResult
+from github_mcp.pagination import Page
+from github_mcp.search_index import search_tree
+from github_mcp.serializers import text_result
+from github_mcp.transport import stream_download, stream_get
+from github_mcp.trees import (
+    TreeIndex,
+    get_tree_cache,
+    tree_listing,
+    tree_path,
+    warm_directory,
+)
+
+def _get_file(
+    github_client: Github,
+    owner: str,
+    repo: str,
+    path: str,
+    ref: Optional[str],
+) -> Tuple[Dict[str, Any], Optional[str]]:
+    """Fetch a file's contents API metadata and its base64 content, if inlined."""
+    repository: Repository = get_repository(github_client, owner, repo)
+    file_content = repository.get_contents(path, ref=ref or NotSet)
+    
+    if isinstance(file_content, list):
+        raise ValueError(f"Path '{path}' is a directory, not a file")
+    
+    metadata = {
+        "name": file_content.name,
+        "path": file_content.path,
+        "sha": file_content.sha,
+        "size": file_content.size,
+        "url": file_content.html_url,
+        "download_url": file_content.download_url,
+        "type": file_content.type,
+        "encoding": file_content.encoding,
+    }
+    return metadata, file_content.content
+
+def _read_file(
+    github_client: Github,
+    owner: str,
+    repo: str,
+    ref: Optional[str],
+    metadata: Dict[str, Any],
+    encoded: Optional[str],
+    file_range: FileRange,
+) -> FileSlice:
+    """Read a range of a file from its inlined content, the blob store or a download."""
+    sha = metadata["sha"]
+    size = metadata["size"]
+    if not needs_raw(metadata):
+        data = decode_file(owner, repo, ref, metadata, encoded)
+        return slice_chunks([data], sha, len(data), file_range)
+    
+    get_path_index().put(owner, repo, ref, metadata)
+    file_slice = slice_stored(sha, size, file_range)
+    if file_slice is not None:
+        return file_slice
+    # The contents API leaves out files over 1 MB; stream the raw blob instead.
+    with stream_get(
+        github_client.requester,
+        f"/repos/{owner}/{repo}/git/blobs/{sha}",
+        {"Accept": RAW_MEDIA_TYPE},
+    ) as response:
+        return slice_chunks(response.iter_content(CHUNK_SIZE), sha, size, file_range)
+
+def _fetch_file(
+    github_client: Github,
+    owner: str,
+    repo: str,
+    path: str,
+    ref: Optional[str],
+) -> Tuple[Dict[str, Any], bytes]:
+    """Fetch a file's contents API metadata and bytes."""
+    metadata, encoded = _get_file(github_client, owner, repo, path, ref)
+    return metadata, _read_file(
+        github_client, owner, repo, ref, metadata, encoded, FileRange()
+    ).data
+
+def _load_tree(
+    github_client: Github,
+    owner: str,
+    repo: str,
+    ref: Optional[str],
+) -> Tuple[TreeIndex, str]:
+    """Fetch the recursive tree of ``ref`` into the tree cache."""
+    resolved = ref or get_repository(github_client, owner, repo).default_branch
+    _, data = github_client.requester.requestJsonAndCheck(
+        "GET",
+        tree_path(owner, repo, resolved),
+        parameters={"recursive": "1"},
+    )
+    return get_tree_cache().store(owner, repo, ref, resolved, data), resolved
 
 async def handle_get_file_content(
     github_client: Github,
@@ -17,29 +144,29 @@ async def handle_get_file_content(
     repo = parameters["repo"]
     path = parameters["path"]
     ref = parameters.get("ref")
+    max_bytes = parameters.get("max_bytes")
+    file_range = cap_range(parse_file_range(parameters), max_bytes)
     
-    repository: Repository = github_client.get_repo(f"{owner}/{repo}")
-    file_content = repository.get_contents(path, ref=ref)
+    def read_file() -> Tuple[Dict[str, Any], FileSlice]:
+        # A file at a commit SHA we have read before needs no request at all.
+        metadata = lookup_file(owner, repo, ref, path)
+        file_slice = None
+        if metadata is not None:
+            file_slice = slice_stored(metadata["sha"], metadata["size"], file_range)
+        if metadata is None or file_slice is None:
+            metadata, encoded = _get_file(github_client, owner, repo, path, ref)
+            file_slice = _read_file(
+                github_client, owner, repo, ref, metadata, encoded, file_range
+            )
+        return metadata, cap_slice(file_slice, max_bytes)
     
-    if isinstance(file_content, list):
-        raise ValueError(f"Path '{path}' is a directory, not a file")
+    metadata, file_slice = await run_blocking(read_file)
     
-    content = base64.b64decode(file_content.content).decode("utf-8")
-    
-    return ToolResult(content=[{
-        "type": "text",
-        "text": json.dumps({
-            "name": file_content.name,
-            "path": file_content.path,
-            "sha": file_content.sha,
-            "size": file_content.size,
-            "url": file_content.html_url,
-            "download_url": file_content.download_url,
-            "type": file_content.type,
-            "encoding": file_content.encoding,
-            "content": content,
-        }, indent=2)
-    }])
+    return text_result(
+        render_file(metadata, file_slice, file_range),
+        parameters.get("fields"),
+        elided=file_summary(file_range, file_slice, max_bytes),
+    )
 
 async def handle_list_directory(
     github_client: Github,
@@ -51,15 +178,16 @@ async def handle_list_directory(
     path = parameters.get("path", "")
     ref = parameters.get("ref")
     
-    repository: Repository = github_client.get_repo(f"{owner}/{repo}")
-    contents = repository.get_contents(path, ref=ref)
-    
-    if not isinstance(contents, list):
-        contents = [contents]
-    
-    return ToolResult(content=[{
-        "type": "text",
-        "text": json.dumps([{
+    def fetch_directory() -> List[Dict[str, Any]]:
+        repository: Repository = get_repository(github_client, owner, repo)
+        contents = repository.get_contents(path, ref=ref or NotSet)
+        
+        listing = isinstance(contents, list)
+        items = contents if isinstance(contents, list) else [contents]
+        
+        # Directory entries have no encoding, and reading it would make
+        # PyGithub fetch each entry again.
+        entries = [{
             "name": item.name,
             "path": item.path,
             "sha": item.sha,
@@ -67,6 +195,131 @@ async def handle_list_directory(
             "url": item.html_url,
             "download_url": item.download_url,
             "type": item.type,
-            "encoding": item.encoding if hasattr(item, "encoding") else None,
-        } for item in contents], indent=2)
-    }]) 
\ No newline at end of file
+            "encoding": None if listing else item.encoding,
+        } for item in items]
+        record_listing(owner, repo, ref, entries)
+        return entries
+    
+    # After get_tree, directories are listed from the path index.
+    entries = warm_directory(owner, repo, ref, path)
+    if entries is not None:
+        record_listing(owner, repo, ref, entries)
+    else:
+        entries = await run_blocking(fetch_directory)
+    
+    return text_result(entries, parameters.get("fields"))
+
+async def handle_get_tree(
+    github_client: Github,
+    parameters: Dict[str, Any],
+) -> ToolResult:
+    """Handle get_tree tool call."""
+    owner = parameters["owner"]
+    repo = parameters["repo"]
+    ref = parameters.get("ref")
+    
+    snapshot = get_tree_cache().lookup(owner, repo, ref)
+    if snapshot is None:
+        snapshot = await run_blocking(_load_tree, github_client, owner, repo, ref)
+    index, resolved = snapshot
+    budget = OutputBudget.from_parameters(parameters, text_field=None)
+    result, next_cursor = tree_listing(index, resolved, parameters, budget)
+    
+    return text_result(result, next_cursor=next_cursor, elided=budget.summary())
+
+def _file_sources(
+    github_client: Github,
+    parameters: Dict[str, Any],
+) -> Tuple[BlobFetcher, ArchiveOpener]:
+    """Fetch single files, or open the tarball, at the call's ref."""
+    owner = parameters["owner"]
+    repo = parameters["repo"]
+    ref = parameters.get("ref")
+    
+    async def fetch_blob(path: str) -> Tuple[str, bytes]:
+        metadata, content = await run_blocking(
+            _fetch_file, github_client, owner, repo, path, ref
+        )
+        return metadata["sha"], content
+    
+    @asynccontextmanager
+    async def open_archive() -> AsyncIterator[BinaryIO]:
+        with ExitStack() as stack:
+            def download() -> RequestsResponse:
+                repository: Repository = get_repository(github_client, owner, repo)
+                # GitHub redirects to a short-lived, pre-authorised download URL.
+                url = repository.get_archive_link("tarball", ref or NotSet)
+                return stack.enter_context(
+                    stream_download(github_client.requester, url)
+                )
+            
+            response = await run_blocking(download)
+            yield cast(BinaryIO, response.response.raw)
+    
+    return fetch_blob, open_archive
+
+def stream_get_files(
+    github_client: Github,
+    parameters: Dict[str, Any],
+) -> AsyncIterator[Page[Dict[str, Any]]]:
+    """Yield get_files results file by file."""
+    owner = parameters["owner"]
+    repo = parameters["repo"]
+    ref = parameters.get("ref")
+    patterns = parameters["paths"]
+    fetch_blob, open_archive = _file_sources(github_client, parameters)
+    
+    async def files() -> AsyncIterator[Page[Dict[str, Any]]]:
+        # Globs need the tree; a warm tree also lets cached blobs skip the API.
+        snapshot = get_tree_cache().lookup(owner, repo, ref)
+        if snapshot is None and any(is_glob(pattern) for pattern in patterns):
+            snapshot = await run_blocking(_load_tree, github_client, owner, repo, ref)
+        index = snapshot[0] if snapshot is not None else None
+        paths, next_cursor = select_paths(patterns, index, parameters)
+        async for page in iter_files(
+            paths, index, fetch_blob, open_archive, next_cursor
+        ):
+            yield page
+    
+    return files()
+
+async def handle_get_files(
+    github_client: Github,
+    parameters: Dict[str, Any],
+) -> ToolResult:
+    """Handle get_files tool call."""
+    budget = OutputBudget.from_parameters(
+        parameters, text_field="content", droppable=False
+    )
+    files, next_cursor = await collect_within_budget(
+        stream_get_files(github_client, parameters), budget
+    )
+    
+    return text_result(files, next_cursor=next_cursor, elided=budget.summary())
+
+async def handle_search_content(
+    github_client: Github,
+    parameters: Dict[str, Any],
+) -> ToolResult:
+    """Handle search_content tool call."""
+    owner = parameters["owner"]
+    repo = parameters["repo"]
+    ref = parameters.get("ref")
+    
+    snapshot = get_tree_cache().lookup(owner, repo, ref)
+    if snapshot is None:
+        snapshot = await run_blocking(_load_tree, github_client, owner, repo, ref)
+    index, resolved = snapshot
+    fetch_blob, open_archive = _file_sources(github_client, parameters)
+    budget = OutputBudget.from_parameters(parameters, text_field="text")
+    result, next_cursor = await search_tree(
+        owner,
+        repo,
+        index,
+        resolved,
+        parameters,
+        lambda paths: iter_files(paths, index, fetch_blob, open_archive),
+        budget,
+    )
+    
+    return text_result(result, next_cursor=next_cursor, elided=budget.summary())
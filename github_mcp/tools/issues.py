@@ -1,28 +1,60 @@
 """Issue-related tool implementations."""
-import json
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Tuple
 
 from github import Github
+from github.Issue import Issue
 from github.Repository import Repository
 
-from github_mcp.server import ToolResult
+from github_mcp.budget import OutputBudget, collect_within_budget
+from github_mcp.cache import get_repository
+from github_mcp.executor import run_blocking
+from github_mcp.mirror import ISSUES, local_filters, mirrored_listing, record_created
+from github_mcp.models import ToolResult
+from github_mcp.pagination import (
+    Page,
+    fetch_github_page,
+    iter_pages,
+    parse_page_request,
+)
+from github_mcp.serializers import text_result
 
-async def handle_list_issues(
+def stream_list_issues(
     github_client: Github,
     parameters: Dict[str, Any],
-) -> ToolResult:
-    """Handle list_issues tool call."""
+) -> AsyncIterator[Page[Dict[str, Any]]]:
+    """Yield list_issues results page by page."""
     owner = parameters["owner"]
     repo = parameters["repo"]
     state = parameters.get("state", "open")
     labels = parameters.get("labels", [])
+    query: Dict[str, Any] = {"state": state}
+    if labels:
+        query["labels"] = ",".join(labels)
+    if parameters.get("author"):
+        query["creator"] = parameters["author"]
+    if parameters.get("assignee"):
+        query["assignee"] = parameters["assignee"]
+    page_request = parse_page_request(
+        parameters,
+        {"owner": owner, "repo": repo, **query, **local_filters(ISSUES, parameters)},
+    )
+    mirrored = mirrored_listing(ISSUES, parameters, page_request)
+    if mirrored is not None:
+        return mirrored
     
-    repository: Repository = github_client.get_repo(f"{owner}/{repo}")
-    issues = repository.get_issues(state=state, labels=labels)
-    
-    return ToolResult(content=[{
-        "type": "text",
-        "text": json.dumps([{
+    def fetch_page(page: int, per_page: int) -> Tuple[List[Dict[str, Any]], bool]:
+        # Issues that are not pull requests have no pull_request key, and
+        # reading it would make PyGithub fetch each issue again; pull
+        # requests are told apart by their URL instead.
+        issues, has_next = fetch_github_page(
+            github_client.requester,
+            Issue,
+            f"/repos/{owner}/{repo}/issues",
+            query,
+            page,
+            per_page,
+        )
+        return [{
             "number": issue.number,
             "title": issue.title,
             "state": issue.state,
@@ -37,9 +69,25 @@ async def handle_list_issues(
             "comments": issue.comments,
             "locked": issue.locked,
             "milestone": issue.milestone.title if issue.milestone else None,
-            "pull_request": bool(issue.pull_request),
-        } for issue in issues[:10]], indent=2)
-    }])
+            "pull_request": "/pull/" in issue.html_url,
+        } for issue in issues], has_next
+    
+    return iter_pages(
+        lambda page, per_page: run_blocking(fetch_page, page, per_page),
+        page_request,
+    )
+
+async def handle_list_issues(
+    github_client: Github,
+    parameters: Dict[str, Any],
+) -> ToolResult:
+    """Handle list_issues tool call."""
+    budget = OutputBudget.from_parameters(parameters)
+    issues, next_cursor = await collect_within_budget(
+        stream_list_issues(github_client, parameters), budget
+    )
+    
+    return text_result(issues, next_cursor=next_cursor, elided=budget.summary())
 
 async def handle_create_issue(
     github_client: Github,
@@ -53,17 +101,16 @@ async def handle_create_issue(
     labels = parameters.get("labels", [])
     assignees = parameters.get("assignees", [])
     
-    repository: Repository = github_client.get_repo(f"{owner}/{repo}")
-    issue = repository.create_issue(
-        title=title,
-        body=body,
-        labels=labels,
-        assignees=assignees,
-    )
-    
-    return ToolResult(content=[{
-        "type": "text",
-        "text": json.dumps({
+    def create_issue() -> Dict[str, Any]:
+        repository: Repository = get_repository(github_client, owner, repo)
+        issue = repository.create_issue(
+            title=title,
+            body=body,
+            labels=labels,
+            assignees=assignees,
+        )
+        record_created(owner, repo, ISSUES, issue.raw_data)
+        return {
             "number": issue.number,
             "title": issue.title,
             "state": issue.state,
@@ -77,5 +124,6 @@ async def handle_create_issue(
             "comments": issue.comments,
             "locked": issue.locked,
             "milestone": issue.milestone.title if issue.milestone else None,
-        }, indent=2)
-    }]) 
\ No newline at end of file
+        }
+    
+    return text_result(await run_blocking(create_issue), parameters.get("fields"))
\ No newline at end of file
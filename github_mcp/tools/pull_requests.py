@@ -1,63 +1,141 @@
 """Pull request-related tool implementations."""
-import json
-from typing import Any, Dict, List
+import asyncio
+from typing import Any, AsyncIterator, Callable, Dict, List, Tuple
 
 from github import Github
+from github.PullRequest import PullRequest
 from github.Repository import Repository
 
-from github_mcp.server import ToolResult
+from github_mcp.budget import OutputBudget, collect_within_budget
+from github_mcp.cache import get_repository
+from github_mcp.executor import run_blocking
+from github_mcp.mirror import (
+    MIRROR_SORTS,
+    PULLS,
+    local_filters,
+    mirrored_listing,
+    record_created,
+)
+from github_mcp.models import ToolResult
+from github_mcp.pagination import (
+    Page,
+    fetch_github_page,
+    iter_pages,
+    parse_page_request,
+)
+from github_mcp.planner import (
+    PULL_REQUEST_DETAIL_FIELDS,
+    PULL_REQUEST_FIELDS,
+    plan_fields,
+)
+from github_mcp.serializers import text_result
 
-async def handle_list_pull_requests(
+PULL_REQUEST_GETTERS: Dict[str, Callable[[PullRequest], Any]] = {
+    "number": lambda pr: pr.number,
+    "title": lambda pr: pr.title,
+    "state": lambda pr: pr.state,
+    "url": lambda pr: pr.html_url,
+    "body": lambda pr: pr.body,
+    "created_at": lambda pr: pr.created_at.isoformat(),
+    "updated_at": lambda pr: pr.updated_at.isoformat(),
+    "closed_at": lambda pr: pr.closed_at.isoformat() if pr.closed_at else None,
+    "merged_at": lambda pr: pr.merged_at.isoformat() if pr.merged_at else None,
+    "head": lambda pr: {
+        "ref": pr.head.ref,
+        "sha": pr.head.sha,
+        "user": pr.head.user.login,
+        "repo": pr.head.repo.full_name if pr.head.repo else None,
+    },
+    "base": lambda pr: {
+        "ref": pr.base.ref,
+        "sha": pr.base.sha,
+        "user": pr.base.user.login,
+        "repo": pr.base.repo.full_name,
+    },
+    "author": lambda pr: pr.user.login,
+    "assignees": lambda pr: [assignee.login for assignee in pr.assignees],
+    "labels": lambda pr: [label.name for label in pr.labels],
+    "comments": lambda pr: pr.comments,
+    "review_comments": lambda pr: pr.review_comments,
+    "commits": lambda pr: pr.commits,
+    "additions": lambda pr: pr.additions,
+    "deletions": lambda pr: pr.deletions,
+    "changed_files": lambda pr: pr.changed_files,
+    "draft": lambda pr: pr.draft,
+    "mergeable": lambda pr: pr.mergeable,
+    "mergeable_state": lambda pr: pr.mergeable_state,
+}
+
+def stream_list_pull_requests(
     github_client: Github,
     parameters: Dict[str, Any],
-) -> ToolResult:
-    """Handle list_pull_requests tool call."""
+) -> AsyncIterator[Page[Dict[str, Any]]]:
+    """Yield list_pull_requests results page by page."""
     owner = parameters["owner"]
     repo = parameters["repo"]
     state = parameters.get("state", "open")
     sort = parameters.get("sort", "created")
+    plan = plan_fields(
+        parameters.get("fields"),
+        PULL_REQUEST_FIELDS,
+        PULL_REQUEST_DETAIL_FIELDS,
+    )
+    query = {"state": state, "sort": sort}
+    page_request = parse_page_request(
+        parameters,
+        {"owner": owner, "repo": repo, **query, **local_filters(PULLS, parameters)},
+    )
+    mirrored = mirrored_listing(
+        PULLS,
+        parameters,
+        page_request,
+        sort,
+        plan.fields,
+        usable=not plan.needs_detail and sort in MIRROR_SORTS,
+    )
+    if mirrored is not None:
+        return mirrored
     
-    repository: Repository = github_client.get_repo(f"{owner}/{repo}")
-    pulls = repository.get_pulls(state=state, sort=sort)
+    def serialize(pulls: List[PullRequest]) -> List[Dict[str, Any]]:
+        return [{
+            name: PULL_REQUEST_GETTERS[name](pr) for name in plan.fields
+        } for pr in pulls]
     
-    return ToolResult(content=[{
-        "type": "text",
-        "text": json.dumps([{
-            "number": pr.number,
-            "title": pr.title,
-            "state": pr.state,
-            "url": pr.html_url,
-            "body": pr.body,
-            "created_at": pr.created_at.isoformat(),
-            "updated_at": pr.updated_at.isoformat(),
-            "closed_at": pr.closed_at.isoformat() if pr.closed_at else None,
-            "merged_at": pr.merged_at.isoformat() if pr.merged_at else None,
-            "head": {
-                "ref": pr.head.ref,
-                "sha": pr.head.sha,
-                "user": pr.head.user.login,
-                "repo": pr.head.repo.full_name if pr.head.repo else None,
-            },
-            "base": {
-                "ref": pr.base.ref,
-                "sha": pr.base.sha,
-                "user": pr.base.user.login,
-                "repo": pr.base.repo.full_name,
-            },
-            "author": pr.user.login,
-            "assignees": [assignee.login for assignee in pr.assignees],
-            "labels": [label.name for label in pr.labels],
-            "comments": pr.comments,
-            "review_comments": pr.review_comments,
-            "commits": pr.commits,
-            "additions": pr.additions,
-            "deletions": pr.deletions,
-            "changed_files": pr.changed_files,
-            "draft": pr.draft,
-            "mergeable": pr.mergeable,
-            "mergeable_state": pr.mergeable_state,
-        } for pr in pulls[:10]], indent=2)
-    }])
+    async def fetch_page(page: int, per_page: int) -> Tuple[List[Dict[str, Any]], bool]:
+        pulls, has_next = await run_blocking(
+            fetch_github_page,
+            github_client.requester,
+            PullRequest,
+            f"/repos/{owner}/{repo}/pulls",
+            query,
+            page,
+            per_page,
+        )
+        if plan.needs_detail and pulls:
+            # Detail fields are not in the list payload; fetch the full pull
+            # requests concurrently instead of letting PyGithub complete each
+            # one lazily in turn.
+            repository: Repository = await run_blocking(
+                get_repository, github_client, owner, repo
+            )
+            pulls = list(await asyncio.gather(*(
+                run_blocking(repository.get_pull, pr.number) for pr in pulls
+            )))
+        return await run_blocking(serialize, pulls), has_next
+    
+    return iter_pages(fetch_page, page_request)
+
+async def handle_list_pull_requests(
+    github_client: Github,
+    parameters: Dict[str, Any],
+) -> ToolResult:
+    """Handle list_pull_requests tool call."""
+    budget = OutputBudget.from_parameters(parameters)
+    pulls, next_cursor = await collect_within_budget(
+        stream_list_pull_requests(github_client, parameters), budget
+    )
+    
+    return text_result(pulls, next_cursor=next_cursor, elided=budget.summary())
 
 async def handle_create_pull_request(
     github_client: Github,
@@ -72,18 +150,17 @@ async def handle_create_pull_request(
     base = parameters.get("base", "main")
     draft = parameters.get("draft", False)
     
-    repository: Repository = github_client.get_repo(f"{owner}/{repo}")
-    pr = repository.create_pull(
-        title=title,
-        body=body,
-        head=head,
-        base=base,
-        draft=draft,
-    )
-    
-    return ToolResult(content=[{
-        "type": "text",
-        "text": json.dumps({
+    def create_pull_request() -> Dict[str, Any]:
+        repository: Repository = get_repository(github_client, owner, repo)
+        pr = repository.create_pull(
+            title=title,
+            body=body,
+            head=head,
+            base=base,
+            draft=draft,
+        )
+        record_created(owner, repo, PULLS, pr.raw_data)
+        return {
             "number": pr.number,
             "title": pr.title,
             "state": pr.state,
@@ -115,5 +192,8 @@ async def handle_create_pull_request(
             "draft": pr.draft,
             "mergeable": pr.mergeable,
             "mergeable_state": pr.mergeable_state,
-        }, indent=2)
-    }]) 
\ No newline at end of file
+        }
+    
+    result = await run_blocking(create_pull_request)
+    
+    return text_result(result, parameters.get("fields"))
\ No newline at end of file
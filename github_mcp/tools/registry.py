@@ -0,0 +1,15 @@
+"""Registry of the tools the MCP server exposes."""
+from typing import Any, Dict
+
+from github_mcp.models import ToolDefinition
+
+TOOLS: Dict[str, ToolDefinition] = {}
+
+
+def register_tool(name: str, description: str, parameters: Dict[str, Any]) -> None:
+    """Register a new tool with the MCP server."""
+    TOOLS[name] = ToolDefinition(
+        name=name,
+        description=description,
+        parameters=parameters,
+    )
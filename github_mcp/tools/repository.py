@@ -1,24 +1,71 @@
 """Repository-related tool implementations."""
-import json
-from typing import Any, Dict, List
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from github import Github
 from github.Repository import Repository
 
-from github_mcp.server import ToolResult
+from github_mcp.budget import OutputBudget, collect_within_budget
+from github_mcp.config import get_settings
+from github_mcp.cache import get_repository
+from github_mcp.executor import run_blocking
+from github_mcp.graphql import (
+    GET_REPOSITORY_QUERY,
+    LIST_REPOSITORIES_QUERY,
+    list_repositories_variables,
+    repositories_from_response,
+    repositories_page_info,
+    repository_from_response,
+)
+from github_mcp.models import ToolResult
+from github_mcp.pagination import (
+    Page,
+    fetch_github_page,
+    iter_cursor_pages,
+    iter_pages,
+    parse_page_request,
+)
+from github_mcp.serializers import text_result
 
-async def handle_list_repositories(
+logger = logging.getLogger(__name__)
+
+async def _graphql(
+    github_client: Github,
+    query: str,
+    variables: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    """Run a GraphQL query, returning None if GraphQL is disabled or fails."""
+    if not get_settings().graphql:
+        return None
+    try:
+        _, data = await run_blocking(
+            github_client.requester.graphql_query, query, variables
+        )
+        return data
+    except Exception as e:
+        logger.warning(f"GraphQL query failed, falling back to REST: {str(e)}")
+        return None
+
+def stream_list_repositories(
     github_client: Github,
     parameters: Dict[str, Any],
-) -> ToolResult:
-    """Handle list_repositories tool call."""
+) -> AsyncIterator[Page[Dict[str, Any]]]:
+    """Yield list_repositories results page by page."""
     visibility = parameters.get("visibility", "all")
     sort = parameters.get("sort", "updated")
-    repos = github_client.get_user().get_repos(visibility=visibility, sort=sort)
+    query = {"visibility": visibility, "sort": sort}
+    page_request = parse_page_request(parameters, query)
     
-    return ToolResult(content=[{
-        "type": "text",
-        "text": json.dumps([{
+    def fetch_page(page: int, per_page: int) -> Tuple[List[Dict[str, Any]], bool]:
+        repos, has_next = fetch_github_page(
+            github_client.requester,
+            Repository,
+            "/user/repos",
+            query,
+            page,
+            per_page,
+        )
+        return [{
             "name": repo.name,
             "full_name": repo.full_name,
             "description": repo.description,
@@ -29,12 +76,48 @@ async def handle_list_repositories(
             "archived": repo.archived,
             "default_branch": repo.default_branch,
             "language": repo.language,
-            "topics": repo.get_topics(),
+            "topics": repo.topics,
             "created_at": repo.created_at.isoformat(),
             "updated_at": repo.updated_at.isoformat(),
             "pushed_at": repo.pushed_at.isoformat() if repo.pushed_at else None,
-        } for repo in repos[:10]], indent=2)
-    }])
+        } for repo in repos], has_next
+    
+    def rest_pages() -> AsyncIterator[Page[Dict[str, Any]]]:
+        return iter_pages(
+            lambda page, per_page: run_blocking(fetch_page, page, per_page),
+            page_request,
+        )
+    
+    async def fetch_graphql_page(
+        after: Optional[str],
+        first: int,
+    ) -> Optional[Tuple[List[Dict[str, Any]], Optional[str], bool]]:
+        data = await _graphql(
+            github_client,
+            LIST_REPOSITORIES_QUERY,
+            list_repositories_variables(visibility, sort, first, after),
+        )
+        if data is None:
+            return None
+        return (repositories_from_response(data), *repositories_page_info(data))
+    
+    # GraphQL cannot seek to a page number, so page/offset positions are
+    # always served by REST.
+    if page_request.after is not None or page_request.at_start:
+        return iter_cursor_pages(fetch_graphql_page, page_request, fallback=rest_pages)
+    return rest_pages()
+
+async def handle_list_repositories(
+    github_client: Github,
+    parameters: Dict[str, Any],
+) -> ToolResult:
+    """Handle list_repositories tool call."""
+    budget = OutputBudget.from_parameters(parameters, text_field="description")
+    repositories, next_cursor = await collect_within_budget(
+        stream_list_repositories(github_client, parameters), budget
+    )
+    
+    return text_result(repositories, next_cursor=next_cursor, elided=budget.summary())
 
 async def handle_get_repository(
     github_client: Github,
@@ -43,11 +126,10 @@ async def handle_get_repository(
     """Handle get_repository tool call."""
     owner = parameters["owner"]
     repo = parameters["repo"]
-    repository: Repository = github_client.get_repo(f"{owner}/{repo}")
     
-    return ToolResult(content=[{
-        "type": "text",
-        "text": json.dumps({
+    def fetch_repository() -> Dict[str, Any]:
+        repository: Repository = get_repository(github_client, owner, repo)
+        return {
             "name": repository.name,
             "full_name": repository.full_name,
             "description": repository.description,
@@ -58,7 +140,7 @@ async def handle_get_repository(
             "archived": repository.archived,
             "default_branch": repository.default_branch,
             "language": repository.language,
-            "topics": repository.get_topics(),
+            "topics": repository.topics,
             "created_at": repository.created_at.isoformat(),
             "updated_at": repository.updated_at.isoformat(),
             "pushed_at": repository.pushed_at.isoformat() if repository.pushed_at else None,
@@ -72,5 +154,16 @@ async def handle_get_repository(
                 "push": repository.permissions.push,
                 "pull": repository.permissions.pull,
             },
-        }, indent=2)
-    }]) 
\ No newline at end of file
+        }
+    
+    data = await _graphql(
+        github_client,
+        GET_REPOSITORY_QUERY,
+        {"owner": owner, "name": repo},
+    )
+    if data is not None and data["data"]["repository"] is not None:
+        repository = repository_from_response(data)
+    else:
+        repository = await run_blocking(fetch_repository)
+    
+    return text_result(repository, parameters.get("fields"))
\ No newline at end of file
@@ -0,0 +1,293 @@
+"""PyGithub connection classes that add response caching and rate-limit scheduling.
+
+PyGithub exposes its HTTP layer through ``Requester.injectConnectionClasses``.
+Injected classes are instantiated once per request, so these keep one
+pooled ``requests.Session`` per origin and credential and reuse it, and
+only add behaviour around :meth:`getresponse`.
+"""
+import hashlib
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, ContextManager, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from github.Requester import (
+    HTTPRequestsConnectionClass,
+    HTTPSRequestsConnectionClass,
+    Requester,
+    RequestsResponse,
+)
+from requests.structures import CaseInsensitiveDict
+
+from github_mcp.metrics import record_upstream
+from github_mcp.rate_limit import get_rate_limiter, resource_for
+from github_mcp.response_cache import CachedResponse, get_response_cache
+
+logger = logging.getLogger(__name__)
+
+_sessions: Dict[Tuple[str, str, int, str], requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def session_credential(authorization: Optional[str]) -> str:
+    """Fingerprint of an ``Authorization`` header that keys its sessions."""
+    return hashlib.sha256((authorization or "").encode()).hexdigest()[:16]
+
+
+def _shared_session(
+    protocol: str,
+    host: str,
+    port: int,
+    credential: str,
+    retry: Any,
+    pool_size: Optional[int],
+) -> requests.Session:
+    """Return a credential's pooled session for an origin, creating it on first use."""
+    key = (protocol, host, port, credential)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            session.auth = Requester.noopAuth
+            pool_size = pool_size or requests.adapters.DEFAULT_POOLSIZE
+            adapter = requests.adapters.HTTPAdapter(
+                max_retries=(
+                    retry if retry is not None else requests.adapters.DEFAULT_RETRIES
+                ),
+                pool_connections=pool_size,
+                pool_maxsize=pool_size,
+            )
+            session.mount(f"{protocol}://", adapter)
+            _sessions[key] = session
+        return session
+
+
+class ReplayedResponse(RequestsResponse):
+    """A cached body presented as a PyGithub ``RequestsResponse``."""
+
+    def __init__(self, cached: CachedResponse) -> None:
+        response = requests.Response()
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict(cached.headers)
+        super().__init__(response)
+        self._body = cached.body
+
+    def read(self) -> str:
+        return self._body.decode("utf-8")
+
+    def iter_content(self, chunk_size: Optional[int] = 1) -> Iterator[bytes]:
+        size = chunk_size or len(self._body) or 1
+        for start in range(0, len(self._body), size):
+            yield self._body[start:start + size]
+
+
+class _CachingConnectionMixin:
+    """Serve GETs through the response cache using conditional requests.
+
+    Every request also passes through the rate-limit scheduler, which
+    replaces PyGithub's own retry policy.
+    """
+
+    protocol: str
+    host: str
+    port: int
+    verb: str
+    url: str
+    headers: Dict[str, str]
+    stream: bool
+    input: Any
+    timeout: Optional[int]
+    verify: Any
+    session: requests.Session
+    retry: Any
+    pool_size: int
+
+    def getresponse(self) -> RequestsResponse:
+        """Send the request once the rate-limit scheduler admits it; retry failures."""
+        limiter = get_rate_limiter()
+        resource = resource_for(self.url)
+        write = self.verb != "GET" and resource != "graphql"
+        headers = self.headers
+        attempt = 0
+        while True:
+            wait = limiter.delay(resource, write)
+            if wait > 0:
+                time.sleep(wait)
+            # Each attempt starts from the caller's headers, without validators
+            # added for the previous one.
+            self.headers = headers
+            response = self._cached_response()
+            delay = (
+                limiter.backoff_delay(attempt, response.status, response.headers, write)
+                if response.status >= 400 else None
+            )
+            if delay is None:
+                return response
+            logger.warning(
+                f"GitHub returned {response.status}; retrying in {delay:.1f}s"
+            )
+            time.sleep(delay)
+            attempt += 1
+
+    def _send(self) -> RequestsResponse:
+        """Send the request and report its rate-limit headers and cost."""
+        self.session = _shared_session(
+            self.protocol,
+            self.host,
+            self.port,
+            session_credential(self.headers.get("Authorization")),
+            self.retry,
+            self.pool_size,
+        )
+        started = time.perf_counter()
+        # As PyGithub's getresponse, but a streamed body is left unread.
+        response = RequestsResponse(
+            self.session.request(
+                self.verb,
+                f"{self.protocol}://{self.host}:{self.port}{self.url}",
+                headers=self.headers,
+                data=self.input,
+                timeout=self.timeout,
+                verify=self.verify,
+                allow_redirects=False,
+                stream=self.stream,
+            )
+        )
+        get_rate_limiter().observe(response.status, response.headers)
+        # Reading a streamed body here would defeat the stream.
+        size = (
+            int(response.headers.get("content-length") or 0)
+            if self.stream else len(response.response.content)
+        )
+        record_upstream(
+            self.verb,
+            f"{self.protocol}://{self.host}:{self.port}{self.url}",
+            response.status,
+            size,
+            started,
+        )
+        return response
+
+    def _cached_response(self) -> RequestsResponse:
+        cache = get_response_cache()
+        conditional = any(
+            name.lower() in ("if-none-match", "if-modified-since")
+            for name in self.headers
+        )
+        # Requests that already carry validators (PyGithub's own update())
+        # expect to see the 304 themselves.
+        if cache is None or self.verb != "GET" or self.stream or conditional:
+            return self._send()
+
+        key = cache.key(
+            f"{self.protocol}://{self.host}:{self.port}{self.url}",
+            self.headers.get("Authorization"),
+        )
+        cached = cache.lookup(key)
+        if cached is not None:
+            self.headers = {**self.headers, **cached.conditional_headers()}
+
+        response = self._send()
+        if response.status == 304 and cached is not None:
+            return ReplayedResponse(cache.revalidated(key, cached, response.headers))
+        if response.status == 200:
+            cache.store(key, response.response.content, response.headers)
+        return response
+
+    def close(self) -> None:
+        # The session is shared between the credential's connections;
+        # close_sessions closes it with the client.
+        pass
+
+
+class CachingHTTPSConnection(_CachingConnectionMixin, HTTPSRequestsConnectionClass):
+    """HTTPS connection class with response caching."""
+
+
+class CachingHTTPConnection(_CachingConnectionMixin, HTTPRequestsConnectionClass):
+    """HTTP connection class with response caching."""
+
+
+@contextmanager
+def _stream(
+    requester: Requester,
+    url: str,
+    headers: Dict[str, str],
+) -> Iterator[RequestsResponse]:
+    """Stream a GET of ``url`` on a caching connection with the requester's settings."""
+    parts = urlparse(url)
+    if not parts.hostname:
+        raise ValueError(f"Cannot stream a relative URL: {url}")
+    kwargs = requester.kwargs
+    connection_class = (
+        CachingHTTPSConnection if parts.scheme == "https" else CachingHTTPConnection
+    )
+    connection = connection_class(
+        parts.hostname,
+        parts.port,
+        timeout=kwargs["timeout"],
+        retry=kwargs["retry"],
+        pool_size=kwargs["pool_size"],
+        verify=kwargs["verify"],
+    )
+    path = f"{parts.path}?{parts.query}" if parts.query else parts.path
+    headers = {**headers, "User-Agent": kwargs["user_agent"]}
+    connection.request("GET", path, None, headers, stream=True)
+    response = connection.getresponse()
+    try:
+        response.raise_for_status()
+        yield response
+    finally:
+        response.response.close()
+
+
+def stream_get(
+    requester: Requester,
+    path: str,
+    headers: Dict[str, str],
+) -> ContextManager[RequestsResponse]:
+    """Stream a GET of an API path with the requester's credential and settings.
+
+    PyGithub's own ``getStream`` insists on ``application/octet-stream``,
+    which the API's raw media types are not, so the request is sent on a
+    caching connection directly; it still passes through the rate-limit
+    scheduler and its retries.
+    """
+    headers = dict(headers)
+    if requester.auth is not None:
+        requester.auth.authentication(headers)
+    return _stream(requester, requester.base_url.rstrip("/") + path, headers)
+
+
+def stream_download(requester: Requester, url: str) -> ContextManager[RequestsResponse]:
+    """Stream a pre-authorised download URL, such as a repository archive link.
+
+    The URL carries its own short-lived token, so no credential is sent;
+    the download still uses a pooled session and the scheduler's retries.
+    """
+    return _stream(requester, url, {})
+
+
+def close_sessions(requester: Requester) -> int:
+    """Close the sessions of a requester's credential; return how many."""
+    headers: Dict[str, str] = {}
+    if requester.auth is not None:
+        requester.auth.authentication(headers)
+    credential = session_credential(headers.get("Authorization"))
+    with _sessions_lock:
+        keys = [key for key in _sessions if key[3] == credential]
+        sessions = [_sessions.pop(key) for key in keys]
+    for session in sessions:
+        session.close()
+    return len(sessions)
+
+
+def install() -> None:
+    """Route PyGithub's HTTP traffic through the caching connection classes.
+
+    Must run before the ``Github`` client is constructed.
+    """
+    Requester.injectConnectionClasses(CachingHTTPConnection, CachingHTTPSConnection)
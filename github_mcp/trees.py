@@ -0,0 +1,444 @@
+"""Recursive git tree snapshots and the path index built from them."""
+import bisect
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Pattern, Tuple
+from urllib.parse import quote
+
+from github_mcp.blob_store import is_immutable_ref
+from github_mcp.budget import OutputBudget, fit_page
+from github_mcp.cache import LRUCache
+from github_mcp.config import get_settings
+from github_mcp.context import credential_scoped, unscoped
+from github_mcp.metrics import record_cache_hit
+from github_mcp.pagination import parse_page_request, slice_page
+from github_mcp.shared_store import SharedStore, get_shared_store
+
+# Entries get_tree returns when no limit is given.
+TREE_DEFAULT_LIMIT = 1000
+
+# Tree entry types as list_directory reports them, by git file mode.
+_CONTENT_TYPES = {
+    "040000": "dir",
+    "120000": "symlink",
+    "160000": "submodule",
+}
+
+
+def tree_path(owner: str, repo: str, ref: str) -> str:
+    """REST path of the recursive tree for ``ref``."""
+    return f"/repos/{owner}/{repo}/git/trees/{quote(ref, safe='')}"
+
+
+def glob_pattern(pattern: str) -> Pattern[str]:
+    """Compile a path glob; ``*`` and ``?`` stay within a directory, ``**`` does not."""
+    parts = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith("**/", index):
+            parts.append("(?:.*/)?")
+            index += 3
+            continue
+        if pattern.startswith("**", index):
+            parts.append(".*")
+            index += 2
+            continue
+        if char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", index + 1)
+            if end == -1:
+                parts.append(re.escape(char))
+            else:
+                body = pattern[index + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                parts.append(f"[{body}]")
+                index = end
+        else:
+            parts.append(re.escape(char))
+        index += 1
+    return re.compile("".join(parts) + r"\Z")
+
+
+class TreeIndex:
+    """Path index over one recursive tree.
+
+    Entries are sorted by path, so everything under a directory is one
+    contiguous range, found by bisection; direct children are grouped
+    by parent when the index is built so a directory listing is a lookup.
+    """
+
+    def __init__(
+        self, sha: str, entries: List[Dict[str, Any]], truncated: bool
+    ) -> None:
+        self.sha = sha
+        self.truncated = truncated
+        self.entries = sorted(entries, key=lambda entry: entry["path"])
+        self._paths = [entry["path"] for entry in self.entries]
+        self._children: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in self.entries:
+            parent = entry["path"].rpartition("/")[0]
+            self._children.setdefault(parent, []).append(entry)
+
+    @classmethod
+    def from_response(cls, data: Dict[str, Any]) -> "TreeIndex":
+        """Build an index from a ``git/trees?recursive=1`` payload."""
+        return cls(
+            data["sha"],
+            [{
+                "path": item["path"],
+                "mode": item["mode"],
+                "type": item["type"],
+                "sha": item["sha"],
+                "size": item.get("size"),
+            } for item in data["tree"]],
+            bool(data.get("truncated")),
+        )
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        """Return the entry at ``path``."""
+        path = path.strip("/")
+        index = bisect.bisect_left(self._paths, path)
+        if index < len(self._paths) and self._paths[index] == path:
+            return self.entries[index]
+        return None
+
+    def is_directory(self, path: str) -> bool:
+        """Return True if ``path`` is the root or a directory in the tree."""
+        path = path.strip("/")
+        if not path:
+            return True
+        entry = self.get(path)
+        return entry is not None and entry["type"] == "tree"
+
+    def children(self, path: str) -> List[Dict[str, Any]]:
+        """Return the direct children of a directory."""
+        return self._children.get(path.strip("/"), [])
+
+    def under(self, prefix: str) -> List[Dict[str, Any]]:
+        """Return every entry below the directory ``prefix``."""
+        prefix = prefix.strip("/")
+        if not prefix:
+            return self.entries
+        start = bisect.bisect_left(self._paths, prefix + "/")
+        # "0" sorts right after "/", so this bounds the "prefix/" range.
+        end = bisect.bisect_left(self._paths, prefix + "0", lo=start)
+        return self.entries[start:end]
+
+    def find(
+        self,
+        prefix: str = "",
+        pattern: Optional[str] = None,
+        entry_type: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return entries below ``prefix`` matching a glob and entry type."""
+        entries = self.under(prefix)
+        if entry_type is not None:
+            entries = [entry for entry in entries if entry["type"] == entry_type]
+        if pattern:
+            regex = glob_pattern(pattern)
+            entries = [entry for entry in entries if regex.match(entry["path"])]
+        return entries
+
+
+def cursor_tree(index: Optional[TreeIndex]) -> Optional[str]:
+    """The tree SHA a listing's cursors are bound to, if it lists a tree.
+
+    The SHA goes into the cursor's query, so a cursor stops working once
+    the ref moves to another tree instead of paging through entries that
+    changed under it.
+    """
+    return None if index is None else index.sha
+
+
+def directory_entries(
+    index: TreeIndex,
+    owner: str,
+    repo: str,
+    ref: str,
+    path: str,
+) -> Optional[List[Dict[str, Any]]]:
+    """Answer list_directory from an index, in the contents API's format.
+
+    Returns None if ``path`` is not in the tree.
+    """
+    path = path.strip("/")
+    if index.is_directory(path):
+        items = index.children(path)
+    else:
+        entry = index.get(path)
+        if entry is None:
+            return None
+        items = [entry]
+
+    settings = get_settings()
+    entries = []
+    for item in items:
+        content_type = _CONTENT_TYPES.get(item["mode"], "file")
+        view = "tree" if content_type == "dir" else "blob"
+        downloadable = content_type in ("file", "symlink")
+        entries.append({
+            "name": item["path"].rpartition("/")[2],
+            "path": item["path"],
+            "sha": item["sha"],
+            "size": item["size"] or 0,
+            "url": (
+                f"{settings.web_url}/{owner}/{repo}/{view}/{ref}/{item['path']}"
+                if content_type != "submodule" else None
+            ),
+            "download_url": (
+                settings.raw_url(owner, repo, ref, item["path"])
+                if downloadable else None
+            ),
+            "type": content_type,
+            "encoding": None,
+        })
+    return entries
+
+
+@dataclass
+class TreeRef:
+    """The tree a ref pointed at when it was last fetched."""
+
+    tree_sha: str
+    ref: str
+
+
+class TreeCache:
+    """Tree indexes by tree SHA, plus which tree each ref points at.
+
+    A tree SHA names immutable content, so its index never goes stale.
+    What a branch or tag points at can move: refs are trusted for
+    ``ref_ttl`` seconds and then refetched, which the response cache
+    usually turns into a ``304`` that reuses the index already built.
+    Full commit SHAs never move and are trusted indefinitely.
+
+    With a ``shared`` store, fetched trees and refs are also written to
+    it, and a local miss is answered from what other workers fetched.
+    Refs resolved with a caller's own token are kept apart from others';
+    the trees they point at are shared, as they are named by content.
+    """
+
+    def __init__(
+        self,
+        max_trees: int,
+        ref_ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+        shared: Optional[SharedStore] = None,
+    ) -> None:
+        self.ref_ttl = ref_ttl
+        self._trees: LRUCache[TreeIndex] = LRUCache(max_trees, float("inf"))
+        self._refs: LRUCache[TreeRef] = LRUCache(max_trees * 4, ref_ttl, clock)
+        self._shared_trees = shared.table("trees", max_trees) if shared else None
+        self._shared_refs = shared.table("tree_refs", max_trees * 4) if shared else None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.builds = 0
+
+    @staticmethod
+    def _key(owner: str, repo: str, ref: Optional[str]) -> str:
+        return credential_scoped(f"{owner.lower()}/{repo.lower()}@{ref or ''}")
+
+    def lookup(
+        self,
+        owner: str,
+        repo: str,
+        ref: Optional[str],
+    ) -> Optional[Tuple[TreeIndex, str]]:
+        """Return the index for ``ref`` and the ref name it was fetched by.
+
+        Only warm entries are returned; no request is made. With no ``ref``
+        the name is that of the default branch.
+        """
+        entry = self._refs.get(self._key(owner, repo, ref))
+        if entry is not None and (is_immutable_ref(ref) or self._refs.is_fresh(entry)):
+            tree = self._trees.get(entry.value.tree_sha)
+            if tree is not None:
+                self._count("hits")
+                record_cache_hit("tree")
+                return tree.value, entry.value.ref
+        snapshot = self._shared_lookup(self._key(owner, repo, ref))
+        if snapshot is not None:
+            self._count("shared_hits")
+            record_cache_hit("tree")
+            return snapshot
+        self._count("misses")
+        return None
+
+    def _shared_lookup(self, key: str) -> Optional[Tuple[TreeIndex, str]]:
+        """Answer a lookup from the trees other workers fetched."""
+        if self._shared_refs is None or self._shared_trees is None:
+            return None
+        # The shared entry expires on its own; it is not copied into the
+        # local refs, where its TTL would start over.
+        tree_ref = self._shared_refs.get(key)
+        if tree_ref is None:
+            return None
+        tree = self._trees.get(tree_ref["tree_sha"])
+        if tree is not None:
+            return tree.value, tree_ref["ref"]
+        data = self._shared_trees.get(tree_ref["tree_sha"])
+        if data is None:
+            return None
+        index = TreeIndex.from_response(data)
+        self._trees.set(index.sha, index)
+        return index, tree_ref["ref"]
+
+    def store(
+        self,
+        owner: str,
+        repo: str,
+        ref: Optional[str],
+        resolved: str,
+        data: Dict[str, Any],
+    ) -> TreeIndex:
+        """Record a fetched tree for ``ref``, reusing an existing index."""
+        tree = self._trees.get(data["sha"])
+        if tree is not None:
+            index = tree.value
+        else:
+            index = TreeIndex.from_response(data)
+            self._trees.set(index.sha, index)
+            self._count("builds")
+        key = self._key(owner, repo, ref)
+        self._refs.set(key, TreeRef(index.sha, resolved))
+        if self._shared_trees is not None and self._shared_refs is not None:
+            if index.sha not in self._shared_trees:
+                self._shared_trees.set(index.sha, {
+                    "sha": index.sha,
+                    "tree": index.entries,
+                    "truncated": index.truncated,
+                })
+            ttl = None if is_immutable_ref(ref) else self.ref_ttl
+            self._shared_refs.set(key, {"tree_sha": index.sha, "ref": resolved}, ttl)
+        return index
+
+    def evict(self, owner: str, repo: str, refs: Optional[Iterable[str]] = None) -> int:
+        """Forget what ``refs`` (all refs if None) point at, for every credential.
+
+        Trees are named by content and stay; the next lookup of an evicted
+        ref fetches it again. ``""`` stands for the default branch.
+        """
+        name = f"{owner.lower()}/{repo.lower()}@"
+        keys = None if refs is None else {name + ref for ref in refs}
+
+        def matches(key: str) -> bool:
+            key = unscoped(key)
+            return key.startswith(name) if keys is None else key in keys
+
+        evicted = self._refs.pop_where(matches)
+        if self._shared_refs is not None:
+            if keys is None:
+                evicted += self._shared_refs.delete_scoped(name, prefix=True)
+            for key in keys or ():
+                evicted += self._shared_refs.delete_scoped(key)
+        return evicted
+
+    def clear(self) -> None:
+        """Drop every index and ref."""
+        self._trees.clear()
+        self._refs.clear()
+        if self._shared_trees is not None and self._shared_refs is not None:
+            self._shared_trees.clear()
+            self._shared_refs.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and occupancy."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "builds": self.builds,
+                "trees": len(self._trees),
+                "refs": len(self._refs),
+                "evictions": self._trees.evictions,
+            }
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+def warm_directory(
+    owner: str,
+    repo: str,
+    ref: Optional[str],
+    path: str,
+) -> Optional[List[Dict[str, Any]]]:
+    """Answer list_directory from a warm, complete tree index, if there is one."""
+    snapshot = get_tree_cache().lookup(owner, repo, ref)
+    if snapshot is None or snapshot[0].truncated:
+        return None
+    index, resolved = snapshot
+    return directory_entries(index, owner, repo, resolved, path)
+
+
+def tree_listing(
+    index: TreeIndex,
+    ref: str,
+    parameters: Dict[str, Any],
+    budget: Optional[OutputBudget] = None,
+) -> Tuple[Dict[str, Any], Optional[str]]:
+    """Filter and page an index for the get_tree tool.
+
+    Returns the tool output and the cursor of the next page, bound to the
+    tree by :func:`cursor_tree`. A ``budget`` ends the page early, at the
+    first entry that does not fit.
+    """
+    path = parameters.get("path", "")
+    pattern = parameters.get("pattern")
+    entry_type = parameters.get("type")
+    entries = index.find(path, pattern, entry_type)
+    page_request = parse_page_request(
+        parameters,
+        {
+            "owner": parameters["owner"],
+            "repo": parameters["repo"],
+            "tree": cursor_tree(index),
+            "path": path,
+            "pattern": pattern,
+            "type": entry_type,
+        },
+        default_limit=TREE_DEFAULT_LIMIT,
+    )
+    if budget is None:
+        budget = OutputBudget.from_parameters(parameters, text_field=None)
+    items, next_cursor = fit_page(slice_page(entries, page_request), budget)
+    return {
+        "sha": index.sha,
+        "ref": ref,
+        "truncated": index.truncated,
+        "total": len(entries),
+        "entries": items,
+    }, next_cursor
+
+
+_tree_cache: Optional[TreeCache] = None
+_tree_cache_lock = threading.Lock()
+
+
+def get_tree_cache() -> TreeCache:
+    """Return the process-wide tree cache."""
+    global _tree_cache
+    if _tree_cache is None:
+        with _tree_cache_lock:
+            if _tree_cache is None:
+                settings = get_settings()
+                _tree_cache = TreeCache(
+                    settings.tree_cache_size,
+                    settings.tree_ref_ttl,
+                    shared=get_shared_store(),
+                )
+    return _tree_cache
@@ -0,0 +1,170 @@
+"""Cache updates driven by GitHub webhook deliveries.
+
+Caches that answer without asking GitHub (the repository cache, which
+tree each ref points at, the path index and the local mirror) otherwise
+trust what they hold until a TTL runs out. A webhook reports exactly what
+changed, so the affected entries are dropped or rewritten as soon as it
+happens and the TTLs can be long.
+"""
+import hashlib
+import hmac
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, cast
+from urllib.parse import parse_qs
+
+from github_mcp.blob_store import get_path_index
+from github_mcp.cache import get_repository_cache
+from github_mcp.config import get_settings
+from github_mcp.mirror import ISSUES, Mirror, get_mirror, repo_key
+from github_mcp.serializers import serialize_issue
+from github_mcp.trees import get_tree_cache
+
+SIGNATURE_PREFIX = "sha256="
+
+# Push payloads list at most this many commits; a longer push may have
+# changed paths the payload does not name.
+PUSH_COMMITS_LIMIT = 20
+
+# Issue actions after which the issue is gone from the repository.
+REMOVED_ACTIONS = ("deleted", "transferred")
+
+# Repository actions that move or delete the repository and everything in it.
+MOVED_ACTIONS = ("deleted", "renamed", "transferred")
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """Return True if ``signature`` is the ``X-Hub-Signature-256`` of ``body``."""
+    if not signature or not signature.startswith(SIGNATURE_PREFIX):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(signature[len(SIGNATURE_PREFIX):], expected)
+
+
+def parse_payload(body: bytes, content_type: str) -> Dict[str, Any]:
+    """Decode a delivery sent as JSON or as a form with a ``payload`` field."""
+    if content_type.startswith("application/x-www-form-urlencoded"):
+        form = parse_qs(body.decode())
+        if "payload" not in form:
+            raise ValueError("Form-encoded delivery has no payload field")
+        return cast(Dict[str, Any], json.loads(form["payload"][0]))
+    return cast(Dict[str, Any], json.loads(body))
+
+
+def _split(full_name: str) -> Tuple[str, str]:
+    owner, _, repo = full_name.partition("/")
+    return owner, repo
+
+
+def _evict_repository(
+    owner: str,
+    repo: str,
+    refs: Optional[Iterable[str]] = None,
+    paths: Optional[Iterable[str]] = None,
+) -> Dict[str, int]:
+    """Drop the cached repository and what ``refs`` (all if None) point at."""
+    refs = None if refs is None else list(refs)
+    return {
+        "repository": get_repository_cache().evict(owner, repo),
+        "tree_refs": get_tree_cache().evict(owner, repo, refs),
+        "paths": get_path_index().evict(owner, repo, refs, paths),
+    }
+
+
+def _mirrored(full_name: str) -> Optional[Tuple[Mirror, str]]:
+    """The mirror and the repository's key in it, if the repository is mirrored."""
+    key = repo_key(*_split(full_name))
+    mirror = get_mirror()
+    if mirror is None or key not in get_settings().mirror_repos:
+        return None
+    return mirror, key
+
+
+def _changed_paths(payload: Dict[str, Any]) -> Optional[Set[str]]:
+    """Paths a push changed, or None if the payload cannot tell all of them."""
+    commits: List[Dict[str, Any]] = payload.get("commits") or []
+    if payload.get("forced") or len(commits) >= PUSH_COMMITS_LIMIT:
+        return None
+    paths: Set[str] = set()
+    for commit in commits:
+        for change in ("added", "removed", "modified"):
+            paths.update(commit.get(change) or ())
+    return paths
+
+
+def handle_push(payload: Dict[str, Any]) -> Dict[str, int]:
+    """Forget what the pushed ref pointed at and the paths the push changed."""
+    repository = payload["repository"]
+    ref = payload["ref"]
+    # Callers name refs as a branch or tag; "" is the default branch.
+    refs = [ref, ref.split("/", 2)[-1]]
+    if ref == f"refs/heads/{repository.get('default_branch')}":
+        refs.append("")
+    paths = None if payload.get("deleted") else _changed_paths(payload)
+    return _evict_repository(*_split(repository["full_name"]), refs, paths)
+
+
+def handle_issues(payload: Dict[str, Any]) -> Dict[str, int]:
+    """Rewrite or drop the issue in the mirror."""
+    mirrored = _mirrored(payload["repository"]["full_name"])
+    if mirrored is None:
+        return {}
+    mirror, key = mirrored
+    issue = payload["issue"]
+    if payload.get("action") in REMOVED_ACTIONS:
+        return {"mirror": mirror.remove(key, ISSUES, issue["number"])}
+    mirror.store(key, ISSUES, [serialize_issue(issue)])
+    return {"mirror": 1}
+
+
+def handle_pull_request(payload: Dict[str, Any]) -> Dict[str, int]:
+    """Rewrite the pull request, and the issue it also is, in the mirror."""
+    mirrored = _mirrored(payload["repository"]["full_name"])
+    if mirrored is None:
+        return {}
+    mirror, key = mirrored
+    mirror.store_pull_request(key, payload["pull_request"])
+    return {"mirror": 2}
+
+
+def handle_repository(payload: Dict[str, Any]) -> Dict[str, int]:
+    """Drop the repository, and all it holds if it moved or was deleted."""
+    action = payload.get("action")
+    owner, repo = _split(payload["repository"]["full_name"])
+    changes = payload.get("changes") or {}
+    if action == "renamed":
+        repo = changes["repository"]["name"]["from"]
+    elif action == "transferred":
+        previous = changes["owner"]["from"]
+        owner = (previous.get("user") or previous.get("organization"))["login"]
+
+    if action in MOVED_ACTIONS:
+        counts = _evict_repository(owner, repo)
+        mirrored = _mirrored(f"{owner}/{repo}")
+        if mirrored is not None:
+            mirror, key = mirrored
+            counts["mirror"] = mirror.remove(key)
+        return counts
+    if "default_branch" in changes:
+        return _evict_repository(owner, repo, [""])
+    return {"repository": get_repository_cache().evict(owner, repo)}
+
+
+EVENT_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Dict[str, int]]] = {
+    "push": handle_push,
+    "issues": handle_issues,
+    "pull_request": handle_pull_request,
+    "repository": handle_repository,
+}
+
+
+def apply_event(event: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Update the caches for one delivery and report what was touched."""
+    handler = EVENT_HANDLERS.get(event)
+    summary: Dict[str, Any] = {
+        "event": event,
+        "action": payload.get("action"),
+        "repository": (payload.get("repository") or {}).get("full_name"),
+    }
+    if handler is None:
+        return {**summary, "ignored": True}
+    return {**summary, "updated": handler(payload)}
@@ -0,0 +1,15 @@
+#!/bin/bash
+set -e
+
+# Ensure environment is set up
+if [ ! -d ".venv" ]; then
+  echo "Python virtual environment not found. Please run scripts/init.sh to set up your environment first."
+  exit 1
+fi
+
+# Activate virtual environment
+source .venv/bin/activate
+
+# Benchmark both backends against the local GitHub API stand-in; extra
+# arguments are passed through (see python -m benchmarks.run --help)
+python -m benchmarks.run --budgets benchmarks/budgets.json "$@"
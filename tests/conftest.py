@@ -0,0 +1,29 @@
+"""Fixtures shared by the test modules."""
+import pytest
+
+from github_mcp import blob_store
+from github_mcp.blob_store import BlobStore
+
+
+class FakeClock:
+    """A clock that only moves when told to, for wall or monotonic time."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """A fake clock at t=1000; tests advance it with ``clock.now += ...``."""
+    return FakeClock()
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """A fresh process-wide blob store."""
+    store = BlobStore(str(tmp_path / "blobs"), 1 << 20)
+    monkeypatch.setattr(blob_store, "_blob_store", store)
+    return store
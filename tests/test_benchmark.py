@@ -0,0 +1,129 @@
+"""Upstream request budgets of every tool, measured against the fake GitHub API."""
+import asyncio
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from benchmarks.fake_github import Seed
+from benchmarks.run import (
+    Measurement,
+    check_budgets,
+    percentile,
+    run_benchmark,
+    serve_fake,
+)
+from github_mcp import (
+    blob_store,
+    cache,
+    clients,
+    rate_limit,
+    response_cache,
+    search_index,
+    server,
+    trees,
+)
+from github_mcp.config import get_settings
+
+BUDGETS = json.loads(
+    (Path(__file__).parent.parent / "benchmarks" / "budgets.json").read_text()
+)
+SEED = Seed(repos=2, issues=12, pulls=6, directories=2, files_per_directory=12)
+# PyGithub spaces POST requests, GraphQL queries included, a second apart.
+READ_TOOLS = [
+    "list_repositories",
+    "get_repository",
+    "list_issues",
+    "list_pull_requests",
+    "get_file_content",
+    "list_directory",
+    "get_tree",
+    "get_files",
+    "search_content",
+]
+
+
+@pytest.fixture
+def fake_github(monkeypatch, tmp_path):
+    """A fake GitHub API, with fresh clients and caches pointed at it."""
+    with serve_fake({"seed": SEED}) as fake:
+        monkeypatch.setenv("GITHUB_MCP_API_URL", fake.base_url)
+        monkeypatch.setenv("GITHUB_MCP_BLOB_CACHE_PATH", str(tmp_path / "blobs"))
+        monkeypatch.setenv("GITHUB_MCP_RESPONSE_CACHE", "memory")
+        for module, name in [
+            (clients, "_client_registry"),
+            (cache, "_repository_cache"),
+            (blob_store, "_blob_store"),
+            (blob_store, "_path_index"),
+            (response_cache, "_response_cache"),
+            (trees, "_tree_cache"),
+            (search_index, "_content_index"),
+        ]:
+            monkeypatch.setattr(module, name, None)
+        monkeypatch.setattr(rate_limit, "_rate_limiters", {})
+        get_settings.cache_clear()
+        yield fake
+        clients._client_registry = None
+    get_settings.cache_clear()
+
+
+def run(fake, tools=None):
+    """Benchmark the in-process app against ``fake``."""
+
+    async def benchmark():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://mcp"
+        ) as client:
+            return await run_benchmark(client, fake, tools, concurrency=(1, 4), calls=4)
+
+    return asyncio.run(benchmark())
+
+
+def test_pygithub_backend_within_budget(fake_github, monkeypatch):
+    """The PyGithub tools make no more upstream requests than budgeted."""
+    monkeypatch.setenv("GITHUB_MCP_BACKEND", "pygithub")
+    monkeypatch.setenv("GITHUB_MCP_GRAPHQL", "false")
+    get_settings.cache_clear()
+
+    results = run(fake_github, READ_TOOLS)
+
+    assert {result.tool for result in results} == set(READ_TOOLS)
+    assert not [result.tool for result in results if result.errors]
+    assert check_budgets(results, BUDGETS) == []
+
+
+def test_httpx_backend_within_budget(fake_github, monkeypatch):
+    """The REST tools make no more upstream requests than budgeted."""
+    monkeypatch.setenv("GITHUB_MCP_BACKEND", "httpx")
+    monkeypatch.setattr(server, "TOOL_HANDLERS", server.REST_TOOL_HANDLERS)
+    monkeypatch.setattr(server, "TOOL_STREAMS", server.REST_TOOL_STREAMS)
+    get_settings.cache_clear()
+
+    results = run(fake_github)
+
+    assert len({result.tool for result in results}) == len(server.TOOLS)
+    assert not [result.tool for result in results if result.errors]
+    assert check_budgets(results, BUDGETS) == []
+
+
+def test_budget_overruns_are_reported():
+    """A run over its budget is described; runs within it are not."""
+    results = [
+        Measurement("list_issues", "warm", 8, 10, 0, 0.0, 0.0, 0.0, 31.0),
+        Measurement("get_tree", "cold", 1, 1, 0, 0.0, 0.0, 0.0, 2.0),
+    ]
+
+    assert check_budgets(results, BUDGETS) == [
+        "list_issues (warm, concurrency 8): 31.0 upstream requests per call, budget 1"
+    ]
+
+
+def test_percentile_is_nearest_rank():
+    """p50 and p99 pick observed samples."""
+    samples = [float(n) for n in range(1, 101)]
+
+    assert percentile(samples, 0.50) == 50.0
+    assert percentile(samples, 0.99) == 99.0
+    assert percentile([], 0.99) == 0.0
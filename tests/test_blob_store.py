@@ -0,0 +1,105 @@
+"""Tests for the SHA-keyed blob store."""
+import base64
+
+import pytest
+
+from github_mcp import blob_store
+from github_mcp.blob_store import BlobStore, PathIndex, git_blob_sha
+
+COMMIT = "0123456789abcdef0123456789abcdef01234567"
+DATA = b"print('hello')\n"
+SHA = git_blob_sha(DATA)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """A fresh process-wide blob store and path index."""
+    store = BlobStore(str(tmp_path / "blobs"), 1024)
+    monkeypatch.setattr(blob_store, "_blob_store", store)
+    monkeypatch.setattr(blob_store, "_path_index", PathIndex(16))
+    return store
+
+
+def metadata(path="src/app.py", sha=SHA):
+    """File metadata as returned by the content tools."""
+    return {"name": path.rsplit("/", 1)[-1], "path": path, "sha": sha, "type": "file"}
+
+
+def test_blob_sha_matches_git():
+    """Blob ids are computed the way git computes them."""
+    assert git_blob_sha(b"") == "e69de29bb2d1d6434b8b29ae775ad8c2e48c5391"
+
+
+def test_put_and_read_ranges(store):
+    """Stored blobs are served whole or by byte range."""
+    assert store.put(SHA, DATA)
+
+    assert store.read(SHA) == DATA
+    assert store.read(SHA, offset=6, length=7) == b"'hello'"
+    assert store.read(SHA, offset=100) == b""
+    assert store.read("f" * 40) is None
+    assert store.stats()["hits"] == 3
+    assert store.stats()["misses"] == 1
+
+
+def test_mismatched_content_is_rejected(store):
+    """Data that does not hash to the SHA is never stored."""
+    assert not store.put(SHA, b"")
+    assert SHA not in store
+
+
+def test_least_recently_used_blobs_are_evicted(tmp_path):
+    """The store stays within its byte budget."""
+    store = BlobStore(str(tmp_path), 2 * len(DATA))
+    blobs = [DATA[:-1] + bytes([i]) for i in range(3)]
+    shas = [git_blob_sha(blob) for blob in blobs]
+
+    store.put(shas[0], blobs[0])
+    store.put(shas[1], blobs[1])
+    store.read(shas[0])
+    store.put(shas[2], blobs[2])
+
+    assert shas[0] in store and shas[2] in store
+    assert shas[1] not in store
+    assert store.stats()["bytes"] == 2 * len(DATA)
+    assert store.stats()["evictions"] == 1
+
+
+def test_blobs_persist_across_instances(tmp_path):
+    """A new store picks up blobs written by an earlier run."""
+    BlobStore(str(tmp_path), 1024).put(SHA, DATA)
+
+    reopened = BlobStore(str(tmp_path), 1024)
+
+    assert reopened.read(SHA) == DATA
+    assert reopened.stats()["bytes"] == len(DATA)
+
+
+def test_blobs_from_other_workers_are_adopted(tmp_path):
+    """A store sees blobs another process wrote to the same directory."""
+    reader = BlobStore(str(tmp_path), 1024)
+    BlobStore(str(tmp_path), 1024).put(SHA, DATA)
+
+    assert SHA in reader
+    assert reader.read(SHA, 0, 5) == DATA[:5]
+    assert reader.stats()["bytes"] == len(DATA)
+
+
+def test_decode_reuses_stored_blobs(store):
+    """Known blobs are served from the store instead of being decoded."""
+    encoded = base64.b64encode(DATA).decode()
+
+    assert blob_store.decode_file("o", "r", "main", metadata(), encoded) == DATA
+    assert blob_store.decode_file("o", "r", "main", metadata(), "not base64!") == DATA
+
+
+def test_lookup_only_serves_commit_shas(store):
+    """Files are served without a request only at immutable refs."""
+    encoded = base64.b64encode(DATA).decode()
+    blob_store.decode_file("o", "r", "main", metadata(), encoded)
+    directory = {**metadata("docs", "0" * 40), "type": "dir"}
+    blob_store.record_listing("o", "r", COMMIT, [metadata(), directory])
+
+    assert blob_store.lookup_file("o", "r", "main", "src/app.py") is None
+    assert blob_store.lookup_file("O", "R", COMMIT, "docs") is None
+    assert blob_store.lookup_file("O", "R", COMMIT, "src/app.py") == metadata()
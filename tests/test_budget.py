@@ -0,0 +1,169 @@
+"""Tests for output size budgets."""
+import asyncio
+
+import pytest
+
+from github_mcp.budget import (
+    OutputBudget,
+    cap_range,
+    cap_slice,
+    collect_within_budget,
+    file_summary,
+    strip_markdown,
+)
+from github_mcp.file_ranges import FileRange, FileSlice
+from github_mcp.pagination import (
+    collect_pages,
+    iter_cursor_pages,
+    iter_pages,
+    parse_page_request,
+)
+
+QUERY = {"owner": "o", "repo": "r", "state": "open"}
+ISSUES = [{"number": n, "body": "x" * 100} for n in range(1, 21)]
+
+
+def fetch_issues(items=ISSUES):
+    """REST page fetcher over ``items``."""
+    async def fetch_page(page, per_page):
+        start = (page - 1) * per_page
+        return items[start:start + per_page], start + per_page < len(items)
+    return fetch_page
+
+
+def list_issues(parameters, items=ISSUES):
+    """Run a budgeted listing; return the items, next cursor and budget."""
+    budget = OutputBudget.from_parameters(parameters)
+    request = parse_page_request(parameters, QUERY)
+    result, cursor = asyncio.run(
+        collect_within_budget(iter_pages(fetch_issues(items), request), budget)
+    )
+    return result, cursor, budget
+
+
+def test_strip_markdown_counts_what_it_drops():
+    """Images and HTML comments are removed and counted."""
+    text = (
+        "Steps:\n\n![screenshot](https://example.com/a.png)\n\n\n"
+        "<!-- template: describe the bug -->\nIt fails. <img src=\"b.png\">"
+    )
+
+    stripped, images, comments = strip_markdown(text)
+
+    assert stripped == "Steps:\n\nIt fails."
+    assert (images, comments) == (2, 1)
+
+
+def test_no_budget_leaves_items_alone():
+    """Without budget parameters every item is returned unchanged."""
+    items, cursor, budget = list_issues({"limit": 5})
+
+    assert items == ISSUES[:5]
+    assert cursor is not None
+    assert budget.summary() is None
+
+
+def test_body_budget_trims_and_reports():
+    """max_body_chars cuts each body and records what was cut."""
+    items = [{"number": 1, "body": "<!-- hidden -->" + "y" * 50}]
+
+    result, _, budget = list_issues({"limit": 1, "max_body_chars": 20}, items)
+
+    assert result[0]["body"] == "y" * 20
+    assert result[0]["elided"]["chars"] == 30
+    assert result[0]["elided"]["comments"] == 1
+    assert "cursor" in result[0]["elided"]
+    assert budget.summary() == {
+        "items": 1, "chars": 30, "images": 0, "comments": 1, "truncated": False,
+    }
+
+
+def test_max_bytes_resumes_at_first_dropped_item():
+    """A listing cut by max_bytes continues from the item it left out."""
+    first, cursor, budget = list_issues({"limit": 10, "per_page": 4, "max_bytes": 500})
+
+    assert 0 < len(first) < 10
+    assert budget.summary()["truncated"] is True
+    rest, _, _ = list_issues({"cursor": cursor})
+    numbers = [item["number"] for item in first + rest]
+    assert numbers == list(range(1, len(first) + 11))
+
+
+def test_first_item_is_cut_to_fit():
+    """An item too large on its own is still returned, with its body cut."""
+    result, cursor, _ = list_issues({"limit": 3, "max_bytes": 60})
+
+    assert len(result) == 1
+    assert len(result[0]["body"]) < 100
+    assert result[0]["elided"]["chars"] > 0
+    # Fetching the trimmed item again returns it in full.
+    again, _, _ = list_issues({"cursor": result[0]["elided"]["cursor"], "limit": 1})
+    assert again == ISSUES[:1]
+    assert cursor is not None
+
+
+def test_graphql_cursor_resumes_mid_page():
+    """Item cursors of cursor-paginated listings skip what was already seen."""
+    async def fetch_page(after, first):
+        start = int(after or 0)
+        end = min(start + first, len(ISSUES))
+        return ISSUES[start:end], str(end), end < len(ISSUES)
+
+    def run(parameters):
+        budget = OutputBudget.from_parameters(parameters)
+        request = parse_page_request(parameters, QUERY)
+        return asyncio.run(
+            collect_within_budget(iter_cursor_pages(fetch_page, request), budget)
+        )
+
+    first, cursor = run({"limit": 6, "per_page": 3, "max_bytes": 450})
+    rest, _ = run({"cursor": cursor})
+
+    assert 0 < len(first) < 6
+    numbers = [item["number"] for item in first + rest]
+    assert numbers == list(range(1, len(first) + 7))
+    resumed = parse_page_request({"cursor": cursor}, QUERY)
+    items, _ = asyncio.run(collect_pages(iter_cursor_pages(fetch_page, resumed)))
+    assert items[0] == rest[0]
+
+
+def test_undroppable_items_are_all_kept():
+    """get_files-style budgets cut content instead of leaving files out."""
+    budget = OutputBudget(max_bytes=200, text_field="content", droppable=False)
+    files = [
+        {"path": f"f{n}", "encoding": "base64", "content": "QUJD" * 30}
+        for n in range(3)
+    ]
+
+    for item in files:
+        assert budget.add(item)
+
+    assert len(budget.items) == 3
+    assert all(len(item["content"]) % 4 == 0 for item in budget.items)
+    assert budget.summary()["truncated"] is False
+
+
+def test_invalid_budget_is_rejected():
+    """Budgets below their minimum are an error."""
+    with pytest.raises(ValueError):
+        OutputBudget.from_parameters({"max_bytes": 0})
+
+
+def test_file_reads_are_capped():
+    """Whole-file and byte-range reads are bounded; line ranges are cut after."""
+    assert cap_range(FileRange(), 100) == FileRange(offset=0, length=100)
+    assert cap_range(FileRange(offset=10, length=50), 100).length == 50
+    lines = FileRange(start_line=1, end_line=5)
+    assert cap_range(lines, 100) is lines
+
+    capped = FileRange(offset=10, length=4)
+    file_slice = FileSlice(b"abcd", False, True)
+    assert file_summary(capped, file_slice, 4) == {
+        "truncated": True, "bytes": 4, "next_offset": 14,
+    }
+    cut = cap_slice(FileSlice(b"line 1\nline 2\n", False, False), 8)
+    assert (cut.data, cut.has_more) == (b"line 1\nl", True)
+    assert file_summary(FileRange(start_line=1), cut, 8) == {
+        "truncated": True,
+        "bytes": 8,
+    }
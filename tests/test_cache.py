@@ -0,0 +1,73 @@
+"""Tests for the in-process caches."""
+from unittest.mock import MagicMock
+
+import pytest
+
+from github_mcp.cache import RepositoryCache
+
+
+def make_cache(clock, max_size=2, ttl=60.0):
+    """Repository cache driven by a fake clock."""
+    return RepositoryCache(max_size, ttl, clock=clock)
+
+
+def test_repeated_lookups_hit_the_cache(clock):
+    """Only the first lookup of a repository calls get_repo."""
+    cache = make_cache(clock)
+    client = MagicMock()
+
+    for _ in range(3):
+        cache.get(client, "Owner", "Repo")
+    cache.get(client, "owner", "repo")
+
+    assert client.get_repo.call_count == 1
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+def test_stale_entries_are_revalidated(clock):
+    """Entries past the TTL are revalidated with a conditional request."""
+    cache = make_cache(clock, ttl=10.0)
+    client = MagicMock()
+    repository = client.get_repo.return_value
+    repository.update.return_value = False
+
+    cache.get(client, "owner", "repo")
+    clock.now += 11.0
+    assert cache.get(client, "owner", "repo") is repository
+    assert cache.get(client, "owner", "repo") is repository
+
+    repository.update.assert_called_once_with()
+    assert client.get_repo.call_count == 1
+    assert cache.stats()["revalidated"] == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_failed_revalidation_drops_the_entry(clock):
+    """A repository that can no longer be fetched is evicted."""
+    cache = make_cache(clock, ttl=10.0)
+    client = MagicMock()
+    client.get_repo.return_value.update.side_effect = RuntimeError("gone")
+
+    cache.get(client, "owner", "repo")
+    clock.now += 11.0
+    with pytest.raises(RuntimeError):
+        cache.get(client, "owner", "repo")
+
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    """The cache stays within its size bound."""
+    cache = make_cache(clock, max_size=2)
+    client = MagicMock()
+
+    cache.get(client, "owner", "a")
+    cache.get(client, "owner", "b")
+    cache.get(client, "owner", "a")
+    cache.get(client, "owner", "c")
+    cache.get(client, "owner", "a")
+
+    assert client.get_repo.call_count == 3
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size"] == 2
@@ -0,0 +1,97 @@
+"""Tests for the per-credential client registry."""
+from types import SimpleNamespace
+
+from github_mcp import cache
+from github_mcp.cache import RepositoryCache
+from github_mcp.clients import ClientRegistry
+from github_mcp.context import current_credential
+
+
+class FakeClient:
+    """Client that records whether it was closed."""
+
+    def __init__(self, token):
+        self.token = token
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+async def use(registry, credential):
+    """Lease and return a credential's client."""
+    async with registry.lease(credential, f"token-{credential}") as client:
+        return client
+
+
+async def test_one_client_per_credential(clock):
+    """A credential's client is reused; another credential gets its own."""
+    registry = ClientRegistry(4, 60.0, FakeClient, clock)
+
+    first = await use(registry, "a")
+
+    assert await use(registry, "a") is first
+    assert (await use(registry, "b")).token == "token-b"
+    assert registry.stats()["created"] == 2
+
+
+async def test_least_recently_used_client_is_evicted(clock):
+    """Over the bound, the least recently used client is closed."""
+    registry = ClientRegistry(2, 60.0, FakeClient, clock)
+    a = await use(registry, "a")
+    b = await use(registry, "b")
+    await use(registry, "a")
+
+    await use(registry, "c")
+
+    assert b.closed and not a.closed
+    assert registry.stats()["clients"] == 2
+    assert await use(registry, "b") is not b
+
+
+async def test_idle_clients_are_closed(clock):
+    """A client unused for the idle timeout is closed on the next lease."""
+    registry = ClientRegistry(4, 60.0, FakeClient, clock)
+    a = await use(registry, "a")
+    clock.now += 30.0
+    b = await use(registry, "b")
+
+    clock.now += 40.0
+    await use(registry, "c")
+
+    assert a.closed and not b.closed
+    assert registry.stats()["evicted"] == 1
+
+
+async def test_leased_clients_close_once_returned(clock):
+    """Eviction never closes a client under a caller that still holds it."""
+    registry = ClientRegistry(1, 60.0, FakeClient, clock)
+
+    async with registry.lease("a", "token-a") as a:
+        await use(registry, "b")
+        assert not a.closed
+        await registry.close()
+        assert not a.closed
+
+    assert a.closed
+
+
+async def test_closed_clients_take_their_repositories(clock, monkeypatch):
+    """Repositories bound to an evicted client are no longer served."""
+    repositories = RepositoryCache(10, 3600)
+    monkeypatch.setattr(cache, "_repository_cache", repositories)
+    github = SimpleNamespace(get_repo=lambda name: SimpleNamespace(full_name=name))
+    for credential in ("a", "b"):
+        token = current_credential.set(credential)
+        try:
+            repositories.get(github, "octo", "repo")
+        finally:
+            current_credential.reset(token)
+    registry = ClientRegistry(1, 60.0, FakeClient, clock)
+
+    await use(registry, "a")
+    await use(registry, "b")
+
+    assert repositories.stats()["size"] == 1
+    assert repositories.forget_credential("b") == 1
+
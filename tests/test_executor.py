@@ -0,0 +1,70 @@
+"""Tests for the blocking-call executor."""
+import asyncio
+import time
+
+import pytest
+
+from github_mcp.config import Settings
+from github_mcp.executor import ToolExecutor
+
+
+@pytest.fixture
+def executor():
+    """Executor with a small pool and a tight limit for one tool."""
+    executor = ToolExecutor(
+        Settings(max_workers=8, tool_concurrency=8, tool_limits={"slow_tool": 2})
+    )
+    yield executor
+    executor.shutdown()
+
+
+async def test_blocking_calls_run_concurrently(executor):
+    """N blocking calls take roughly as long as one."""
+    async def call():
+        async with executor.limit("list_issues"):
+            return await executor.run(time.sleep, 0.2)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(8)))
+    assert time.perf_counter() - start < 0.8
+
+    stats = executor.stats()
+    assert stats["tools"]["list_issues"]["completed"] == 8
+    assert stats["pool"]["queue_depth"] == 0
+
+
+async def test_per_tool_limit_queues_excess_calls(executor):
+    """Calls above a tool's limit wait and are counted as queued."""
+    running = 0
+    peak = 0
+
+    def work():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        time.sleep(0.05)
+        running -= 1
+
+    async def call():
+        async with executor.limit("slow_tool"):
+            await executor.run(work)
+
+    await asyncio.gather(*(call() for _ in range(6)))
+
+    stats = executor.stats()["tools"]["slow_tool"]
+    assert peak <= 2
+    assert stats["limit"] == 2
+    assert stats["max_waiting"] >= 4
+    assert stats["waiting"] == 0
+
+
+async def test_failures_are_counted(executor):
+    """Exceptions propagate and are recorded against the tool."""
+    def boom():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        async with executor.limit("list_issues"):
+            await executor.run(boom)
+
+    assert executor.stats()["tools"]["list_issues"]["failed"] == 1
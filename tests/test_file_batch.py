@@ -0,0 +1,136 @@
+"""Tests for get_files batch fetches."""
+import asyncio
+import io
+import tarfile
+from contextlib import asynccontextmanager
+
+import pytest
+
+from github_mcp import file_batch
+from github_mcp.blob_store import git_blob_sha
+from github_mcp.config import Settings
+from github_mcp.file_batch import AsyncByteReader, iter_files, select_paths
+from github_mcp.pagination import collect_pages
+from github_mcp.trees import TreeIndex
+
+FILES = {
+    "README.md": b"# Demo\n",
+    "src/app.py": b"import util\n",
+    "src/pkg/util.py": b"VALUE = 1\n",
+    "logo.png": b"\x89PNG\r\n\x1a\n\xff",
+}
+TREE = TreeIndex(
+    "t" * 40,
+    [
+        {
+            "path": path,
+            "mode": "100644",
+            "type": "blob",
+            "sha": git_blob_sha(data),
+            "size": len(data),
+        }
+        for path, data in FILES.items()
+    ]
+    + [
+        {"path": "src", "mode": "040000", "type": "tree", "sha": "b" * 40, "size": None}
+    ],
+    False,
+)
+PARAMETERS = {"owner": "o", "repo": "r"}
+
+
+def use_settings(monkeypatch, **overrides):
+    """Run batch fetches with the given settings."""
+    settings = Settings(**overrides)
+    monkeypatch.setattr(file_batch, "get_settings", lambda: settings)
+
+
+def tarball(files, chunk_size=64):
+    """A GitHub-style gzipped tarball, split into chunks."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for path, data in files.items():
+            member = tarfile.TarInfo(f"o-r-abc1234/{path}")
+            member.size = len(data)
+            archive.addfile(member, io.BytesIO(data))
+    data = buffer.getvalue()
+    return [data[start:start + chunk_size] for start in range(0, len(data), chunk_size)]
+
+
+def run(paths, index, fetched, archives):
+    """Collect a batch, recording per-file fetches and archive downloads."""
+    async def fetch_blob(path):
+        fetched.append(path)
+        if path not in FILES:
+            raise ValueError("404: Not Found")
+        return git_blob_sha(FILES[path]), FILES[path]
+
+    @asynccontextmanager
+    async def open_archive():
+        archives.append(True)
+
+        async def chunks():
+            for chunk in tarball(FILES):
+                yield chunk
+
+        yield AsyncByteReader(chunks(), asyncio.get_running_loop())
+
+    pages = iter_files(paths, index, fetch_blob, open_archive, next_cursor="next")
+    return asyncio.run(collect_pages(pages))
+
+
+def test_globs_expand_against_the_tree():
+    """Globs match files only; order follows the request and duplicates go."""
+    paths, cursor = select_paths(
+        ["src/**/*.py", "README.md", "src/app.py"], TREE, PARAMETERS
+    )
+
+    assert paths == ["src/app.py", "src/pkg/util.py", "README.md"]
+    assert cursor is None
+    with pytest.raises(ValueError):
+        select_paths(["*.md"], None, PARAMETERS)
+
+
+def test_matched_paths_are_paged():
+    """A cursor resumes after the last returned path."""
+    parameters = {**PARAMETERS, "paths": ["**"], "limit": 3}
+    first, cursor = select_paths(["**"], TREE, parameters)
+    rest, _ = select_paths(["**"], TREE, {**PARAMETERS, "cursor": cursor})
+
+    assert first + rest == sorted(FILES)
+
+
+def test_small_batches_fetch_each_file(store, monkeypatch):
+    """Below the threshold files are fetched one by one, errors per file."""
+    use_settings(monkeypatch, archive_threshold=10)
+    store.put(git_blob_sha(FILES["README.md"]), FILES["README.md"])
+    fetched, archives = [], []
+    paths = ["README.md", "src/app.py", "logo.png", "missing.txt", "src"]
+
+    results, cursor = run(paths, TREE, fetched, archives)
+
+    by_path = {result["path"]: result for result in results}
+    assert sorted(fetched) == ["logo.png", "src/app.py"]
+    assert not archives
+    assert by_path["README.md"]["content"] == "# Demo\n"
+    assert by_path["logo.png"]["encoding"] == "base64"
+    assert by_path["missing.txt"]["error"] == "File not found"
+    assert "not a file" in by_path["src"]["error"]
+    assert cursor == "next"
+
+
+def test_large_batches_stream_the_archive(store, monkeypatch):
+    """Above the threshold one tarball is read and its blobs are stored."""
+    use_settings(monkeypatch, archive_threshold=1)
+    fetched, archives = [], []
+
+    results, _ = run(
+        ["src/app.py", "src/pkg/util.py", "gone.txt"], None, fetched, archives
+    )
+
+    by_path = {result["path"]: result for result in results}
+    assert not fetched
+    assert archives == [True]
+    assert by_path["src/pkg/util.py"]["content"] == "VALUE = 1\n"
+    assert by_path["gone.txt"]["error"] == "File not found in archive"
+    assert store.read(git_blob_sha(FILES["src/app.py"])) == FILES["src/app.py"]
@@ -0,0 +1,134 @@
+"""Tests for byte and line ranges of file contents."""
+import pytest
+
+from github_mcp import file_ranges
+from github_mcp.blob_store import git_blob_sha
+from github_mcp.file_ranges import (
+    FileRange,
+    RangeSlicer,
+    parse_file_range,
+    render_file,
+    slice_chunks,
+    slice_stored,
+)
+
+TEXT = b"".join(b"line %d\n" % number for number in range(1, 101))
+SHA = git_blob_sha(TEXT)
+
+
+def chunked(data, size=7):
+    """Split ``data`` into chunks that cut across lines."""
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+def cut(file_range, data=TEXT):
+    """Feed ``data`` to a slicer in small chunks, as a download would."""
+    slicer = RangeSlicer(file_range, len(data))
+    for chunk in chunked(data):
+        if slicer.feed(chunk):
+            break
+    return slicer.slice()
+
+
+@pytest.mark.parametrize("file_range, expected, has_more", [
+    (FileRange(), TEXT, False),
+    (FileRange(offset=5, length=10), TEXT[5:15], True),
+    (FileRange(offset=len(TEXT) - 3), TEXT[-3:], False),
+    (FileRange(start_line=2, end_line=3), b"line 2\nline 3\n", True),
+    (FileRange(start_line=99), b"line 99\nline 100\n", False),
+    (FileRange(end_line=1), b"line 1\n", True),
+])
+def test_ranges_cross_chunk_boundaries(file_range, expected, has_more):
+    """Ranges are cut exactly, however the chunks fall."""
+    file_slice = cut(file_range)
+
+    assert file_slice.data == expected
+    assert file_slice.has_more is has_more
+
+
+def test_reading_stops_at_the_end_of_the_range(monkeypatch):
+    """Without a blob store, nothing after the range is downloaded."""
+    monkeypatch.setattr(file_ranges, "get_blob_store", lambda: None)
+    consumed = []
+
+    def chunks():
+        for chunk in chunked(TEXT):
+            consumed.append(chunk)
+            yield chunk
+
+    slice_chunks(chunks(), SHA, len(TEXT), FileRange(start_line=1, end_line=1))
+
+    assert len(consumed) == 1
+
+
+def test_binary_detection_looks_at_the_head_only():
+    """A NUL in the first 8000 bytes marks a file as binary."""
+    assert cut(FileRange(offset=0, length=1), b"\x89PNG\0" + TEXT).binary
+    assert not cut(FileRange(), b"x" * 8000 + b"\0").binary
+
+
+def test_streamed_files_are_stored_and_reread(store):
+    """A download is written to the store, and later ranges come from disk."""
+    slice_chunks(chunked(TEXT), SHA, len(TEXT), FileRange(offset=0, length=4))
+
+    assert store.read(SHA) == TEXT
+    line = slice_stored(SHA, len(TEXT), FileRange(start_line=10, end_line=10))
+    assert line.data == b"line 10\n"
+    assert slice_stored(SHA, len(TEXT), FileRange(offset=7, length=6)).data == b"line 2"
+    assert slice_stored("0" * 40, 1, FileRange()) is None
+
+
+def test_stored_reads_close_the_blob_early(store, monkeypatch):
+    """A line range that ends before the blob does releases its file at once."""
+    slice_chunks([TEXT], SHA, len(TEXT), FileRange())
+    opened, closed = [], []
+
+    def read(sha, chunk_size):
+        try:
+            yield from chunked(TEXT, chunk_size)
+        finally:
+            closed.append(sha)
+
+    def iter_chunks(sha, chunk_size):
+        # Held here, the generator is not closed by being dropped.
+        opened.append(read(sha, chunk_size))
+        return opened[-1]
+
+    monkeypatch.setattr(store, "iter_chunks", iter_chunks)
+    monkeypatch.setattr(file_ranges, "CHUNK_SIZE", 16)
+
+    line = slice_stored(SHA, len(TEXT), FileRange(start_line=1, end_line=1))
+
+    assert line.data == b"line 1\n"
+    assert closed == [SHA]
+
+
+def test_changed_downloads_are_not_stored(store):
+    """Bytes that do not hash to the expected SHA never reach the store."""
+    changed = TEXT.replace(b"line 5", b"LINE 5")
+
+    file_slice = slice_chunks(chunked(changed), SHA, len(changed), FileRange())
+
+    assert file_slice.data == changed
+    assert SHA not in store
+
+
+def test_range_parameters_are_validated():
+    """Byte and line ranges cannot be mixed or inverted."""
+    assert parse_file_range({"start_line": 3}).lines
+    with pytest.raises(ValueError):
+        parse_file_range({"offset": 1, "start_line": 3})
+    with pytest.raises(ValueError):
+        parse_file_range({"start_line": 5, "end_line": 4})
+
+
+def test_binary_content_is_base64_encoded():
+    """Text is returned as is; binary content is base64 encoded."""
+    file_range = FileRange(offset=0, length=3)
+
+    text = render_file({"path": "a.txt"}, cut(file_range), file_range)
+    binary = render_file({"path": "a.bin"}, cut(file_range, b"\0\1\2\3"), file_range)
+
+    assert (text["content"], text["binary"], text["has_more"]) == ("lin", False, True)
+    assert (binary["content"], binary["binary"]) == ("AAEC", True)
+    assert binary["range"] == {"offset": 0, "length": 3}
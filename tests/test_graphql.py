@@ -0,0 +1,83 @@
+"""Tests for GraphQL repository queries and response mapping."""
+from github_mcp.graphql import (
+    list_repositories_variables,
+    repositories_from_response,
+    repository_from_response,
+)
+
+NODE = {
+    "name": "test-repo",
+    "nameWithOwner": "test-owner/test-repo",
+    "description": "Test repository",
+    "url": "https://github.com/test-owner/test-repo",
+    "stargazerCount": 42,
+    "forkCount": 7,
+    "isPrivate": False,
+    "isArchived": False,
+    "defaultBranchRef": {"name": "main"},
+    "primaryLanguage": {"name": "Python"},
+    "repositoryTopics": {
+        "nodes": [{"topic": {"name": "test"}}, {"topic": {"name": "python"}}]
+    },
+    "createdAt": "2024-01-01T00:00:00Z",
+    "updatedAt": "2024-02-01T00:00:00Z",
+    "pushedAt": None,
+}
+
+
+def test_list_variables_follow_rest_defaults():
+    """REST sort keys map to GraphQL order fields and default directions."""
+    assert list_repositories_variables("all", "updated") == {
+        "first": 10,
+        "after": None,
+        "privacy": None,
+        "field": "UPDATED_AT",
+        "direction": "DESC",
+    }
+    variables = list_repositories_variables("private", "full_name")
+    assert variables["privacy"] == "PRIVATE"
+    assert (variables["field"], variables["direction"]) == ("NAME", "ASC")
+
+
+def test_list_response_includes_topics():
+    """Topics come back with the page, not from a per-repository call."""
+    repos = repositories_from_response(
+        {"data": {"viewer": {"repositories": {"nodes": [NODE]}}}}
+    )
+    assert repos == [{
+        "name": "test-repo",
+        "full_name": "test-owner/test-repo",
+        "description": "Test repository",
+        "url": "https://github.com/test-owner/test-repo",
+        "stars": 42,
+        "forks": 7,
+        "private": False,
+        "archived": False,
+        "default_branch": "main",
+        "language": "Python",
+        "topics": ["test", "python"],
+        "created_at": "2024-01-01T00:00:00+00:00",
+        "updated_at": "2024-02-01T00:00:00+00:00",
+        "pushed_at": None,
+    }]
+
+
+def test_detail_response_maps_counts_and_permissions():
+    """Counts, license and viewer permission match the REST output shape."""
+    node = {
+        **NODE,
+        "issues": {"totalCount": 3},
+        "pullRequests": {"totalCount": 2},
+        "watchers": {"totalCount": 5},
+        "isFork": True,
+        "parent": {"forkCount": 11},
+        "diskUsage": 128,
+        "licenseInfo": {"name": "MIT License"},
+        "viewerPermission": "WRITE",
+    }
+    repo = repository_from_response({"data": {"repository": node}})
+    assert repo["open_issues_count"] == 5
+    assert repo["subscribers_count"] == 5
+    assert repo["network_count"] == 11
+    assert repo["license"] == "MIT License"
+    assert repo["permissions"] == {"admin": False, "push": True, "pull": True}
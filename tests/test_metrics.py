@@ -0,0 +1,208 @@
+"""Tests for per-tool instrumentation."""
+import time
+from dataclasses import replace
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from github_mcp import metrics, server
+from github_mcp.config import Settings, get_settings
+from github_mcp.metrics import (
+    Histogram,
+    collect_calls,
+    record_cache_hit,
+    record_upstream,
+    server_timing,
+    track_call,
+)
+from github_mcp.response_cache import MemoryStorage, ResponseCache
+from github_mcp.rest.client import AsyncGitHubClient
+from github_mcp.serializers import text_result
+
+client = TestClient(server.app)
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics(monkeypatch):
+    """Start every test with an empty registry."""
+    monkeypatch.setattr(metrics, "_metrics", None)
+
+
+async def handle_fake(github_client, parameters):
+    """A tool that makes two GitHub requests and hits one cache."""
+    record_upstream("GET", "https://api.github.com/a", 200, 1000, time.perf_counter())
+    record_upstream("GET", "https://api.github.com/b", 304, 0, time.perf_counter())
+    record_cache_hit("response")
+    return text_result([{"number": 1}])
+
+
+@pytest.fixture
+def fake_tool(monkeypatch):
+    """Serve list_issues with :func:`handle_fake` and no GitHub client."""
+    monkeypatch.setitem(server.TOOL_HANDLERS, "list_issues", handle_fake)
+
+    class Lease:
+        async def __aenter__(self):
+            return None
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+    monkeypatch.setattr(server, "lease_client", lambda token: Lease())
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Buckets are cumulative and end with +Inf, followed by sum and count."""
+    histogram = Histogram("h", "Help.", (1, 10))
+    for value in (0.5, 5, 50):
+        histogram.observe(("t",), value)
+
+    assert histogram.render() == [
+        "# HELP h Help.",
+        "# TYPE h histogram",
+        'h_bucket{tool="t",le="1"} 1',
+        'h_bucket{tool="t",le="10"} 2',
+        'h_bucket{tool="t",le="+Inf"} 3',
+        'h_sum{tool="t"} 55.5',
+        'h_count{tool="t"} 3',
+    ]
+
+
+def test_tool_calls_are_exposed_per_tool(fake_tool):
+    """/metrics reports the upstream requests, cache hits and output of each tool."""
+    response = client.post("/tool", json={"name": "list_issues", "parameters": {}})
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
+
+    scrape = client.get("/metrics")
+
+    assert scrape.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = scrape.text
+    assert 'github_mcp_tool_calls_total{tool="list_issues",outcome="ok"} 1' in body
+    assert 'github_mcp_tool_upstream_requests_sum{tool="list_issues"} 2' in body
+    assert 'github_mcp_tool_upstream_bytes_sum{tool="list_issues"} 1000' in body
+    assert (
+        'github_mcp_upstream_responses_total{tool="list_issues",status="304"} 1' in body
+    )
+    assert 'github_mcp_cache_hits_total{tool="list_issues",cache="response"} 1' in body
+    registry = metrics.get_metrics()
+    assert registry.response_bytes.sum(("list_issues",)) == len('[{"number":1}]')
+    assert registry.serialization_seconds.count(("list_issues",)) == 1
+
+
+def test_failed_calls_are_counted(fake_tool, monkeypatch):
+    """A call that raises is recorded with the error outcome."""
+    async def handle_broken(github_client, parameters):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(server.TOOL_HANDLERS, "list_issues", handle_broken)
+
+    response = client.post("/tool", json={"name": "list_issues", "parameters": {}})
+
+    assert response.status_code == 500
+    assert metrics.get_metrics().calls.value(("list_issues", "error")) == 1
+
+
+def test_timing_headers(fake_tool, monkeypatch):
+    """With timing headers on, /tool responses carry Server-Timing."""
+    monkeypatch.setattr(
+        server, "settings", replace(server.settings, timing_headers=True)
+    )
+
+    response = client.post("/tool", json={"name": "list_issues", "parameters": {}})
+
+    timing = response.headers["server-timing"]
+    assert timing.startswith("tool;dur=")
+    assert 'desc="2 requests, 1000 bytes"' in timing
+    assert 'cache;desc="1 hits"' in timing
+
+
+def test_metrics_can_be_disabled(monkeypatch):
+    """With metrics off nothing is recorded and /metrics is not served."""
+    monkeypatch.setenv("GITHUB_MCP_METRICS", "false")
+    get_settings.cache_clear()
+    monkeypatch.setattr(server, "settings", get_settings())
+    try:
+        with track_call("get_tree"):
+            record_upstream(
+                "GET", "https://api.github.com/x", 200, 10, time.perf_counter()
+            )
+
+        assert metrics.get_metrics().duration.count(("get_tree",)) == 0
+        assert client.get("/metrics").status_code == 404
+    finally:
+        get_settings.cache_clear()
+
+
+async def test_rest_client_reports_requests_and_revalidations():
+    """The httpx client records every response; a 304 also counts as a cache hit."""
+    def handler(request):
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, json={"name": "r"}, headers={"ETag": '"v1"'})
+
+    github = AsyncGitHubClient(
+        "test-token",
+        Settings(http2=False),
+        transport=httpx.MockTransport(handler),
+        response_cache=ResponseCache(MemoryStorage(10, 1 << 20)),
+    )
+    with collect_calls() as calls:
+        with track_call("get_repository"):
+            await github.get_json("/repos/o/r")
+            await github.get_json("/repos/o/r")
+    await github.aclose()
+
+    (call,) = calls
+    assert call.upstream_requests == 2
+    assert call.statuses == {200: 1, 304: 1}
+    assert call.upstream_bytes == len(b'{"name":"r"}')
+    assert call.cache_hits == {"response": 1}
+    assert "2 requests" in server_timing(calls)
+
+
+def test_tracing_records_call_and_request_spans(monkeypatch):
+    """With tracing on, each call gets a span and each request a child span."""
+    spans = []
+
+    class Span:
+        def __init__(self, name, **kwargs):
+            self.name = name
+            self.attributes = dict(kwargs.get("attributes") or {})
+            spans.append(self)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            return False
+
+        def set_attributes(self, attributes):
+            self.attributes.update(attributes)
+
+        def end(self, end_time=None):
+            self.ended = end_time
+
+    tracer = SimpleNamespace(start_as_current_span=Span, start_span=Span)
+    fake_trace = SimpleNamespace(
+        get_tracer=lambda name: tracer,
+        SpanKind=SimpleNamespace(CLIENT="client"),
+    )
+    monkeypatch.setattr(metrics, "trace", fake_trace, raising=False)
+    monkeypatch.setattr(metrics, "HAVE_OPENTELEMETRY", True)
+    monkeypatch.setenv("GITHUB_MCP_TRACING", "true")
+    get_settings.cache_clear()
+    try:
+        with track_call("get_files"):
+            record_upstream(
+                "GET", "https://api.github.com/x", 200, 10, time.perf_counter()
+            )
+    finally:
+        get_settings.cache_clear()
+
+    call_span, request_span = spans
+    assert call_span.name == "tools/call get_files"
+    assert call_span.attributes["github_mcp.upstream.requests"] == 1
+    assert request_span.attributes["http.response.status_code"] == 200
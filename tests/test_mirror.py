@@ -0,0 +1,259 @@
+"""Tests for the local issue and pull request mirror."""
+import asyncio
+import json
+
+import pytest
+
+from github_mcp import mirror as mirror_module
+from github_mcp.config import get_settings
+from github_mcp.context import current_credential
+from github_mcp.mirror import (
+    ISSUES,
+    MIRROR_PULL_REQUEST_FIELDS,
+    PULLS,
+    Mirror,
+    MirrorQuery,
+    sync_repository,
+)
+from github_mcp.rest.issues import handle_create_issue, handle_list_issues
+from github_mcp.rest.pull_requests import (
+    handle_create_pull_request,
+    handle_list_pull_requests,
+)
+from github_mcp.serializers import serialize_issue, serialize_pull_request
+
+REPO = "octo/repo"
+
+
+def issue(number, updated_at, labels=(), author="alice", assignees=(), state="open"):
+    """A REST issue payload."""
+    return {
+        "number": number,
+        "title": f"Issue {number}",
+        "state": state,
+        "html_url": f"https://github.com/{REPO}/issues/{number}",
+        "body": f"Body of issue {number}",
+        "created_at": f"2024-01-{number:02d}T00:00:00Z",
+        "updated_at": updated_at,
+        "closed_at": None,
+        "labels": [{"name": label} for label in labels],
+        "assignees": [{"login": login} for login in assignees],
+        "user": {"login": author},
+        "comments": 0,
+        "locked": False,
+        "milestone": None,
+    }
+
+
+def pull(number, updated_at, author="bob"):
+    """A REST pull request payload, as the list endpoint returns it."""
+    branch = {"ref": "main", "sha": "0" * 40, "user": {"login": "octo"},
+              "repo": {"full_name": REPO}}
+    return {
+        "number": number,
+        "title": f"Pull {number}",
+        "state": "open",
+        "html_url": f"https://github.com/{REPO}/pull/{number}",
+        "body": "Fixes the parser",
+        "created_at": f"2024-02-{number:02d}T00:00:00Z",
+        "updated_at": updated_at,
+        "closed_at": None,
+        "merged_at": None,
+        "head": branch,
+        "base": branch,
+        "user": {"login": author},
+        "assignees": [],
+        "labels": [],
+        "draft": False,
+    }
+
+
+class FakeClient:
+    """Answers the list endpoints the sync uses, honouring since and sort order."""
+
+    def __init__(self, issues, pulls):
+        self.issues = issues
+        self.pulls = pulls
+        self.requests = []
+
+    async def get_page(self, path, params, page, per_page):
+        self.requests.append((path, dict(params), page))
+        if path.endswith("/issues"):
+            items = sorted(self.issues, key=lambda item: item["updated_at"])
+            since = params.get("since")
+            items = [item for item in items if not since or item["updated_at"] >= since]
+        else:
+            items = sorted(
+                self.pulls, key=lambda item: item["updated_at"], reverse=True
+            )
+        start = (page - 1) * per_page
+        return items[start:start + per_page], start + per_page < len(items)
+
+
+@pytest.fixture
+def store(tmp_path):
+    """An empty mirror database."""
+    return Mirror(str(tmp_path / "mirror.sqlite3"))
+
+
+@pytest.fixture
+def configured(monkeypatch, tmp_path):
+    """Settings that mirror REPO into a fresh database."""
+    monkeypatch.setenv("GITHUB_MCP_MIRROR_REPOS", REPO)
+    monkeypatch.setenv("GITHUB_MCP_MIRROR_PATH", str(tmp_path / "mirror.sqlite3"))
+    monkeypatch.setattr(mirror_module, "_mirror", None)
+    get_settings.cache_clear()
+    yield mirror_module.get_mirror()
+    get_settings.cache_clear()
+
+
+def test_sync_is_incremental(store):
+    """Later syncs ask only for what changed since the newest stored update."""
+    client = FakeClient(
+        [issue(1, "2024-03-01T00:00:00Z"), issue(2, "2024-03-02T00:00:00Z")],
+        [pull(3, "2024-03-01T00:00:00Z"), pull(4, "2024-03-02T00:00:00Z")],
+    )
+    assert asyncio.run(sync_repository(client, store, REPO, 0))
+    assert store.cursors(REPO) == ("2024-03-02T00:00:00Z", "2024-03-02T00:00:00Z")
+
+    client.issues[0] = issue(1, "2024-03-05T00:00:00Z", state="closed")
+    client.pulls.append(pull(5, "2024-03-06T00:00:00Z"))
+    client.requests.clear()
+    assert asyncio.run(sync_repository(client, store, REPO, 0))
+
+    issues_request, pulls_request = client.requests
+    assert issues_request[1]["since"] == "2024-03-02T00:00:00Z"
+    assert pulls_request[1]["sort"] == "updated"
+    closed = store.query(REPO, ISSUES, MirrorQuery(state="closed"), 0, 10)
+    assert [item["number"] for item in closed] == [1]
+    pulls = store.query(REPO, PULLS, MirrorQuery(), 0, 10)
+    assert [item["number"] for item in pulls] == [5, 4, 3]
+    assert "mergeable" not in pulls[0]
+
+
+def test_only_one_worker_syncs_at_a_time(tmp_path):
+    """A repository leased by one worker, or synced recently, is skipped by others."""
+    path = str(tmp_path / "mirror.sqlite3")
+    first, second = Mirror(path), Mirror(path)
+
+    assert first.claim(REPO, 60)
+    assert not second.claim(REPO, 60)
+    first.release(REPO, synced=True)
+    assert not second.claim(REPO, 60)
+    assert second.covers(REPO, 300)
+    assert second.claim(REPO, 0)
+
+
+def test_local_filters(store):
+    """Labels, author, assignee and text filters are applied in SQLite."""
+    store.store(REPO, ISSUES, [
+        serialize_issue(payload) for payload in [
+            issue(1, "2024-03-01T00:00:00Z", labels=["bug"], assignees=["carol"]),
+            issue(2, "2024-03-02T00:00:00Z", labels=["Bug", "ui"], author="dave"),
+            issue(3, "2024-03-03T00:00:00Z"),
+        ]
+    ])
+
+    def numbers(**filters):
+        items = store.query(REPO, ISSUES, MirrorQuery(**filters), 0, 10)
+        return [item["number"] for item in items]
+
+    assert numbers() == [3, 2, 1]
+    assert numbers(labels=("bug",)) == [2, 1]
+    assert numbers(labels=("bug", "ui")) == [2]
+    assert numbers(author="DAVE") == [2]
+    assert numbers(assignee="carol") == [1]
+    assert numbers(search="body issue 3") == [3]
+    assert numbers(search="100%") == []
+    assert numbers(sort="updated", direction="asc") == [1, 2, 3]
+
+
+def test_list_tools_answer_from_the_mirror(configured):
+    """Mirrored repositories are listed without a GitHub client."""
+    configured.store(REPO, ISSUES, [
+        serialize_issue(issue(n, f"2024-03-{n:02d}T00:00:00Z"))
+        for n in range(1, 6)
+    ])
+    configured.store(REPO, PULLS, [
+        serialize_pull_request(
+            pull(1, "2024-03-01T00:00:00Z"), MIRROR_PULL_REQUEST_FIELDS
+        )
+    ])
+    assert configured.claim(REPO, 0)
+    configured.release(REPO, synced=True)
+
+    async def list_issues(parameters):
+        parameters = {"owner": "octo", "repo": "Repo", **parameters}
+        result = await handle_list_issues(None, parameters)
+        return json.loads(result.content[0]["text"]), result.next_cursor
+
+    first, cursor = asyncio.run(list_issues({"limit": 2}))
+    rest, _ = asyncio.run(list_issues({"cursor": cursor, "limit": 10}))
+    assert [item["number"] for item in first + rest] == [5, 4, 3, 2, 1]
+    found, _ = asyncio.run(list_issues({"search": "issue 4"}))
+    assert [item["number"] for item in found] == [4]
+
+    result = asyncio.run(handle_list_pull_requests(
+        None, {"owner": "octo", "repo": "repo", "author": "bob", "fields": ["number"]}
+    ))
+    assert json.loads(result.content[0]["text"]) == [{"number": 1}]
+
+
+def test_mirror_only_filters_need_the_mirror(configured):
+    """Calls the mirror cannot answer reject filters GitHub cannot apply."""
+    async def list_pulls(parameters):
+        parameters = {"owner": "octo", "repo": "repo", **parameters}
+        return await handle_list_pull_requests(None, parameters)
+
+    # Never synced.
+    with pytest.raises(ValueError, match="local mirror"):
+        asyncio.run(list_pulls({"author": "bob"}))
+
+    assert configured.claim(REPO, 0)
+    configured.release(REPO, synced=True)
+    # Detail fields are not mirrored.
+    with pytest.raises(ValueError, match="local mirror"):
+        asyncio.run(list_pulls({"author": "bob", "fields": ["additions"]}))
+    # Per-request tokens are never answered from the keychain token's mirror.
+    token = current_credential.set("other")
+    try:
+        with pytest.raises(ValueError, match="local mirror"):
+            asyncio.run(list_pulls({"search": "parser"}))
+    finally:
+        current_credential.reset(token)
+
+
+def test_created_items_are_mirrored(configured):
+    """Issues and pull requests created through the server are listed right away."""
+    created = {
+        "/repos/octo/repo/issues": issue(7, "2024-03-07T00:00:00Z"),
+        "/repos/octo/repo/pulls": {
+            **pull(8, "2024-03-08T00:00:00Z"),
+            "url": f"https://api.github.com/repos/{REPO}/pulls/8",
+            # Single pull request payloads carry the detail fields too.
+            **dict.fromkeys(
+                ("comments", "review_comments", "commits", "additions", "deletions",
+                 "changed_files"),
+                0,
+            ),
+            "locked": False,
+            "mergeable": True,
+            "mergeable_state": "clean",
+        },
+    }
+
+    class CreatingClient:
+        async def post_json(self, path, body):
+            return created[path]
+
+    parameters = {"owner": "octo", "repo": "repo", "title": "New", "head": "fix"}
+    asyncio.run(handle_create_issue(CreatingClient(), parameters))
+    asyncio.run(handle_create_pull_request(CreatingClient(), parameters))
+
+    issues = configured.query(REPO, ISSUES, MirrorQuery(), 0, 10)
+    assert [(item["number"], item["pull_request"]) for item in issues] == [
+        (8, True),
+        (7, False),
+    ]
+    (pull_request,) = configured.query(REPO, PULLS, MirrorQuery(), 0, 10)
+    assert pull_request["number"] == 8
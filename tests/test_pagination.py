@@ -0,0 +1,131 @@
+"""Tests for list tool pagination."""
+import asyncio
+
+import pytest
+
+from github_mcp.pagination import (
+    collect_pages,
+    has_next_page,
+    iter_cursor_pages,
+    iter_pages,
+    parse_page_request,
+)
+
+QUERY = {"owner": "o", "repo": "r", "state": "open"}
+ITEMS = list(range(25))
+
+
+def make_fetcher(items, requested):
+    """REST page fetcher over ``items`` that records requested pages."""
+    async def fetch_page(page, per_page):
+        requested.append((page, per_page))
+        start = (page - 1) * per_page
+        return items[start:start + per_page], start + per_page < len(items)
+    return fetch_page
+
+
+def walk(parameters, items=ITEMS):
+    """Follow next_cursor until the listing is exhausted."""
+    pages = []
+    requested = []
+    while True:
+        request = parse_page_request(parameters, QUERY)
+        page, cursor = asyncio.run(
+            collect_pages(iter_pages(make_fetcher(items, requested), request))
+        )
+        pages.append(page)
+        if cursor is None:
+            return pages, requested
+        parameters = {"cursor": cursor}
+
+
+def test_default_fetches_only_what_is_returned():
+    """Without parameters one page of ten items is requested."""
+    request = parse_page_request({}, QUERY)
+    assert (request.limit, request.per_page, request.page) == (10, 10, 1)
+
+
+def test_cursor_walks_every_item_once():
+    """Following the cursor returns each item exactly once, in order."""
+    pages, requested = walk({"limit": 7, "per_page": 5})
+
+    assert [len(page) for page in pages] == [7, 7, 7, 4]
+    assert sum(pages, []) == ITEMS
+    # Pages split by the limit are fetched again, but never earlier ones.
+    assert [page for page, _ in requested] == [1, 2, 2, 3, 3, 4, 5, 5, 6]
+
+
+def test_limit_spans_several_pages():
+    """A limit larger than the page size fetches the covering pages."""
+    request = parse_page_request({"limit": 12, "per_page": 5, "page": 2}, QUERY)
+    requested = []
+
+    items, cursor = asyncio.run(
+        collect_pages(iter_pages(make_fetcher(ITEMS, requested), request))
+    )
+
+    assert items == ITEMS[5:17]
+    assert requested == [(2, 5), (3, 5), (4, 5)]
+    resumed = parse_page_request({"cursor": cursor}, QUERY)
+    assert (resumed.page, resumed.offset) == (4, 2)
+
+
+def test_cursor_is_bound_to_its_query():
+    """A cursor cannot be replayed against different filters."""
+    cursor = parse_page_request({}, QUERY).cursor(page=2)
+
+    with pytest.raises(ValueError):
+        parse_page_request({"cursor": cursor}, {**QUERY, "state": "closed"})
+    with pytest.raises(ValueError):
+        parse_page_request({"cursor": "not-a-cursor"}, QUERY)
+
+
+def test_graphql_pages_follow_end_cursors():
+    """GraphQL listings resume from the end cursor of the last item."""
+    async def fetch_page(after, first):
+        start = int(after or 0)
+        end = min(start + first, len(ITEMS))
+        return ITEMS[start:end], str(end), end < len(ITEMS)
+
+    request = parse_page_request({"limit": 15, "per_page": 10}, QUERY)
+    items, cursor = asyncio.run(collect_pages(iter_cursor_pages(fetch_page, request)))
+    assert items == ITEMS[:15]
+
+    resumed = parse_page_request({"cursor": cursor}, QUERY)
+    items, cursor = asyncio.run(collect_pages(iter_cursor_pages(fetch_page, resumed)))
+    assert items == ITEMS[15:]
+    assert cursor is None
+
+
+def test_pages_carry_their_own_cursor():
+    """Every streamed page says where a listing interrupted after it resumes."""
+    async def pages():
+        request = parse_page_request({"limit": 12, "per_page": 5}, QUERY)
+        return [page async for page in iter_pages(make_fetcher(ITEMS, []), request)]
+
+    pages = asyncio.run(pages())
+
+    assert [page.items for page in pages] == [ITEMS[:5], ITEMS[5:10], ITEMS[10:12]]
+    resumed = parse_page_request({"cursor": pages[0].next_cursor}, QUERY)
+    assert (resumed.page, resumed.offset) == (2, 0)
+
+
+def test_graphql_falls_back_to_rest():
+    """A listing starts over REST when GraphQL is unavailable."""
+    async def unavailable(after, first):
+        return None
+
+    request = parse_page_request({"limit": 3}, QUERY)
+    fallback = lambda: iter_pages(make_fetcher(ITEMS, []), request)
+    items, _ = asyncio.run(
+        collect_pages(iter_cursor_pages(unavailable, request, fallback=fallback))
+    )
+
+    assert items == ITEMS[:3]
+
+
+def test_link_header_detection():
+    """Only a rel="next" link means another page exists."""
+    assert has_next_page('<https://api.github.com/x?page=2>; rel="next"')
+    assert not has_next_page('<https://api.github.com/x?page=1>; rel="prev"')
+    assert not has_next_page(None)
@@ -0,0 +1,38 @@
+"""Tests for the field fetch planner."""
+import pytest
+
+from github_mcp.planner import (
+    PULL_REQUEST_DETAIL_FIELDS,
+    PULL_REQUEST_FIELDS,
+    plan_fields,
+)
+
+
+def test_default_plan_uses_list_payload_only():
+    """Without a field request no per-item detail fetch is planned."""
+    plan = plan_fields(None, PULL_REQUEST_FIELDS, PULL_REQUEST_DETAIL_FIELDS)
+    assert not plan.needs_detail
+    assert "number" in plan.fields
+    assert not set(plan.fields) & set(PULL_REQUEST_DETAIL_FIELDS)
+
+
+def test_detail_field_requires_detail_fetch():
+    """Asking for a detail field plans the extra fetch, in output order."""
+    plan = plan_fields(
+        ["mergeable", "number"], PULL_REQUEST_FIELDS, PULL_REQUEST_DETAIL_FIELDS
+    )
+    assert plan.needs_detail
+    assert plan.fields == ("number", "mergeable")
+
+
+def test_wildcard_selects_everything():
+    """The '*' field selects every available field."""
+    plan = plan_fields(["*"], PULL_REQUEST_FIELDS, PULL_REQUEST_DETAIL_FIELDS)
+    assert plan.fields == PULL_REQUEST_FIELDS
+    assert plan.needs_detail
+
+
+def test_unknown_field_is_rejected():
+    """Unknown fields raise a ValueError naming them."""
+    with pytest.raises(ValueError, match="bogus"):
+        plan_fields(["bogus"], PULL_REQUEST_FIELDS, PULL_REQUEST_DETAIL_FIELDS)
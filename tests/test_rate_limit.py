@@ -0,0 +1,157 @@
+"""Tests for rate-limit-aware request scheduling."""
+import httpx
+import pytest
+
+from github_mcp.config import Settings
+from github_mcp.rate_limit import RateLimiter, RateLimitExceeded, resource_for
+from github_mcp.rest.client import AsyncGitHubClient, GitHubAPIError
+
+
+def quota(remaining, limit=5000, reset=4600, resource="core"):
+    """Rate-limit headers as GitHub sends them."""
+    return {
+        "x-ratelimit-limit": str(limit),
+        "x-ratelimit-remaining": str(remaining),
+        "x-ratelimit-used": str(limit - remaining),
+        "x-ratelimit-reset": str(reset),
+        "x-ratelimit-resource": resource,
+    }
+
+
+def test_requests_go_straight_through_with_quota_to_spare(clock):
+    """Above the reserve nothing waits."""
+    limiter = RateLimiter(clock=clock)
+    limiter.observe(200, quota(4000))
+
+    assert [limiter.delay() for _ in range(20)] == [0.0] * 20
+    assert limiter.stats()["throttled"] == 0
+
+
+def test_reads_below_the_reserve_are_paced_but_writes_are_not(clock):
+    """Low quota spreads reads evenly until the reset; writes keep going."""
+    limiter = RateLimiter(clock=clock, reserve=0.1)
+    # 360 requests left for the next hour: one every ten seconds.
+    limiter.observe(200, quota(360))
+
+    waits = [limiter.delay() for _ in range(7)]
+
+    assert waits[:5] == [0.0] * 5
+    assert waits[5:] == pytest.approx([10.0, 20.0])
+    assert limiter.delay(write=True) == 0.0
+    assert limiter.delay("search") == 0.0
+
+
+def test_exhausted_quota_waits_for_the_reset_or_fails_fast(clock):
+    """An empty quota holds requests until the reset, within max_wait."""
+    limiter = RateLimiter(clock=clock, max_wait=60.0)
+    limiter.observe(200, quota(0, reset=1030))
+
+    assert limiter.delay() == pytest.approx(30.0)
+
+    limiter.observe(200, quota(0, reset=1600))
+    with pytest.raises(RateLimitExceeded) as exc_info:
+        limiter.delay()
+    assert exc_info.value.retry_after == pytest.approx(600.0)
+    assert limiter.stats()["rejected"] == 1
+
+    clock.now = 1601
+    assert limiter.delay() == 0.0
+
+
+def test_retry_after_blocks_every_resource(clock):
+    """A secondary rate limit's Retry-After holds all requests back."""
+    limiter = RateLimiter(clock=clock)
+    limiter.observe(403, {"retry-after": "15"})
+
+    assert limiter.delay("core") == 15.0
+    assert limiter.delay("graphql", write=True) == 15.0
+    assert limiter.retry_after() == 15.0
+
+
+def test_backoff_is_jittered_and_bounded():
+    """Delays grow exponentially, with jitter, up to max_backoff."""
+    low = RateLimiter(backoff=1.0, max_backoff=8.0, retries=10, rng=lambda: 0.0)
+    high = RateLimiter(backoff=1.0, max_backoff=8.0, retries=10, rng=lambda: 1.0)
+
+    assert [low.backoff_delay(n, 502, {}) for n in range(5)] == [0.5, 1, 2, 4, 4]
+    assert [high.backoff_delay(n, 502, {}) for n in range(5)] == [1, 2, 4, 8, 8]
+
+
+def test_backoff_only_retries_what_is_safe(clock):
+    """Server errors are retried for reads only; rate limits always."""
+    limiter = RateLimiter(clock=clock, retries=2, rng=lambda: 0.0)
+
+    assert limiter.backoff_delay(0, 503, {}) == 0.5
+    assert limiter.backoff_delay(0, 503, {}, write=True) is None
+    assert limiter.backoff_delay(0, 404, {}) is None
+    assert limiter.backoff_delay(0, 403, {}) is None
+    assert limiter.backoff_delay(0, 429, {"retry-after": "7"}, write=True) == 7.0
+    assert limiter.backoff_delay(0, 403, quota(0, reset=1012)) == 12.0
+    assert limiter.backoff_delay(2, 503, {}) is None
+    assert limiter.backoff_delay(0, 429, {"retry-after": "3600"}) is None
+
+
+def test_resources_follow_the_request_path():
+    """Search and GraphQL have quotas of their own."""
+    assert resource_for("/search/issues") == "search"
+    assert resource_for("https://api.github.com/graphql") == "graphql"
+    assert resource_for("/repos/o/r/issues") == "core"
+
+
+def make_client(handler, **limits):
+    """Build a client with a limiter that never actually sleeps."""
+    limiter = RateLimiter(backoff=0.0, **limits)
+    client = AsyncGitHubClient(
+        "test-token",
+        Settings(http2=False),
+        transport=httpx.MockTransport(handler),
+        rate_limiter=limiter,
+    )
+    return client, limiter
+
+
+async def test_client_retries_transient_errors():
+    """A read that hits a 502 is retried and succeeds."""
+    statuses = [502, 200]
+
+    def handler(request):
+        return httpx.Response(statuses.pop(0), json={"name": "r"}, headers=quota(4000))
+
+    client, limiter = make_client(handler)
+    data = await client.get_json("/repos/o/r")
+    await client.aclose()
+
+    assert data == {"name": "r"}
+    assert limiter.stats()["retried"] == 1
+    assert limiter.stats()["resources"]["core"]["remaining"] == 4000
+
+
+async def test_client_does_not_retry_failed_writes():
+    """A POST that hits a 502 fails without being resent."""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(502, json={"message": "Bad Gateway"})
+
+    client, _ = make_client(handler)
+    with pytest.raises(GitHubAPIError):
+        await client.post_json("/repos/o/r/issues", {"title": "t"})
+    await client.aclose()
+
+    assert len(calls) == 1
+
+
+async def test_client_raises_rate_limit_exceeded():
+    """A rate limit that outlasts the retries raises RateLimitExceeded."""
+    def handler(request):
+        return httpx.Response(
+            429, json={"message": "slow down"}, headers={"retry-after": "0"}
+        )
+
+    client, limiter = make_client(handler, retries=2)
+    with pytest.raises(RateLimitExceeded):
+        await client.get_json("/search/issues")
+    await client.aclose()
+
+    assert limiter.stats()["retried"] == 2
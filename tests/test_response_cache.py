@@ -0,0 +1,230 @@
+"""Tests for the conditional-request response cache."""
+import io
+
+import httpx
+import pytest
+import requests
+from github import Auth, Github
+from github.Requester import Requester
+
+from github_mcp import transport
+from github_mcp.clients import close_client
+from github_mcp.config import Settings
+from github_mcp.context import current_tool
+from github_mcp.file_ranges import RAW_MEDIA_TYPE
+from github_mcp.response_cache import (
+    CachedResponse,
+    MemoryStorage,
+    ResponseCache,
+    SQLiteStorage,
+)
+from github_mcp.rest.client import AsyncGitHubClient
+
+ETAG = '"abc123"'
+ORIGIN = ("https", "api.github.com", 443)
+CREDENTIAL = transport.session_credential("token test-token")
+BODY = b'{"name": "test-repo", "full_name": "test-owner/test-repo"}'
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache(request, tmp_path):
+    """A response cache on each storage backend."""
+    if request.param == "memory":
+        return ResponseCache(MemoryStorage(16, 1 << 20))
+    return ResponseCache(SQLiteStorage(str(tmp_path / "responses.db"), 16))
+
+
+def test_storage_evicts_least_recently_used(tmp_path):
+    """Both storages stay within their entry limit."""
+    for storage in (
+        MemoryStorage(2, 1 << 20),
+        SQLiteStorage(str(tmp_path / "r.db"), 2),
+    ):
+        cache = ResponseCache(storage)
+        for key in ("a", "b", "c"):
+            cache.store(key, b"{}", {"ETag": f'"{key}"'})
+        assert len(storage) == 2
+        assert cache.lookup("a") is None
+        assert cache.lookup("c").etag == '"c"'
+
+
+
+def test_memory_storage_evicts_by_body_size():
+    """The memory storage drops old responses once their bodies exceed its budget."""
+    storage = MemoryStorage(16, 10)
+    for key in ("a", "b", "c"):
+        storage.set(key, CachedResponse(body=b"1234", headers={}))
+
+    assert len(storage) == 2
+    assert storage.get("a") is None
+    storage.set("b", CachedResponse(body=b"1234567", headers={}))
+    assert storage.get("c") is None
+    assert storage.get("b").body == b"1234567"
+
+async def test_httpx_backend_revalidates(cache):
+    """A second GET sends If-None-Match and replays the body on a 304."""
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == ETAG:
+            return httpx.Response(304, headers={"ETag": ETAG})
+        return httpx.Response(200, headers={"ETag": ETAG}, content=BODY)
+
+    client = AsyncGitHubClient(
+        "test-token",
+        Settings(http2=False),
+        transport=httpx.MockTransport(handler),
+        response_cache=cache,
+    )
+    context_token = current_tool.set("get_repository")
+    try:
+        first = await client.get_json("/repos/test-owner/test-repo")
+        second = await client.get_json("/repos/test-owner/test-repo")
+    finally:
+        current_tool.reset(context_token)
+        await client.aclose()
+
+    assert first == second == {"name": "test-repo", "full_name": "test-owner/test-repo"}
+    assert seen == [None, ETAG]
+    stats = cache.stats()["tools"]["get_repository"]
+    assert stats["hits"] == 1
+    assert stats["hit_ratio"] == 0.5
+    assert stats["bytes_saved"] == len(BODY)
+
+
+class FakeAdapter(requests.adapters.BaseAdapter):
+    """Answer requests with an ETag and 304 on revalidation."""
+
+    def __init__(self):
+        super().__init__()
+        self.seen = []
+
+    def send(self, request, **kwargs):
+        self.seen.append(request.headers.get("If-None-Match"))
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        response.headers["ETag"] = ETAG
+        if request.headers.get("If-None-Match") == ETAG:
+            response.status_code = 304
+            response._content = b""
+        else:
+            response.status_code = 200
+            response.headers["Content-Type"] = "application/json"
+            response._content = BODY
+        return response
+
+    def close(self):
+        pass
+
+
+def test_pygithub_transport_revalidates(cache, monkeypatch):
+    """PyGithub GETs are revalidated through the injected connection classes."""
+    adapter = FakeAdapter()
+    session = requests.Session()
+    session.mount("https://", adapter)
+    monkeypatch.setattr(transport, "_sessions", {ORIGIN + (CREDENTIAL,): session})
+    monkeypatch.setattr(transport, "get_response_cache", lambda: cache)
+
+    transport.install()
+    try:
+        client = Github(auth=Auth.Token("test-token"))
+        first = client.get_repo("test-owner/test-repo")
+        second = client.get_repo("test-owner/test-repo")
+    finally:
+        Requester.resetConnectionClasses()
+
+    assert first.full_name == second.full_name == "test-owner/test-repo"
+    assert adapter.seen == [None, ETAG]
+
+
+def test_pygithub_raw_streams_use_the_client_credential(cache, monkeypatch):
+    """Raw blob streams carry the client's token and pass the rate limiter, uncached."""
+    requests_seen = []
+
+    class RawAdapter(FakeAdapter):
+        def send(self, request, **kwargs):
+            requests_seen.append(request)
+            response = requests.Response()
+            response.status_code = 200
+            response.headers["X-RateLimit-Remaining"] = "4999"
+            response.raw = io.BytesIO(b"raw bytes")
+            return response
+
+    session = requests.Session()
+    session.mount("https://", RawAdapter())
+    monkeypatch.setattr(transport, "_sessions", {ORIGIN + (CREDENTIAL,): session})
+    monkeypatch.setattr(transport, "get_response_cache", lambda: cache)
+    observed = []
+    monkeypatch.setattr(
+        transport.get_rate_limiter(), "observe", lambda *args: observed.append(args)
+    )
+    client = Github(auth=Auth.Token("test-token"))
+
+    with transport.stream_get(
+        client.requester, "/repos/o/r/git/blobs/abc", {"Accept": RAW_MEDIA_TYPE}
+    ) as response:
+        assert b"".join(response.iter_content(4)) == b"raw bytes"
+
+    (request,) = requests_seen
+    assert request.url.endswith("api.github.com:443/repos/o/r/git/blobs/abc")
+    assert request.headers["Authorization"] == "token test-token"
+    assert request.headers["Accept"] == RAW_MEDIA_TYPE
+    assert len(observed) == 1
+    assert len(cache.storage) == 0
+
+
+def test_pygithub_archive_downloads_are_retried_without_the_token(monkeypatch):
+    """Pre-authorised download links share a pool and retry transient failures."""
+    requests_seen = []
+
+    class FlakyAdapter(FakeAdapter):
+        def send(self, request, **kwargs):
+            requests_seen.append(request)
+            response = requests.Response()
+            response.status_code = 503 if len(requests_seen) == 1 else 200
+            response.raw = io.BytesIO(b"tarball")
+            return response
+
+    session = requests.Session()
+    session.mount("https://", FlakyAdapter())
+    origin = ("https", "codeload.github.com", 443, transport.session_credential(None))
+    monkeypatch.setattr(transport, "_sessions", {origin: session})
+    monkeypatch.setattr(transport.time, "sleep", lambda seconds: None)
+    client = Github(auth=Auth.Token("test-token"))
+
+    url = "https://codeload.github.com/o/r/legacy.tar.gz/main?token=short-lived"
+    with transport.stream_download(client.requester, url) as response:
+        assert response.response.raw.read() == b"tarball"
+
+    assert [request.url for request in requests_seen] == [
+        "https://codeload.github.com:443/o/r/legacy.tar.gz/main?token=short-lived"
+    ] * 2
+    assert "Authorization" not in requests_seen[-1].headers
+
+
+async def test_pygithub_sessions_are_per_credential(monkeypatch):
+    """Each token has its own connection pool, closed along with its client."""
+    adapters = {token: FakeAdapter() for token in ("first", "second")}
+    sessions = {}
+    for token, adapter in adapters.items():
+        session = requests.Session()
+        session.mount("https://", adapter)
+        sessions[ORIGIN + (transport.session_credential(f"token {token}"),)] = session
+    monkeypatch.setattr(transport, "_sessions", dict(sessions))
+    monkeypatch.setattr(transport, "get_response_cache", lambda: None)
+
+    transport.install()
+    try:
+        clients = {token: Github(auth=Auth.Token(token)) for token in adapters}
+        for client in clients.values():
+            client.get_repo("test-owner/test-repo")
+    finally:
+        Requester.resetConnectionClasses()
+
+    assert [adapter.seen for adapter in adapters.values()] == [[None], [None]]
+    await close_client(clients["first"])
+    assert set(transport._sessions) == {
+        ORIGIN + (transport.session_credential("token second"),)
+    }
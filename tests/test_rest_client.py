@@ -0,0 +1,47 @@
+"""Tests for the async httpx REST client."""
+import httpx
+import pytest
+
+from github_mcp.config import Settings
+from github_mcp.rest.client import AsyncGitHubClient, GitHubAPIError
+
+
+def make_client(handler):
+    """Build a client whose requests are answered by ``handler``."""
+    return AsyncGitHubClient(
+        "test-token",
+        Settings(http2=False),
+        transport=httpx.MockTransport(handler),
+    )
+
+
+async def test_requests_are_authenticated():
+    """Requests carry the token and GitHub media type."""
+    seen = {}
+
+    def handler(request):
+        seen.update(request.headers)
+        seen["url"] = str(request.url)
+        return httpx.Response(200, json={"name": "test-repo"})
+
+    client = make_client(handler)
+    data = await client.get_json("/repos/o/r", params={"per_page": 10})
+    await client.aclose()
+
+    assert data == {"name": "test-repo"}
+    assert seen["authorization"] == "Bearer test-token"
+    assert seen["accept"] == "application/vnd.github+json"
+    assert seen["url"] == "https://api.github.com/repos/o/r?per_page=10"
+
+
+async def test_error_status_raises():
+    """Error responses raise GitHubAPIError with GitHub's message."""
+    client = make_client(
+        lambda request: httpx.Response(404, json={"message": "Not Found"})
+    )
+    with pytest.raises(GitHubAPIError) as exc_info:
+        await client.get_json("/repos/o/missing")
+    await client.aclose()
+
+    assert exc_info.value.status_code == 404
+    assert exc_info.value.message == "Not Found"
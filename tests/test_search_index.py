@@ -0,0 +1,191 @@
+"""Tests for the trigram index behind search_content."""
+import pytest
+
+from github_mcp import search_index
+from github_mcp.blob_store import git_blob_sha
+from github_mcp.budget import OutputBudget
+from github_mcp.file_batch import file_result
+from github_mcp.pagination import Page
+from github_mcp.search_index import ContentIndex, SearchQuery, literal_runs, search_tree
+from github_mcp.trees import TreeIndex
+
+FILES = {
+    "README.md": b"# Parser\n\nParses things.\n",
+    "src/parser.py": (
+        b"def parse(text):\n    return Parser(text).run()\n\nclass Parser:\n    pass\n"
+    ),
+    "src/lexer.py": b"def tokens(text):\n    return text.split()\n",
+    "logo.png": b"\x89PNG\r\n\x1a\n\x00\x00",
+}
+
+
+def make_tree(files, sha="tree-1"):
+    return TreeIndex(sha, [
+        {"path": path, "mode": "100644", "type": "blob", "sha": git_blob_sha(data),
+         "size": len(data)}
+        for path, data in files.items()
+    ], False)
+
+
+class Loader:
+    """Serves file contents as get_files would, remembering what was asked for."""
+
+    def __init__(self, files):
+        self.files = files
+        self.requested = []
+
+    async def __call__(self, paths):
+        self.requested.extend(paths)
+        for path in paths:
+            data = self.files[path]
+            yield Page([file_result(path, git_blob_sha(data), data)], None)
+
+
+@pytest.fixture(autouse=True)
+def content_index(monkeypatch):
+    """A fresh, process-wide index for every test."""
+    index = ContentIndex(max_bytes=1 << 20, max_file_size=1 << 16)
+    monkeypatch.setattr(search_index, "_content_index", index)
+    return index
+
+
+async def search(tree, loader, **parameters):
+    parameters = {"owner": "octo", "repo": "repo", **parameters}
+    budget = OutputBudget.from_parameters(parameters, text_field="text")
+    return await search_tree("octo", "repo", tree, "main", parameters, loader, budget)
+
+
+@pytest.mark.parametrize("pattern, runs", [
+    ("def parse", ["def parse"]),
+    (r"class \w+\(Base\):", ["class ", "(Base):"]),
+    (r"colou?r", ["colo", "r"]),
+    (r"ab+c{2,3}d", ["ab", "d"]),
+    (r"(optional)?text", ["text"]),
+    (r"[abc]xyz\x41", ["xyz"]),
+    (r"\bfoo\b", ["foo"]),
+    (r"cat|dog", []),
+])
+def test_literal_runs(pattern, runs):
+    """Only strings every match must contain are extracted."""
+    assert literal_runs(pattern) == runs
+
+
+def test_queries_narrow_by_trigrams():
+    """Literal queries need all their trigrams; short or unanchored ones need none."""
+    literal = SearchQuery.from_parameters({"query": "Parse"})
+    assert literal.required == {"par", "ars", "rse"}
+    unanchored = SearchQuery.from_parameters({"query": r"\d+", "regex": True})
+    assert unanchored.required == set()
+    with pytest.raises(ValueError, match="Invalid regular expression"):
+        SearchQuery.from_parameters({"query": "(", "regex": True})
+
+
+async def test_literal_and_regex_hits_carry_line_numbers():
+    """Hits come in path order with their 1-based line numbers."""
+    loader = Loader(FILES)
+    tree = make_tree(FILES)
+
+    result, _ = await search(tree, loader, query="parser")
+    assert [(hit["path"], hit["line"]) for hit in result["matches"]] == [
+        ("README.md", 1),
+        ("src/parser.py", 2),
+        ("src/parser.py", 4),
+    ]
+    assert (result["searched"], result["skipped"]) == (3, 1)
+
+    result, _ = await search(tree, loader, query="parse", case_sensitive=True)
+    assert [(hit["path"], hit["line"]) for hit in result["matches"]] == [
+        ("src/parser.py", 1),
+    ]
+
+    result, _ = await search(tree, loader, query=r"^def \w+\(text\)", regex=True,
+                             pattern="src/*.py")
+    assert result["matches"] == [
+        {"path": "src/lexer.py", "line": 1, "text": "def tokens(text):"},
+        {"path": "src/parser.py", "line": 1, "text": "def parse(text):"},
+    ]
+    # Everything was fetched by the first search.
+    assert sorted(loader.requested) == sorted(FILES)
+
+
+async def test_hits_are_paged_by_cursor():
+    """A cursor resumes the hits of the same tree and query."""
+    tree = make_tree(FILES)
+    loader = Loader(FILES)
+
+    first, cursor = await search(tree, loader, query="text", limit=2)
+    rest, next_cursor = await search(tree, loader, query="text", cursor=cursor)
+
+    lines = [(hit["path"], hit["line"]) for hit in first["matches"] + rest["matches"]]
+    assert lines == [
+        ("src/lexer.py", 1),
+        ("src/lexer.py", 2),
+        ("src/parser.py", 1),
+        ("src/parser.py", 2),
+    ]
+    assert next_cursor is None
+    with pytest.raises(ValueError, match="different parameters"):
+        await search(tree, loader, query="other", cursor=cursor)
+
+
+async def test_new_trees_only_index_changed_blobs(content_index):
+    """After a push, only files whose blob changed are fetched again."""
+    loader = Loader(FILES)
+    await search(make_tree(FILES), loader, query="parse")
+
+    changed = {**FILES, "src/lexer.py": b"def tokens(text):\n    return parse(text)\n"}
+    loader = Loader(changed)
+    result, _ = await search(make_tree(changed, "tree-2"), loader, query="parse(")
+
+    assert loader.requested == ["src/lexer.py"]
+    assert [hit["path"] for hit in result["matches"]] == [
+        "src/lexer.py",
+        "src/parser.py",
+    ]
+    assert content_index.stats()["indexed_files"] == 5
+
+
+async def test_old_trees_release_their_blobs(content_index, monkeypatch):
+    """Blobs only trees older than the last few name are dropped from the index."""
+    monkeypatch.setattr(search_index, "TREES_PER_REPOSITORY", 1)
+    await search(make_tree(FILES), Loader(FILES), query="parse")
+    repository = content_index.repository("octo", "repo")
+    old_sha = git_blob_sha(FILES["src/lexer.py"])
+
+    changed = {**FILES, "src/lexer.py": b"lexer = None\n"}
+    await search(make_tree(changed, "tree-2"), Loader(changed), query="lexer")
+
+    assert old_sha not in repository.texts
+    assert repository.candidates({"tok"}) == set()
+
+
+async def test_files_over_the_budget_are_skipped(monkeypatch):
+    """Files above the size limit, or beyond the index's bytes, are not searched."""
+    monkeypatch.setattr(
+        search_index, "_content_index", ContentIndex(max_bytes=60, max_file_size=50)
+    )
+    loader = Loader(FILES)
+
+    result, _ = await search(make_tree(FILES), loader, query="text")
+
+    assert "src/parser.py" not in loader.requested
+    assert result["skipped"] == 3
+    # Files that did not fit are not fetched again for the same tree.
+    requested = list(loader.requested)
+    await search(make_tree(FILES), loader, query="tokens")
+    assert loader.requested == requested
+
+
+async def test_files_are_indexed_as_they_arrive(content_index):
+    """Fetched files are indexed one page at a time, not gathered first."""
+    indexed = []
+
+    class CountingLoader(Loader):
+        async def __call__(self, paths):
+            async for page in super().__call__(paths):
+                indexed.append(content_index.stats()["indexed_files"])
+                yield page
+
+    await search(make_tree(FILES), CountingLoader(FILES), query="parse")
+
+    assert indexed == [0, 1, 2, 3]
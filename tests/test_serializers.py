@@ -0,0 +1,71 @@
+"""Tests for tool output serialization."""
+import json
+from dataclasses import replace
+
+import pytest
+
+from github_mcp import serializers
+from github_mcp.config import Settings
+from github_mcp.serializers import dumps, isoformat, select_fields, text_result
+
+ITEMS = [
+    {"number": 1, "title": "First", "body": "Long text", "labels": ["bug"]},
+    {"number": 2, "title": "Second", "body": None, "labels": []},
+]
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    """Settings read by the encoder, replaceable per test."""
+    current = {"settings": Settings()}
+
+    def configure(**changes):
+        current["settings"] = replace(current["settings"], **changes)
+
+    monkeypatch.setattr(serializers, "get_settings", lambda: current["settings"])
+    return configure
+
+
+def test_isoformat_matches_pygithub():
+    """GitHub timestamps are normalised like PyGithub datetimes."""
+    assert isoformat("2024-01-02T03:04:05Z") == "2024-01-02T03:04:05+00:00"
+    assert isoformat(None) is None
+
+
+def test_fields_are_projected_per_item():
+    """Only the requested fields are kept, in each item of a list."""
+    assert select_fields(ITEMS, ["number", "title", "missing"]) == [
+        {"number": 1, "title": "First"},
+        {"number": 2, "title": "Second"},
+    ]
+    assert select_fields(ITEMS[0], ["labels"]) == {"labels": ["bug"]}
+    assert select_fields(ITEMS, ["*"]) is ITEMS
+    assert select_fields(ITEMS, None) is ITEMS
+
+
+@pytest.mark.parametrize("have_orjson", [serializers.HAVE_ORJSON, False])
+def test_compact_output_has_no_whitespace(settings, monkeypatch, have_orjson):
+    """Compact output is the same JSON without indentation, with or without orjson."""
+    monkeypatch.setattr(serializers, "HAVE_ORJSON", have_orjson)
+    data = {"title": "Ünïcode", "items": ITEMS}
+
+    text = dumps(data)
+
+    assert json.loads(text) == data
+    assert "\n" not in text and ": " not in text
+    assert "Ünïcode" in text
+
+
+def test_pretty_output_can_be_configured(settings):
+    """With compact output off, results are indented as before."""
+    settings(compact_output=False)
+
+    assert dumps(ITEMS) == json.dumps(ITEMS, indent=2)
+
+
+def test_text_result_carries_the_cursor(settings):
+    """A result holds the projected JSON text and the continuation cursor."""
+    result = text_result(ITEMS, ["number"], "cursor")
+
+    assert json.loads(result.content[0]["text"]) == [{"number": 1}, {"number": 2}]
+    assert result.next_cursor == "cursor"
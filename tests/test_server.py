@@ -1,38 +1,74 @@
 """Tests for the GitHub MCP server."""
+import asyncio
 import json
-import os
+from dataclasses import replace
+from datetime import datetime, timezone
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
-from github_mcp.server import app, register_tool
+from github_mcp import clients, server
+from github_mcp.cache import get_repository_cache
+from github_mcp.models import ToolCall
+from github_mcp.pagination import Page
+from github_mcp.server import app, sse_endpoint
 
 # Test client
 client = TestClient(app)
 
+CREATED = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+REPO_JSON = {
+    "name": "test-repo",
+    "full_name": "test-owner/test-repo",
+    "description": "Test repository",
+    "html_url": "https://github.com/test-owner/test-repo",
+    "stargazers_count": 42,
+    "forks_count": 7,
+    "private": False,
+    "archived": False,
+    "default_branch": "main",
+    "language": "Python",
+    "topics": ["test", "python"],
+    "created_at": "2024-01-02T03:04:05Z",
+    "updated_at": "2024-01-02T03:04:05Z",
+    "pushed_at": None,
+}
+
 @pytest.fixture
 def mock_github():
     """Mock GitHub client for testing."""
-    with patch("github_mcp.server.Github") as mock:
-        # Mock user and repositories
-        mock_user = MagicMock()
+    with patch("github.Github") as mock, \
+            patch.object(clients, "get_github_token", return_value="test-token"):
+        # GraphQL fails, so tools fall back to REST
+        mock.return_value.requester.graphql_query.side_effect = RuntimeError(
+            "no GraphQL"
+        )
+        mock.return_value.requester.requestJsonAndCheck.return_value = ({}, [REPO_JSON])
+
+        # Mock repository
         mock_repo = MagicMock()
-        mock_repo.name = "test-repo"
-        mock_repo.full_name = "test-owner/test-repo"
-        mock_repo.description = "Test repository"
-        mock_repo.html_url = "https://github.com/test-owner/test-repo"
-        mock_repo.stargazers_count = 42
-        mock_repo.forks_count = 7
-        mock_repo.default_branch = "main"
-        mock_repo.language = "Python"
-        mock_repo.get_topics.return_value = ["test", "python"]
-        
-        mock_user.get_repos.return_value = [mock_repo]
-        mock.return_value.get_user.return_value = mock_user
+        for name, value in REPO_JSON.items():
+            setattr(mock_repo, name, value)
+        mock_repo.created_at = mock_repo.updated_at = CREATED
+        mock_repo.open_issues_count = 3
+        mock_repo.subscribers_count = 2
+        mock_repo.network_count = 7
+        mock_repo.size = 100
+        mock_repo.license = None
+        mock_repo.permissions.admin = mock_repo.permissions.push = False
+        mock_repo.permissions.pull = True
         mock.return_value.get_repo.return_value = mock_repo
-        
+
+        # Clients are created lazily; start each test without one
+        clients._client_registry = None
+        clients._keychain_token = None
+        get_repository_cache().clear()
         yield mock
+        clients._client_registry = None
+        clients._keychain_token = None
 
 def test_root_endpoint():
     """Test the root endpoint returns server information."""
@@ -63,6 +99,19 @@ def test_list_repositories(mock_github):
     assert repos[0]["name"] == "test-repo"
     assert repos[0]["full_name"] == "test-owner/test-repo"
 
+def test_fields_select_output(mock_github):
+    """Test the fields parameter trims each result item."""
+    response = client.post(
+        "/tool",
+        json={
+            "name": "list_repositories",
+            "parameters": {"fields": ["name", "stars"]},
+        },
+    )
+    assert response.status_code == 200
+    text = response.json()["content"][0]["text"]
+    assert json.loads(text) == [{"name": "test-repo", "stars": 42}]
+
 def test_get_repository(mock_github):
     """Test the get_repository tool."""
     response = client.post(
@@ -87,6 +136,37 @@ def test_get_repository(mock_github):
     assert repo["language"] == "Python"
     assert repo["topics"] == ["test", "python"]
 
+def test_request_token_gets_its_own_client(mock_github):
+    """Test a token sent with the request is used instead of the keychain token."""
+    parameters = {"owner": "test-owner", "repo": "test-repo"}
+    for token in ("user-token", "other-token", "user-token"):
+        response = client.post(
+            "/tool",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"name": "get_repository", "parameters": parameters},
+        )
+        assert response.status_code == 200
+
+    tokens = [call.kwargs["auth"].token for call in mock_github.call_args_list]
+    assert tokens == ["user-token", "other-token"]
+    assert clients._keychain_token is None
+
+def test_request_token_can_be_required(mock_github, monkeypatch):
+    """Test calls without a token are refused when tokens are required."""
+    monkeypatch.setattr(
+        server, "settings", replace(server.settings, require_request_token=True)
+    )
+    response = client.post("/tool", json={"name": "list_repositories"})
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+
+    response = client.post(
+        "/tool",
+        headers={"X-GitHub-Token": "user-token"},
+        json={"name": "list_repositories"},
+    )
+    assert response.status_code == 200
+
 def test_invalid_tool():
     """Test calling an invalid tool."""
     response = client.post(
@@ -99,12 +179,71 @@ def test_invalid_tool():
     assert response.status_code == 404
     assert "not found" in response.json()["detail"].lower()
 
-def test_sse_endpoint():
+def test_batch_reports_errors_per_call():
+    """Test a failing call in a batch does not fail the others."""
+    response = client.post(
+        "/tools/batch",
+        json=[
+            {"name": "invalid_tool", "parameters": {}},
+            {"name": "other_invalid_tool"},
+        ],
+    )
+    assert response.status_code == 200
+    items = response.json()
+    assert [item["index"] for item in items] == [0, 1]
+    assert items[0]["result"] is None
+    assert items[0]["error"]["status_code"] == 404
+    assert items[1]["name"] == "other_invalid_tool"
+
+def test_batch_size_is_limited():
+    """Test oversized batches are rejected."""
+    response = client.post("/tools/batch", json=[{"name": "invalid_tool"}] * 1000)
+    assert response.status_code == 413
+
+def test_sse_endpoint(monkeypatch):
     """Test the SSE endpoint."""
+    async def disconnect(seconds):
+        raise ConnectionError("client went away")
+
+    # The keep-alive loop never ends by itself; fail its first sleep.
+    monkeypatch.setattr(server, "asyncio", SimpleNamespace(sleep=disconnect))
     response = client.get("/sse")
     assert response.status_code == 200
-    assert response.headers["content-type"] == "text/event-stream"
-    
+    assert response.headers["content-type"].startswith("text/event-stream")
+
     # Read the first event
     event = next(response.iter_lines())
-    assert b"event: ping" in event 
\ No newline at end of file
+    assert "event: ping" in event
+
+def test_sse_endpoint_pings_without_a_tool():
+    """Without a tool, the stream opens with a keep-alive ping."""
+    response = asyncio.run(sse_endpoint(tool=None, parameters="{}"))
+    assert response.media_type == "text/event-stream"
+
+    # Read the first event; the stream then pings forever
+    async def first_event():
+        return await response.body_iterator.__anext__()
+
+    assert asyncio.run(first_event())["event"] == "ping"
+
+async def test_streams_only_hold_a_slot_while_fetching(mock_github, monkeypatch):
+    """A slow SSE reader does not keep the tool's concurrency slot."""
+    executor = server.get_executor()
+    active = []
+
+    async def pages(github_client, parameters):
+        for number in (1, 2):
+            active.append(executor.stats()["tools"]["list_issues"]["active"])
+            yield Page([{"number": number}], None)
+
+    monkeypatch.setattr(server, "TOOL_STREAMS", {"list_issues": pages})
+    call = ToolCall(name="list_issues", parameters={"owner": "o", "repo": "r"})
+    events = server.stream_tool_events(call)
+
+    first = await events.__anext__()
+    assert json.loads(first["data"]) == {"number": 1}
+    assert executor.stats()["tools"]["list_issues"]["active"] == 0
+    rest = [event async for event in events]
+
+    assert active == [1, 1]
+    assert [event["event"] for event in rest] == ["item", "summary"]
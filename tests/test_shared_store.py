@@ -0,0 +1,110 @@
+"""Tests for the cache store shared between server workers."""
+from github_mcp.blob_store import PathIndex
+from github_mcp.shared_store import TOUCH_INTERVAL, SharedStore
+from github_mcp.trees import TreeCache
+
+TREE = {
+    "sha": "t" * 40,
+    "truncated": False,
+    "tree": [
+        {
+            "path": "README.md",
+            "mode": "100644",
+            "type": "blob",
+            "sha": "a" * 40,
+            "size": 10,
+        },
+        {"path": "src", "mode": "040000", "type": "tree", "sha": "b" * 40},
+        {
+            "path": "src/app.py",
+            "mode": "100644",
+            "type": "blob",
+            "sha": "c" * 40,
+            "size": 20,
+        },
+    ],
+}
+
+
+def test_workers_see_each_others_entries(tmp_path):
+    """Two connections to one database share values."""
+    path = str(tmp_path / "shared.sqlite3")
+    first = SharedStore(path).table("things", 10)
+    second = SharedStore(path).table("things", 10)
+
+    first.set_many([("a", {"n": 1}), ("b", [1, 2])])
+
+    assert second.get("a") == {"n": 1}
+    assert "b" in second
+    assert second.get("c") is None
+
+
+def test_entries_expire_and_are_evicted(tmp_path, clock):
+    """TTLs are honoured and each namespace keeps its newest entries."""
+    store = SharedStore(str(tmp_path / "shared.sqlite3"), clock=clock)
+    table = store.table("things", 2)
+
+    table.set("short", 1, ttl=5.0)
+    clock.now += 1
+    table.set("long", 2)
+    clock.now += 5
+    assert table.get("short") is None
+    assert "short" not in table
+
+    table.set("newest", 3)
+    assert table.get("long") == 2
+    assert store.count("things") == 2
+    assert store.stats()["entries"] == {"things": 2}
+
+
+def test_path_index_is_shared(tmp_path):
+    """Metadata recorded by one worker is found by another."""
+    path = str(tmp_path / "shared.sqlite3")
+    metadata = {"name": "app.py", "path": "src/app.py", "sha": "c" * 40, "type": "file"}
+    PathIndex(16, SharedStore(path).table("path_index", 16)).put(
+        "o", "r", "main", metadata
+    )
+
+    other = PathIndex(16, SharedStore(path).table("path_index", 16))
+
+    assert other.get("O", "R", "main", "src/app.py") == metadata
+    assert other.get("o", "r", "dev", "src/app.py") is None
+
+
+def test_trees_fetched_by_one_worker_warm_the_others(tmp_path, clock):
+    """A tree cached by one worker answers lookups in another until its ref expires."""
+    path = str(tmp_path / "shared.sqlite3")
+    first = TreeCache(4, 10.0, shared=SharedStore(path, clock=clock))
+    second = TreeCache(4, 10.0, shared=SharedStore(path, clock=clock))
+
+    first.store("o", "r", "main", "main", TREE)
+    index, resolved = second.lookup("o", "r", "main")
+
+    assert (len(index), resolved) == (3, "main")
+    assert index.children("src")[0]["path"] == "src/app.py"
+    assert second.stats()["shared_hits"] == 1
+    assert second.stats()["builds"] == 0
+
+    clock.now += 11
+    assert second.lookup("o", "r", "main") is None
+
+
+def test_reads_refresh_access_time_at_most_once_per_interval(tmp_path, clock):
+    """Hits only write when the entry's access time is older than the interval."""
+    store = SharedStore(str(tmp_path / "shared.sqlite3"), clock=clock)
+    table = store.table("things", 2)
+    table.set("old", 1)
+    clock.now += 1
+    table.set("new", 2)
+
+    clock.now += TOUCH_INTERVAL / 2
+    assert table.get("old") == 1
+    table.set("newest", 3)
+    assert "old" not in table
+
+    table.set("new", 2)
+    clock.now += TOUCH_INTERVAL
+    assert table.get("newest") == 3
+    table.set("other", 4)
+    assert "newest" in table
+    assert "new" not in table
@@ -0,0 +1,110 @@
+"""Tests for coalescing identical concurrent tool calls."""
+import asyncio
+
+import pytest
+
+from github_mcp.context import current_credential
+from github_mcp.single_flight import SingleFlight, call_key
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "owner": {"type": "string"},
+        "repo": {"type": "string"},
+        "state": {"type": "string", "default": "open"},
+    },
+}
+
+
+def test_equivalent_calls_share_a_key():
+    """Defaults, nulls and key order do not change the key."""
+    key = call_key("list_issues", {"owner": "o", "repo": "r"}, SCHEMA)
+
+    assert (
+        call_key("list_issues", {"repo": "r", "owner": "o", "state": "open"}, SCHEMA)
+        == key
+    )
+    assert (
+        call_key("list_issues", {"owner": "o", "repo": "r", "labels": None}, SCHEMA)
+        == key
+    )
+    assert (
+        call_key("list_issues", {"owner": "o", "repo": "r", "state": "closed"}, SCHEMA)
+        != key
+    )
+    assert call_key("list_pull_requests", {"owner": "o", "repo": "r"}, SCHEMA) != key
+
+
+def test_credentials_never_share_a_key():
+    """The same call made with another token gets another key."""
+    key = call_key("list_issues", {"owner": "o", "repo": "r"}, SCHEMA)
+    context_token = current_credential.set("0123456789abcdef")
+    try:
+        assert call_key("list_issues", {"owner": "o", "repo": "r"}, SCHEMA) != key
+    finally:
+        current_credential.reset(context_token)
+
+
+async def test_concurrent_calls_run_once():
+    """N identical calls in flight cost one call."""
+    group = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(True)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    results = await asyncio.gather(*(group.do("key", fetch) for _ in range(10)))
+
+    assert results == ["result"] * 10
+    assert len(calls) == 1
+    assert group.stats() == {"calls": 1, "coalesced": 9, "in_flight": 0}
+
+
+async def test_finished_calls_are_not_reused():
+    """A call that completed is made again by the next caller."""
+    group = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(True)
+        return len(calls)
+
+    assert await group.do("key", fetch) == 1
+    assert await group.do("key", fetch) == 2
+
+
+async def test_errors_reach_every_waiter():
+    """A failed call fails all the callers that shared it."""
+    group = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError("404: Not Found")
+
+    results = await asyncio.gather(
+        *(group.do("key", fetch) for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+async def test_cancelled_caller_does_not_cancel_the_others():
+    """The shared call survives its first caller going away."""
+    group = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return "result"
+
+    first = asyncio.ensure_future(group.do("key", fetch))
+    await asyncio.sleep(0)
+    second = asyncio.ensure_future(group.do("key", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "result"
+    with pytest.raises(asyncio.CancelledError):
+        await first
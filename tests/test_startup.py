@@ -0,0 +1,40 @@
+"""Tests for the cost of starting the server."""
+import json
+import subprocess
+import sys
+
+# Cold import of github_mcp.server must stay below this many seconds.
+IMPORT_BUDGET_SECONDS = 2.0
+
+# Run in a fresh interpreter, failing if anything spawns a process (as
+# reading the keychain does) while the server module is imported.
+IMPORT_SCRIPT = """
+import json, subprocess, sys, time
+
+def forbidden(*args, **kwargs):
+    raise AssertionError(f"subprocess started during import: {args}")
+
+subprocess.Popen = forbidden
+start = time.perf_counter()
+import github_mcp.server
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "seconds": elapsed,
+    "loaded": [name for name in ("github", "httpx", "github_mcp.tools.content",
+                                 "github_mcp.rest.content") if name in sys.modules],
+}))
+"""
+
+
+def test_import_is_fast_and_lazy():
+    """Importing the server reads no keychain and loads no backend."""
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    report = json.loads(output.strip().splitlines()[-1])
+
+    assert report["loaded"] == []
+    assert report["seconds"] < IMPORT_BUDGET_SECONDS
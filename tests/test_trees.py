@@ -0,0 +1,132 @@
+"""Tests for tree snapshots and the path index."""
+import pytest
+
+from github_mcp import trees
+from github_mcp.trees import TreeCache, TreeIndex, directory_entries, glob_pattern
+
+TREE = {
+    "sha": "t" * 40,
+    "truncated": False,
+    "tree": [
+        {
+            "path": "README.md",
+            "mode": "100644",
+            "type": "blob",
+            "sha": "a" * 40,
+            "size": 10,
+        },
+        {"path": "src", "mode": "040000", "type": "tree", "sha": "b" * 40},
+        {
+            "path": "src/app.py",
+            "mode": "100644",
+            "type": "blob",
+            "sha": "c" * 40,
+            "size": 20,
+        },
+        {"path": "src/pkg", "mode": "040000", "type": "tree", "sha": "d" * 40},
+        {
+            "path": "src/pkg/util.py",
+            "mode": "100644",
+            "type": "blob",
+            "sha": "e" * 40,
+            "size": 5,
+        },
+        {
+            "path": "src-old.txt",
+            "mode": "100644",
+            "type": "blob",
+            "sha": "f" * 40,
+            "size": 1,
+        },
+        {"path": "vendor", "mode": "160000", "type": "commit", "sha": "0" * 40},
+    ],
+}
+
+
+def paths(entries):
+    """Paths of index entries, in order."""
+    return [entry["path"] for entry in entries]
+
+
+def test_prefix_lookup_stays_inside_the_directory():
+    """Entries under a prefix exclude siblings that share its spelling."""
+    index = TreeIndex.from_response(TREE)
+
+    assert paths(index.under("src")) == ["src/app.py", "src/pkg", "src/pkg/util.py"]
+    assert paths(index.children("")) == ["README.md", "src", "src-old.txt", "vendor"]
+    assert index.get("src/app.py")["size"] == 20
+    assert index.get("missing") is None
+
+
+@pytest.mark.parametrize("pattern, expected", [
+    ("*.py", []),
+    ("src/*.py", ["src/app.py"]),
+    ("**/*.py", ["src/app.py", "src/pkg/util.py"]),
+    ("src/**", ["src/app.py", "src/pkg", "src/pkg/util.py"]),
+    ("src?old.txt", ["src-old.txt"]),
+])
+def test_glob_lookup(pattern, expected):
+    """Single stars stay within a directory; double stars cross them."""
+    index = TreeIndex.from_response(TREE)
+    assert paths(index.find(pattern=pattern)) == expected
+
+
+def test_glob_character_classes():
+    """Bracket expressions support negation."""
+    assert glob_pattern("[!a]*.md").match("README.md")
+    assert not glob_pattern("[!R]*.md").match("README.md")
+
+
+def test_directory_entries_match_the_contents_api():
+    """Listings from the index use the contents API's format."""
+    index = TreeIndex.from_response(TREE)
+
+    entries = directory_entries(index, "o", "r", "main", "")
+
+    by_name = {entry["name"]: entry for entry in entries}
+    assert by_name["src"]["type"] == "dir"
+    assert by_name["src"]["url"] == "https://github.com/o/r/tree/main/src"
+    assert by_name["src"]["download_url"] is None
+    assert by_name["README.md"]["download_url"] == (
+        "https://raw.githubusercontent.com/o/r/main/README.md"
+    )
+    assert by_name["vendor"]["type"] == "submodule"
+    assert paths(directory_entries(index, "o", "r", "main", "src/app.py")) == [
+        "src/app.py"
+    ]
+    assert directory_entries(index, "o", "r", "main", "nope") is None
+
+
+def test_refs_expire_but_trees_are_reused(clock):
+    """A moved-on ref is refetched; an unchanged tree is not rebuilt."""
+    cache = TreeCache(4, 10.0, clock=clock)
+
+    assert cache.lookup("o", "r", "main") is None
+    cache.store("o", "r", "main", "main", TREE)
+    index, resolved = cache.lookup("O", "R", "main")
+    assert (len(index), resolved) == (7, "main")
+
+    clock.now += 11.0
+    assert cache.lookup("o", "r", "main") is None
+    assert cache.store("o", "r", "main", "main", TREE) is index
+    assert cache.stats()["builds"] == 1
+
+
+def test_commit_refs_never_expire():
+    """A tree fetched at a commit SHA stays warm."""
+    cache = TreeCache(4, 0.0)
+    commit = "1" * 40
+
+    cache.store("o", "r", commit, commit, TREE)
+
+    assert cache.lookup("o", "r", commit) is not None
+    assert cache.lookup("o", "r", "main") is None
+
+
+def test_truncated_trees_do_not_answer_listings(monkeypatch):
+    """list_directory only trusts complete trees."""
+    cache = TreeCache(4, 60.0)
+    monkeypatch.setattr(trees, "_tree_cache", cache)
+    cache.store("o", "r", None, "main", {**TREE, "truncated": True})
+
+    assert trees.warm_directory("o", "r", None, "src") is None
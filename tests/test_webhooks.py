@@ -0,0 +1,222 @@
+"""Tests for webhook-driven cache updates, replaying recorded deliveries."""
+import hashlib
+import hmac
+import json
+from dataclasses import replace
+from pathlib import Path
+from types import SimpleNamespace
+from urllib.parse import urlencode
+
+import pytest
+from fastapi.testclient import TestClient
+
+from github_mcp import blob_store, cache
+from github_mcp import mirror as mirror_module
+from github_mcp import server, trees
+from github_mcp.blob_store import PathIndex
+from github_mcp.cache import RepositoryCache
+from github_mcp.config import get_settings
+from github_mcp.context import current_credential
+from github_mcp.mirror import ISSUES, PULLS, MirrorQuery
+from github_mcp.serializers import serialize_issue
+from github_mcp.shared_store import SharedStore
+from github_mcp.trees import TreeCache
+
+FIXTURES = Path(__file__).parent / "fixtures" / "webhooks"
+SECRET = "It's a Secret to Everybody"
+# A caller's own token, as credential_id fingerprints it.
+CALLER = "0123456789abcdef"
+
+client = TestClient(server.app)
+
+
+def recorded(event):
+    """The recorded delivery body of an event."""
+    return (FIXTURES / f"{event}.json").read_bytes()
+
+
+def sign(body, secret=SECRET):
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def deliver(event, body=None, signature=None, **headers):
+    """POST a delivery to /webhook, signed unless a signature is given."""
+    body = recorded(event) if body is None else body
+    headers = {
+        "X-GitHub-Event": event,
+        "X-Hub-Signature-256": signature or sign(body),
+        "Content-Type": "application/json",
+        **headers,
+    }
+    return client.post("/webhook", content=body, headers=headers)
+
+
+def as_caller(credential, fn, *args):
+    """Call ``fn`` with ``credential`` as the current credential."""
+    token = current_credential.set(credential)
+    try:
+        return fn(*args)
+    finally:
+        current_credential.reset(token)
+
+
+@pytest.fixture
+def caches(monkeypatch, tmp_path):
+    """Fresh repository, tree and path caches over a shared store, and a mirror."""
+    shared = SharedStore(str(tmp_path / "shared.sqlite3"))
+    caches = SimpleNamespace(
+        repositories=RepositoryCache(10, 3600),
+        trees=TreeCache(10, 3600, shared=shared),
+        paths=PathIndex(100, shared.table("path_index", 100)),
+        shared=shared,
+    )
+    monkeypatch.setattr(cache, "_repository_cache", caches.repositories)
+    monkeypatch.setattr(trees, "_tree_cache", caches.trees)
+    monkeypatch.setattr(blob_store, "_path_index", caches.paths)
+    monkeypatch.setattr(
+        server, "settings", replace(server.settings, webhook_secret=SECRET)
+    )
+    monkeypatch.setenv("GITHUB_MCP_MIRROR_REPOS", "octo/repo,octo/old-repo")
+    monkeypatch.setenv("GITHUB_MCP_MIRROR_PATH", str(tmp_path / "mirror.sqlite3"))
+    monkeypatch.setattr(mirror_module, "_mirror", None)
+    get_settings.cache_clear()
+    caches.mirror = mirror_module.get_mirror()
+    yield caches
+    get_settings.cache_clear()
+
+
+def tree(sha):
+    return {"sha": sha, "tree": [], "truncated": False}
+
+
+def test_deliveries_must_be_signed(caches, monkeypatch):
+    """Unsigned or wrongly signed deliveries are rejected; unknown events ignored."""
+    assert deliver("ping", b"{}", signature="sha256=" + "0" * 64).status_code == 401
+    assert deliver("ping", b"{}", signature=sign(b"{}", "guess")).status_code == 401
+
+    response = deliver("ping", b'{"zen": "Keep it logically awesome."}')
+    assert response.status_code == 200
+    assert response.json()["ignored"] is True
+
+    monkeypatch.setattr(
+        server, "settings", replace(server.settings, webhook_secret=None)
+    )
+    assert deliver("ping", b"{}").status_code == 404
+
+
+def test_push_drops_the_pushed_ref_and_changed_paths(caches):
+    """Only the pushed branch, the default ref and the changed paths are dropped."""
+    for credential in ("", CALLER):
+        for ref in ("main", "", "dev"):
+            as_caller(
+                credential, caches.trees.store, "octo", "repo", ref, "main", tree("t1")
+            )
+        as_caller(credential, caches.paths.put_many, "octo", "repo", "main", [
+            {"path": "src/parser.py", "sha": "a"},
+            {"path": "src/app.py", "sha": "b"},
+        ])
+        as_caller(credential, caches.paths.put, "octo", "repo", "dev",
+                  {"path": "src/parser.py", "sha": "a"})
+
+    response = deliver("push")
+
+    assert response.status_code == 200
+    assert response.json()["updated"] == {"repository": 0, "tree_refs": 8, "paths": 4}
+    for credential in ("", CALLER):
+        lookup = caches.trees.lookup
+        assert as_caller(credential, lookup, "octo", "repo", "main") is None
+        assert as_caller(credential, lookup, "octo", "repo", None) is None
+        assert as_caller(credential, lookup, "octo", "repo", "dev") is not None
+        get = caches.paths.get
+        assert (
+            as_caller(credential, get, "octo", "repo", "main", "src/parser.py") is None
+        )
+        assert as_caller(credential, get, "octo", "repo", "main", "src/app.py")
+        assert as_caller(credential, get, "octo", "repo", "dev", "src/parser.py")
+
+
+def test_long_pushes_drop_every_path_of_the_ref(caches):
+    """A push whose payload may not name every change forgets the whole ref."""
+    payload = json.loads(recorded("push"))
+    payload["forced"] = True
+    caches.paths.put(
+        "octo", "repo", "main", {"path": "unrelated.txt", "sha": "c"}
+    )
+
+    response = deliver("push", json.dumps(payload).encode())
+
+    assert response.json()["updated"]["paths"] == 2
+    assert caches.paths.get("octo", "repo", "main", "unrelated.txt") is None
+
+
+def test_issue_and_pull_request_events_update_the_mirror(caches):
+    """Deliveries rewrite mirrored items, but never with an older version."""
+    issue = json.loads(recorded("issues"))["issue"]
+    caches.mirror.store(
+        "octo/repo",
+        ISSUES,
+        [
+            serialize_issue(
+                {**issue, "state": "open", "updated_at": "2024-03-09T00:00:00Z"}
+            )
+        ],
+    )
+
+    assert deliver("issues").json()["updated"] == {"mirror": 1}
+    assert deliver("pull_request").json()["updated"] == {"mirror": 2}
+    caches.mirror.store(
+        "octo/repo",
+        ISSUES,
+        [
+            serialize_issue(
+                {**issue, "state": "open", "updated_at": "2024-03-09T00:00:00Z"}
+            )
+        ],
+    )
+
+    issues = caches.mirror.query("octo/repo", ISSUES, MirrorQuery(state="all"), 0, 10)
+    assert [
+        (item["number"], item["state"], item["pull_request"]) for item in issues
+    ] == [
+        (8, "open", True),
+        (7, "closed", False),
+    ]
+    (pull,) = caches.mirror.query("octo/repo", PULLS, MirrorQuery(), 0, 10)
+    assert pull["head"]["repo"] == "bob/repo"
+    assert "additions" not in pull
+
+    deleted = json.loads(recorded("issues"))
+    deleted["action"] = "deleted"
+    response = deliver("issues", json.dumps(deleted).encode())
+    assert response.json()["updated"] == {"mirror": 1}
+
+
+def test_renamed_repositories_are_forgotten_under_the_old_name(caches):
+    """A rename drops the repository, its refs, paths and mirror rows."""
+    github = SimpleNamespace(get_repo=lambda name: SimpleNamespace(full_name=name))
+    caches.repositories.get(github, "octo", "old-repo")
+    caches.trees.store("octo", "old-repo", "dev", "dev", tree("t2"))
+    caches.paths.put("octo", "old-repo", "dev", {"path": "a.txt", "sha": "d"})
+    caches.mirror.store("octo/old-repo", ISSUES, [
+        serialize_issue(json.loads(recorded("issues"))["issue"])
+    ])
+
+    response = deliver("repository")
+
+    assert response.json()["updated"] == {
+        "repository": 1, "tree_refs": 2, "paths": 2, "mirror": 1,
+    }
+    assert caches.trees.lookup("octo", "old-repo", "dev") is None
+    assert caches.mirror.query("octo/old-repo", ISSUES, MirrorQuery(), 0, 10) == []
+
+
+def test_form_encoded_deliveries(caches):
+    """Webhooks configured with the form content type are decoded too."""
+    body = urlencode({"payload": recorded("issues").decode()}).encode()
+
+    response = deliver(
+        "issues", body, **{"Content-Type": "application/x-www-form-urlencoded"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["updated"] == {"mirror": 1}